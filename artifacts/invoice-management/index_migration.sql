@@ -0,0 +1,18 @@
+-- インデックス移行: invoice-management
+-- CONCURRENTLY はトランザクション外で実行する（psql -f でそのまま流せる）
+
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報）） / INVOICE の削除
+DROP INDEX CONCURRENTLY IF EXISTS idx_invoice_send_invoice;
+--   元の定義: CREATE INDEX idx_invoice_send_invoice ON INVOICE_SEND(invoice_id);
+CREATE INDEX CONCURRENTLY idx_invoice_send_invoice ON INVOICE_SEND(invoice_id) INCLUDE (send_date_time);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_invoice_number;  -- ワークロードに invoice_number を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_invoice_number ON INVOICE(invoice_number);
+DROP INDEX CONCURRENTLY IF EXISTS idx_invoice_send_datetime;  -- ワークロードに send_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_invoice_send_datetime ON INVOICE_SEND(send_date_time);
+DROP INDEX CONCURRENTLY IF EXISTS idx_payment_datetime;  -- ワークロードに payment_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_payment_datetime ON PAYMENT(payment_date_time);
+DROP INDEX CONCURRENTLY IF EXISTS idx_confirmation_send_datetime;  -- ワークロードに send_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_confirmation_send_datetime ON CONFIRMATION_SEND(send_date_time);
+
+ANALYZE;
@@ -0,0 +1,274 @@
+-- ================================================
+-- 現在状態プロジェクション（イベント追記時にトリガーで 1 行ずつ更新）
+-- invoice-management
+-- 生成: python -m tools.projection invoice-management --write
+-- schema.sql の後、データ投入の前に実行する
+-- ================================================
+--
+-- 使い方:
+--   SELECT * FROM INVOICE_STATE WHERE invoice_id = ?;  -- 主キー参照で現在状態を取得
+--   CALL rebuild_projections();  -- イベントから全件を作り直す（復旧・トリガーを止めた一括投入の後）
+
+-- ================================================
+-- プロジェクションテーブル
+-- ================================================
+
+-- 請求書の現在状態
+CREATE TABLE INVOICE_STATE (
+    invoice_id INTEGER PRIMARY KEY,
+    invoice_send_count BIGINT NOT NULL DEFAULT 0,
+    first_invoice_send_at TIMESTAMP WITH TIME ZONE,
+    last_invoice_send_at TIMESTAMP WITH TIME ZONE,
+    last_invoice_send_id INTEGER,
+    last_invoice_send_method VARCHAR(50),
+    payment_count BIGINT NOT NULL DEFAULT 0,
+    first_payment_at TIMESTAMP WITH TIME ZONE,
+    last_payment_at TIMESTAMP WITH TIME ZONE,
+    last_payment_id INTEGER,
+    last_payment_amount NUMERIC(10,2),
+    last_payment_method VARCHAR(50),
+    total_payment_amount NUMERIC NOT NULL DEFAULT 0,
+    remaining_amount NUMERIC,
+    confirmation_send_count BIGINT NOT NULL DEFAULT 0,
+    first_confirmation_send_at TIMESTAMP WITH TIME ZONE,
+    last_confirmation_send_at TIMESTAMP WITH TIME ZONE,
+    last_confirmation_send_id INTEGER,
+    last_confirmation_send_method VARCHAR(50),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_invoice_state_invoice FOREIGN KEY (invoice_id)
+        REFERENCES INVOICE(invoice_id) ON DELETE RESTRICT
+);
+
+COMMENT ON TABLE INVOICE_STATE IS '請求書の現在状態（イベントから導出）';
+COMMENT ON COLUMN INVOICE_STATE.invoice_id IS '請求書ID';
+COMMENT ON COLUMN INVOICE_STATE.invoice_send_count IS '請求書送付イベントの件数';
+COMMENT ON COLUMN INVOICE_STATE.first_invoice_send_at IS '最初の請求書送付イベントの送付日時';
+COMMENT ON COLUMN INVOICE_STATE.last_invoice_send_at IS '最新の請求書送付イベントの送付日時';
+COMMENT ON COLUMN INVOICE_STATE.last_invoice_send_id IS '最新の請求書送付イベントのイベントID';
+COMMENT ON COLUMN INVOICE_STATE.last_invoice_send_method IS '最新の請求書送付イベントの送付方法';
+COMMENT ON COLUMN INVOICE_STATE.payment_count IS '入金イベントの件数';
+COMMENT ON COLUMN INVOICE_STATE.first_payment_at IS '最初の入金イベントの入金日時';
+COMMENT ON COLUMN INVOICE_STATE.last_payment_at IS '最新の入金イベントの入金日時';
+COMMENT ON COLUMN INVOICE_STATE.last_payment_id IS '最新の入金イベントの入金ID';
+COMMENT ON COLUMN INVOICE_STATE.last_payment_amount IS '最新の入金イベントの入金額';
+COMMENT ON COLUMN INVOICE_STATE.last_payment_method IS '最新の入金イベントの入金方法';
+COMMENT ON COLUMN INVOICE_STATE.total_payment_amount IS '入金イベントの入金額の累計';
+COMMENT ON COLUMN INVOICE_STATE.remaining_amount IS '残請求金額（請求金額 - 入金額の累計）';
+COMMENT ON COLUMN INVOICE_STATE.confirmation_send_count IS '確認状送付イベントの件数';
+COMMENT ON COLUMN INVOICE_STATE.first_confirmation_send_at IS '最初の確認状送付イベントの送付日時';
+COMMENT ON COLUMN INVOICE_STATE.last_confirmation_send_at IS '最新の確認状送付イベントの送付日時';
+COMMENT ON COLUMN INVOICE_STATE.last_confirmation_send_id IS '最新の確認状送付イベントの確認状ID';
+COMMENT ON COLUMN INVOICE_STATE.last_confirmation_send_method IS '最新の確認状送付イベントの送付方法';
+COMMENT ON COLUMN INVOICE_STATE.updated_at IS '更新日時';
+
+-- ================================================
+-- 追記トリガー
+-- ================================================
+
+-- 請求書の追加 → 状態行を作成（イベントのないリソースも一覧できるようにする）
+CREATE OR REPLACE FUNCTION invoice_state_init() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO INVOICE_STATE (invoice_id, remaining_amount)
+    VALUES (NEW.invoice_id, NEW.amount)
+    ON CONFLICT (invoice_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_invoice_invoice_state_init AFTER INSERT ON INVOICE
+    FOR EACH ROW EXECUTE FUNCTION invoice_state_init();
+
+-- 請求書の amount の訂正 → 残高を再計算
+CREATE OR REPLACE FUNCTION invoice_state_adjust_amount() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE INVOICE_STATE
+    SET remaining_amount = NEW.amount - total_payment_amount,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE invoice_id = NEW.invoice_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_invoice_invoice_state_adjust_amount
+    AFTER UPDATE OF amount ON INVOICE
+    FOR EACH ROW WHEN (NEW.amount IS DISTINCT FROM OLD.amount)
+    EXECUTE FUNCTION invoice_state_adjust_amount();
+
+-- 請求書送付の追記 → 請求書の現在状態
+CREATE OR REPLACE FUNCTION invoice_state_apply_invoice_send() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO INVOICE_STATE AS s (
+        invoice_id,
+        invoice_send_count,
+        first_invoice_send_at,
+        last_invoice_send_at,
+        last_invoice_send_id,
+        last_invoice_send_method
+    ) VALUES (
+        NEW.invoice_id,
+        1,
+        NEW.send_date_time,
+        NEW.send_date_time,
+        NEW.event_id,
+        NEW.send_method
+    )
+    ON CONFLICT (invoice_id) DO UPDATE SET
+        invoice_send_count = s.invoice_send_count + 1,
+        first_invoice_send_at = LEAST(s.first_invoice_send_at, EXCLUDED.first_invoice_send_at),
+        last_invoice_send_at = GREATEST(s.last_invoice_send_at, EXCLUDED.last_invoice_send_at),
+        last_invoice_send_id = CASE WHEN s.last_invoice_send_at IS NULL OR EXCLUDED.last_invoice_send_at >= s.last_invoice_send_at THEN EXCLUDED.last_invoice_send_id ELSE s.last_invoice_send_id END,
+        last_invoice_send_method = CASE WHEN s.last_invoice_send_at IS NULL OR EXCLUDED.last_invoice_send_at >= s.last_invoice_send_at THEN EXCLUDED.last_invoice_send_method ELSE s.last_invoice_send_method END,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_invoice_send_invoice_state AFTER INSERT ON INVOICE_SEND
+    FOR EACH ROW EXECUTE FUNCTION invoice_state_apply_invoice_send();
+
+-- 入金の追記 → 請求書の現在状態
+CREATE OR REPLACE FUNCTION invoice_state_apply_payment() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO INVOICE_STATE AS s (
+        invoice_id,
+        payment_count,
+        first_payment_at,
+        last_payment_at,
+        last_payment_id,
+        last_payment_amount,
+        last_payment_method,
+        total_payment_amount,
+        remaining_amount
+    ) VALUES (
+        NEW.invoice_id,
+        1,
+        NEW.payment_date_time,
+        NEW.payment_date_time,
+        NEW.payment_id,
+        NEW.payment_amount,
+        NEW.payment_method,
+        COALESCE(NEW.payment_amount, 0),
+        (SELECT r.amount FROM INVOICE r WHERE r.invoice_id = NEW.invoice_id) - COALESCE(NEW.payment_amount, 0)
+    )
+    ON CONFLICT (invoice_id) DO UPDATE SET
+        payment_count = s.payment_count + 1,
+        first_payment_at = LEAST(s.first_payment_at, EXCLUDED.first_payment_at),
+        last_payment_at = GREATEST(s.last_payment_at, EXCLUDED.last_payment_at),
+        last_payment_id = CASE WHEN s.last_payment_at IS NULL OR EXCLUDED.last_payment_at >= s.last_payment_at THEN EXCLUDED.last_payment_id ELSE s.last_payment_id END,
+        last_payment_amount = CASE WHEN s.last_payment_at IS NULL OR EXCLUDED.last_payment_at >= s.last_payment_at THEN EXCLUDED.last_payment_amount ELSE s.last_payment_amount END,
+        last_payment_method = CASE WHEN s.last_payment_at IS NULL OR EXCLUDED.last_payment_at >= s.last_payment_at THEN EXCLUDED.last_payment_method ELSE s.last_payment_method END,
+        total_payment_amount = s.total_payment_amount + EXCLUDED.total_payment_amount,
+        remaining_amount = s.remaining_amount - EXCLUDED.total_payment_amount,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_payment_invoice_state AFTER INSERT ON PAYMENT
+    FOR EACH ROW EXECUTE FUNCTION invoice_state_apply_payment();
+
+-- 確認状送付の追記 → 請求書の現在状態
+CREATE OR REPLACE FUNCTION invoice_state_apply_confirmation_send() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO INVOICE_STATE AS s (
+        invoice_id,
+        confirmation_send_count,
+        first_confirmation_send_at,
+        last_confirmation_send_at,
+        last_confirmation_send_id,
+        last_confirmation_send_method
+    ) VALUES (
+        NEW.invoice_id,
+        1,
+        NEW.send_date_time,
+        NEW.send_date_time,
+        NEW.confirmation_id,
+        NEW.send_method
+    )
+    ON CONFLICT (invoice_id) DO UPDATE SET
+        confirmation_send_count = s.confirmation_send_count + 1,
+        first_confirmation_send_at = LEAST(s.first_confirmation_send_at, EXCLUDED.first_confirmation_send_at),
+        last_confirmation_send_at = GREATEST(s.last_confirmation_send_at, EXCLUDED.last_confirmation_send_at),
+        last_confirmation_send_id = CASE WHEN s.last_confirmation_send_at IS NULL OR EXCLUDED.last_confirmation_send_at >= s.last_confirmation_send_at THEN EXCLUDED.last_confirmation_send_id ELSE s.last_confirmation_send_id END,
+        last_confirmation_send_method = CASE WHEN s.last_confirmation_send_at IS NULL OR EXCLUDED.last_confirmation_send_at >= s.last_confirmation_send_at THEN EXCLUDED.last_confirmation_send_method ELSE s.last_confirmation_send_method END,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_confirmation_send_invoice_state AFTER INSERT ON CONFIRMATION_SEND
+    FOR EACH ROW EXECUTE FUNCTION invoice_state_apply_confirmation_send();
+
+-- イベントは追記のみ（更新・削除すると状態がイベントとずれるため拒否する）
+CREATE OR REPLACE FUNCTION reject_event_modification() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    RAISE EXCEPTION 'イベントテーブル % は追記のみです（%）', TG_TABLE_NAME, TG_OP
+        USING HINT = '訂正は新しいイベントとして追記してください';
+END;
+$$;
+
+CREATE TRIGGER trg_invoice_send_append_only BEFORE UPDATE OR DELETE ON INVOICE_SEND
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+CREATE TRIGGER trg_payment_append_only BEFORE UPDATE OR DELETE ON PAYMENT
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+CREATE TRIGGER trg_confirmation_send_append_only BEFORE UPDATE OR DELETE ON CONFIRMATION_SEND
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+-- ================================================
+-- イベントからの再構築
+-- ================================================
+
+-- 請求書の現在状態をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_invoice_state() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE INVOICE_SEND, PAYMENT, CONFIRMATION_SEND IN SHARE MODE;
+    TRUNCATE INVOICE_STATE;
+    INSERT INTO INVOICE_STATE (invoice_id, remaining_amount)
+    SELECT invoice_id, amount FROM INVOICE;
+
+    -- 請求書送付
+    UPDATE INVOICE_STATE s SET invoice_send_count = e.n, first_invoice_send_at = e.first_at, last_invoice_send_at = e.last_at
+    FROM (SELECT invoice_id, COUNT(*) AS n, MIN(send_date_time) AS first_at, MAX(send_date_time) AS last_at
+          FROM INVOICE_SEND GROUP BY invoice_id) e
+    WHERE s.invoice_id = e.invoice_id;
+    UPDATE INVOICE_STATE s SET last_invoice_send_id = e.event_id, last_invoice_send_method = e.send_method
+    FROM (SELECT DISTINCT ON (invoice_id) invoice_id, event_id, send_method
+          FROM INVOICE_SEND ORDER BY invoice_id, send_date_time DESC, event_id DESC) e
+    WHERE s.invoice_id = e.invoice_id;
+
+    -- 入金
+    UPDATE INVOICE_STATE s SET payment_count = e.n, first_payment_at = e.first_at, last_payment_at = e.last_at, total_payment_amount = e.total_payment_amount
+    FROM (SELECT invoice_id, COUNT(*) AS n, MIN(payment_date_time) AS first_at, MAX(payment_date_time) AS last_at, COALESCE(SUM(payment_amount), 0) AS total_payment_amount
+          FROM PAYMENT GROUP BY invoice_id) e
+    WHERE s.invoice_id = e.invoice_id;
+    UPDATE INVOICE_STATE s SET last_payment_id = e.payment_id, last_payment_amount = e.payment_amount, last_payment_method = e.payment_method
+    FROM (SELECT DISTINCT ON (invoice_id) invoice_id, payment_id, payment_amount, payment_method
+          FROM PAYMENT ORDER BY invoice_id, payment_date_time DESC, payment_id DESC) e
+    WHERE s.invoice_id = e.invoice_id;
+
+    -- 確認状送付
+    UPDATE INVOICE_STATE s SET confirmation_send_count = e.n, first_confirmation_send_at = e.first_at, last_confirmation_send_at = e.last_at
+    FROM (SELECT invoice_id, COUNT(*) AS n, MIN(send_date_time) AS first_at, MAX(send_date_time) AS last_at
+          FROM CONFIRMATION_SEND GROUP BY invoice_id) e
+    WHERE s.invoice_id = e.invoice_id;
+    UPDATE INVOICE_STATE s SET last_confirmation_send_id = e.confirmation_id, last_confirmation_send_method = e.send_method
+    FROM (SELECT DISTINCT ON (invoice_id) invoice_id, confirmation_id, send_method
+          FROM CONFIRMATION_SEND ORDER BY invoice_id, send_date_time DESC, confirmation_id DESC) e
+    WHERE s.invoice_id = e.invoice_id;
+
+    UPDATE INVOICE_STATE SET remaining_amount = remaining_amount - total_payment_amount;
+
+    SELECT COUNT(*) INTO n FROM INVOICE_STATE;
+    RETURN n;
+END;
+$$;
+
+CREATE OR REPLACE PROCEDURE rebuild_projections() LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM rebuild_invoice_state();
+END;
+$$;
@@ -111,24 +111,51 @@ COMMENT ON COLUMN CONFIRMATION_SEND.send_method IS '送付方法';
 
 -- ================================================
 -- インデックス（パフォーマンス最適化）
+-- query_examples.sql / openapi.yaml のアクセスパターンから導出
+-- 生成: python -m tools.index_advisor invoice-management --write
 -- ================================================
 
 -- 請求書インデックス
-CREATE INDEX idx_invoice_customer ON INVOICE(customer_id);
+-- クエリ2（確認状送付が必要な請求書）: 範囲条件 due_date
+-- クエリ6（督促が必要な顧客リスト）: 範囲条件 due_date
 CREATE INDEX idx_invoice_duedate ON INVOICE(due_date);
-CREATE INDEX idx_invoice_number ON INVOICE(invoice_number);
+-- クエリ3（入金状況サマリー（顧客別））: 結合条件 customer_id — ネステッドループ結合の内側を索引で参照
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_invoice_customer ON INVOICE(customer_id);
 
 -- 請求書送付イベントインデックス
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報））: 相関サブクエリ invoice_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- INVOICE の削除: 外部キー invoice_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+-- INCLUDE (send_date_time): 参照列を索引に含めて Index Only Scan にする
+CREATE INDEX idx_invoice_send_invoice ON INVOICE_SEND(invoice_id) INCLUDE (send_date_time);
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_invoice_send_customer ON INVOICE_SEND(customer_id);
-CREATE INDEX idx_invoice_send_invoice ON INVOICE_SEND(invoice_id);
-CREATE INDEX idx_invoice_send_datetime ON INVOICE_SEND(send_date_time);
 
 -- 入金イベントインデックス
-CREATE INDEX idx_payment_customer ON PAYMENT(customer_id);
+-- クエリ1（未入金請求書の一覧）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ2（確認状送付が必要な請求書）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ3（入金状況サマリー（顧客別））: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ5（分割払いの検出）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ6（督促が必要な顧客リスト）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報））: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報））: 相関サブクエリ invoice_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- INVOICE の削除: 外部キー invoice_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_payment_invoice ON PAYMENT(invoice_id);
-CREATE INDEX idx_payment_datetime ON PAYMENT(payment_date_time);
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_payment_customer ON PAYMENT(customer_id);
 
 -- 確認状送付イベントインデックス
-CREATE INDEX idx_confirmation_send_customer ON CONFIRMATION_SEND(customer_id);
+-- クエリ2（確認状送付が必要な請求書）: 相関サブクエリ invoice_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- クエリ6（督促が必要な顧客リスト）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報））: 相関サブクエリ invoice_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- INVOICE の削除: 外部キー invoice_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_confirmation_send_invoice ON CONFIRMATION_SEND(invoice_id);
-CREATE INDEX idx_confirmation_send_datetime ON CONFIRMATION_SEND(send_date_time);
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_confirmation_send_customer ON CONFIRMATION_SEND(customer_id);
+
+-- 作成しないインデックス（どのクエリ・エンドポイント・外部キーの検査にも使わない。
+-- 未使用の索引は挿入性能を下げる）
+--   idx_invoice_number ON INVOICE(invoice_number): ワークロードに invoice_number を使う検索・結合・並び替えがない
+--   idx_invoice_send_datetime ON INVOICE_SEND(send_date_time): ワークロードに send_date_time を使う検索・結合・並び替えがない
+--   idx_payment_datetime ON PAYMENT(payment_date_time): ワークロードに payment_date_time を使う検索・結合・並び替えがない
+--   idx_confirmation_send_datetime ON CONFIRMATION_SEND(send_date_time): ワークロードに send_date_time を使う検索・結合・並び替えがない
@@ -0,0 +1,252 @@
+-- ================================================
+-- イミュータブルデータモデル DDL
+-- 生成日時: 2026-01-10
+-- パーティション版（イベントテーブルを日時列で 3 months ごとに範囲分割）
+-- 生成: python -m tools.partition invoice-management --write
+-- ================================================
+
+-- ================================================
+-- リソーステーブル
+-- ================================================
+
+-- 顧客テーブル
+CREATE TABLE CUSTOMER (
+    customer_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    address VARCHAR(255),
+    phone VARCHAR(20),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE CUSTOMER IS '顧客';
+COMMENT ON COLUMN CUSTOMER.customer_id IS '顧客ID';
+COMMENT ON COLUMN CUSTOMER.name IS '顧客名';
+COMMENT ON COLUMN CUSTOMER.address IS '住所';
+COMMENT ON COLUMN CUSTOMER.phone IS '電話番号';
+COMMENT ON COLUMN CUSTOMER.created_at IS '作成日時';
+
+-- 請求書テーブル
+CREATE TABLE INVOICE (
+    invoice_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    customer_id INTEGER NOT NULL,
+    invoice_number VARCHAR(50) NOT NULL,
+    issue_date DATE NOT NULL,
+    amount NUMERIC(10,2) NOT NULL,
+    due_date DATE NOT NULL,
+    CONSTRAINT fk_invoice_customer FOREIGN KEY (customer_id)
+        REFERENCES CUSTOMER(customer_id) ON DELETE RESTRICT
+);
+
+COMMENT ON TABLE INVOICE IS '請求書';
+COMMENT ON COLUMN INVOICE.invoice_id IS '請求書ID';
+COMMENT ON COLUMN INVOICE.customer_id IS '顧客ID';
+COMMENT ON COLUMN INVOICE.invoice_number IS '請求番号';
+COMMENT ON COLUMN INVOICE.issue_date IS '発行日';
+COMMENT ON COLUMN INVOICE.amount IS '請求金額';
+COMMENT ON COLUMN INVOICE.due_date IS '支払期日';
+
+-- ================================================
+-- イベントテーブル
+-- ================================================
+
+-- 請求書送付イベント
+CREATE TABLE INVOICE_SEND (
+    event_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    invoice_id INTEGER NOT NULL,
+    customer_id INTEGER NOT NULL,
+    send_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    send_method VARCHAR(50),
+    CONSTRAINT fk_invoice_send_invoice FOREIGN KEY (invoice_id)
+        REFERENCES INVOICE(invoice_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_invoice_send_customer FOREIGN KEY (customer_id)
+        REFERENCES CUSTOMER(customer_id) ON DELETE RESTRICT,
+    PRIMARY KEY (event_id, send_date_time)
+) PARTITION BY RANGE (send_date_time);
+
+COMMENT ON TABLE INVOICE_SEND IS '請求書送付イベント';
+COMMENT ON COLUMN INVOICE_SEND.event_id IS 'イベントID';
+COMMENT ON COLUMN INVOICE_SEND.invoice_id IS '請求書ID';
+COMMENT ON COLUMN INVOICE_SEND.customer_id IS '顧客ID';
+COMMENT ON COLUMN INVOICE_SEND.send_date_time IS '送付日時';
+COMMENT ON COLUMN INVOICE_SEND.send_method IS '送付方法';
+
+-- 入金イベント
+CREATE TABLE PAYMENT (
+    payment_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    invoice_id INTEGER NOT NULL,
+    customer_id INTEGER NOT NULL,
+    payment_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    payment_amount NUMERIC(10,2) NOT NULL,
+    payment_method VARCHAR(50),
+    CONSTRAINT fk_payment_invoice FOREIGN KEY (invoice_id)
+        REFERENCES INVOICE(invoice_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_payment_customer FOREIGN KEY (customer_id)
+        REFERENCES CUSTOMER(customer_id) ON DELETE RESTRICT,
+    PRIMARY KEY (payment_id, payment_date_time)
+) PARTITION BY RANGE (payment_date_time);
+
+COMMENT ON TABLE PAYMENT IS '入金イベント';
+COMMENT ON COLUMN PAYMENT.payment_id IS '入金ID';
+COMMENT ON COLUMN PAYMENT.invoice_id IS '請求書ID';
+COMMENT ON COLUMN PAYMENT.customer_id IS '顧客ID';
+COMMENT ON COLUMN PAYMENT.payment_date_time IS '入金日時';
+COMMENT ON COLUMN PAYMENT.payment_amount IS '入金額';
+COMMENT ON COLUMN PAYMENT.payment_method IS '入金方法';
+
+-- 確認状送付イベント
+CREATE TABLE CONFIRMATION_SEND (
+    confirmation_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    invoice_id INTEGER NOT NULL,
+    customer_id INTEGER NOT NULL,
+    send_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    send_method VARCHAR(50),
+    CONSTRAINT fk_confirmation_send_invoice FOREIGN KEY (invoice_id)
+        REFERENCES INVOICE(invoice_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_confirmation_send_customer FOREIGN KEY (customer_id)
+        REFERENCES CUSTOMER(customer_id) ON DELETE RESTRICT,
+    PRIMARY KEY (confirmation_id, send_date_time)
+) PARTITION BY RANGE (send_date_time);
+
+COMMENT ON TABLE CONFIRMATION_SEND IS '確認状送付イベント';
+COMMENT ON COLUMN CONFIRMATION_SEND.confirmation_id IS '確認状ID';
+COMMENT ON COLUMN CONFIRMATION_SEND.invoice_id IS '請求書ID';
+COMMENT ON COLUMN CONFIRMATION_SEND.customer_id IS '顧客ID';
+COMMENT ON COLUMN CONFIRMATION_SEND.send_date_time IS '送付日時';
+COMMENT ON COLUMN CONFIRMATION_SEND.send_method IS '送付方法';
+
+-- ================================================
+-- パーティション管理
+-- ================================================
+
+-- parent の範囲パーティションを step 単位で from_ts から to_ts まで作成する（作成済みは飛ばす）
+-- パーティション名は {テーブル}_p{開始日}。境界はセッションのタイムゾーンで年初から step ごとに揃える
+CREATE OR REPLACE FUNCTION create_time_partitions(
+    parent REGCLASS, from_ts TIMESTAMPTZ, to_ts TIMESTAMPTZ, step INTERVAL
+) RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE
+    lo TIMESTAMPTZ := date_trunc('year', from_ts);
+    hi TIMESTAMPTZ;
+    parent_name TEXT;
+    key_column TEXT;
+    default_part REGCLASS;
+    part TEXT;
+    misplaced BOOLEAN;
+    created INTEGER := 0;
+BEGIN
+    SELECT c.relname, a.attname INTO parent_name, key_column
+    FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+    WHERE pt.partrelid = parent;
+    IF parent_name IS NULL THEN
+        RAISE EXCEPTION '% はパーティションテーブルではありません', parent;
+    END IF;
+    SELECT i.inhrelid::REGCLASS INTO default_part
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = parent AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT';
+
+    WHILE lo + step <= from_ts LOOP
+        lo := lo + step;
+    END LOOP;
+    WHILE lo < to_ts LOOP
+        hi := lo + step;
+        part := format('%s_p%s', parent_name, to_char(lo, 'YYYYMMDD'));
+        IF to_regclass(quote_ident(part)) IS NULL THEN
+            -- デフォルトパーティションに範囲内の行があると作成できない（行の移動はプロジェクションの再計算を伴うため自動では行わない）
+            IF default_part IS NOT NULL THEN
+                EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE %I >= $1 AND %I < $2)',
+                               default_part, key_column, key_column)
+                    INTO misplaced USING lo, hi;
+                IF misplaced THEN
+                    RAISE EXCEPTION '% に [%, %) の行があるため % を作成できません', default_part, lo, hi, part
+                        USING HINT = '行を退避してから作成し、元のテーブルに戻してください';
+                END IF;
+            END IF;
+            EXECUTE format('CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                           part, parent, lo, hi);
+            created := created + 1;
+        END IF;
+        lo := hi;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+
+-- すべてのイベントテーブルに、現在から ahead 先までのパーティションを作成する
+-- 定期実行する（例: pg_cron で毎月 SELECT create_event_partitions();）
+CREATE OR REPLACE FUNCTION create_event_partitions(
+    ahead INTERVAL DEFAULT INTERVAL '3 months', history INTERVAL DEFAULT INTERVAL '0 months'
+) RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE
+    created INTEGER := 0;
+BEGIN
+    created := created + create_time_partitions('INVOICE_SEND', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    created := created + create_time_partitions('PAYMENT', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    created := created + create_time_partitions('CONFIRMATION_SEND', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    RETURN created;
+END;
+$$;
+
+-- 範囲外（作成前の未来日時・作成範囲より前の過去日時）の行を受けるデフォルトパーティション
+CREATE TABLE INVOICE_SEND_DEFAULT PARTITION OF INVOICE_SEND DEFAULT;
+CREATE TABLE PAYMENT_DEFAULT PARTITION OF PAYMENT DEFAULT;
+CREATE TABLE CONFIRMATION_SEND_DEFAULT PARTITION OF CONFIRMATION_SEND DEFAULT;
+
+SELECT create_event_partitions(INTERVAL '3 months', INTERVAL '36 months');
+
+-- ================================================
+-- インデックス（パフォーマンス最適化）
+-- query_examples.sql / openapi.yaml のアクセスパターンから導出
+-- 生成: python -m tools.index_advisor invoice-management --write
+-- ================================================
+
+-- 請求書インデックス
+-- クエリ2（確認状送付が必要な請求書）: 範囲条件 due_date
+-- クエリ6（督促が必要な顧客リスト）: 範囲条件 due_date
+CREATE INDEX idx_invoice_duedate ON INVOICE(due_date);
+-- クエリ3（入金状況サマリー（顧客別））: 結合条件 customer_id — ネステッドループ結合の内側を索引で参照
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_invoice_customer ON INVOICE(customer_id);
+
+-- 請求書送付イベントインデックス
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報））: 相関サブクエリ invoice_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- INVOICE の削除: 外部キー invoice_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+-- INCLUDE (send_date_time): 参照列を索引に含めて Index Only Scan にする
+CREATE INDEX idx_invoice_send_invoice ON INVOICE_SEND(invoice_id) INCLUDE (send_date_time);
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_invoice_send_customer ON INVOICE_SEND(customer_id);
+
+-- 入金イベントインデックス
+-- クエリ1（未入金請求書の一覧）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ2（確認状送付が必要な請求書）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ3（入金状況サマリー（顧客別））: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ5（分割払いの検出）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ6（督促が必要な顧客リスト）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報））: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報））: 相関サブクエリ invoice_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- INVOICE の削除: 外部キー invoice_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_payment_invoice ON PAYMENT(invoice_id);
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_payment_customer ON PAYMENT(customer_id);
+
+-- 確認状送付イベントインデックス
+-- クエリ2（確認状送付が必要な請求書）: 相関サブクエリ invoice_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- クエリ6（督促が必要な顧客リスト）: 結合条件 invoice_id — ネステッドループ結合の内側を索引で参照
+-- クエリ7（請求書の詳細ステータス（1件の請求書の全情報））: 相関サブクエリ invoice_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- INVOICE の削除: 外部キー invoice_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_confirmation_send_invoice ON CONFIRMATION_SEND(invoice_id);
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_confirmation_send_customer ON CONFIRMATION_SEND(customer_id);
+
+-- 日時列の BRIN インデックス（イベントは日時順に追記されるため、ページ範囲ごとの最小・最大値で
+-- 範囲条件を絞り込める。B-tree に比べて数百分の一の大きさで、追記時の更新もほぼない）
+CREATE INDEX brin_invoice_send_datetime ON INVOICE_SEND USING brin (send_date_time) WITH (pages_per_range = 32, autosummarize = on);
+CREATE INDEX brin_payment_datetime ON PAYMENT USING brin (payment_date_time) WITH (pages_per_range = 32, autosummarize = on);
+CREATE INDEX brin_confirmation_send_datetime ON CONFIRMATION_SEND USING brin (send_date_time) WITH (pages_per_range = 32, autosummarize = on);
+
+-- 作成しないインデックス（どのクエリ・エンドポイント・外部キーの検査にも使わない。
+-- 未使用の索引は挿入性能を下げる）
+--   idx_invoice_number ON INVOICE(invoice_number): ワークロードに invoice_number を使う検索・結合・並び替えがない
+--   idx_invoice_send_datetime ON INVOICE_SEND(send_date_time): ワークロードに send_date_time を使う検索・結合・並び替えがない
+--   idx_payment_datetime ON PAYMENT(payment_date_time): ワークロードに payment_date_time を使う検索・結合・並び替えがない
+--   idx_confirmation_send_datetime ON CONFIRMATION_SEND(send_date_time): ワークロードに send_date_time を使う検索・結合・並び替えがない
@@ -0,0 +1,341 @@
+-- ================================================
+-- 時点指定（as of）クエリ（イベントの有効期間を範囲型で持ち、GiST インデックスで時点を引く）
+-- invoice-management
+-- 生成: python -m tools.temporal invoice-management --write
+-- projections.sql の後、データ投入の前に実行する（イベントの追記のみトリガーを前提にする）
+-- ================================================
+--
+-- 使い方:
+--   SELECT * FROM invoice_state_as_of(?, ?);  -- 指定時点の状態（INVOICE_STATE と同じ列）
+--   SELECT r.invoice_id, s.* FROM INVOICE r
+--   CROSS JOIN LATERAL invoice_state_as_of(r.invoice_id, ?) s;  -- 全件の指定時点の状態
+--   SELECT e.* FROM PAYMENT_VALIDITY v JOIN PAYMENT e USING (payment_id)
+--   WHERE v.invoice_id = ? AND v.valid_during @> ?::timestamptz;  -- 指定時点で最新の入金
+--   CALL rebuild_validity();  -- イベントから全件を作り直す（復旧・トリガーを止めた一括投入の後）
+
+-- ================================================
+-- 有効期間テーブル
+-- ================================================
+
+-- 整数列の = と範囲の && を 1 つの GiST インデックス・排他制約にまとめる
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- 請求書送付イベントの有効期間（次の請求書送付イベントまで）
+CREATE TABLE INVOICE_SEND_VALIDITY (
+    invoice_id INTEGER NOT NULL,
+    event_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    CONSTRAINT fk_invoice_send_validity_invoice FOREIGN KEY (invoice_id)
+        REFERENCES INVOICE(invoice_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_invoice_send_validity_overlap
+        EXCLUDE USING gist (invoice_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_invoice_send_validity_from ON INVOICE_SEND_VALIDITY(invoice_id, valid_from, event_id);
+
+COMMENT ON TABLE INVOICE_SEND_VALIDITY IS '請求書送付イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN INVOICE_SEND_VALIDITY.valid_from IS '送付日時';
+COMMENT ON COLUMN INVOICE_SEND_VALIDITY.valid_during IS '最新の請求書送付イベントだった期間（次の請求書送付イベントの日時まで）';
+COMMENT ON COLUMN INVOICE_SEND_VALIDITY.seq IS 'この時点までの請求書送付イベントの件数';
+
+-- 入金イベントの有効期間（次の入金イベントまで）
+CREATE TABLE PAYMENT_VALIDITY (
+    invoice_id INTEGER NOT NULL,
+    payment_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    total_payment_amount NUMERIC NOT NULL,
+    CONSTRAINT fk_payment_validity_invoice FOREIGN KEY (invoice_id)
+        REFERENCES INVOICE(invoice_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_payment_validity_overlap
+        EXCLUDE USING gist (invoice_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_payment_validity_from ON PAYMENT_VALIDITY(invoice_id, valid_from, payment_id);
+
+COMMENT ON TABLE PAYMENT_VALIDITY IS '入金イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN PAYMENT_VALIDITY.valid_from IS '入金日時';
+COMMENT ON COLUMN PAYMENT_VALIDITY.valid_during IS '最新の入金イベントだった期間（次の入金イベントの日時まで）';
+COMMENT ON COLUMN PAYMENT_VALIDITY.seq IS 'この時点までの入金イベントの件数';
+COMMENT ON COLUMN PAYMENT_VALIDITY.total_payment_amount IS '入金イベントの入金額の累計（この時点まで）';
+
+-- 確認状送付イベントの有効期間（次の確認状送付イベントまで）
+CREATE TABLE CONFIRMATION_SEND_VALIDITY (
+    invoice_id INTEGER NOT NULL,
+    confirmation_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    CONSTRAINT fk_confirmation_send_validity_invoice FOREIGN KEY (invoice_id)
+        REFERENCES INVOICE(invoice_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_confirmation_send_validity_overlap
+        EXCLUDE USING gist (invoice_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_confirmation_send_validity_from ON CONFIRMATION_SEND_VALIDITY(invoice_id, valid_from, confirmation_id);
+
+COMMENT ON TABLE CONFIRMATION_SEND_VALIDITY IS '確認状送付イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN CONFIRMATION_SEND_VALIDITY.valid_from IS '送付日時';
+COMMENT ON COLUMN CONFIRMATION_SEND_VALIDITY.valid_during IS '最新の確認状送付イベントだった期間（次の確認状送付イベントの日時まで）';
+COMMENT ON COLUMN CONFIRMATION_SEND_VALIDITY.seq IS 'この時点までの確認状送付イベントの件数';
+
+-- ================================================
+-- 追記トリガー
+-- ================================================
+
+-- 請求書送付イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION invoice_send_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev INVOICE_SEND_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM INVOICE WHERE invoice_id = NEW.invoice_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM INVOICE_SEND_VALIDITY
+    WHERE invoice_id = NEW.invoice_id AND (valid_from, event_id) < (NEW.send_date_time, NEW.event_id)
+    ORDER BY valid_from DESC, event_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM INVOICE_SEND_VALIDITY
+    WHERE invoice_id = NEW.invoice_id AND (valid_from, event_id) > (NEW.send_date_time, NEW.event_id)
+    ORDER BY valid_from, event_id
+    LIMIT 1;
+
+    UPDATE INVOICE_SEND_VALIDITY SET valid_during = tstzrange(valid_from, NEW.send_date_time)
+    WHERE event_id = prev.event_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE INVOICE_SEND_VALIDITY SET seq = seq + 1
+        WHERE invoice_id = NEW.invoice_id AND (valid_from, event_id) > (NEW.send_date_time, NEW.event_id);
+    END IF;
+    INSERT INTO INVOICE_SEND_VALIDITY (
+        invoice_id,
+        event_id,
+        valid_from,
+        valid_during,
+        seq
+    ) VALUES (
+        NEW.invoice_id,
+        NEW.event_id,
+        NEW.send_date_time,
+        tstzrange(NEW.send_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_invoice_send_validity AFTER INSERT ON INVOICE_SEND
+    FOR EACH ROW EXECUTE FUNCTION invoice_send_validity_apply();
+
+-- 入金イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION payment_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev PAYMENT_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM INVOICE WHERE invoice_id = NEW.invoice_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM PAYMENT_VALIDITY
+    WHERE invoice_id = NEW.invoice_id AND (valid_from, payment_id) < (NEW.payment_date_time, NEW.payment_id)
+    ORDER BY valid_from DESC, payment_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM PAYMENT_VALIDITY
+    WHERE invoice_id = NEW.invoice_id AND (valid_from, payment_id) > (NEW.payment_date_time, NEW.payment_id)
+    ORDER BY valid_from, payment_id
+    LIMIT 1;
+
+    UPDATE PAYMENT_VALIDITY SET valid_during = tstzrange(valid_from, NEW.payment_date_time)
+    WHERE payment_id = prev.payment_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE PAYMENT_VALIDITY SET seq = seq + 1, total_payment_amount = total_payment_amount + COALESCE(NEW.payment_amount, 0)
+        WHERE invoice_id = NEW.invoice_id AND (valid_from, payment_id) > (NEW.payment_date_time, NEW.payment_id);
+    END IF;
+    INSERT INTO PAYMENT_VALIDITY (
+        invoice_id,
+        payment_id,
+        valid_from,
+        valid_during,
+        seq,
+        total_payment_amount
+    ) VALUES (
+        NEW.invoice_id,
+        NEW.payment_id,
+        NEW.payment_date_time,
+        tstzrange(NEW.payment_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1,
+        COALESCE(prev.total_payment_amount, 0) + COALESCE(NEW.payment_amount, 0)
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_payment_validity AFTER INSERT ON PAYMENT
+    FOR EACH ROW EXECUTE FUNCTION payment_validity_apply();
+
+-- 確認状送付イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION confirmation_send_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev CONFIRMATION_SEND_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM INVOICE WHERE invoice_id = NEW.invoice_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM CONFIRMATION_SEND_VALIDITY
+    WHERE invoice_id = NEW.invoice_id AND (valid_from, confirmation_id) < (NEW.send_date_time, NEW.confirmation_id)
+    ORDER BY valid_from DESC, confirmation_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM CONFIRMATION_SEND_VALIDITY
+    WHERE invoice_id = NEW.invoice_id AND (valid_from, confirmation_id) > (NEW.send_date_time, NEW.confirmation_id)
+    ORDER BY valid_from, confirmation_id
+    LIMIT 1;
+
+    UPDATE CONFIRMATION_SEND_VALIDITY SET valid_during = tstzrange(valid_from, NEW.send_date_time)
+    WHERE confirmation_id = prev.confirmation_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE CONFIRMATION_SEND_VALIDITY SET seq = seq + 1
+        WHERE invoice_id = NEW.invoice_id AND (valid_from, confirmation_id) > (NEW.send_date_time, NEW.confirmation_id);
+    END IF;
+    INSERT INTO CONFIRMATION_SEND_VALIDITY (
+        invoice_id,
+        confirmation_id,
+        valid_from,
+        valid_during,
+        seq
+    ) VALUES (
+        NEW.invoice_id,
+        NEW.confirmation_id,
+        NEW.send_date_time,
+        tstzrange(NEW.send_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_confirmation_send_validity AFTER INSERT ON CONFIRMATION_SEND
+    FOR EACH ROW EXECUTE FUNCTION confirmation_send_validity_apply();
+
+-- ================================================
+-- 時点指定の関数
+-- ================================================
+
+-- 指定時点の請求書の状態（INVOICE_STATE の時点指定版）
+CREATE OR REPLACE FUNCTION invoice_state_as_of(p_invoice_id INTEGER, p_at TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (
+    invoice_id INTEGER,
+    invoice_send_count BIGINT,
+    first_invoice_send_at TIMESTAMP WITH TIME ZONE,
+    last_invoice_send_at TIMESTAMP WITH TIME ZONE,
+    last_invoice_send_id INTEGER,
+    last_invoice_send_method VARCHAR(50),
+    payment_count BIGINT,
+    first_payment_at TIMESTAMP WITH TIME ZONE,
+    last_payment_at TIMESTAMP WITH TIME ZONE,
+    last_payment_id INTEGER,
+    last_payment_amount NUMERIC(10,2),
+    last_payment_method VARCHAR(50),
+    total_payment_amount NUMERIC,
+    remaining_amount NUMERIC,
+    confirmation_send_count BIGINT,
+    first_confirmation_send_at TIMESTAMP WITH TIME ZONE,
+    last_confirmation_send_at TIMESTAMP WITH TIME ZONE,
+    last_confirmation_send_id INTEGER,
+    last_confirmation_send_method VARCHAR(50)
+) LANGUAGE sql STABLE AS $$
+    SELECT
+        r.invoice_id,
+        COALESCE(v1.seq, 0),
+        CASE WHEN v1.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM INVOICE_SEND_VALIDITY f WHERE f.invoice_id = r.invoice_id) END,
+        v1.valid_from,
+        v1.event_id,
+        e1.send_method,
+        COALESCE(v2.seq, 0),
+        CASE WHEN v2.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM PAYMENT_VALIDITY f WHERE f.invoice_id = r.invoice_id) END,
+        v2.valid_from,
+        v2.payment_id,
+        e2.payment_amount,
+        e2.payment_method,
+        COALESCE(v2.total_payment_amount, 0),
+        r.amount - COALESCE(v2.total_payment_amount, 0),
+        COALESCE(v3.seq, 0),
+        CASE WHEN v3.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM CONFIRMATION_SEND_VALIDITY f WHERE f.invoice_id = r.invoice_id) END,
+        v3.valid_from,
+        v3.confirmation_id,
+        e3.send_method
+    FROM INVOICE r
+    LEFT JOIN INVOICE_SEND_VALIDITY v1
+        ON v1.invoice_id = r.invoice_id AND v1.valid_during @> p_at
+    LEFT JOIN INVOICE_SEND e1 ON e1.event_id = v1.event_id
+    LEFT JOIN PAYMENT_VALIDITY v2
+        ON v2.invoice_id = r.invoice_id AND v2.valid_during @> p_at
+    LEFT JOIN PAYMENT e2 ON e2.payment_id = v2.payment_id
+    LEFT JOIN CONFIRMATION_SEND_VALIDITY v3
+        ON v3.invoice_id = r.invoice_id AND v3.valid_during @> p_at
+    LEFT JOIN CONFIRMATION_SEND e3 ON e3.confirmation_id = v3.confirmation_id
+    WHERE r.invoice_id = p_invoice_id
+$$;
+
+-- ================================================
+-- イベントからの再構築
+-- ================================================
+
+-- 請求書送付の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_invoice_send_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE INVOICE_SEND IN SHARE MODE;
+    TRUNCATE INVOICE_SEND_VALIDITY;
+    INSERT INTO INVOICE_SEND_VALIDITY (invoice_id, event_id, valid_from, valid_during, seq)
+    SELECT invoice_id, event_id, send_date_time, tstzrange(send_date_time, LEAD(send_date_time) OVER w), ROW_NUMBER() OVER w
+    FROM INVOICE_SEND
+    WINDOW w AS (PARTITION BY invoice_id ORDER BY send_date_time, event_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- 入金の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_payment_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE PAYMENT IN SHARE MODE;
+    TRUNCATE PAYMENT_VALIDITY;
+    INSERT INTO PAYMENT_VALIDITY (invoice_id, payment_id, valid_from, valid_during, seq, total_payment_amount)
+    SELECT invoice_id, payment_id, payment_date_time, tstzrange(payment_date_time, LEAD(payment_date_time) OVER w), ROW_NUMBER() OVER w, SUM(COALESCE(payment_amount, 0)) OVER w
+    FROM PAYMENT
+    WINDOW w AS (PARTITION BY invoice_id ORDER BY payment_date_time, payment_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- 確認状送付の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_confirmation_send_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE CONFIRMATION_SEND IN SHARE MODE;
+    TRUNCATE CONFIRMATION_SEND_VALIDITY;
+    INSERT INTO CONFIRMATION_SEND_VALIDITY (invoice_id, confirmation_id, valid_from, valid_during, seq)
+    SELECT invoice_id, confirmation_id, send_date_time, tstzrange(send_date_time, LEAD(send_date_time) OVER w), ROW_NUMBER() OVER w
+    FROM CONFIRMATION_SEND
+    WINDOW w AS (PARTITION BY invoice_id ORDER BY send_date_time, confirmation_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+CREATE OR REPLACE PROCEDURE rebuild_validity() LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM rebuild_invoice_send_validity();
+    PERFORM rebuild_payment_validity();
+    PERFORM rebuild_confirmation_send_validity();
+END;
+$$;
@@ -0,0 +1,1488 @@
+-- ================================================
+-- API の GET 操作ごとの SQL（参照サーバー tools.api_server が実行するもの）
+-- project-record-system
+-- 生成: python -m tools.api project-record-system --write
+-- ================================================
+--
+-- 引数はすべて $n のプレースホルダ（プリペアドステートメントとして接続ごとに再利用）。
+-- 一覧・履歴は limit + 1 行を読み、余った 1 行があれば最後の行のキーを nextCursor にする。
+
+-- ================================================
+-- listProjects: GET /api/projects（先頭ページ）
+-- $1 = customerID
+-- $2 = plannedStartDateFrom
+-- $3 = plannedStartDateTo
+-- $4 = plannedEndDateFrom
+-- $5 = plannedEndDateTo
+-- $6 = limit + 1
+-- ================================================
+SELECT
+    project_id AS "projectID",
+    project_name AS "projectName",
+    customer_id AS "customerID",
+    estimated_effort AS "estimatedEffort",
+    planned_start_date AS "plannedStartDate",
+    planned_end_date AS "plannedEndDate",
+    created_at AS "createdAt"
+FROM PROJECT
+WHERE customer_id = $1::INTEGER
+  AND planned_start_date >= $2::DATE
+  AND planned_start_date <= $3::DATE
+  AND planned_end_date >= $4::DATE
+  AND planned_end_date <= $5::DATE
+ORDER BY created_at DESC, project_id DESC
+LIMIT $6;
+
+-- ================================================
+-- listProjects: GET /api/projects（次ページ、sort=-createdAt）
+-- $1 = customerID
+-- $2 = plannedStartDateFrom
+-- $3 = plannedStartDateTo
+-- $4 = plannedEndDateFrom
+-- $5 = plannedEndDateTo
+-- $6 = <前ページ末尾のソート値>
+-- $7 = <前ページ末尾のID>
+-- $8 = limit + 1
+-- ================================================
+SELECT
+    project_id AS "projectID",
+    project_name AS "projectName",
+    customer_id AS "customerID",
+    estimated_effort AS "estimatedEffort",
+    planned_start_date AS "plannedStartDate",
+    planned_end_date AS "plannedEndDate",
+    created_at AS "createdAt"
+FROM PROJECT
+WHERE customer_id = $1::INTEGER
+  AND planned_start_date >= $2::DATE
+  AND planned_start_date <= $3::DATE
+  AND planned_end_date >= $4::DATE
+  AND planned_end_date <= $5::DATE
+  AND (created_at, project_id) < ($6::TIMESTAMP WITH TIME ZONE, $7::INTEGER)
+ORDER BY created_at DESC, project_id DESC
+LIMIT $8;
+
+-- ================================================
+-- getProject: GET /api/projects/{projectID}
+-- $1 = project_id
+-- ================================================
+SELECT
+    project_id AS "projectID",
+    project_name AS "projectName",
+    customer_id AS "customerID",
+    estimated_effort AS "estimatedEffort",
+    planned_start_date AS "plannedStartDate",
+    planned_end_date AS "plannedEndDate",
+    created_at AS "createdAt"
+FROM PROJECT
+WHERE project_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetProject: GET /api/projects/batch
+-- $1 = project_id の配列
+-- ================================================
+SELECT
+    t.project_id AS "projectID",
+    t.project_name AS "projectName",
+    t.customer_id AS "customerID",
+    t.estimated_effort AS "estimatedEffort",
+    t.planned_start_date AS "plannedStartDate",
+    t.planned_end_date AS "plannedEndDate",
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN PROJECT t ON t.project_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listPersons: GET /api/persons（先頭ページ）
+-- $1 = limit + 1
+-- ================================================
+SELECT
+    person_id AS "personID",
+    name,
+    email,
+    created_at AS "createdAt"
+FROM PERSON
+ORDER BY created_at DESC, person_id DESC
+LIMIT $1;
+
+-- ================================================
+-- listPersons: GET /api/persons（次ページ、sort=-createdAt）
+-- $1 = <前ページ末尾のソート値>
+-- $2 = <前ページ末尾のID>
+-- $3 = limit + 1
+-- ================================================
+SELECT
+    person_id AS "personID",
+    name,
+    email,
+    created_at AS "createdAt"
+FROM PERSON
+WHERE (created_at, person_id) < ($1::TIMESTAMP WITH TIME ZONE, $2::INTEGER)
+ORDER BY created_at DESC, person_id DESC
+LIMIT $3;
+
+-- ================================================
+-- getPerson: GET /api/persons/{personID}
+-- $1 = person_id
+-- ================================================
+SELECT
+    person_id AS "personID",
+    name,
+    email,
+    created_at AS "createdAt"
+FROM PERSON
+WHERE person_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetPerson: GET /api/persons/batch
+-- $1 = person_id の配列
+-- ================================================
+SELECT
+    t.person_id AS "personID",
+    t.name,
+    t.email,
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN PERSON t ON t.person_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listOrganizations: GET /api/organizations（先頭ページ）
+-- $1 = parentOrganizationID
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    organization_id AS "organizationID",
+    organization_name AS "organizationName",
+    organization_type AS "organizationType",
+    parent_organization_id AS "parentOrganizationID",
+    created_at AS "createdAt"
+FROM ORGANIZATION
+WHERE parent_organization_id = $1::INTEGER
+ORDER BY created_at DESC, organization_id DESC
+LIMIT $2;
+
+-- ================================================
+-- listOrganizations: GET /api/organizations（次ページ、sort=-createdAt）
+-- $1 = parentOrganizationID
+-- $2 = <前ページ末尾のソート値>
+-- $3 = <前ページ末尾のID>
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    organization_id AS "organizationID",
+    organization_name AS "organizationName",
+    organization_type AS "organizationType",
+    parent_organization_id AS "parentOrganizationID",
+    created_at AS "createdAt"
+FROM ORGANIZATION
+WHERE parent_organization_id = $1::INTEGER
+  AND (created_at, organization_id) < ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY created_at DESC, organization_id DESC
+LIMIT $4;
+
+-- ================================================
+-- getOrganization: GET /api/organizations/{organizationID}
+-- $1 = organization_id
+-- ================================================
+SELECT
+    organization_id AS "organizationID",
+    organization_name AS "organizationName",
+    organization_type AS "organizationType",
+    parent_organization_id AS "parentOrganizationID",
+    created_at AS "createdAt"
+FROM ORGANIZATION
+WHERE organization_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetOrganization: GET /api/organizations/batch
+-- $1 = organization_id の配列
+-- ================================================
+SELECT
+    t.organization_id AS "organizationID",
+    t.organization_name AS "organizationName",
+    t.organization_type AS "organizationType",
+    t.parent_organization_id AS "parentOrganizationID",
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN ORGANIZATION t ON t.organization_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listCustomers: GET /api/customers（先頭ページ）
+-- $1 = industryID
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    customer_id AS "customerID",
+    customer_name AS "customerName",
+    industry_id AS "industryID",
+    created_at AS "createdAt"
+FROM CUSTOMER
+WHERE industry_id = $1::INTEGER
+ORDER BY created_at DESC, customer_id DESC
+LIMIT $2;
+
+-- ================================================
+-- listCustomers: GET /api/customers（次ページ、sort=-createdAt）
+-- $1 = industryID
+-- $2 = <前ページ末尾のソート値>
+-- $3 = <前ページ末尾のID>
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    customer_id AS "customerID",
+    customer_name AS "customerName",
+    industry_id AS "industryID",
+    created_at AS "createdAt"
+FROM CUSTOMER
+WHERE industry_id = $1::INTEGER
+  AND (created_at, customer_id) < ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY created_at DESC, customer_id DESC
+LIMIT $4;
+
+-- ================================================
+-- getCustomer: GET /api/customers/{customerID}
+-- $1 = customer_id
+-- ================================================
+SELECT
+    customer_id AS "customerID",
+    customer_name AS "customerName",
+    industry_id AS "industryID",
+    created_at AS "createdAt"
+FROM CUSTOMER
+WHERE customer_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetCustomer: GET /api/customers/batch
+-- $1 = customer_id の配列
+-- ================================================
+SELECT
+    t.customer_id AS "customerID",
+    t.customer_name AS "customerName",
+    t.industry_id AS "industryID",
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN CUSTOMER t ON t.customer_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listIndustrys: GET /api/industries（先頭ページ）
+-- $1 = limit + 1
+-- ================================================
+SELECT
+    industry_id AS "industryID",
+    industry_name AS "industryName",
+    created_at AS "createdAt"
+FROM INDUSTRY
+ORDER BY created_at DESC, industry_id DESC
+LIMIT $1;
+
+-- ================================================
+-- listIndustrys: GET /api/industries（次ページ、sort=-createdAt）
+-- $1 = <前ページ末尾のソート値>
+-- $2 = <前ページ末尾のID>
+-- $3 = limit + 1
+-- ================================================
+SELECT
+    industry_id AS "industryID",
+    industry_name AS "industryName",
+    created_at AS "createdAt"
+FROM INDUSTRY
+WHERE (created_at, industry_id) < ($1::TIMESTAMP WITH TIME ZONE, $2::INTEGER)
+ORDER BY created_at DESC, industry_id DESC
+LIMIT $3;
+
+-- ================================================
+-- getIndustry: GET /api/industries/{industryID}
+-- $1 = industry_id
+-- ================================================
+SELECT
+    industry_id AS "industryID",
+    industry_name AS "industryName",
+    created_at AS "createdAt"
+FROM INDUSTRY
+WHERE industry_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetIndustry: GET /api/industries/batch
+-- $1 = industry_id の配列
+-- ================================================
+SELECT
+    t.industry_id AS "industryID",
+    t.industry_name AS "industryName",
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN INDUSTRY t ON t.industry_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listRoles: GET /api/roles（先頭ページ）
+-- $1 = limit + 1
+-- ================================================
+SELECT
+    role_id AS "roleID",
+    role_name AS "roleName",
+    created_at AS "createdAt"
+FROM ROLE
+ORDER BY created_at DESC, role_id DESC
+LIMIT $1;
+
+-- ================================================
+-- listRoles: GET /api/roles（次ページ、sort=-createdAt）
+-- $1 = <前ページ末尾のソート値>
+-- $2 = <前ページ末尾のID>
+-- $3 = limit + 1
+-- ================================================
+SELECT
+    role_id AS "roleID",
+    role_name AS "roleName",
+    created_at AS "createdAt"
+FROM ROLE
+WHERE (created_at, role_id) < ($1::TIMESTAMP WITH TIME ZONE, $2::INTEGER)
+ORDER BY created_at DESC, role_id DESC
+LIMIT $3;
+
+-- ================================================
+-- getRole: GET /api/roles/{roleID}
+-- $1 = role_id
+-- ================================================
+SELECT
+    role_id AS "roleID",
+    role_name AS "roleName",
+    created_at AS "createdAt"
+FROM ROLE
+WHERE role_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetRole: GET /api/roles/batch
+-- $1 = role_id の配列
+-- ================================================
+SELECT
+    t.role_id AS "roleID",
+    t.role_name AS "roleName",
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN ROLE t ON t.role_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listSupportTypes: GET /api/support_types（先頭ページ）
+-- $1 = description
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    support_type_id AS "supportTypeID",
+    support_type_name AS "supportTypeName",
+    description,
+    created_at AS "createdAt"
+FROM SUPPORT_TYPE
+WHERE strpos(description, $1::TEXT) > 0
+ORDER BY created_at DESC, support_type_id DESC
+LIMIT $2;
+
+-- ================================================
+-- listSupportTypes: GET /api/support_types（次ページ、sort=-createdAt）
+-- $1 = description
+-- $2 = <前ページ末尾のソート値>
+-- $3 = <前ページ末尾のID>
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    support_type_id AS "supportTypeID",
+    support_type_name AS "supportTypeName",
+    description,
+    created_at AS "createdAt"
+FROM SUPPORT_TYPE
+WHERE strpos(description, $1::TEXT) > 0
+  AND (created_at, support_type_id) < ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY created_at DESC, support_type_id DESC
+LIMIT $4;
+
+-- ================================================
+-- getSupportType: GET /api/support_types/{supportTypeID}
+-- $1 = support_type_id
+-- ================================================
+SELECT
+    support_type_id AS "supportTypeID",
+    support_type_name AS "supportTypeName",
+    description,
+    created_at AS "createdAt"
+FROM SUPPORT_TYPE
+WHERE support_type_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetSupportType: GET /api/support_types/batch
+-- $1 = support_type_id の配列
+-- ================================================
+SELECT
+    t.support_type_id AS "supportTypeID",
+    t.support_type_name AS "supportTypeName",
+    t.description,
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN SUPPORT_TYPE t ON t.support_type_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listUsers: GET /api/users（先頭ページ）
+-- $1 = personID
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    user_id AS "userID",
+    person_id AS "personID",
+    username,
+    created_at AS "createdAt"
+FROM USER_ACCOUNT
+WHERE person_id = $1::INTEGER
+ORDER BY created_at DESC, user_id DESC
+LIMIT $2;
+
+-- ================================================
+-- listUsers: GET /api/users（次ページ、sort=-createdAt）
+-- $1 = personID
+-- $2 = <前ページ末尾のソート値>
+-- $3 = <前ページ末尾のID>
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    user_id AS "userID",
+    person_id AS "personID",
+    username,
+    created_at AS "createdAt"
+FROM USER_ACCOUNT
+WHERE person_id = $1::INTEGER
+  AND (created_at, user_id) < ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY created_at DESC, user_id DESC
+LIMIT $4;
+
+-- ================================================
+-- getUser: GET /api/users/{userID}
+-- $1 = user_id
+-- ================================================
+SELECT
+    user_id AS "userID",
+    person_id AS "personID",
+    username,
+    created_at AS "createdAt"
+FROM USER_ACCOUNT
+WHERE user_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetUser: GET /api/users/batch
+-- $1 = user_id の配列
+-- ================================================
+SELECT
+    t.user_id AS "userID",
+    t.person_id AS "personID",
+    t.username,
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN USER_ACCOUNT t ON t.user_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listDevelopmentTypes: GET /api/development_types（先頭ページ）
+-- $1 = description
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    development_type_id AS "developmentTypeID",
+    development_type_name AS "developmentTypeName",
+    description,
+    created_at AS "createdAt"
+FROM DEVELOPMENT_TYPE
+WHERE strpos(description, $1::TEXT) > 0
+ORDER BY created_at DESC, development_type_id DESC
+LIMIT $2;
+
+-- ================================================
+-- listDevelopmentTypes: GET /api/development_types（次ページ、sort=-createdAt）
+-- $1 = description
+-- $2 = <前ページ末尾のソート値>
+-- $3 = <前ページ末尾のID>
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    development_type_id AS "developmentTypeID",
+    development_type_name AS "developmentTypeName",
+    description,
+    created_at AS "createdAt"
+FROM DEVELOPMENT_TYPE
+WHERE strpos(description, $1::TEXT) > 0
+  AND (created_at, development_type_id) < ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY created_at DESC, development_type_id DESC
+LIMIT $4;
+
+-- ================================================
+-- getDevelopmentType: GET /api/development_types/{developmentTypeID}
+-- $1 = development_type_id
+-- ================================================
+SELECT
+    development_type_id AS "developmentTypeID",
+    development_type_name AS "developmentTypeName",
+    description,
+    created_at AS "createdAt"
+FROM DEVELOPMENT_TYPE
+WHERE development_type_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetDevelopmentType: GET /api/development_types/batch
+-- $1 = development_type_id の配列
+-- ================================================
+SELECT
+    t.development_type_id AS "developmentTypeID",
+    t.development_type_name AS "developmentTypeName",
+    t.description,
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN DEVELOPMENT_TYPE t ON t.development_type_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listDevelopmentMethods: GET /api/development_methods（先頭ページ）
+-- $1 = description
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    development_method_id AS "developmentMethodID",
+    development_method_name AS "developmentMethodName",
+    description,
+    created_at AS "createdAt"
+FROM DEVELOPMENT_METHOD
+WHERE strpos(description, $1::TEXT) > 0
+ORDER BY created_at DESC, development_method_id DESC
+LIMIT $2;
+
+-- ================================================
+-- listDevelopmentMethods: GET /api/development_methods（次ページ、sort=-createdAt）
+-- $1 = description
+-- $2 = <前ページ末尾のソート値>
+-- $3 = <前ページ末尾のID>
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    development_method_id AS "developmentMethodID",
+    development_method_name AS "developmentMethodName",
+    description,
+    created_at AS "createdAt"
+FROM DEVELOPMENT_METHOD
+WHERE strpos(description, $1::TEXT) > 0
+  AND (created_at, development_method_id) < ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY created_at DESC, development_method_id DESC
+LIMIT $4;
+
+-- ================================================
+-- getDevelopmentMethod: GET /api/development_methods/{developmentMethodID}
+-- $1 = development_method_id
+-- ================================================
+SELECT
+    development_method_id AS "developmentMethodID",
+    development_method_name AS "developmentMethodName",
+    description,
+    created_at AS "createdAt"
+FROM DEVELOPMENT_METHOD
+WHERE development_method_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetDevelopmentMethod: GET /api/development_methods/batch
+-- $1 = development_method_id の配列
+-- ================================================
+SELECT
+    t.development_method_id AS "developmentMethodID",
+    t.development_method_name AS "developmentMethodName",
+    t.description,
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN DEVELOPMENT_METHOD t ON t.development_method_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- listTargetPhases: GET /api/target_phases（先頭ページ）
+-- $1 = description
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    target_phase_id AS "targetPhaseID",
+    target_phase_name AS "targetPhaseName",
+    description,
+    created_at AS "createdAt"
+FROM TARGET_PHASE
+WHERE strpos(description, $1::TEXT) > 0
+ORDER BY created_at DESC, target_phase_id DESC
+LIMIT $2;
+
+-- ================================================
+-- listTargetPhases: GET /api/target_phases（次ページ、sort=-createdAt）
+-- $1 = description
+-- $2 = <前ページ末尾のソート値>
+-- $3 = <前ページ末尾のID>
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    target_phase_id AS "targetPhaseID",
+    target_phase_name AS "targetPhaseName",
+    description,
+    created_at AS "createdAt"
+FROM TARGET_PHASE
+WHERE strpos(description, $1::TEXT) > 0
+  AND (created_at, target_phase_id) < ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY created_at DESC, target_phase_id DESC
+LIMIT $4;
+
+-- ================================================
+-- getTargetPhase: GET /api/target_phases/{targetPhaseID}
+-- $1 = target_phase_id
+-- ================================================
+SELECT
+    target_phase_id AS "targetPhaseID",
+    target_phase_name AS "targetPhaseName",
+    description,
+    created_at AS "createdAt"
+FROM TARGET_PHASE
+WHERE target_phase_id = $1::INTEGER;
+
+-- ================================================
+-- batchGetTargetPhase: GET /api/target_phases/batch
+-- $1 = target_phase_id の配列
+-- ================================================
+SELECT
+    t.target_phase_id AS "targetPhaseID",
+    t.target_phase_name AS "targetPhaseName",
+    t.description,
+    t.created_at AS "createdAt"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN TARGET_PHASE t ON t.target_phase_id = ids.id
+ORDER BY ids.n;
+
+-- ================================================
+-- getProjectLatestStart: GET /api/projects/{eventID}/start/latest
+-- $1 = project_id
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    start_date_time AS "startDateTime",
+    registered_by AS "registeredBy"
+FROM PROJECT_START
+WHERE project_id = $1::INTEGER
+ORDER BY start_date_time DESC, event_id DESC
+LIMIT 1;
+
+-- ================================================
+-- getProjectLatestStart: GET /api/projects/{eventID}/start/latest（as_of 指定）
+-- $1 = project_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    e.event_id AS "eventID",
+    e.project_id AS "projectID",
+    e.start_date_time AS "startDateTime",
+    e.registered_by AS "registeredBy"
+FROM PROJECT_START_VALIDITY v
+JOIN PROJECT_START e ON e.event_id = v.event_id
+WHERE v.project_id = $1::INTEGER AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE;
+
+-- ================================================
+-- batchGetProjectLatestStart: GET /api/projects/start/latest
+-- $1 = project_id の配列
+-- ================================================
+SELECT e.*
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+CROSS JOIN LATERAL (
+    SELECT
+        event_id AS "eventID",
+        project_id AS "projectID",
+        start_date_time AS "startDateTime",
+        registered_by AS "registeredBy"
+    FROM PROJECT_START
+    WHERE project_id = ids.id
+    ORDER BY start_date_time DESC, event_id DESC
+    LIMIT 1
+) e
+ORDER BY ids.n;
+
+-- ================================================
+-- batchGetProjectLatestStart: GET /api/projects/start/latest（as_of 指定）
+-- $1 = project_id の配列
+-- $2 = as_of
+-- ================================================
+SELECT
+    e.event_id AS "eventID",
+    e.project_id AS "projectID",
+    e.start_date_time AS "startDateTime",
+    e.registered_by AS "registeredBy"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN PROJECT_START_VALIDITY v ON v.project_id = ids.id AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE
+JOIN PROJECT_START e ON e.event_id = v.event_id
+ORDER BY ids.n;
+
+-- ================================================
+-- getProjectStartHistory: GET /api/projects/{eventID}/start/history（先頭ページ）
+-- $1 = project_id
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    start_date_time AS "startDateTime",
+    registered_by AS "registeredBy"
+FROM PROJECT_START
+WHERE project_id = $1::INTEGER
+ORDER BY start_date_time, event_id
+LIMIT $2;
+
+-- ================================================
+-- getProjectStartHistory: GET /api/projects/{eventID}/start/history（次ページ）
+-- $1 = project_id
+-- $2 = 前ページ末尾の start_date_time
+-- $3 = 前ページ末尾の event_id
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    start_date_time AS "startDateTime",
+    registered_by AS "registeredBy"
+FROM PROJECT_START
+WHERE project_id = $1::INTEGER
+  AND (start_date_time, event_id) > ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY start_date_time, event_id
+LIMIT $4;
+
+-- ================================================
+-- getProjectStartSummary: GET /api/projects/{eventID}/start/summary
+-- $1 = project_id
+-- ================================================
+SELECT
+    $1::INTEGER AS "projectID",
+    COUNT(*) AS "eventCount",
+    MAX(start_date_time) AS "latestEvent",
+    MIN(start_date_time) AS "firstEvent"
+FROM PROJECT_START
+WHERE project_id = $1::INTEGER;
+
+-- ================================================
+-- getProjectStartSummary: GET /api/projects/{eventID}/start/summary（as_of 指定）
+-- $1 = project_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    ids.id AS "projectID",
+    COALESCE(v.seq, 0) AS "eventCount",
+    v.valid_from AS "latestEvent",
+    (SELECT MIN(f.valid_from) FROM PROJECT_START_VALIDITY f WHERE f.project_id = v.project_id) AS "firstEvent"
+FROM (VALUES ($1::INTEGER)) AS ids(id)
+LEFT JOIN PROJECT_START_VALIDITY v ON v.project_id = ids.id AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE;
+
+-- ================================================
+-- getOrganizationJoinLatestEvent: GET /api/organization_joins/{eventID}/event/latest
+-- $1 = event_id
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    organization_id AS "organizationID",
+    join_date_time AS "joinDateTime",
+    registered_by AS "registeredBy"
+FROM ORGANIZATION_JOIN
+WHERE event_id = $1::INTEGER
+ORDER BY join_date_time DESC, event_id DESC
+LIMIT 1;
+
+-- ================================================
+-- batchGetOrganizationJoinLatestEvent: GET /api/organization_joins/event/latest
+-- $1 = event_id の配列
+-- ================================================
+SELECT e.*
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+CROSS JOIN LATERAL (
+    SELECT
+        event_id AS "eventID",
+        project_id AS "projectID",
+        organization_id AS "organizationID",
+        join_date_time AS "joinDateTime",
+        registered_by AS "registeredBy"
+    FROM ORGANIZATION_JOIN
+    WHERE event_id = ids.id
+    ORDER BY join_date_time DESC, event_id DESC
+    LIMIT 1
+) e
+ORDER BY ids.n;
+
+-- ================================================
+-- getOrganizationJoinEventHistory: GET /api/organization_joins/{eventID}/event/history（先頭ページ）
+-- $1 = event_id
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    organization_id AS "organizationID",
+    join_date_time AS "joinDateTime",
+    registered_by AS "registeredBy"
+FROM ORGANIZATION_JOIN
+WHERE event_id = $1::INTEGER
+ORDER BY join_date_time, event_id
+LIMIT $2;
+
+-- ================================================
+-- getOrganizationJoinEventHistory: GET /api/organization_joins/{eventID}/event/history（次ページ）
+-- $1 = event_id
+-- $2 = 前ページ末尾の join_date_time
+-- $3 = 前ページ末尾の event_id
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    organization_id AS "organizationID",
+    join_date_time AS "joinDateTime",
+    registered_by AS "registeredBy"
+FROM ORGANIZATION_JOIN
+WHERE event_id = $1::INTEGER
+  AND (join_date_time, event_id) > ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY join_date_time, event_id
+LIMIT $4;
+
+-- ================================================
+-- getOrganizationJoinEventSummary: GET /api/organization_joins/{eventID}/event/summary
+-- $1 = event_id
+-- ================================================
+SELECT
+    $1::INTEGER AS "organizationjoinID",
+    COUNT(*) AS "eventCount",
+    MAX(join_date_time) AS "latestEvent",
+    MIN(join_date_time) AS "firstEvent"
+FROM ORGANIZATION_JOIN
+WHERE event_id = $1::INTEGER;
+
+-- ================================================
+-- getPersonLatestAssign: GET /api/persons/{eventID}/assign/latest
+-- $1 = person_id
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    person_id AS "personID",
+    role_id AS "roleID",
+    assign_date_time AS "assignDateTime",
+    registered_by AS "registeredBy"
+FROM PERSON_ASSIGN
+WHERE person_id = $1::INTEGER
+ORDER BY assign_date_time DESC, event_id DESC
+LIMIT 1;
+
+-- ================================================
+-- getPersonLatestAssign: GET /api/persons/{eventID}/assign/latest（as_of 指定）
+-- $1 = person_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    e.event_id AS "eventID",
+    e.project_id AS "projectID",
+    e.person_id AS "personID",
+    e.role_id AS "roleID",
+    e.assign_date_time AS "assignDateTime",
+    e.registered_by AS "registeredBy"
+FROM PROJECT_PERSON_VALIDITY v
+JOIN PERSON_ASSIGN e ON e.event_id = v.source_event_id
+WHERE v.person_id = $1::INTEGER AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE AND v.source_event = 'PERSON_ASSIGN'
+ORDER BY e.assign_date_time DESC, e.event_id DESC
+LIMIT 1;
+
+-- ================================================
+-- batchGetPersonLatestAssign: GET /api/persons/assign/latest
+-- $1 = person_id の配列
+-- ================================================
+SELECT e.*
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+CROSS JOIN LATERAL (
+    SELECT
+        event_id AS "eventID",
+        project_id AS "projectID",
+        person_id AS "personID",
+        role_id AS "roleID",
+        assign_date_time AS "assignDateTime",
+        registered_by AS "registeredBy"
+    FROM PERSON_ASSIGN
+    WHERE person_id = ids.id
+    ORDER BY assign_date_time DESC, event_id DESC
+    LIMIT 1
+) e
+ORDER BY ids.n;
+
+-- ================================================
+-- batchGetPersonLatestAssign: GET /api/persons/assign/latest（as_of 指定）
+-- $1 = person_id の配列
+-- $2 = as_of
+-- ================================================
+SELECT e.*
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+CROSS JOIN LATERAL (
+    SELECT
+        e.event_id AS "eventID",
+        e.project_id AS "projectID",
+        e.person_id AS "personID",
+        e.role_id AS "roleID",
+        e.assign_date_time AS "assignDateTime",
+        e.registered_by AS "registeredBy"
+    FROM PROJECT_PERSON_VALIDITY v
+    JOIN PERSON_ASSIGN e ON e.event_id = v.source_event_id
+    WHERE v.person_id = ids.id AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE AND v.source_event = 'PERSON_ASSIGN'
+    ORDER BY e.assign_date_time DESC, e.event_id DESC
+    LIMIT 1
+) e
+ORDER BY ids.n;
+
+-- ================================================
+-- getPersonAssignHistory: GET /api/persons/{eventID}/assign/history（先頭ページ）
+-- $1 = person_id
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    person_id AS "personID",
+    role_id AS "roleID",
+    assign_date_time AS "assignDateTime",
+    registered_by AS "registeredBy"
+FROM PERSON_ASSIGN
+WHERE person_id = $1::INTEGER
+ORDER BY assign_date_time, event_id
+LIMIT $2;
+
+-- ================================================
+-- getPersonAssignHistory: GET /api/persons/{eventID}/assign/history（次ページ）
+-- $1 = person_id
+-- $2 = 前ページ末尾の assign_date_time
+-- $3 = 前ページ末尾の event_id
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    person_id AS "personID",
+    role_id AS "roleID",
+    assign_date_time AS "assignDateTime",
+    registered_by AS "registeredBy"
+FROM PERSON_ASSIGN
+WHERE person_id = $1::INTEGER
+  AND (assign_date_time, event_id) > ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY assign_date_time, event_id
+LIMIT $4;
+
+-- ================================================
+-- getProjectCurrentPersons: GET /api/projects/{eventID}/members/current
+-- $1 = project_id
+-- ================================================
+SELECT
+    l.event_id AS "eventID",
+    l.project_id AS "projectID",
+    l.person_id AS "personID",
+    l.role_id AS "roleID",
+    l.assign_date_time AS "assignDateTime",
+    l.registered_by AS "registeredBy"
+FROM PERSON_ASSIGN l
+WHERE l.project_id = $1::INTEGER
+  AND NOT EXISTS (
+      SELECT 1 FROM PERSON_REPLACE r
+      WHERE r.project_id = l.project_id
+        AND r.old_person_id = l.person_id
+        AND r.role_id = l.role_id
+        AND r.replace_date_time > l.assign_date_time
+  )
+ORDER BY l.assign_date_time, l.event_id;
+
+-- ================================================
+-- getProjectCurrentPersons: GET /api/projects/{eventID}/members/current（as_of 指定）
+-- $1 = project_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    l.event_id AS "eventID",
+    l.project_id AS "projectID",
+    l.person_id AS "personID",
+    l.role_id AS "roleID",
+    l.assign_date_time AS "assignDateTime",
+    l.registered_by AS "registeredBy"
+FROM project_person_as_of($1::INTEGER, $2::TIMESTAMP WITH TIME ZONE) m
+JOIN PERSON_ASSIGN l ON l.event_id = m.source_event_id
+WHERE m.source_event = 'PERSON_ASSIGN'
+ORDER BY l.assign_date_time, l.event_id;
+
+-- ================================================
+-- getPersonAssignSummary: GET /api/persons/{eventID}/assign/summary
+-- $1 = person_id
+-- ================================================
+SELECT
+    $1::INTEGER AS "personID",
+    COUNT(*) AS "eventCount",
+    MAX(assign_date_time) AS "latestEvent",
+    MIN(assign_date_time) AS "firstEvent"
+FROM PERSON_ASSIGN
+WHERE person_id = $1::INTEGER;
+
+-- ================================================
+-- getPersonAssignSummary: GET /api/persons/{eventID}/assign/summary（as_of 指定）
+-- $1 = person_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    ids.id AS "personID",
+    COUNT(v.source_event_id) AS "eventCount",
+    MAX(lower(v.valid_during)) AS "latestEvent",
+    MIN(lower(v.valid_during)) AS "firstEvent"
+FROM (VALUES ($1::INTEGER)) AS ids(id)
+LEFT JOIN PROJECT_PERSON_VALIDITY v ON v.person_id = ids.id AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE AND v.source_event = 'PERSON_ASSIGN'
+GROUP BY ids.id;
+
+-- ================================================
+-- getPersonLatestReplace: GET /api/persons/{eventID}/replace/latest
+-- $1 = old_person_id / new_person_id
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    old_person_id AS "oldPersonID",
+    new_person_id AS "newPersonID",
+    role_id AS "roleID",
+    replace_date_time AS "replaceDateTime",
+    registered_by AS "registeredBy"
+FROM PERSON_REPLACE
+WHERE (old_person_id = $1::INTEGER OR new_person_id = $1::INTEGER)
+ORDER BY replace_date_time DESC, event_id DESC
+LIMIT 1;
+
+-- ================================================
+-- batchGetPersonLatestReplace: GET /api/persons/replace/latest
+-- $1 = old_person_id / new_person_id の配列
+-- ================================================
+SELECT e.*
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+CROSS JOIN LATERAL (
+    SELECT
+        event_id AS "eventID",
+        project_id AS "projectID",
+        old_person_id AS "oldPersonID",
+        new_person_id AS "newPersonID",
+        role_id AS "roleID",
+        replace_date_time AS "replaceDateTime",
+        registered_by AS "registeredBy"
+    FROM PERSON_REPLACE
+    WHERE (old_person_id = ids.id OR new_person_id = ids.id)
+    ORDER BY replace_date_time DESC, event_id DESC
+    LIMIT 1
+) e
+ORDER BY ids.n;
+
+-- ================================================
+-- getPersonReplaceHistory: GET /api/persons/{eventID}/replace/history（先頭ページ）
+-- $1 = old_person_id / new_person_id
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    old_person_id AS "oldPersonID",
+    new_person_id AS "newPersonID",
+    role_id AS "roleID",
+    replace_date_time AS "replaceDateTime",
+    registered_by AS "registeredBy"
+FROM PERSON_REPLACE
+WHERE (old_person_id = $1::INTEGER OR new_person_id = $1::INTEGER)
+ORDER BY replace_date_time, event_id
+LIMIT $2;
+
+-- ================================================
+-- getPersonReplaceHistory: GET /api/persons/{eventID}/replace/history（次ページ）
+-- $1 = old_person_id / new_person_id
+-- $2 = 前ページ末尾の replace_date_time
+-- $3 = 前ページ末尾の event_id
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    old_person_id AS "oldPersonID",
+    new_person_id AS "newPersonID",
+    role_id AS "roleID",
+    replace_date_time AS "replaceDateTime",
+    registered_by AS "registeredBy"
+FROM PERSON_REPLACE
+WHERE (old_person_id = $1::INTEGER OR new_person_id = $1::INTEGER)
+  AND (replace_date_time, event_id) > ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY replace_date_time, event_id
+LIMIT $4;
+
+-- ================================================
+-- getPersonReplaceSummary: GET /api/persons/{eventID}/replace/summary
+-- $1 = old_person_id / new_person_id
+-- ================================================
+SELECT
+    $1::INTEGER AS "personID",
+    COUNT(*) AS "eventCount",
+    MAX(replace_date_time) AS "latestEvent",
+    MIN(replace_date_time) AS "firstEvent"
+FROM PERSON_REPLACE
+WHERE (old_person_id = $1::INTEGER OR new_person_id = $1::INTEGER);
+
+-- ================================================
+-- getRiskLatestEvaluate: GET /api/risks/{eventID}/evaluate/latest
+-- $1 = project_id
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    risk_rank AS "riskRank",
+    evaluate_date_time AS "evaluateDateTime",
+    evaluated_by AS "evaluatedBy",
+    is_system_proposed AS "isSystemProposed",
+    is_manual_adjusted AS "isManualAdjusted"
+FROM RISK_EVALUATE
+WHERE project_id = $1::INTEGER
+ORDER BY evaluate_date_time DESC, event_id DESC
+LIMIT 1;
+
+-- ================================================
+-- getRiskLatestEvaluate: GET /api/risks/{eventID}/evaluate/latest（as_of 指定）
+-- $1 = project_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    e.event_id AS "eventID",
+    e.project_id AS "projectID",
+    e.risk_rank AS "riskRank",
+    e.evaluate_date_time AS "evaluateDateTime",
+    e.evaluated_by AS "evaluatedBy",
+    e.is_system_proposed AS "isSystemProposed",
+    e.is_manual_adjusted AS "isManualAdjusted"
+FROM RISK_EVALUATE_VALIDITY v
+JOIN RISK_EVALUATE e ON e.event_id = v.event_id
+WHERE v.project_id = $1::INTEGER AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE;
+
+-- ================================================
+-- batchGetRiskLatestEvaluate: GET /api/risks/evaluate/latest
+-- $1 = project_id の配列
+-- ================================================
+SELECT e.*
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+CROSS JOIN LATERAL (
+    SELECT
+        event_id AS "eventID",
+        project_id AS "projectID",
+        risk_rank AS "riskRank",
+        evaluate_date_time AS "evaluateDateTime",
+        evaluated_by AS "evaluatedBy",
+        is_system_proposed AS "isSystemProposed",
+        is_manual_adjusted AS "isManualAdjusted"
+    FROM RISK_EVALUATE
+    WHERE project_id = ids.id
+    ORDER BY evaluate_date_time DESC, event_id DESC
+    LIMIT 1
+) e
+ORDER BY ids.n;
+
+-- ================================================
+-- batchGetRiskLatestEvaluate: GET /api/risks/evaluate/latest（as_of 指定）
+-- $1 = project_id の配列
+-- $2 = as_of
+-- ================================================
+SELECT
+    e.event_id AS "eventID",
+    e.project_id AS "projectID",
+    e.risk_rank AS "riskRank",
+    e.evaluate_date_time AS "evaluateDateTime",
+    e.evaluated_by AS "evaluatedBy",
+    e.is_system_proposed AS "isSystemProposed",
+    e.is_manual_adjusted AS "isManualAdjusted"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN RISK_EVALUATE_VALIDITY v ON v.project_id = ids.id AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE
+JOIN RISK_EVALUATE e ON e.event_id = v.event_id
+ORDER BY ids.n;
+
+-- ================================================
+-- getRiskEvaluateHistory: GET /api/risks/{eventID}/evaluate/history（先頭ページ）
+-- $1 = project_id
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    risk_rank AS "riskRank",
+    evaluate_date_time AS "evaluateDateTime",
+    evaluated_by AS "evaluatedBy",
+    is_system_proposed AS "isSystemProposed",
+    is_manual_adjusted AS "isManualAdjusted"
+FROM RISK_EVALUATE
+WHERE project_id = $1::INTEGER
+ORDER BY evaluate_date_time, event_id
+LIMIT $2;
+
+-- ================================================
+-- getRiskEvaluateHistory: GET /api/risks/{eventID}/evaluate/history（次ページ）
+-- $1 = project_id
+-- $2 = 前ページ末尾の evaluate_date_time
+-- $3 = 前ページ末尾の event_id
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    risk_rank AS "riskRank",
+    evaluate_date_time AS "evaluateDateTime",
+    evaluated_by AS "evaluatedBy",
+    is_system_proposed AS "isSystemProposed",
+    is_manual_adjusted AS "isManualAdjusted"
+FROM RISK_EVALUATE
+WHERE project_id = $1::INTEGER
+  AND (evaluate_date_time, event_id) > ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY evaluate_date_time, event_id
+LIMIT $4;
+
+-- ================================================
+-- getRiskEvaluateSummary: GET /api/risks/{eventID}/evaluate/summary
+-- $1 = project_id
+-- ================================================
+SELECT
+    $1::INTEGER AS "riskID",
+    COUNT(*) AS "eventCount",
+    MAX(evaluate_date_time) AS "latestEvent",
+    MIN(evaluate_date_time) AS "firstEvent"
+FROM RISK_EVALUATE
+WHERE project_id = $1::INTEGER;
+
+-- ================================================
+-- getRiskEvaluateSummary: GET /api/risks/{eventID}/evaluate/summary（as_of 指定）
+-- $1 = project_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    ids.id AS "riskID",
+    COALESCE(v.seq, 0) AS "eventCount",
+    v.valid_from AS "latestEvent",
+    (SELECT MIN(f.valid_from) FROM RISK_EVALUATE_VALIDITY f WHERE f.project_id = v.project_id) AS "firstEvent"
+FROM (VALUES ($1::INTEGER)) AS ids(id)
+LEFT JOIN RISK_EVALUATE_VALIDITY v ON v.project_id = ids.id AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE;
+
+-- ================================================
+-- getSupportExecuteLatestEvent: GET /api/support_executes/{eventID}/event/latest
+-- $1 = event_id
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    support_type_id AS "supportTypeID",
+    support_person_id AS "supportPersonID",
+    execute_date_time AS "executeDateTime",
+    support_content AS "supportContent",
+    outcome,
+    memo
+FROM SUPPORT_EXECUTE
+WHERE event_id = $1::INTEGER
+ORDER BY execute_date_time DESC, event_id DESC
+LIMIT 1;
+
+-- ================================================
+-- batchGetSupportExecuteLatestEvent: GET /api/support_executes/event/latest
+-- $1 = event_id の配列
+-- ================================================
+SELECT e.*
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+CROSS JOIN LATERAL (
+    SELECT
+        event_id AS "eventID",
+        project_id AS "projectID",
+        support_type_id AS "supportTypeID",
+        support_person_id AS "supportPersonID",
+        execute_date_time AS "executeDateTime",
+        support_content AS "supportContent",
+        outcome,
+        memo
+    FROM SUPPORT_EXECUTE
+    WHERE event_id = ids.id
+    ORDER BY execute_date_time DESC, event_id DESC
+    LIMIT 1
+) e
+ORDER BY ids.n;
+
+-- ================================================
+-- getSupportExecuteEventHistory: GET /api/support_executes/{eventID}/event/history（先頭ページ）
+-- $1 = event_id
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    support_type_id AS "supportTypeID",
+    support_person_id AS "supportPersonID",
+    execute_date_time AS "executeDateTime",
+    support_content AS "supportContent",
+    outcome,
+    memo
+FROM SUPPORT_EXECUTE
+WHERE event_id = $1::INTEGER
+ORDER BY execute_date_time, event_id
+LIMIT $2;
+
+-- ================================================
+-- getSupportExecuteEventHistory: GET /api/support_executes/{eventID}/event/history（次ページ）
+-- $1 = event_id
+-- $2 = 前ページ末尾の execute_date_time
+-- $3 = 前ページ末尾の event_id
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    support_type_id AS "supportTypeID",
+    support_person_id AS "supportPersonID",
+    execute_date_time AS "executeDateTime",
+    support_content AS "supportContent",
+    outcome,
+    memo
+FROM SUPPORT_EXECUTE
+WHERE event_id = $1::INTEGER
+  AND (execute_date_time, event_id) > ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY execute_date_time, event_id
+LIMIT $4;
+
+-- ================================================
+-- getSupportExecuteEventSummary: GET /api/support_executes/{eventID}/event/summary
+-- $1 = event_id
+-- ================================================
+SELECT
+    $1::INTEGER AS "supportexecuteID",
+    COUNT(*) AS "eventCount",
+    MAX(execute_date_time) AS "latestEvent",
+    MIN(execute_date_time) AS "firstEvent"
+FROM SUPPORT_EXECUTE
+WHERE event_id = $1::INTEGER;
+
+-- ================================================
+-- getProjectLatestComplete: GET /api/projects/{eventID}/complete/latest
+-- $1 = project_id
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    complete_date_time AS "completeDateTime",
+    actual_effort AS "actualEffort",
+    registered_by AS "registeredBy"
+FROM PROJECT_COMPLETE
+WHERE project_id = $1::INTEGER
+ORDER BY complete_date_time DESC, event_id DESC
+LIMIT 1;
+
+-- ================================================
+-- getProjectLatestComplete: GET /api/projects/{eventID}/complete/latest（as_of 指定）
+-- $1 = project_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    e.event_id AS "eventID",
+    e.project_id AS "projectID",
+    e.complete_date_time AS "completeDateTime",
+    e.actual_effort AS "actualEffort",
+    e.registered_by AS "registeredBy"
+FROM PROJECT_COMPLETE_VALIDITY v
+JOIN PROJECT_COMPLETE e ON e.event_id = v.event_id
+WHERE v.project_id = $1::INTEGER AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE;
+
+-- ================================================
+-- batchGetProjectLatestComplete: GET /api/projects/complete/latest
+-- $1 = project_id の配列
+-- ================================================
+SELECT e.*
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+CROSS JOIN LATERAL (
+    SELECT
+        event_id AS "eventID",
+        project_id AS "projectID",
+        complete_date_time AS "completeDateTime",
+        actual_effort AS "actualEffort",
+        registered_by AS "registeredBy"
+    FROM PROJECT_COMPLETE
+    WHERE project_id = ids.id
+    ORDER BY complete_date_time DESC, event_id DESC
+    LIMIT 1
+) e
+ORDER BY ids.n;
+
+-- ================================================
+-- batchGetProjectLatestComplete: GET /api/projects/complete/latest（as_of 指定）
+-- $1 = project_id の配列
+-- $2 = as_of
+-- ================================================
+SELECT
+    e.event_id AS "eventID",
+    e.project_id AS "projectID",
+    e.complete_date_time AS "completeDateTime",
+    e.actual_effort AS "actualEffort",
+    e.registered_by AS "registeredBy"
+FROM unnest($1::INTEGER[]) WITH ORDINALITY AS ids(id, n)
+JOIN PROJECT_COMPLETE_VALIDITY v ON v.project_id = ids.id AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE
+JOIN PROJECT_COMPLETE e ON e.event_id = v.event_id
+ORDER BY ids.n;
+
+-- ================================================
+-- getProjectCompleteHistory: GET /api/projects/{eventID}/complete/history（先頭ページ）
+-- $1 = project_id
+-- $2 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    complete_date_time AS "completeDateTime",
+    actual_effort AS "actualEffort",
+    registered_by AS "registeredBy"
+FROM PROJECT_COMPLETE
+WHERE project_id = $1::INTEGER
+ORDER BY complete_date_time, event_id
+LIMIT $2;
+
+-- ================================================
+-- getProjectCompleteHistory: GET /api/projects/{eventID}/complete/history（次ページ）
+-- $1 = project_id
+-- $2 = 前ページ末尾の complete_date_time
+-- $3 = 前ページ末尾の event_id
+-- $4 = limit + 1
+-- ================================================
+SELECT
+    event_id AS "eventID",
+    project_id AS "projectID",
+    complete_date_time AS "completeDateTime",
+    actual_effort AS "actualEffort",
+    registered_by AS "registeredBy"
+FROM PROJECT_COMPLETE
+WHERE project_id = $1::INTEGER
+  AND (complete_date_time, event_id) > ($2::TIMESTAMP WITH TIME ZONE, $3::INTEGER)
+ORDER BY complete_date_time, event_id
+LIMIT $4;
+
+-- ================================================
+-- getProjectCompleteSummary: GET /api/projects/{eventID}/complete/summary
+-- $1 = project_id
+-- ================================================
+SELECT
+    $1::INTEGER AS "projectID",
+    COUNT(*) AS "eventCount",
+    MAX(complete_date_time) AS "latestEvent",
+    MIN(complete_date_time) AS "firstEvent"
+FROM PROJECT_COMPLETE
+WHERE project_id = $1::INTEGER;
+
+-- ================================================
+-- getProjectCompleteSummary: GET /api/projects/{eventID}/complete/summary（as_of 指定）
+-- $1 = project_id
+-- $2 = as_of
+-- ================================================
+SELECT
+    ids.id AS "projectID",
+    COALESCE(v.seq, 0) AS "eventCount",
+    v.valid_from AS "latestEvent",
+    (SELECT MIN(f.valid_from) FROM PROJECT_COMPLETE_VALIDITY f WHERE f.project_id = v.project_id) AS "firstEvent"
+FROM (VALUES ($1::INTEGER)) AS ids(id)
+LEFT JOIN PROJECT_COMPLETE_VALIDITY v ON v.project_id = ids.id AND v.valid_during @> $2::TIMESTAMP WITH TIME ZONE;
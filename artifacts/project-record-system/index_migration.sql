@@ -0,0 +1,80 @@
+-- インデックス移行: project-record-system
+-- CONCURRENTLY はトランザクション外で実行する（psql -f でそのまま流せる）
+
+-- クエリ9（業界別プロジェクトサマリー） / INDUSTRY の削除
+CREATE INDEX CONCURRENTLY idx_customer_industry_notnull ON CUSTOMER(industry_id) WHERE industry_id IS NOT NULL;
+-- DEVELOPMENT_TYPE の削除
+CREATE INDEX CONCURRENTLY idx_project_development_type_development_type ON PROJECT_DEVELOPMENT_TYPE(development_type_id);
+-- DEVELOPMENT_METHOD の削除
+CREATE INDEX CONCURRENTLY idx_project_development_method_development_method ON PROJECT_DEVELOPMENT_METHOD(development_method_id);
+-- TARGET_PHASE の削除
+CREATE INDEX CONCURRENTLY idx_project_target_phase_target_phase ON PROJECT_TARGET_PHASE(target_phase_id);
+-- GET /api/projects/{eventID}/start/history / GET /api/projects/{eventID}/start/latest / GET /api/projects/{eventID}/start/summary / クエリ1（プロジェクト一覧と現在の状態） / クエリ4（プロジェクトの最新リスク評価） / クエリ9（業界別プロジェクトサマリー） / クエリ10（担当者の稼働状況（現在進行中のプロジェクト）） / PROJECT の削除
+CREATE INDEX CONCURRENTLY idx_project_start_project_datetime_event ON PROJECT_START(project_id, start_date_time, event_id);
+-- PERSON の削除
+CREATE INDEX CONCURRENTLY idx_project_start_registered_by ON PROJECT_START(registered_by);
+-- PERSON の削除
+CREATE INDEX CONCURRENTLY idx_organization_join_registered_by ON ORGANIZATION_JOIN(registered_by);
+-- クエリ2（プロジェクトの現在の担当者一覧） / GET /api/projects/{eventID}/members/current / PROJECT の削除
+CREATE INDEX CONCURRENTLY idx_person_assign_project_role_datetime ON PERSON_ASSIGN(project_id, role_id, assign_date_time DESC) INCLUDE (person_id);
+-- GET /api/persons/{eventID}/assign/history / GET /api/persons/{eventID}/assign/latest / GET /api/persons/{eventID}/assign/summary / PERSON の削除
+CREATE INDEX CONCURRENTLY idx_person_assign_person_datetime_event ON PERSON_ASSIGN(person_id, assign_date_time, event_id);
+-- ROLE の削除
+CREATE INDEX CONCURRENTLY idx_person_assign_role ON PERSON_ASSIGN(role_id);
+-- PERSON の削除
+CREATE INDEX CONCURRENTLY idx_person_assign_registered_by ON PERSON_ASSIGN(registered_by);
+-- クエリ2（プロジェクトの現在の担当者一覧） / クエリ10（担当者の稼働状況（現在進行中のプロジェクト）） / GET /api/projects/{eventID}/members/current / PERSON の削除
+CREATE INDEX CONCURRENTLY idx_person_replace_old_person_project_role_datetime ON PERSON_REPLACE(old_person_id, project_id, role_id, replace_date_time);
+-- GET /api/persons/{eventID}/replace/history / GET /api/persons/{eventID}/replace/latest / GET /api/persons/{eventID}/replace/summary
+CREATE INDEX CONCURRENTLY idx_person_replace_old_person_datetime_event ON PERSON_REPLACE(old_person_id, replace_date_time, event_id);
+-- GET /api/persons/{eventID}/replace/history / GET /api/persons/{eventID}/replace/latest / GET /api/persons/{eventID}/replace/summary / PERSON の削除
+CREATE INDEX CONCURRENTLY idx_person_replace_new_person_datetime_event ON PERSON_REPLACE(new_person_id, replace_date_time, event_id);
+-- ROLE の削除
+CREATE INDEX CONCURRENTLY idx_person_replace_role ON PERSON_REPLACE(role_id);
+-- PERSON の削除
+CREATE INDEX CONCURRENTLY idx_person_replace_registered_by ON PERSON_REPLACE(registered_by);
+-- GET /api/risks/{eventID}/evaluate/history / クエリ4（プロジェクトの最新リスク評価） / クエリ9（業界別プロジェクトサマリー） / GET /api/risks/{eventID}/evaluate/latest / GET /api/risks/{eventID}/evaluate/summary / PROJECT の削除
+CREATE INDEX CONCURRENTLY idx_risk_evaluate_project_datetime_event ON RISK_EVALUATE(project_id, evaluate_date_time, event_id) INCLUDE (risk_rank, evaluated_by, is_system_proposed, is_manual_adjusted);
+-- PERSON の削除
+CREATE INDEX CONCURRENTLY idx_risk_evaluate_evaluated_by ON RISK_EVALUATE(evaluated_by);
+-- GET /api/projects/{eventID}/complete/history / GET /api/projects/{eventID}/complete/latest / GET /api/projects/{eventID}/complete/summary / クエリ1（プロジェクト一覧と現在の状態） / クエリ4（プロジェクトの最新リスク評価） / クエリ9（業界別プロジェクトサマリー） / クエリ10（担当者の稼働状況（現在進行中のプロジェクト）） / PROJECT の削除
+CREATE INDEX CONCURRENTLY idx_project_complete_project_datetime_event ON PROJECT_COMPLETE(project_id, complete_date_time, event_id);
+-- PERSON の削除
+CREATE INDEX CONCURRENTLY idx_project_complete_registered_by ON PROJECT_COMPLETE(registered_by);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_project_start_date;  -- ワークロードに planned_start_date を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_project_start_date ON PROJECT(planned_start_date);
+DROP INDEX CONCURRENTLY IF EXISTS idx_project_end_date;  -- ワークロードに planned_end_date を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_project_end_date ON PROJECT(planned_end_date);
+DROP INDEX CONCURRENTLY IF EXISTS idx_customer_industry;  -- 部分インデックス idx_customer_industry_notnull で代替
+--   元の定義: CREATE INDEX idx_customer_industry ON CUSTOMER(industry_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_project_start_project;  -- idx_project_start_project_datetime_event の先頭列で代替
+--   元の定義: CREATE INDEX idx_project_start_project ON PROJECT_START(project_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_project_start_datetime;  -- ワークロードに start_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_project_start_datetime ON PROJECT_START(start_date_time);
+DROP INDEX CONCURRENTLY IF EXISTS idx_organization_join_datetime;  -- ワークロードに join_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_organization_join_datetime ON ORGANIZATION_JOIN(join_date_time);
+DROP INDEX CONCURRENTLY IF EXISTS idx_person_assign_project;  -- idx_person_assign_project_role_datetime の先頭列で代替
+--   元の定義: CREATE INDEX idx_person_assign_project ON PERSON_ASSIGN(project_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_person_assign_person;  -- idx_person_assign_person_datetime_event の先頭列で代替
+--   元の定義: CREATE INDEX idx_person_assign_person ON PERSON_ASSIGN(person_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_person_assign_datetime;  -- ワークロードに assign_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_person_assign_datetime ON PERSON_ASSIGN(assign_date_time);
+DROP INDEX CONCURRENTLY IF EXISTS idx_person_replace_old;  -- idx_person_replace_old_person_project_role_datetime の先頭列で代替
+--   元の定義: CREATE INDEX idx_person_replace_old ON PERSON_REPLACE(old_person_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_person_replace_new;  -- idx_person_replace_new_person_datetime_event の先頭列で代替
+--   元の定義: CREATE INDEX idx_person_replace_new ON PERSON_REPLACE(new_person_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_person_replace_datetime;  -- ワークロードに replace_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_person_replace_datetime ON PERSON_REPLACE(replace_date_time);
+DROP INDEX CONCURRENTLY IF EXISTS idx_risk_evaluate_project;  -- idx_risk_evaluate_project_datetime_event の先頭列で代替
+--   元の定義: CREATE INDEX idx_risk_evaluate_project ON RISK_EVALUATE(project_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_risk_evaluate_datetime;  -- ワークロードに evaluate_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_risk_evaluate_datetime ON RISK_EVALUATE(evaluate_date_time);
+DROP INDEX CONCURRENTLY IF EXISTS idx_support_execute_datetime;  -- ワークロードに execute_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_support_execute_datetime ON SUPPORT_EXECUTE(execute_date_time);
+DROP INDEX CONCURRENTLY IF EXISTS idx_project_complete_project;  -- idx_project_complete_project_datetime_event の先頭列で代替
+--   元の定義: CREATE INDEX idx_project_complete_project ON PROJECT_COMPLETE(project_id);
+DROP INDEX CONCURRENTLY IF EXISTS idx_project_complete_datetime;  -- ワークロードに complete_date_time を使う検索・結合・並び替えがない
+--   元の定義: CREATE INDEX idx_project_complete_datetime ON PROJECT_COMPLETE(complete_date_time);
+
+ANALYZE;
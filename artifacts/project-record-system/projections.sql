@@ -0,0 +1,657 @@
+-- ================================================
+-- 現在状態プロジェクション（イベント追記時にトリガーで 1 行ずつ更新）
+-- project-record-system
+-- 生成: python -m tools.projection project-record-system --write
+-- schema.sql の後、データ投入の前に実行する
+-- ================================================
+--
+-- 使い方:
+--   SELECT * FROM PROJECT_STATE WHERE project_id = ?;  -- 主キー参照で現在状態を取得
+--   SELECT * FROM PROJECT_ORGANIZATION_CURRENT WHERE project_id = ?;
+--   SELECT * FROM PROJECT_PERSON_CURRENT WHERE project_id = ?;
+--   CALL rebuild_projections();  -- イベントから全件を作り直す（復旧・トリガーを止めた一括投入の後）
+
+-- ================================================
+-- プロジェクションテーブル
+-- ================================================
+
+-- プロジェクトの現在状態
+CREATE TABLE PROJECT_STATE (
+    project_id INTEGER PRIMARY KEY,
+    project_start_count BIGINT NOT NULL DEFAULT 0,
+    first_project_start_at TIMESTAMP WITH TIME ZONE,
+    last_project_start_at TIMESTAMP WITH TIME ZONE,
+    last_project_start_id INTEGER,
+    last_project_start_registered_by INTEGER,
+    organization_join_count BIGINT NOT NULL DEFAULT 0,
+    first_organization_join_at TIMESTAMP WITH TIME ZONE,
+    last_organization_join_at TIMESTAMP WITH TIME ZONE,
+    last_organization_join_id INTEGER,
+    person_assign_count BIGINT NOT NULL DEFAULT 0,
+    first_person_assign_at TIMESTAMP WITH TIME ZONE,
+    last_person_assign_at TIMESTAMP WITH TIME ZONE,
+    last_person_assign_id INTEGER,
+    person_replace_count BIGINT NOT NULL DEFAULT 0,
+    first_person_replace_at TIMESTAMP WITH TIME ZONE,
+    last_person_replace_at TIMESTAMP WITH TIME ZONE,
+    last_person_replace_id INTEGER,
+    risk_evaluate_count BIGINT NOT NULL DEFAULT 0,
+    first_risk_evaluate_at TIMESTAMP WITH TIME ZONE,
+    last_risk_evaluate_at TIMESTAMP WITH TIME ZONE,
+    last_risk_evaluate_id INTEGER,
+    last_risk_evaluate_rank VARCHAR(20),
+    last_risk_evaluate_evaluated_by INTEGER,
+    last_risk_evaluate_is_system_proposed BOOLEAN,
+    last_risk_evaluate_is_manual_adjusted BOOLEAN,
+    support_execute_count BIGINT NOT NULL DEFAULT 0,
+    first_support_execute_at TIMESTAMP WITH TIME ZONE,
+    last_support_execute_at TIMESTAMP WITH TIME ZONE,
+    last_support_execute_id INTEGER,
+    last_support_execute_type_id INTEGER,
+    last_support_execute_person_id INTEGER,
+    project_complete_count BIGINT NOT NULL DEFAULT 0,
+    first_project_complete_at TIMESTAMP WITH TIME ZONE,
+    last_project_complete_at TIMESTAMP WITH TIME ZONE,
+    last_project_complete_id INTEGER,
+    last_project_complete_actual_effort DECIMAL(10,2),
+    last_project_complete_registered_by INTEGER,
+    total_actual_effort NUMERIC NOT NULL DEFAULT 0,
+    remaining_estimated_effort NUMERIC,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_project_state_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT
+);
+
+COMMENT ON TABLE PROJECT_STATE IS 'プロジェクトの現在状態（イベントから導出）';
+COMMENT ON COLUMN PROJECT_STATE.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PROJECT_STATE.project_start_count IS 'プロジェクト開始イベントの件数';
+COMMENT ON COLUMN PROJECT_STATE.first_project_start_at IS '最初のプロジェクト開始イベントの開始日時';
+COMMENT ON COLUMN PROJECT_STATE.last_project_start_at IS '最新のプロジェクト開始イベントの開始日時';
+COMMENT ON COLUMN PROJECT_STATE.last_project_start_id IS '最新のプロジェクト開始イベントのイベントID';
+COMMENT ON COLUMN PROJECT_STATE.last_project_start_registered_by IS '最新のプロジェクト開始イベントの登録者ID';
+COMMENT ON COLUMN PROJECT_STATE.organization_join_count IS '組織参画イベントの件数';
+COMMENT ON COLUMN PROJECT_STATE.first_organization_join_at IS '最初の組織参画イベントの参画日時';
+COMMENT ON COLUMN PROJECT_STATE.last_organization_join_at IS '最新の組織参画イベントの参画日時';
+COMMENT ON COLUMN PROJECT_STATE.last_organization_join_id IS '最新の組織参画イベントのイベントID';
+COMMENT ON COLUMN PROJECT_STATE.person_assign_count IS '担当者アサインイベントの件数';
+COMMENT ON COLUMN PROJECT_STATE.first_person_assign_at IS '最初の担当者アサインイベントのアサイン日時';
+COMMENT ON COLUMN PROJECT_STATE.last_person_assign_at IS '最新の担当者アサインイベントのアサイン日時';
+COMMENT ON COLUMN PROJECT_STATE.last_person_assign_id IS '最新の担当者アサインイベントのイベントID';
+COMMENT ON COLUMN PROJECT_STATE.person_replace_count IS '担当者交代イベントの件数';
+COMMENT ON COLUMN PROJECT_STATE.first_person_replace_at IS '最初の担当者交代イベントの交代日時';
+COMMENT ON COLUMN PROJECT_STATE.last_person_replace_at IS '最新の担当者交代イベントの交代日時';
+COMMENT ON COLUMN PROJECT_STATE.last_person_replace_id IS '最新の担当者交代イベントのイベントID';
+COMMENT ON COLUMN PROJECT_STATE.risk_evaluate_count IS 'リスク評価イベントの件数';
+COMMENT ON COLUMN PROJECT_STATE.first_risk_evaluate_at IS '最初のリスク評価イベントの評価日時';
+COMMENT ON COLUMN PROJECT_STATE.last_risk_evaluate_at IS '最新のリスク評価イベントの評価日時';
+COMMENT ON COLUMN PROJECT_STATE.last_risk_evaluate_id IS '最新のリスク評価イベントのイベントID';
+COMMENT ON COLUMN PROJECT_STATE.last_risk_evaluate_rank IS '最新のリスク評価イベントのリスクランク';
+COMMENT ON COLUMN PROJECT_STATE.last_risk_evaluate_evaluated_by IS '最新のリスク評価イベントの評価者ID';
+COMMENT ON COLUMN PROJECT_STATE.last_risk_evaluate_is_system_proposed IS '最新のリスク評価イベントのシステム提案フラグ';
+COMMENT ON COLUMN PROJECT_STATE.last_risk_evaluate_is_manual_adjusted IS '最新のリスク評価イベントの手動調整フラグ';
+COMMENT ON COLUMN PROJECT_STATE.support_execute_count IS '支援実施イベントの件数';
+COMMENT ON COLUMN PROJECT_STATE.first_support_execute_at IS '最初の支援実施イベントの実施日時';
+COMMENT ON COLUMN PROJECT_STATE.last_support_execute_at IS '最新の支援実施イベントの実施日時';
+COMMENT ON COLUMN PROJECT_STATE.last_support_execute_id IS '最新の支援実施イベントのイベントID';
+COMMENT ON COLUMN PROJECT_STATE.last_support_execute_type_id IS '最新の支援実施イベントの支援タイプID';
+COMMENT ON COLUMN PROJECT_STATE.last_support_execute_person_id IS '最新の支援実施イベントの支援担当者ID';
+COMMENT ON COLUMN PROJECT_STATE.project_complete_count IS 'プロジェクト完了イベントの件数';
+COMMENT ON COLUMN PROJECT_STATE.first_project_complete_at IS '最初のプロジェクト完了イベントの完了日時';
+COMMENT ON COLUMN PROJECT_STATE.last_project_complete_at IS '最新のプロジェクト完了イベントの完了日時';
+COMMENT ON COLUMN PROJECT_STATE.last_project_complete_id IS '最新のプロジェクト完了イベントのイベントID';
+COMMENT ON COLUMN PROJECT_STATE.last_project_complete_actual_effort IS '最新のプロジェクト完了イベントの実績工数';
+COMMENT ON COLUMN PROJECT_STATE.last_project_complete_registered_by IS '最新のプロジェクト完了イベントの登録者ID';
+COMMENT ON COLUMN PROJECT_STATE.total_actual_effort IS 'プロジェクト完了イベントの実績工数の累計';
+COMMENT ON COLUMN PROJECT_STATE.remaining_estimated_effort IS '残受注規模（受注規模 - 実績工数の累計）';
+COMMENT ON COLUMN PROJECT_STATE.updated_at IS '更新日時';
+
+-- プロジェクトの現在の組織
+CREATE TABLE PROJECT_ORGANIZATION_CURRENT (
+    project_id INTEGER NOT NULL,
+    organization_id INTEGER NOT NULL,
+    since TIMESTAMP WITH TIME ZONE NOT NULL,
+    source_event VARCHAR(63) NOT NULL,
+    source_event_id INTEGER NOT NULL,
+    PRIMARY KEY (project_id, organization_id),
+    CONSTRAINT fk_project_organization_current_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_project_organization_current_organization FOREIGN KEY (organization_id)
+        REFERENCES ORGANIZATION(organization_id) ON DELETE RESTRICT
+);
+
+CREATE INDEX idx_project_organization_current_organization ON PROJECT_ORGANIZATION_CURRENT(organization_id);
+
+COMMENT ON TABLE PROJECT_ORGANIZATION_CURRENT IS 'プロジェクトの現在の組織（組織参画）';
+COMMENT ON COLUMN PROJECT_ORGANIZATION_CURRENT.since IS '開始日時';
+COMMENT ON COLUMN PROJECT_ORGANIZATION_CURRENT.source_event IS '開始したイベント';
+COMMENT ON COLUMN PROJECT_ORGANIZATION_CURRENT.source_event_id IS '開始したイベントのID';
+
+-- プロジェクトの現在の人
+CREATE TABLE PROJECT_PERSON_CURRENT (
+    project_id INTEGER NOT NULL,
+    person_id INTEGER NOT NULL,
+    role_id INTEGER NOT NULL,
+    since TIMESTAMP WITH TIME ZONE NOT NULL,
+    source_event VARCHAR(63) NOT NULL,
+    source_event_id INTEGER NOT NULL,
+    PRIMARY KEY (project_id, person_id, role_id),
+    CONSTRAINT fk_project_person_current_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_project_person_current_person FOREIGN KEY (person_id)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_project_person_current_role FOREIGN KEY (role_id)
+        REFERENCES ROLE(role_id) ON DELETE RESTRICT
+);
+
+CREATE INDEX idx_project_person_current_person ON PROJECT_PERSON_CURRENT(person_id);
+
+COMMENT ON TABLE PROJECT_PERSON_CURRENT IS 'プロジェクトの現在の人（担当者アサインから担当者交代で外れたものを除く）';
+COMMENT ON COLUMN PROJECT_PERSON_CURRENT.since IS '開始日時';
+COMMENT ON COLUMN PROJECT_PERSON_CURRENT.source_event IS '開始したイベント';
+COMMENT ON COLUMN PROJECT_PERSON_CURRENT.source_event_id IS '開始したイベントのID';
+
+-- ================================================
+-- 追記トリガー
+-- ================================================
+
+-- プロジェクトの追加 → 状態行を作成（イベントのないリソースも一覧できるようにする）
+CREATE OR REPLACE FUNCTION project_state_init() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_STATE (project_id, remaining_estimated_effort)
+    VALUES (NEW.project_id, NEW.estimated_effort)
+    ON CONFLICT (project_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_project_project_state_init AFTER INSERT ON PROJECT
+    FOR EACH ROW EXECUTE FUNCTION project_state_init();
+
+-- プロジェクトの estimated_effort の訂正 → 残高を再計算
+CREATE OR REPLACE FUNCTION project_state_adjust_estimated_effort() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE PROJECT_STATE
+    SET remaining_estimated_effort = NEW.estimated_effort - total_actual_effort,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE project_id = NEW.project_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_project_project_state_adjust_estimated_effort
+    AFTER UPDATE OF estimated_effort ON PROJECT
+    FOR EACH ROW WHEN (NEW.estimated_effort IS DISTINCT FROM OLD.estimated_effort)
+    EXECUTE FUNCTION project_state_adjust_estimated_effort();
+
+-- プロジェクト開始の追記 → プロジェクトの現在状態
+CREATE OR REPLACE FUNCTION project_state_apply_project_start() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_STATE AS s (
+        project_id,
+        project_start_count,
+        first_project_start_at,
+        last_project_start_at,
+        last_project_start_id,
+        last_project_start_registered_by
+    ) VALUES (
+        NEW.project_id,
+        1,
+        NEW.start_date_time,
+        NEW.start_date_time,
+        NEW.event_id,
+        NEW.registered_by
+    )
+    ON CONFLICT (project_id) DO UPDATE SET
+        project_start_count = s.project_start_count + 1,
+        first_project_start_at = LEAST(s.first_project_start_at, EXCLUDED.first_project_start_at),
+        last_project_start_at = GREATEST(s.last_project_start_at, EXCLUDED.last_project_start_at),
+        last_project_start_id = CASE WHEN s.last_project_start_at IS NULL OR EXCLUDED.last_project_start_at >= s.last_project_start_at THEN EXCLUDED.last_project_start_id ELSE s.last_project_start_id END,
+        last_project_start_registered_by = CASE WHEN s.last_project_start_at IS NULL OR EXCLUDED.last_project_start_at >= s.last_project_start_at THEN EXCLUDED.last_project_start_registered_by ELSE s.last_project_start_registered_by END,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_project_start_project_state AFTER INSERT ON PROJECT_START
+    FOR EACH ROW EXECUTE FUNCTION project_state_apply_project_start();
+
+-- 組織参画の追記 → プロジェクトの現在状態
+CREATE OR REPLACE FUNCTION project_state_apply_organization_join() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_STATE AS s (
+        project_id,
+        organization_join_count,
+        first_organization_join_at,
+        last_organization_join_at,
+        last_organization_join_id
+    ) VALUES (
+        NEW.project_id,
+        1,
+        NEW.join_date_time,
+        NEW.join_date_time,
+        NEW.event_id
+    )
+    ON CONFLICT (project_id) DO UPDATE SET
+        organization_join_count = s.organization_join_count + 1,
+        first_organization_join_at = LEAST(s.first_organization_join_at, EXCLUDED.first_organization_join_at),
+        last_organization_join_at = GREATEST(s.last_organization_join_at, EXCLUDED.last_organization_join_at),
+        last_organization_join_id = CASE WHEN s.last_organization_join_at IS NULL OR EXCLUDED.last_organization_join_at >= s.last_organization_join_at THEN EXCLUDED.last_organization_join_id ELSE s.last_organization_join_id END,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_organization_join_project_state AFTER INSERT ON ORGANIZATION_JOIN
+    FOR EACH ROW EXECUTE FUNCTION project_state_apply_organization_join();
+
+-- 担当者アサインの追記 → プロジェクトの現在状態
+CREATE OR REPLACE FUNCTION project_state_apply_person_assign() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_STATE AS s (
+        project_id,
+        person_assign_count,
+        first_person_assign_at,
+        last_person_assign_at,
+        last_person_assign_id
+    ) VALUES (
+        NEW.project_id,
+        1,
+        NEW.assign_date_time,
+        NEW.assign_date_time,
+        NEW.event_id
+    )
+    ON CONFLICT (project_id) DO UPDATE SET
+        person_assign_count = s.person_assign_count + 1,
+        first_person_assign_at = LEAST(s.first_person_assign_at, EXCLUDED.first_person_assign_at),
+        last_person_assign_at = GREATEST(s.last_person_assign_at, EXCLUDED.last_person_assign_at),
+        last_person_assign_id = CASE WHEN s.last_person_assign_at IS NULL OR EXCLUDED.last_person_assign_at >= s.last_person_assign_at THEN EXCLUDED.last_person_assign_id ELSE s.last_person_assign_id END,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_person_assign_project_state AFTER INSERT ON PERSON_ASSIGN
+    FOR EACH ROW EXECUTE FUNCTION project_state_apply_person_assign();
+
+-- 担当者交代の追記 → プロジェクトの現在状態
+CREATE OR REPLACE FUNCTION project_state_apply_person_replace() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_STATE AS s (
+        project_id,
+        person_replace_count,
+        first_person_replace_at,
+        last_person_replace_at,
+        last_person_replace_id
+    ) VALUES (
+        NEW.project_id,
+        1,
+        NEW.replace_date_time,
+        NEW.replace_date_time,
+        NEW.event_id
+    )
+    ON CONFLICT (project_id) DO UPDATE SET
+        person_replace_count = s.person_replace_count + 1,
+        first_person_replace_at = LEAST(s.first_person_replace_at, EXCLUDED.first_person_replace_at),
+        last_person_replace_at = GREATEST(s.last_person_replace_at, EXCLUDED.last_person_replace_at),
+        last_person_replace_id = CASE WHEN s.last_person_replace_at IS NULL OR EXCLUDED.last_person_replace_at >= s.last_person_replace_at THEN EXCLUDED.last_person_replace_id ELSE s.last_person_replace_id END,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_person_replace_project_state AFTER INSERT ON PERSON_REPLACE
+    FOR EACH ROW EXECUTE FUNCTION project_state_apply_person_replace();
+
+-- リスク評価の追記 → プロジェクトの現在状態
+CREATE OR REPLACE FUNCTION project_state_apply_risk_evaluate() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_STATE AS s (
+        project_id,
+        risk_evaluate_count,
+        first_risk_evaluate_at,
+        last_risk_evaluate_at,
+        last_risk_evaluate_id,
+        last_risk_evaluate_rank,
+        last_risk_evaluate_evaluated_by,
+        last_risk_evaluate_is_system_proposed,
+        last_risk_evaluate_is_manual_adjusted
+    ) VALUES (
+        NEW.project_id,
+        1,
+        NEW.evaluate_date_time,
+        NEW.evaluate_date_time,
+        NEW.event_id,
+        NEW.risk_rank,
+        NEW.evaluated_by,
+        NEW.is_system_proposed,
+        NEW.is_manual_adjusted
+    )
+    ON CONFLICT (project_id) DO UPDATE SET
+        risk_evaluate_count = s.risk_evaluate_count + 1,
+        first_risk_evaluate_at = LEAST(s.first_risk_evaluate_at, EXCLUDED.first_risk_evaluate_at),
+        last_risk_evaluate_at = GREATEST(s.last_risk_evaluate_at, EXCLUDED.last_risk_evaluate_at),
+        last_risk_evaluate_id = CASE WHEN s.last_risk_evaluate_at IS NULL OR EXCLUDED.last_risk_evaluate_at >= s.last_risk_evaluate_at THEN EXCLUDED.last_risk_evaluate_id ELSE s.last_risk_evaluate_id END,
+        last_risk_evaluate_rank = CASE WHEN s.last_risk_evaluate_at IS NULL OR EXCLUDED.last_risk_evaluate_at >= s.last_risk_evaluate_at THEN EXCLUDED.last_risk_evaluate_rank ELSE s.last_risk_evaluate_rank END,
+        last_risk_evaluate_evaluated_by = CASE WHEN s.last_risk_evaluate_at IS NULL OR EXCLUDED.last_risk_evaluate_at >= s.last_risk_evaluate_at THEN EXCLUDED.last_risk_evaluate_evaluated_by ELSE s.last_risk_evaluate_evaluated_by END,
+        last_risk_evaluate_is_system_proposed = CASE WHEN s.last_risk_evaluate_at IS NULL OR EXCLUDED.last_risk_evaluate_at >= s.last_risk_evaluate_at THEN EXCLUDED.last_risk_evaluate_is_system_proposed ELSE s.last_risk_evaluate_is_system_proposed END,
+        last_risk_evaluate_is_manual_adjusted = CASE WHEN s.last_risk_evaluate_at IS NULL OR EXCLUDED.last_risk_evaluate_at >= s.last_risk_evaluate_at THEN EXCLUDED.last_risk_evaluate_is_manual_adjusted ELSE s.last_risk_evaluate_is_manual_adjusted END,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_risk_evaluate_project_state AFTER INSERT ON RISK_EVALUATE
+    FOR EACH ROW EXECUTE FUNCTION project_state_apply_risk_evaluate();
+
+-- 支援実施の追記 → プロジェクトの現在状態
+CREATE OR REPLACE FUNCTION project_state_apply_support_execute() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_STATE AS s (
+        project_id,
+        support_execute_count,
+        first_support_execute_at,
+        last_support_execute_at,
+        last_support_execute_id,
+        last_support_execute_type_id,
+        last_support_execute_person_id
+    ) VALUES (
+        NEW.project_id,
+        1,
+        NEW.execute_date_time,
+        NEW.execute_date_time,
+        NEW.event_id,
+        NEW.support_type_id,
+        NEW.support_person_id
+    )
+    ON CONFLICT (project_id) DO UPDATE SET
+        support_execute_count = s.support_execute_count + 1,
+        first_support_execute_at = LEAST(s.first_support_execute_at, EXCLUDED.first_support_execute_at),
+        last_support_execute_at = GREATEST(s.last_support_execute_at, EXCLUDED.last_support_execute_at),
+        last_support_execute_id = CASE WHEN s.last_support_execute_at IS NULL OR EXCLUDED.last_support_execute_at >= s.last_support_execute_at THEN EXCLUDED.last_support_execute_id ELSE s.last_support_execute_id END,
+        last_support_execute_type_id = CASE WHEN s.last_support_execute_at IS NULL OR EXCLUDED.last_support_execute_at >= s.last_support_execute_at THEN EXCLUDED.last_support_execute_type_id ELSE s.last_support_execute_type_id END,
+        last_support_execute_person_id = CASE WHEN s.last_support_execute_at IS NULL OR EXCLUDED.last_support_execute_at >= s.last_support_execute_at THEN EXCLUDED.last_support_execute_person_id ELSE s.last_support_execute_person_id END,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_support_execute_project_state AFTER INSERT ON SUPPORT_EXECUTE
+    FOR EACH ROW EXECUTE FUNCTION project_state_apply_support_execute();
+
+-- プロジェクト完了の追記 → プロジェクトの現在状態
+CREATE OR REPLACE FUNCTION project_state_apply_project_complete() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_STATE AS s (
+        project_id,
+        project_complete_count,
+        first_project_complete_at,
+        last_project_complete_at,
+        last_project_complete_id,
+        last_project_complete_actual_effort,
+        last_project_complete_registered_by,
+        total_actual_effort,
+        remaining_estimated_effort
+    ) VALUES (
+        NEW.project_id,
+        1,
+        NEW.complete_date_time,
+        NEW.complete_date_time,
+        NEW.event_id,
+        NEW.actual_effort,
+        NEW.registered_by,
+        COALESCE(NEW.actual_effort, 0),
+        (SELECT r.estimated_effort FROM PROJECT r WHERE r.project_id = NEW.project_id) - COALESCE(NEW.actual_effort, 0)
+    )
+    ON CONFLICT (project_id) DO UPDATE SET
+        project_complete_count = s.project_complete_count + 1,
+        first_project_complete_at = LEAST(s.first_project_complete_at, EXCLUDED.first_project_complete_at),
+        last_project_complete_at = GREATEST(s.last_project_complete_at, EXCLUDED.last_project_complete_at),
+        last_project_complete_id = CASE WHEN s.last_project_complete_at IS NULL OR EXCLUDED.last_project_complete_at >= s.last_project_complete_at THEN EXCLUDED.last_project_complete_id ELSE s.last_project_complete_id END,
+        last_project_complete_actual_effort = CASE WHEN s.last_project_complete_at IS NULL OR EXCLUDED.last_project_complete_at >= s.last_project_complete_at THEN EXCLUDED.last_project_complete_actual_effort ELSE s.last_project_complete_actual_effort END,
+        last_project_complete_registered_by = CASE WHEN s.last_project_complete_at IS NULL OR EXCLUDED.last_project_complete_at >= s.last_project_complete_at THEN EXCLUDED.last_project_complete_registered_by ELSE s.last_project_complete_registered_by END,
+        total_actual_effort = s.total_actual_effort + EXCLUDED.total_actual_effort,
+        remaining_estimated_effort = s.remaining_estimated_effort - EXCLUDED.total_actual_effort,
+        updated_at = CURRENT_TIMESTAMP;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_project_complete_project_state AFTER INSERT ON PROJECT_COMPLETE
+    FOR EACH ROW EXECUTE FUNCTION project_state_apply_project_complete();
+
+-- 組織参画の追記 → プロジェクトの現在の組織に追加
+CREATE OR REPLACE FUNCTION project_organization_current_apply_organization_join() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO PROJECT_ORGANIZATION_CURRENT AS c (project_id, organization_id, since, source_event, source_event_id)
+    VALUES (NEW.project_id, NEW.organization_id, NEW.join_date_time, 'ORGANIZATION_JOIN', NEW.event_id)
+    ON CONFLICT (project_id, organization_id) DO UPDATE SET
+        since = EXCLUDED.since,
+        source_event = EXCLUDED.source_event,
+        source_event_id = EXCLUDED.source_event_id
+    WHERE (EXCLUDED.since, EXCLUDED.source_event_id) < (c.since, c.source_event_id);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_organization_join_project_organization_current AFTER INSERT ON ORGANIZATION_JOIN
+    FOR EACH ROW EXECUTE FUNCTION project_organization_current_apply_organization_join();
+
+-- プロジェクトの現在の人の組み合わせ 1 つ分をイベントから作り直す
+CREATE OR REPLACE FUNCTION refresh_project_person_current(p_project_id INTEGER, p_person_id INTEGER, p_role_id INTEGER) RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    -- 同じ主体への同時追記を直列化する（削除と導き直しの間に他の追記が割り込まないように）
+    PERFORM 1 FROM PROJECT WHERE project_id = p_project_id FOR NO KEY UPDATE;
+    DELETE FROM PROJECT_PERSON_CURRENT
+    WHERE project_id = p_project_id AND person_id = p_person_id AND role_id = p_role_id;
+    INSERT INTO PROJECT_PERSON_CURRENT (project_id, person_id, role_id, since, source_event, source_event_id)
+    SELECT project_id, person_id, role_id, since, source_event, source_event_id
+    FROM (
+        SELECT project_id, person_id, role_id, assign_date_time, 'PERSON_ASSIGN', event_id FROM PERSON_ASSIGN
+        WHERE project_id = p_project_id AND person_id = p_person_id AND role_id = p_role_id
+        UNION ALL
+        SELECT project_id, new_person_id, role_id, replace_date_time, 'PERSON_REPLACE', event_id FROM PERSON_REPLACE
+        WHERE project_id = p_project_id AND new_person_id = p_person_id AND role_id = p_role_id
+    ) AS m (project_id, person_id, role_id, since, source_event, source_event_id)
+    WHERE NOT EXISTS (SELECT 1 FROM PERSON_REPLACE r
+                   WHERE r.project_id = m.project_id
+                     AND r.old_person_id = m.person_id
+                     AND r.role_id = m.role_id
+                     AND r.replace_date_time > m.since)
+    ORDER BY since, source_event, source_event_id
+    LIMIT 1;
+END;
+$$;
+
+-- 担当者アサインの追記 → プロジェクトの現在の人に追加
+CREATE OR REPLACE FUNCTION project_person_current_apply_person_assign() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM refresh_project_person_current(NEW.project_id, NEW.person_id, NEW.role_id);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_person_assign_project_person_current AFTER INSERT ON PERSON_ASSIGN
+    FOR EACH ROW EXECUTE FUNCTION project_person_current_apply_person_assign();
+
+-- 担当者交代の追記 → 旧側を外し、新側をプロジェクトの現在の人に追加
+CREATE OR REPLACE FUNCTION project_person_current_apply_person_replace() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM refresh_project_person_current(NEW.project_id, NEW.old_person_id, NEW.role_id);
+    PERFORM refresh_project_person_current(NEW.project_id, NEW.new_person_id, NEW.role_id);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_person_replace_project_person_current AFTER INSERT ON PERSON_REPLACE
+    FOR EACH ROW EXECUTE FUNCTION project_person_current_apply_person_replace();
+
+-- イベントは追記のみ（更新・削除すると状態がイベントとずれるため拒否する）
+CREATE OR REPLACE FUNCTION reject_event_modification() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    RAISE EXCEPTION 'イベントテーブル % は追記のみです（%）', TG_TABLE_NAME, TG_OP
+        USING HINT = '訂正は新しいイベントとして追記してください';
+END;
+$$;
+
+CREATE TRIGGER trg_project_start_append_only BEFORE UPDATE OR DELETE ON PROJECT_START
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+CREATE TRIGGER trg_organization_join_append_only BEFORE UPDATE OR DELETE ON ORGANIZATION_JOIN
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+CREATE TRIGGER trg_person_assign_append_only BEFORE UPDATE OR DELETE ON PERSON_ASSIGN
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+CREATE TRIGGER trg_person_replace_append_only BEFORE UPDATE OR DELETE ON PERSON_REPLACE
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+CREATE TRIGGER trg_risk_evaluate_append_only BEFORE UPDATE OR DELETE ON RISK_EVALUATE
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+CREATE TRIGGER trg_support_execute_append_only BEFORE UPDATE OR DELETE ON SUPPORT_EXECUTE
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+CREATE TRIGGER trg_project_complete_append_only BEFORE UPDATE OR DELETE ON PROJECT_COMPLETE
+    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();
+
+-- ================================================
+-- イベントからの再構築
+-- ================================================
+
+-- プロジェクトの現在状態をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_project_state() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE PROJECT_START, ORGANIZATION_JOIN, PERSON_ASSIGN, PERSON_REPLACE, RISK_EVALUATE, SUPPORT_EXECUTE, PROJECT_COMPLETE IN SHARE MODE;
+    TRUNCATE PROJECT_STATE;
+    INSERT INTO PROJECT_STATE (project_id, remaining_estimated_effort)
+    SELECT project_id, estimated_effort FROM PROJECT;
+
+    -- プロジェクト開始
+    UPDATE PROJECT_STATE s SET project_start_count = e.n, first_project_start_at = e.first_at, last_project_start_at = e.last_at
+    FROM (SELECT project_id, COUNT(*) AS n, MIN(start_date_time) AS first_at, MAX(start_date_time) AS last_at
+          FROM PROJECT_START GROUP BY project_id) e
+    WHERE s.project_id = e.project_id;
+    UPDATE PROJECT_STATE s SET last_project_start_id = e.event_id, last_project_start_registered_by = e.registered_by
+    FROM (SELECT DISTINCT ON (project_id) project_id, event_id, registered_by
+          FROM PROJECT_START ORDER BY project_id, start_date_time DESC, event_id DESC) e
+    WHERE s.project_id = e.project_id;
+
+    -- 組織参画
+    UPDATE PROJECT_STATE s SET organization_join_count = e.n, first_organization_join_at = e.first_at, last_organization_join_at = e.last_at
+    FROM (SELECT project_id, COUNT(*) AS n, MIN(join_date_time) AS first_at, MAX(join_date_time) AS last_at
+          FROM ORGANIZATION_JOIN GROUP BY project_id) e
+    WHERE s.project_id = e.project_id;
+    UPDATE PROJECT_STATE s SET last_organization_join_id = e.event_id
+    FROM (SELECT DISTINCT ON (project_id) project_id, event_id
+          FROM ORGANIZATION_JOIN ORDER BY project_id, join_date_time DESC, event_id DESC) e
+    WHERE s.project_id = e.project_id;
+
+    -- 担当者アサイン
+    UPDATE PROJECT_STATE s SET person_assign_count = e.n, first_person_assign_at = e.first_at, last_person_assign_at = e.last_at
+    FROM (SELECT project_id, COUNT(*) AS n, MIN(assign_date_time) AS first_at, MAX(assign_date_time) AS last_at
+          FROM PERSON_ASSIGN GROUP BY project_id) e
+    WHERE s.project_id = e.project_id;
+    UPDATE PROJECT_STATE s SET last_person_assign_id = e.event_id
+    FROM (SELECT DISTINCT ON (project_id) project_id, event_id
+          FROM PERSON_ASSIGN ORDER BY project_id, assign_date_time DESC, event_id DESC) e
+    WHERE s.project_id = e.project_id;
+
+    -- 担当者交代
+    UPDATE PROJECT_STATE s SET person_replace_count = e.n, first_person_replace_at = e.first_at, last_person_replace_at = e.last_at
+    FROM (SELECT project_id, COUNT(*) AS n, MIN(replace_date_time) AS first_at, MAX(replace_date_time) AS last_at
+          FROM PERSON_REPLACE GROUP BY project_id) e
+    WHERE s.project_id = e.project_id;
+    UPDATE PROJECT_STATE s SET last_person_replace_id = e.event_id
+    FROM (SELECT DISTINCT ON (project_id) project_id, event_id
+          FROM PERSON_REPLACE ORDER BY project_id, replace_date_time DESC, event_id DESC) e
+    WHERE s.project_id = e.project_id;
+
+    -- リスク評価
+    UPDATE PROJECT_STATE s SET risk_evaluate_count = e.n, first_risk_evaluate_at = e.first_at, last_risk_evaluate_at = e.last_at
+    FROM (SELECT project_id, COUNT(*) AS n, MIN(evaluate_date_time) AS first_at, MAX(evaluate_date_time) AS last_at
+          FROM RISK_EVALUATE GROUP BY project_id) e
+    WHERE s.project_id = e.project_id;
+    UPDATE PROJECT_STATE s SET last_risk_evaluate_id = e.event_id, last_risk_evaluate_rank = e.risk_rank, last_risk_evaluate_evaluated_by = e.evaluated_by, last_risk_evaluate_is_system_proposed = e.is_system_proposed, last_risk_evaluate_is_manual_adjusted = e.is_manual_adjusted
+    FROM (SELECT DISTINCT ON (project_id) project_id, event_id, risk_rank, evaluated_by, is_system_proposed, is_manual_adjusted
+          FROM RISK_EVALUATE ORDER BY project_id, evaluate_date_time DESC, event_id DESC) e
+    WHERE s.project_id = e.project_id;
+
+    -- 支援実施
+    UPDATE PROJECT_STATE s SET support_execute_count = e.n, first_support_execute_at = e.first_at, last_support_execute_at = e.last_at
+    FROM (SELECT project_id, COUNT(*) AS n, MIN(execute_date_time) AS first_at, MAX(execute_date_time) AS last_at
+          FROM SUPPORT_EXECUTE GROUP BY project_id) e
+    WHERE s.project_id = e.project_id;
+    UPDATE PROJECT_STATE s SET last_support_execute_id = e.event_id, last_support_execute_type_id = e.support_type_id, last_support_execute_person_id = e.support_person_id
+    FROM (SELECT DISTINCT ON (project_id) project_id, event_id, support_type_id, support_person_id
+          FROM SUPPORT_EXECUTE ORDER BY project_id, execute_date_time DESC, event_id DESC) e
+    WHERE s.project_id = e.project_id;
+
+    -- プロジェクト完了
+    UPDATE PROJECT_STATE s SET project_complete_count = e.n, first_project_complete_at = e.first_at, last_project_complete_at = e.last_at, total_actual_effort = e.total_actual_effort
+    FROM (SELECT project_id, COUNT(*) AS n, MIN(complete_date_time) AS first_at, MAX(complete_date_time) AS last_at, COALESCE(SUM(actual_effort), 0) AS total_actual_effort
+          FROM PROJECT_COMPLETE GROUP BY project_id) e
+    WHERE s.project_id = e.project_id;
+    UPDATE PROJECT_STATE s SET last_project_complete_id = e.event_id, last_project_complete_actual_effort = e.actual_effort, last_project_complete_registered_by = e.registered_by
+    FROM (SELECT DISTINCT ON (project_id) project_id, event_id, actual_effort, registered_by
+          FROM PROJECT_COMPLETE ORDER BY project_id, complete_date_time DESC, event_id DESC) e
+    WHERE s.project_id = e.project_id;
+
+    UPDATE PROJECT_STATE SET remaining_estimated_effort = remaining_estimated_effort - total_actual_effort;
+
+    SELECT COUNT(*) INTO n FROM PROJECT_STATE;
+    RETURN n;
+END;
+$$;
+
+-- プロジェクトの現在の組織をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_project_organization_current() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE ORGANIZATION_JOIN IN SHARE MODE;
+    TRUNCATE PROJECT_ORGANIZATION_CURRENT;
+    INSERT INTO PROJECT_ORGANIZATION_CURRENT (project_id, organization_id, since, source_event, source_event_id)
+    SELECT DISTINCT ON (project_id, organization_id) project_id, organization_id, since, source_event, source_event_id
+    FROM (
+        SELECT project_id, organization_id, join_date_time, 'ORGANIZATION_JOIN', event_id FROM ORGANIZATION_JOIN
+    ) AS m (project_id, organization_id, since, source_event, source_event_id)
+    ORDER BY project_id, organization_id, since, source_event, source_event_id;
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- プロジェクトの現在の人をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_project_person_current() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE PERSON_ASSIGN, PERSON_REPLACE IN SHARE MODE;
+    TRUNCATE PROJECT_PERSON_CURRENT;
+    INSERT INTO PROJECT_PERSON_CURRENT (project_id, person_id, role_id, since, source_event, source_event_id)
+    SELECT DISTINCT ON (project_id, person_id, role_id) project_id, person_id, role_id, since, source_event, source_event_id
+    FROM (
+        SELECT project_id, person_id, role_id, assign_date_time, 'PERSON_ASSIGN', event_id FROM PERSON_ASSIGN
+        UNION ALL
+        SELECT project_id, new_person_id, role_id, replace_date_time, 'PERSON_REPLACE', event_id FROM PERSON_REPLACE
+    ) AS m (project_id, person_id, role_id, since, source_event, source_event_id)
+    WHERE NOT EXISTS (SELECT 1 FROM PERSON_REPLACE r
+                   WHERE r.project_id = m.project_id
+                     AND r.old_person_id = m.person_id
+                     AND r.role_id = m.role_id
+                     AND r.replace_date_time > m.since)
+    ORDER BY project_id, person_id, role_id, since, source_event, source_event_id;
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+CREATE OR REPLACE PROCEDURE rebuild_projections() LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM rebuild_project_state();
+    PERFORM rebuild_project_organization_current();
+    PERFORM rebuild_project_person_current();
+END;
+$$;
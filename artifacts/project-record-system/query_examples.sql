@@ -192,7 +192,7 @@ WITH RECURSIVE OrgHierarchy AS (
         o.organization_type,
         o.parent_organization_id,
         1 AS Level,
-        o.organization_name AS Path
+        o.organization_name::TEXT AS Path
     FROM
         ORGANIZATION_JOIN oj
         INNER JOIN ORGANIZATION o ON oj.organization_id = o.organization_id
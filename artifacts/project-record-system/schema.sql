@@ -400,52 +400,149 @@ COMMENT ON COLUMN PROJECT_COMPLETE.registered_by IS '登録者ID';
 
 -- ================================================
 -- インデックス（パフォーマンス最適化）
+-- query_examples.sql / openapi.yaml のアクセスパターンから導出
+-- 生成: python -m tools.index_advisor project-record-system --write
 -- ================================================
 
 -- プロジェクトインデックス
+-- クエリ9（業界別プロジェクトサマリー）: 結合条件 customer_id — ネステッドループ結合の内側を索引で参照
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_project_customer ON PROJECT(customer_id);
-CREATE INDEX idx_project_start_date ON PROJECT(planned_start_date);
-CREATE INDEX idx_project_end_date ON PROJECT(planned_end_date);
 
 -- 組織インデックス
+-- ORGANIZATION の削除: 外部キー parent_organization_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_organization_parent ON ORGANIZATION(parent_organization_id);
 
 -- 顧客インデックス
-CREATE INDEX idx_customer_industry ON CUSTOMER(industry_id);
+-- クエリ9（業界別プロジェクトサマリー）: 結合条件 industry_id — ネステッドループ結合の内側を索引で参照
+-- INDUSTRY の削除: 外部キー industry_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+-- WHERE industry_id IS NOT NULL: 結合で一致しない NULL 行を索引から除外
+CREATE INDEX idx_customer_industry_notnull ON CUSTOMER(industry_id) WHERE industry_id IS NOT NULL;
 
 -- ユーザーインデックス
+-- PERSON の削除: 外部キー person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_user_person ON USER_ACCOUNT(person_id);
 
+-- プロジェクト開発種別インデックス
+-- DEVELOPMENT_TYPE の削除: 外部キー development_type_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_development_type_development_type ON PROJECT_DEVELOPMENT_TYPE(development_type_id);
+
+-- プロジェクト開発方式インデックス
+-- DEVELOPMENT_METHOD の削除: 外部キー development_method_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_development_method_development_method ON PROJECT_DEVELOPMENT_METHOD(development_method_id);
+
+-- プロジェクト対象工程インデックス
+-- TARGET_PHASE の削除: 外部キー target_phase_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_target_phase_target_phase ON PROJECT_TARGET_PHASE(target_phase_id);
+
 -- プロジェクト開始イベントインデックス
-CREATE INDEX idx_project_start_project ON PROJECT_START(project_id);
-CREATE INDEX idx_project_start_datetime ON PROJECT_START(start_date_time);
+-- GET /api/projects/{eventID}/start/history: project_id = ? ORDER BY start_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/projects/{eventID}/start/latest: project_id = ? ORDER BY start_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/projects/{eventID}/start/summary: project_id = ? の MIN/MAX(start_date_time) — 索引の両端から取得
+-- クエリ1（プロジェクト一覧と現在の状態）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ4（プロジェクトの最新リスク評価）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ9（業界別プロジェクトサマリー）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ10（担当者の稼働状況（現在進行中のプロジェクト））: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_start_project_datetime_event ON PROJECT_START(project_id, start_date_time, event_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_start_registered_by ON PROJECT_START(registered_by);
 
 -- 組織参画イベントインデックス
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_organization_join_project ON ORGANIZATION_JOIN(project_id);
+-- ORGANIZATION の削除: 外部キー organization_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_organization_join_org ON ORGANIZATION_JOIN(organization_id);
-CREATE INDEX idx_organization_join_datetime ON ORGANIZATION_JOIN(join_date_time);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_organization_join_registered_by ON ORGANIZATION_JOIN(registered_by);
 
 -- 担当者アサインイベントインデックス
-CREATE INDEX idx_person_assign_project ON PERSON_ASSIGN(project_id);
-CREATE INDEX idx_person_assign_person ON PERSON_ASSIGN(person_id);
-CREATE INDEX idx_person_assign_datetime ON PERSON_ASSIGN(assign_date_time);
+-- クエリ2（プロジェクトの現在の担当者一覧）: PARTITION BY project_id, role_id ORDER BY assign_date_time DESC — 各グループの最新行をソートなしで取得
+-- GET /api/projects/{eventID}/members/current: project_id = ?
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+-- INCLUDE (person_id): 参照列を索引に含めて Index Only Scan にする
+CREATE INDEX idx_person_assign_project_role_datetime ON PERSON_ASSIGN(project_id, role_id, assign_date_time DESC) INCLUDE (person_id);
+-- GET /api/persons/{eventID}/assign/history: person_id = ? ORDER BY assign_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/persons/{eventID}/assign/latest: person_id = ? ORDER BY assign_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/persons/{eventID}/assign/summary: person_id = ? の MIN/MAX(assign_date_time) — 索引の両端から取得
+-- PERSON の削除: 外部キー person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_assign_person_datetime_event ON PERSON_ASSIGN(person_id, assign_date_time, event_id);
+-- ROLE の削除: 外部キー role_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_assign_role ON PERSON_ASSIGN(role_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_assign_registered_by ON PERSON_ASSIGN(registered_by);
 
 -- 担当者交代イベントインデックス
+-- クエリ2（プロジェクトの現在の担当者一覧）: 相関サブクエリ project_id, old_person_id, role_id = 外側の列 AND replace_date_time 範囲 — 外側の行ごとに索引で存在確認・参照
+-- クエリ10（担当者の稼働状況（現在進行中のプロジェクト））: 相関サブクエリ project_id, old_person_id, role_id = 外側の列 AND replace_date_time 範囲 — 外側の行ごとに索引で存在確認・参照
+-- GET /api/projects/{eventID}/members/current: 相関サブクエリ project_id, old_person_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- PERSON の削除: 外部キー old_person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_old_person_project_role_datetime ON PERSON_REPLACE(old_person_id, project_id, role_id, replace_date_time);
+-- GET /api/persons/{eventID}/replace/history: old_person_id = ? ORDER BY replace_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/persons/{eventID}/replace/latest: old_person_id = ? ORDER BY replace_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/persons/{eventID}/replace/summary: old_person_id = ? の MIN/MAX(replace_date_time) — 索引の両端から取得
+CREATE INDEX idx_person_replace_old_person_datetime_event ON PERSON_REPLACE(old_person_id, replace_date_time, event_id);
+-- GET /api/persons/{eventID}/replace/history: new_person_id = ? ORDER BY replace_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/persons/{eventID}/replace/latest: new_person_id = ? ORDER BY replace_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/persons/{eventID}/replace/summary: new_person_id = ? の MIN/MAX(replace_date_time) — 索引の両端から取得
+-- PERSON の削除: 外部キー new_person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_new_person_datetime_event ON PERSON_REPLACE(new_person_id, replace_date_time, event_id);
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_person_replace_project ON PERSON_REPLACE(project_id);
-CREATE INDEX idx_person_replace_old ON PERSON_REPLACE(old_person_id);
-CREATE INDEX idx_person_replace_new ON PERSON_REPLACE(new_person_id);
-CREATE INDEX idx_person_replace_datetime ON PERSON_REPLACE(replace_date_time);
+-- ROLE の削除: 外部キー role_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_role ON PERSON_REPLACE(role_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_registered_by ON PERSON_REPLACE(registered_by);
 
 -- リスク評価イベントインデックス
-CREATE INDEX idx_risk_evaluate_project ON RISK_EVALUATE(project_id);
-CREATE INDEX idx_risk_evaluate_datetime ON RISK_EVALUATE(evaluate_date_time);
+-- GET /api/risks/{eventID}/evaluate/history: project_id = ? ORDER BY evaluate_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- クエリ4（プロジェクトの最新リスク評価）: PARTITION BY project_id ORDER BY evaluate_date_time DESC — 各グループの最新行をソートなしで取得
+-- クエリ9（業界別プロジェクトサマリー）: PARTITION BY project_id ORDER BY evaluate_date_time DESC — 各グループの最新行をソートなしで取得
+-- GET /api/risks/{eventID}/evaluate/latest: project_id = ? ORDER BY evaluate_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/risks/{eventID}/evaluate/summary: project_id = ? の MIN/MAX(evaluate_date_time) — 索引の両端から取得
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+-- INCLUDE (risk_rank, evaluated_by, is_system_proposed, is_manual_adjusted): 参照列を索引に含めて Index Only Scan にする
+CREATE INDEX idx_risk_evaluate_project_datetime_event ON RISK_EVALUATE(project_id, evaluate_date_time, event_id) INCLUDE (risk_rank, evaluated_by, is_system_proposed, is_manual_adjusted);
+-- PERSON の削除: 外部キー evaluated_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_risk_evaluate_evaluated_by ON RISK_EVALUATE(evaluated_by);
 
 -- 支援実施イベントインデックス
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_support_execute_project ON SUPPORT_EXECUTE(project_id);
+-- SUPPORT_TYPE の削除: 外部キー support_type_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_support_execute_type ON SUPPORT_EXECUTE(support_type_id);
+-- PERSON の削除: 外部キー support_person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
 CREATE INDEX idx_support_execute_person ON SUPPORT_EXECUTE(support_person_id);
-CREATE INDEX idx_support_execute_datetime ON SUPPORT_EXECUTE(execute_date_time);
 
 -- プロジェクト完了イベントインデックス
-CREATE INDEX idx_project_complete_project ON PROJECT_COMPLETE(project_id);
-CREATE INDEX idx_project_complete_datetime ON PROJECT_COMPLETE(complete_date_time);
+-- GET /api/projects/{eventID}/complete/history: project_id = ? ORDER BY complete_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/projects/{eventID}/complete/latest: project_id = ? ORDER BY complete_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/projects/{eventID}/complete/summary: project_id = ? の MIN/MAX(complete_date_time) — 索引の両端から取得
+-- クエリ1（プロジェクト一覧と現在の状態）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ4（プロジェクトの最新リスク評価）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ9（業界別プロジェクトサマリー）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ10（担当者の稼働状況（現在進行中のプロジェクト））: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_complete_project_datetime_event ON PROJECT_COMPLETE(project_id, complete_date_time, event_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_complete_registered_by ON PROJECT_COMPLETE(registered_by);
+
+-- 作成しないインデックス（どのクエリ・エンドポイント・外部キーの検査にも使わない。
+-- 未使用の索引は挿入性能を下げる）
+--   idx_project_start_date ON PROJECT(planned_start_date): ワークロードに planned_start_date を使う検索・結合・並び替えがない
+--   idx_project_end_date ON PROJECT(planned_end_date): ワークロードに planned_end_date を使う検索・結合・並び替えがない
+--   idx_customer_industry ON CUSTOMER(industry_id): 部分インデックス idx_customer_industry_notnull で代替
+--   idx_project_start_project ON PROJECT_START(project_id): idx_project_start_project_datetime_event の先頭列で代替
+--   idx_project_start_datetime ON PROJECT_START(start_date_time): ワークロードに start_date_time を使う検索・結合・並び替えがない
+--   idx_organization_join_datetime ON ORGANIZATION_JOIN(join_date_time): ワークロードに join_date_time を使う検索・結合・並び替えがない
+--   idx_person_assign_project ON PERSON_ASSIGN(project_id): idx_person_assign_project_role_datetime の先頭列で代替
+--   idx_person_assign_person ON PERSON_ASSIGN(person_id): idx_person_assign_person_datetime_event の先頭列で代替
+--   idx_person_assign_datetime ON PERSON_ASSIGN(assign_date_time): ワークロードに assign_date_time を使う検索・結合・並び替えがない
+--   idx_person_replace_old ON PERSON_REPLACE(old_person_id): idx_person_replace_old_person_project_role_datetime の先頭列で代替
+--   idx_person_replace_new ON PERSON_REPLACE(new_person_id): idx_person_replace_new_person_datetime_event の先頭列で代替
+--   idx_person_replace_datetime ON PERSON_REPLACE(replace_date_time): ワークロードに replace_date_time を使う検索・結合・並び替えがない
+--   idx_risk_evaluate_project ON RISK_EVALUATE(project_id): idx_risk_evaluate_project_datetime_event の先頭列で代替
+--   idx_risk_evaluate_datetime ON RISK_EVALUATE(evaluate_date_time): ワークロードに evaluate_date_time を使う検索・結合・並び替えがない
+--   idx_support_execute_datetime ON SUPPORT_EXECUTE(execute_date_time): ワークロードに execute_date_time を使う検索・結合・並び替えがない
+--   idx_project_complete_project ON PROJECT_COMPLETE(project_id): idx_project_complete_project_datetime_event の先頭列で代替
+--   idx_project_complete_datetime ON PROJECT_COMPLETE(complete_date_time): ワークロードに complete_date_time を使う検索・結合・並び替えがない
@@ -0,0 +1,655 @@
+-- ================================================
+-- イミュータブルデータモデル DDL
+-- プロジェクト記録システム
+-- 生成日時: 2026-01-15
+-- パーティション版（イベントテーブルを日時列で 3 months ごとに範囲分割）
+-- 生成: python -m tools.partition project-record-system --write
+-- ================================================
+
+-- ================================================
+-- リソーステーブル
+-- ================================================
+
+-- プロジェクトテーブル
+CREATE TABLE PROJECT (
+    project_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    project_name VARCHAR(200) NOT NULL,
+    customer_id INTEGER NOT NULL,
+    estimated_effort DECIMAL(10,2),
+    planned_start_date DATE,
+    planned_end_date DATE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE PROJECT IS 'プロジェクト';
+COMMENT ON COLUMN PROJECT.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PROJECT.project_name IS 'プロジェクト名';
+COMMENT ON COLUMN PROJECT.customer_id IS '顧客ID';
+COMMENT ON COLUMN PROJECT.estimated_effort IS '受注規模';
+COMMENT ON COLUMN PROJECT.planned_start_date IS '計画開始日';
+COMMENT ON COLUMN PROJECT.planned_end_date IS '計画終了日';
+COMMENT ON COLUMN PROJECT.created_at IS '作成日時';
+
+-- 人テーブル
+CREATE TABLE PERSON (
+    person_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(100),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE PERSON IS '人';
+COMMENT ON COLUMN PERSON.person_id IS '人ID';
+COMMENT ON COLUMN PERSON.name IS '氏名';
+COMMENT ON COLUMN PERSON.email IS 'メールアドレス';
+COMMENT ON COLUMN PERSON.created_at IS '作成日時';
+
+-- 組織テーブル
+CREATE TABLE ORGANIZATION (
+    organization_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    organization_name VARCHAR(100) NOT NULL,
+    organization_type VARCHAR(50),
+    parent_organization_id INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_organization_parent FOREIGN KEY (parent_organization_id)
+        REFERENCES ORGANIZATION(organization_id) ON DELETE RESTRICT
+);
+
+COMMENT ON TABLE ORGANIZATION IS '組織';
+COMMENT ON COLUMN ORGANIZATION.organization_id IS '組織ID';
+COMMENT ON COLUMN ORGANIZATION.organization_name IS '組織名';
+COMMENT ON COLUMN ORGANIZATION.organization_type IS '組織種別';
+COMMENT ON COLUMN ORGANIZATION.parent_organization_id IS '親組織ID';
+COMMENT ON COLUMN ORGANIZATION.created_at IS '作成日時';
+
+-- 顧客テーブル
+CREATE TABLE CUSTOMER (
+    customer_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    customer_name VARCHAR(200) NOT NULL,
+    industry_id INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE CUSTOMER IS '顧客';
+COMMENT ON COLUMN CUSTOMER.customer_id IS '顧客ID';
+COMMENT ON COLUMN CUSTOMER.customer_name IS '顧客名';
+COMMENT ON COLUMN CUSTOMER.industry_id IS '業界ID';
+COMMENT ON COLUMN CUSTOMER.created_at IS '作成日時';
+
+-- 業界テーブル
+CREATE TABLE INDUSTRY (
+    industry_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    industry_name VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE INDUSTRY IS '業界';
+COMMENT ON COLUMN INDUSTRY.industry_id IS '業界ID';
+COMMENT ON COLUMN INDUSTRY.industry_name IS '業界名';
+COMMENT ON COLUMN INDUSTRY.created_at IS '作成日時';
+
+-- 役割テーブル
+CREATE TABLE ROLE (
+    role_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    role_name VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE ROLE IS '役割';
+COMMENT ON COLUMN ROLE.role_id IS '役割ID';
+COMMENT ON COLUMN ROLE.role_name IS '役割名';
+COMMENT ON COLUMN ROLE.created_at IS '作成日時';
+
+-- 支援タイプテーブル
+CREATE TABLE SUPPORT_TYPE (
+    support_type_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    support_type_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE SUPPORT_TYPE IS '支援タイプ';
+COMMENT ON COLUMN SUPPORT_TYPE.support_type_id IS '支援タイプID';
+COMMENT ON COLUMN SUPPORT_TYPE.support_type_name IS '支援タイプ名';
+COMMENT ON COLUMN SUPPORT_TYPE.description IS '説明';
+COMMENT ON COLUMN SUPPORT_TYPE.created_at IS '作成日時';
+
+-- ユーザーテーブル
+CREATE TABLE USER_ACCOUNT (
+    user_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    person_id INTEGER NOT NULL,
+    username VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_user_person FOREIGN KEY (person_id)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT
+);
+
+COMMENT ON TABLE USER_ACCOUNT IS 'ユーザー';
+COMMENT ON COLUMN USER_ACCOUNT.user_id IS 'ユーザーID';
+COMMENT ON COLUMN USER_ACCOUNT.person_id IS '人ID';
+COMMENT ON COLUMN USER_ACCOUNT.username IS 'ユーザー名';
+COMMENT ON COLUMN USER_ACCOUNT.created_at IS '作成日時';
+
+-- 開発種別テーブル
+CREATE TABLE DEVELOPMENT_TYPE (
+    development_type_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    development_type_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE DEVELOPMENT_TYPE IS '開発種別';
+COMMENT ON COLUMN DEVELOPMENT_TYPE.development_type_id IS '開発種別ID';
+COMMENT ON COLUMN DEVELOPMENT_TYPE.development_type_name IS '開発種別名';
+COMMENT ON COLUMN DEVELOPMENT_TYPE.description IS '説明';
+COMMENT ON COLUMN DEVELOPMENT_TYPE.created_at IS '作成日時';
+
+-- 開発方式テーブル
+CREATE TABLE DEVELOPMENT_METHOD (
+    development_method_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    development_method_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE DEVELOPMENT_METHOD IS '開発方式';
+COMMENT ON COLUMN DEVELOPMENT_METHOD.development_method_id IS '開発方式ID';
+COMMENT ON COLUMN DEVELOPMENT_METHOD.development_method_name IS '開発方式名';
+COMMENT ON COLUMN DEVELOPMENT_METHOD.description IS '説明';
+COMMENT ON COLUMN DEVELOPMENT_METHOD.created_at IS '作成日時';
+
+-- 対象工程テーブル
+CREATE TABLE TARGET_PHASE (
+    target_phase_id INTEGER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    target_phase_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE TARGET_PHASE IS '対象工程';
+COMMENT ON COLUMN TARGET_PHASE.target_phase_id IS '対象工程ID';
+COMMENT ON COLUMN TARGET_PHASE.target_phase_name IS '対象工程名';
+COMMENT ON COLUMN TARGET_PHASE.description IS '説明';
+COMMENT ON COLUMN TARGET_PHASE.created_at IS '作成日時';
+
+-- 外部キー制約（リソーステーブル）
+ALTER TABLE PROJECT ADD CONSTRAINT fk_project_customer
+    FOREIGN KEY (customer_id) REFERENCES CUSTOMER(customer_id) ON DELETE RESTRICT;
+
+ALTER TABLE CUSTOMER ADD CONSTRAINT fk_customer_industry
+    FOREIGN KEY (industry_id) REFERENCES INDUSTRY(industry_id) ON DELETE RESTRICT;
+
+-- ================================================
+-- ジャンクションテーブル（多対多関係）
+-- ================================================
+
+-- プロジェクト開発種別テーブル
+CREATE TABLE PROJECT_DEVELOPMENT_TYPE (
+    project_id INTEGER NOT NULL,
+    development_type_id INTEGER NOT NULL,
+    PRIMARY KEY (project_id, development_type_id),
+    CONSTRAINT fk_pdt_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_pdt_development_type FOREIGN KEY (development_type_id)
+        REFERENCES DEVELOPMENT_TYPE(development_type_id) ON DELETE RESTRICT
+);
+
+COMMENT ON TABLE PROJECT_DEVELOPMENT_TYPE IS 'プロジェクト開発種別';
+COMMENT ON COLUMN PROJECT_DEVELOPMENT_TYPE.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PROJECT_DEVELOPMENT_TYPE.development_type_id IS '開発種別ID';
+
+-- プロジェクト開発方式テーブル
+CREATE TABLE PROJECT_DEVELOPMENT_METHOD (
+    project_id INTEGER NOT NULL,
+    development_method_id INTEGER NOT NULL,
+    PRIMARY KEY (project_id, development_method_id),
+    CONSTRAINT fk_pdm_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_pdm_development_method FOREIGN KEY (development_method_id)
+        REFERENCES DEVELOPMENT_METHOD(development_method_id) ON DELETE RESTRICT
+);
+
+COMMENT ON TABLE PROJECT_DEVELOPMENT_METHOD IS 'プロジェクト開発方式';
+COMMENT ON COLUMN PROJECT_DEVELOPMENT_METHOD.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PROJECT_DEVELOPMENT_METHOD.development_method_id IS '開発方式ID';
+
+-- プロジェクト対象工程テーブル
+CREATE TABLE PROJECT_TARGET_PHASE (
+    project_id INTEGER NOT NULL,
+    target_phase_id INTEGER NOT NULL,
+    PRIMARY KEY (project_id, target_phase_id),
+    CONSTRAINT fk_ptp_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_ptp_target_phase FOREIGN KEY (target_phase_id)
+        REFERENCES TARGET_PHASE(target_phase_id) ON DELETE RESTRICT
+);
+
+COMMENT ON TABLE PROJECT_TARGET_PHASE IS 'プロジェクト対象工程';
+COMMENT ON COLUMN PROJECT_TARGET_PHASE.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PROJECT_TARGET_PHASE.target_phase_id IS '対象工程ID';
+
+-- ================================================
+-- イベントテーブル
+-- ================================================
+
+-- プロジェクト開始イベント
+CREATE TABLE PROJECT_START (
+    event_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    project_id INTEGER NOT NULL,
+    start_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    registered_by INTEGER NOT NULL,
+    CONSTRAINT fk_project_start_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_project_start_person FOREIGN KEY (registered_by)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    PRIMARY KEY (event_id, start_date_time)
+) PARTITION BY RANGE (start_date_time);
+
+COMMENT ON TABLE PROJECT_START IS 'プロジェクト開始イベント';
+COMMENT ON COLUMN PROJECT_START.event_id IS 'イベントID';
+COMMENT ON COLUMN PROJECT_START.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PROJECT_START.start_date_time IS '開始日時';
+COMMENT ON COLUMN PROJECT_START.registered_by IS '登録者ID';
+
+-- 組織参画イベント
+CREATE TABLE ORGANIZATION_JOIN (
+    event_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    project_id INTEGER NOT NULL,
+    organization_id INTEGER NOT NULL,
+    join_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    registered_by INTEGER NOT NULL,
+    CONSTRAINT fk_organization_join_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_organization_join_org FOREIGN KEY (organization_id)
+        REFERENCES ORGANIZATION(organization_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_organization_join_person FOREIGN KEY (registered_by)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    PRIMARY KEY (event_id, join_date_time)
+) PARTITION BY RANGE (join_date_time);
+
+COMMENT ON TABLE ORGANIZATION_JOIN IS '組織参画イベント';
+COMMENT ON COLUMN ORGANIZATION_JOIN.event_id IS 'イベントID';
+COMMENT ON COLUMN ORGANIZATION_JOIN.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN ORGANIZATION_JOIN.organization_id IS '組織ID';
+COMMENT ON COLUMN ORGANIZATION_JOIN.join_date_time IS '参画日時';
+COMMENT ON COLUMN ORGANIZATION_JOIN.registered_by IS '登録者ID';
+
+-- 担当者アサインイベント
+CREATE TABLE PERSON_ASSIGN (
+    event_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    project_id INTEGER NOT NULL,
+    person_id INTEGER NOT NULL,
+    role_id INTEGER NOT NULL,
+    assign_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    registered_by INTEGER NOT NULL,
+    CONSTRAINT fk_person_assign_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_person_assign_person FOREIGN KEY (person_id)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_person_assign_role FOREIGN KEY (role_id)
+        REFERENCES ROLE(role_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_person_assign_registered FOREIGN KEY (registered_by)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    PRIMARY KEY (event_id, assign_date_time)
+) PARTITION BY RANGE (assign_date_time);
+
+COMMENT ON TABLE PERSON_ASSIGN IS '担当者アサインイベント';
+COMMENT ON COLUMN PERSON_ASSIGN.event_id IS 'イベントID';
+COMMENT ON COLUMN PERSON_ASSIGN.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PERSON_ASSIGN.person_id IS '人ID';
+COMMENT ON COLUMN PERSON_ASSIGN.role_id IS '役割ID';
+COMMENT ON COLUMN PERSON_ASSIGN.assign_date_time IS 'アサイン日時';
+COMMENT ON COLUMN PERSON_ASSIGN.registered_by IS '登録者ID';
+
+-- 担当者交代イベント
+CREATE TABLE PERSON_REPLACE (
+    event_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    project_id INTEGER NOT NULL,
+    old_person_id INTEGER NOT NULL,
+    new_person_id INTEGER NOT NULL,
+    role_id INTEGER NOT NULL,
+    replace_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    registered_by INTEGER NOT NULL,
+    CONSTRAINT fk_person_replace_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_person_replace_old FOREIGN KEY (old_person_id)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_person_replace_new FOREIGN KEY (new_person_id)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_person_replace_role FOREIGN KEY (role_id)
+        REFERENCES ROLE(role_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_person_replace_registered FOREIGN KEY (registered_by)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    PRIMARY KEY (event_id, replace_date_time)
+) PARTITION BY RANGE (replace_date_time);
+
+COMMENT ON TABLE PERSON_REPLACE IS '担当者交代イベント';
+COMMENT ON COLUMN PERSON_REPLACE.event_id IS 'イベントID';
+COMMENT ON COLUMN PERSON_REPLACE.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PERSON_REPLACE.old_person_id IS '旧担当者ID';
+COMMENT ON COLUMN PERSON_REPLACE.new_person_id IS '新担当者ID';
+COMMENT ON COLUMN PERSON_REPLACE.role_id IS '役割ID';
+COMMENT ON COLUMN PERSON_REPLACE.replace_date_time IS '交代日時';
+COMMENT ON COLUMN PERSON_REPLACE.registered_by IS '登録者ID';
+
+-- リスク評価イベント
+CREATE TABLE RISK_EVALUATE (
+    event_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    project_id INTEGER NOT NULL,
+    risk_rank VARCHAR(20),
+    evaluate_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    evaluated_by INTEGER NOT NULL,
+    is_system_proposed BOOLEAN DEFAULT FALSE,
+    is_manual_adjusted BOOLEAN DEFAULT FALSE,
+    CONSTRAINT fk_risk_evaluate_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_risk_evaluate_person FOREIGN KEY (evaluated_by)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    PRIMARY KEY (event_id, evaluate_date_time)
+) PARTITION BY RANGE (evaluate_date_time);
+
+COMMENT ON TABLE RISK_EVALUATE IS 'リスク評価イベント';
+COMMENT ON COLUMN RISK_EVALUATE.event_id IS 'イベントID';
+COMMENT ON COLUMN RISK_EVALUATE.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN RISK_EVALUATE.risk_rank IS 'リスクランク';
+COMMENT ON COLUMN RISK_EVALUATE.evaluate_date_time IS '評価日時';
+COMMENT ON COLUMN RISK_EVALUATE.evaluated_by IS '評価者ID';
+COMMENT ON COLUMN RISK_EVALUATE.is_system_proposed IS 'システム提案フラグ';
+COMMENT ON COLUMN RISK_EVALUATE.is_manual_adjusted IS '手動調整フラグ';
+
+-- 支援実施イベント
+CREATE TABLE SUPPORT_EXECUTE (
+    event_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    project_id INTEGER NOT NULL,
+    support_type_id INTEGER NOT NULL,
+    support_person_id INTEGER NOT NULL,
+    execute_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    support_content TEXT,
+    outcome TEXT,
+    memo TEXT,
+    CONSTRAINT fk_support_execute_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_support_execute_type FOREIGN KEY (support_type_id)
+        REFERENCES SUPPORT_TYPE(support_type_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_support_execute_person FOREIGN KEY (support_person_id)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    PRIMARY KEY (event_id, execute_date_time)
+) PARTITION BY RANGE (execute_date_time);
+
+COMMENT ON TABLE SUPPORT_EXECUTE IS '支援実施イベント';
+COMMENT ON COLUMN SUPPORT_EXECUTE.event_id IS 'イベントID';
+COMMENT ON COLUMN SUPPORT_EXECUTE.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN SUPPORT_EXECUTE.support_type_id IS '支援タイプID';
+COMMENT ON COLUMN SUPPORT_EXECUTE.support_person_id IS '支援担当者ID';
+COMMENT ON COLUMN SUPPORT_EXECUTE.execute_date_time IS '実施日時';
+COMMENT ON COLUMN SUPPORT_EXECUTE.support_content IS '支援内容';
+COMMENT ON COLUMN SUPPORT_EXECUTE.outcome IS '成果';
+COMMENT ON COLUMN SUPPORT_EXECUTE.memo IS 'メモ';
+
+-- プロジェクト完了イベント
+CREATE TABLE PROJECT_COMPLETE (
+    event_id INTEGER GENERATED ALWAYS AS IDENTITY,
+    project_id INTEGER NOT NULL,
+    complete_date_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    actual_effort DECIMAL(10,2),
+    registered_by INTEGER NOT NULL,
+    CONSTRAINT fk_project_complete_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_project_complete_person FOREIGN KEY (registered_by)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    PRIMARY KEY (event_id, complete_date_time)
+) PARTITION BY RANGE (complete_date_time);
+
+COMMENT ON TABLE PROJECT_COMPLETE IS 'プロジェクト完了イベント';
+COMMENT ON COLUMN PROJECT_COMPLETE.event_id IS 'イベントID';
+COMMENT ON COLUMN PROJECT_COMPLETE.project_id IS 'プロジェクトID';
+COMMENT ON COLUMN PROJECT_COMPLETE.complete_date_time IS '完了日時';
+COMMENT ON COLUMN PROJECT_COMPLETE.actual_effort IS '実績工数';
+COMMENT ON COLUMN PROJECT_COMPLETE.registered_by IS '登録者ID';
+
+-- ================================================
+-- パーティション管理
+-- ================================================
+
+-- parent の範囲パーティションを step 単位で from_ts から to_ts まで作成する（作成済みは飛ばす）
+-- パーティション名は {テーブル}_p{開始日}。境界はセッションのタイムゾーンで年初から step ごとに揃える
+CREATE OR REPLACE FUNCTION create_time_partitions(
+    parent REGCLASS, from_ts TIMESTAMPTZ, to_ts TIMESTAMPTZ, step INTERVAL
+) RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE
+    lo TIMESTAMPTZ := date_trunc('year', from_ts);
+    hi TIMESTAMPTZ;
+    parent_name TEXT;
+    key_column TEXT;
+    default_part REGCLASS;
+    part TEXT;
+    misplaced BOOLEAN;
+    created INTEGER := 0;
+BEGIN
+    SELECT c.relname, a.attname INTO parent_name, key_column
+    FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+    WHERE pt.partrelid = parent;
+    IF parent_name IS NULL THEN
+        RAISE EXCEPTION '% はパーティションテーブルではありません', parent;
+    END IF;
+    SELECT i.inhrelid::REGCLASS INTO default_part
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = parent AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT';
+
+    WHILE lo + step <= from_ts LOOP
+        lo := lo + step;
+    END LOOP;
+    WHILE lo < to_ts LOOP
+        hi := lo + step;
+        part := format('%s_p%s', parent_name, to_char(lo, 'YYYYMMDD'));
+        IF to_regclass(quote_ident(part)) IS NULL THEN
+            -- デフォルトパーティションに範囲内の行があると作成できない（行の移動はプロジェクションの再計算を伴うため自動では行わない）
+            IF default_part IS NOT NULL THEN
+                EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE %I >= $1 AND %I < $2)',
+                               default_part, key_column, key_column)
+                    INTO misplaced USING lo, hi;
+                IF misplaced THEN
+                    RAISE EXCEPTION '% に [%, %) の行があるため % を作成できません', default_part, lo, hi, part
+                        USING HINT = '行を退避してから作成し、元のテーブルに戻してください';
+                END IF;
+            END IF;
+            EXECUTE format('CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                           part, parent, lo, hi);
+            created := created + 1;
+        END IF;
+        lo := hi;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+
+-- すべてのイベントテーブルに、現在から ahead 先までのパーティションを作成する
+-- 定期実行する（例: pg_cron で毎月 SELECT create_event_partitions();）
+CREATE OR REPLACE FUNCTION create_event_partitions(
+    ahead INTERVAL DEFAULT INTERVAL '3 months', history INTERVAL DEFAULT INTERVAL '0 months'
+) RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE
+    created INTEGER := 0;
+BEGIN
+    created := created + create_time_partitions('PROJECT_START', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    created := created + create_time_partitions('ORGANIZATION_JOIN', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    created := created + create_time_partitions('PERSON_ASSIGN', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    created := created + create_time_partitions('PERSON_REPLACE', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    created := created + create_time_partitions('RISK_EVALUATE', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    created := created + create_time_partitions('SUPPORT_EXECUTE', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    created := created + create_time_partitions('PROJECT_COMPLETE', CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '3 months');
+    RETURN created;
+END;
+$$;
+
+-- 範囲外（作成前の未来日時・作成範囲より前の過去日時）の行を受けるデフォルトパーティション
+CREATE TABLE PROJECT_START_DEFAULT PARTITION OF PROJECT_START DEFAULT;
+CREATE TABLE ORGANIZATION_JOIN_DEFAULT PARTITION OF ORGANIZATION_JOIN DEFAULT;
+CREATE TABLE PERSON_ASSIGN_DEFAULT PARTITION OF PERSON_ASSIGN DEFAULT;
+CREATE TABLE PERSON_REPLACE_DEFAULT PARTITION OF PERSON_REPLACE DEFAULT;
+CREATE TABLE RISK_EVALUATE_DEFAULT PARTITION OF RISK_EVALUATE DEFAULT;
+CREATE TABLE SUPPORT_EXECUTE_DEFAULT PARTITION OF SUPPORT_EXECUTE DEFAULT;
+CREATE TABLE PROJECT_COMPLETE_DEFAULT PARTITION OF PROJECT_COMPLETE DEFAULT;
+
+SELECT create_event_partitions(INTERVAL '3 months', INTERVAL '36 months');
+
+-- ================================================
+-- インデックス（パフォーマンス最適化）
+-- query_examples.sql / openapi.yaml のアクセスパターンから導出
+-- 生成: python -m tools.index_advisor project-record-system --write
+-- ================================================
+
+-- プロジェクトインデックス
+-- クエリ9（業界別プロジェクトサマリー）: 結合条件 customer_id — ネステッドループ結合の内側を索引で参照
+-- CUSTOMER の削除: 外部キー customer_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_customer ON PROJECT(customer_id);
+
+-- 組織インデックス
+-- ORGANIZATION の削除: 外部キー parent_organization_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_organization_parent ON ORGANIZATION(parent_organization_id);
+
+-- 顧客インデックス
+-- クエリ9（業界別プロジェクトサマリー）: 結合条件 industry_id — ネステッドループ結合の内側を索引で参照
+-- INDUSTRY の削除: 外部キー industry_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+-- WHERE industry_id IS NOT NULL: 結合で一致しない NULL 行を索引から除外
+CREATE INDEX idx_customer_industry_notnull ON CUSTOMER(industry_id) WHERE industry_id IS NOT NULL;
+
+-- ユーザーインデックス
+-- PERSON の削除: 外部キー person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_user_person ON USER_ACCOUNT(person_id);
+
+-- プロジェクト開発種別インデックス
+-- DEVELOPMENT_TYPE の削除: 外部キー development_type_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_development_type_development_type ON PROJECT_DEVELOPMENT_TYPE(development_type_id);
+
+-- プロジェクト開発方式インデックス
+-- DEVELOPMENT_METHOD の削除: 外部キー development_method_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_development_method_development_method ON PROJECT_DEVELOPMENT_METHOD(development_method_id);
+
+-- プロジェクト対象工程インデックス
+-- TARGET_PHASE の削除: 外部キー target_phase_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_target_phase_target_phase ON PROJECT_TARGET_PHASE(target_phase_id);
+
+-- プロジェクト開始イベントインデックス
+-- GET /api/projects/{eventID}/start/history: project_id = ? ORDER BY start_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/projects/{eventID}/start/latest: project_id = ? ORDER BY start_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/projects/{eventID}/start/summary: project_id = ? の MIN/MAX(start_date_time) — 索引の両端から取得
+-- クエリ1（プロジェクト一覧と現在の状態）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ4（プロジェクトの最新リスク評価）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ9（業界別プロジェクトサマリー）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ10（担当者の稼働状況（現在進行中のプロジェクト））: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_start_project_datetime_event ON PROJECT_START(project_id, start_date_time, event_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_start_registered_by ON PROJECT_START(registered_by);
+
+-- 組織参画イベントインデックス
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_organization_join_project ON ORGANIZATION_JOIN(project_id);
+-- ORGANIZATION の削除: 外部キー organization_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_organization_join_org ON ORGANIZATION_JOIN(organization_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_organization_join_registered_by ON ORGANIZATION_JOIN(registered_by);
+
+-- 担当者アサインイベントインデックス
+-- クエリ2（プロジェクトの現在の担当者一覧）: PARTITION BY project_id, role_id ORDER BY assign_date_time DESC — 各グループの最新行をソートなしで取得
+-- GET /api/projects/{eventID}/members/current: project_id = ?
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+-- INCLUDE (person_id): 参照列を索引に含めて Index Only Scan にする
+CREATE INDEX idx_person_assign_project_role_datetime ON PERSON_ASSIGN(project_id, role_id, assign_date_time DESC) INCLUDE (person_id);
+-- GET /api/persons/{eventID}/assign/history: person_id = ? ORDER BY assign_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/persons/{eventID}/assign/latest: person_id = ? ORDER BY assign_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/persons/{eventID}/assign/summary: person_id = ? の MIN/MAX(assign_date_time) — 索引の両端から取得
+-- PERSON の削除: 外部キー person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_assign_person_datetime_event ON PERSON_ASSIGN(person_id, assign_date_time, event_id);
+-- ROLE の削除: 外部キー role_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_assign_role ON PERSON_ASSIGN(role_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_assign_registered_by ON PERSON_ASSIGN(registered_by);
+
+-- 担当者交代イベントインデックス
+-- クエリ2（プロジェクトの現在の担当者一覧）: 相関サブクエリ project_id, old_person_id, role_id = 外側の列 AND replace_date_time 範囲 — 外側の行ごとに索引で存在確認・参照
+-- クエリ10（担当者の稼働状況（現在進行中のプロジェクト））: 相関サブクエリ project_id, old_person_id, role_id = 外側の列 AND replace_date_time 範囲 — 外側の行ごとに索引で存在確認・参照
+-- GET /api/projects/{eventID}/members/current: 相関サブクエリ project_id, old_person_id = 外側の列 — 外側の行ごとに索引で存在確認・参照
+-- PERSON の削除: 外部キー old_person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_old_person_project_role_datetime ON PERSON_REPLACE(old_person_id, project_id, role_id, replace_date_time);
+-- GET /api/persons/{eventID}/replace/history: old_person_id = ? ORDER BY replace_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/persons/{eventID}/replace/latest: old_person_id = ? ORDER BY replace_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/persons/{eventID}/replace/summary: old_person_id = ? の MIN/MAX(replace_date_time) — 索引の両端から取得
+CREATE INDEX idx_person_replace_old_person_datetime_event ON PERSON_REPLACE(old_person_id, replace_date_time, event_id);
+-- GET /api/persons/{eventID}/replace/history: new_person_id = ? ORDER BY replace_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/persons/{eventID}/replace/latest: new_person_id = ? ORDER BY replace_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/persons/{eventID}/replace/summary: new_person_id = ? の MIN/MAX(replace_date_time) — 索引の両端から取得
+-- PERSON の削除: 外部キー new_person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_new_person_datetime_event ON PERSON_REPLACE(new_person_id, replace_date_time, event_id);
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_project ON PERSON_REPLACE(project_id);
+-- ROLE の削除: 外部キー role_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_role ON PERSON_REPLACE(role_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_person_replace_registered_by ON PERSON_REPLACE(registered_by);
+
+-- リスク評価イベントインデックス
+-- GET /api/risks/{eventID}/evaluate/history: project_id = ? ORDER BY evaluate_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- クエリ4（プロジェクトの最新リスク評価）: PARTITION BY project_id ORDER BY evaluate_date_time DESC — 各グループの最新行をソートなしで取得
+-- クエリ9（業界別プロジェクトサマリー）: PARTITION BY project_id ORDER BY evaluate_date_time DESC — 各グループの最新行をソートなしで取得
+-- GET /api/risks/{eventID}/evaluate/latest: project_id = ? ORDER BY evaluate_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/risks/{eventID}/evaluate/summary: project_id = ? の MIN/MAX(evaluate_date_time) — 索引の両端から取得
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+-- INCLUDE (risk_rank, evaluated_by, is_system_proposed, is_manual_adjusted): 参照列を索引に含めて Index Only Scan にする
+CREATE INDEX idx_risk_evaluate_project_datetime_event ON RISK_EVALUATE(project_id, evaluate_date_time, event_id) INCLUDE (risk_rank, evaluated_by, is_system_proposed, is_manual_adjusted);
+-- PERSON の削除: 外部キー evaluated_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_risk_evaluate_evaluated_by ON RISK_EVALUATE(evaluated_by);
+
+-- 支援実施イベントインデックス
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_support_execute_project ON SUPPORT_EXECUTE(project_id);
+-- SUPPORT_TYPE の削除: 外部キー support_type_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_support_execute_type ON SUPPORT_EXECUTE(support_type_id);
+-- PERSON の削除: 外部キー support_person_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_support_execute_person ON SUPPORT_EXECUTE(support_person_id);
+
+-- プロジェクト完了イベントインデックス
+-- GET /api/projects/{eventID}/complete/history: project_id = ? ORDER BY complete_date_time, event_id LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）
+-- GET /api/projects/{eventID}/complete/latest: project_id = ? ORDER BY complete_date_time DESC LIMIT 1 — 索引の端から 1 件で終了
+-- GET /api/projects/{eventID}/complete/summary: project_id = ? の MIN/MAX(complete_date_time) — 索引の両端から取得
+-- クエリ1（プロジェクト一覧と現在の状態）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ4（プロジェクトの最新リスク評価）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ9（業界別プロジェクトサマリー）: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- クエリ10（担当者の稼働状況（現在進行中のプロジェクト））: 結合条件 project_id — ネステッドループ結合の内側を索引で参照
+-- PROJECT の削除: 外部キー project_id — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_complete_project_datetime_event ON PROJECT_COMPLETE(project_id, complete_date_time, event_id);
+-- PERSON の削除: 外部キー registered_by — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う
+CREATE INDEX idx_project_complete_registered_by ON PROJECT_COMPLETE(registered_by);
+
+-- 日時列の BRIN インデックス（イベントは日時順に追記されるため、ページ範囲ごとの最小・最大値で
+-- 範囲条件を絞り込める。B-tree に比べて数百分の一の大きさで、追記時の更新もほぼない）
+CREATE INDEX brin_project_start_datetime ON PROJECT_START USING brin (start_date_time) WITH (pages_per_range = 32, autosummarize = on);
+CREATE INDEX brin_organization_join_datetime ON ORGANIZATION_JOIN USING brin (join_date_time) WITH (pages_per_range = 32, autosummarize = on);
+CREATE INDEX brin_person_assign_datetime ON PERSON_ASSIGN USING brin (assign_date_time) WITH (pages_per_range = 32, autosummarize = on);
+CREATE INDEX brin_person_replace_datetime ON PERSON_REPLACE USING brin (replace_date_time) WITH (pages_per_range = 32, autosummarize = on);
+CREATE INDEX brin_risk_evaluate_datetime ON RISK_EVALUATE USING brin (evaluate_date_time) WITH (pages_per_range = 32, autosummarize = on);
+CREATE INDEX brin_support_execute_datetime ON SUPPORT_EXECUTE USING brin (execute_date_time) WITH (pages_per_range = 32, autosummarize = on);
+CREATE INDEX brin_project_complete_datetime ON PROJECT_COMPLETE USING brin (complete_date_time) WITH (pages_per_range = 32, autosummarize = on);
+
+-- 作成しないインデックス（どのクエリ・エンドポイント・外部キーの検査にも使わない。
+-- 未使用の索引は挿入性能を下げる）
+--   idx_project_start_date ON PROJECT(planned_start_date): ワークロードに planned_start_date を使う検索・結合・並び替えがない
+--   idx_project_end_date ON PROJECT(planned_end_date): ワークロードに planned_end_date を使う検索・結合・並び替えがない
+--   idx_customer_industry ON CUSTOMER(industry_id): 部分インデックス idx_customer_industry_notnull で代替
+--   idx_project_start_project ON PROJECT_START(project_id): idx_project_start_project_datetime_event の先頭列で代替
+--   idx_project_start_datetime ON PROJECT_START(start_date_time): ワークロードに start_date_time を使う検索・結合・並び替えがない
+--   idx_organization_join_datetime ON ORGANIZATION_JOIN(join_date_time): ワークロードに join_date_time を使う検索・結合・並び替えがない
+--   idx_person_assign_project ON PERSON_ASSIGN(project_id): idx_person_assign_project_role_datetime の先頭列で代替
+--   idx_person_assign_person ON PERSON_ASSIGN(person_id): idx_person_assign_person_datetime_event の先頭列で代替
+--   idx_person_assign_datetime ON PERSON_ASSIGN(assign_date_time): ワークロードに assign_date_time を使う検索・結合・並び替えがない
+--   idx_person_replace_old ON PERSON_REPLACE(old_person_id): idx_person_replace_old_person_project_role_datetime の先頭列で代替
+--   idx_person_replace_new ON PERSON_REPLACE(new_person_id): idx_person_replace_new_person_datetime_event の先頭列で代替
+--   idx_person_replace_datetime ON PERSON_REPLACE(replace_date_time): ワークロードに replace_date_time を使う検索・結合・並び替えがない
+--   idx_risk_evaluate_project ON RISK_EVALUATE(project_id): idx_risk_evaluate_project_datetime_event の先頭列で代替
+--   idx_risk_evaluate_datetime ON RISK_EVALUATE(evaluate_date_time): ワークロードに evaluate_date_time を使う検索・結合・並び替えがない
+--   idx_support_execute_datetime ON SUPPORT_EXECUTE(execute_date_time): ワークロードに execute_date_time を使う検索・結合・並び替えがない
+--   idx_project_complete_project ON PROJECT_COMPLETE(project_id): idx_project_complete_project_datetime_event の先頭列で代替
+--   idx_project_complete_datetime ON PROJECT_COMPLETE(complete_date_time): ワークロードに complete_date_time を使う検索・結合・並び替えがない
@@ -0,0 +1,927 @@
+-- ================================================
+-- 時点指定（as of）クエリ（イベントの有効期間を範囲型で持ち、GiST インデックスで時点を引く）
+-- project-record-system
+-- 生成: python -m tools.temporal project-record-system --write
+-- projections.sql の後、データ投入の前に実行する（イベントの追記のみトリガーを前提にする）
+-- ================================================
+--
+-- 使い方:
+--   SELECT * FROM project_state_as_of(?, ?);  -- 指定時点の状態（PROJECT_STATE と同じ列）
+--   SELECT r.project_id, s.* FROM PROJECT r
+--   CROSS JOIN LATERAL project_state_as_of(r.project_id, ?) s;  -- 全件の指定時点の状態
+--   SELECT e.* FROM RISK_EVALUATE_VALIDITY v JOIN RISK_EVALUATE e USING (event_id)
+--   WHERE v.project_id = ? AND v.valid_during @> ?::timestamptz;  -- 指定時点で最新のリスク評価
+--   SELECT * FROM project_organization_as_of(?, ?);  -- 指定時点のプロジェクトの組織
+--   SELECT * FROM project_person_as_of(?, ?);  -- 指定時点のプロジェクトの人
+--   CALL rebuild_validity();  -- イベントから全件を作り直す（復旧・トリガーを止めた一括投入の後）
+
+-- ================================================
+-- 有効期間テーブル
+-- ================================================
+
+-- 整数列の = と範囲の && を 1 つの GiST インデックス・排他制約にまとめる
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- プロジェクト開始イベントの有効期間（次のプロジェクト開始イベントまで）
+CREATE TABLE PROJECT_START_VALIDITY (
+    project_id INTEGER NOT NULL,
+    event_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    CONSTRAINT fk_project_start_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_project_start_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_project_start_validity_from ON PROJECT_START_VALIDITY(project_id, valid_from, event_id);
+
+COMMENT ON TABLE PROJECT_START_VALIDITY IS 'プロジェクト開始イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN PROJECT_START_VALIDITY.valid_from IS '開始日時';
+COMMENT ON COLUMN PROJECT_START_VALIDITY.valid_during IS '最新のプロジェクト開始イベントだった期間（次のプロジェクト開始イベントの日時まで）';
+COMMENT ON COLUMN PROJECT_START_VALIDITY.seq IS 'この時点までのプロジェクト開始イベントの件数';
+
+-- 組織参画イベントの有効期間（次の組織参画イベントまで）
+CREATE TABLE ORGANIZATION_JOIN_VALIDITY (
+    project_id INTEGER NOT NULL,
+    event_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    CONSTRAINT fk_organization_join_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_organization_join_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_organization_join_validity_from ON ORGANIZATION_JOIN_VALIDITY(project_id, valid_from, event_id);
+
+COMMENT ON TABLE ORGANIZATION_JOIN_VALIDITY IS '組織参画イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN ORGANIZATION_JOIN_VALIDITY.valid_from IS '参画日時';
+COMMENT ON COLUMN ORGANIZATION_JOIN_VALIDITY.valid_during IS '最新の組織参画イベントだった期間（次の組織参画イベントの日時まで）';
+COMMENT ON COLUMN ORGANIZATION_JOIN_VALIDITY.seq IS 'この時点までの組織参画イベントの件数';
+
+-- 担当者アサインイベントの有効期間（次の担当者アサインイベントまで）
+CREATE TABLE PERSON_ASSIGN_VALIDITY (
+    project_id INTEGER NOT NULL,
+    event_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    CONSTRAINT fk_person_assign_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_person_assign_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_person_assign_validity_from ON PERSON_ASSIGN_VALIDITY(project_id, valid_from, event_id);
+
+COMMENT ON TABLE PERSON_ASSIGN_VALIDITY IS '担当者アサインイベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN PERSON_ASSIGN_VALIDITY.valid_from IS 'アサイン日時';
+COMMENT ON COLUMN PERSON_ASSIGN_VALIDITY.valid_during IS '最新の担当者アサインイベントだった期間（次の担当者アサインイベントの日時まで）';
+COMMENT ON COLUMN PERSON_ASSIGN_VALIDITY.seq IS 'この時点までの担当者アサインイベントの件数';
+
+-- 担当者交代イベントの有効期間（次の担当者交代イベントまで）
+CREATE TABLE PERSON_REPLACE_VALIDITY (
+    project_id INTEGER NOT NULL,
+    event_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    CONSTRAINT fk_person_replace_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_person_replace_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_person_replace_validity_from ON PERSON_REPLACE_VALIDITY(project_id, valid_from, event_id);
+
+COMMENT ON TABLE PERSON_REPLACE_VALIDITY IS '担当者交代イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN PERSON_REPLACE_VALIDITY.valid_from IS '交代日時';
+COMMENT ON COLUMN PERSON_REPLACE_VALIDITY.valid_during IS '最新の担当者交代イベントだった期間（次の担当者交代イベントの日時まで）';
+COMMENT ON COLUMN PERSON_REPLACE_VALIDITY.seq IS 'この時点までの担当者交代イベントの件数';
+
+-- リスク評価イベントの有効期間（次のリスク評価イベントまで）
+CREATE TABLE RISK_EVALUATE_VALIDITY (
+    project_id INTEGER NOT NULL,
+    event_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    CONSTRAINT fk_risk_evaluate_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_risk_evaluate_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_risk_evaluate_validity_from ON RISK_EVALUATE_VALIDITY(project_id, valid_from, event_id);
+
+COMMENT ON TABLE RISK_EVALUATE_VALIDITY IS 'リスク評価イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN RISK_EVALUATE_VALIDITY.valid_from IS '評価日時';
+COMMENT ON COLUMN RISK_EVALUATE_VALIDITY.valid_during IS '最新のリスク評価イベントだった期間（次のリスク評価イベントの日時まで）';
+COMMENT ON COLUMN RISK_EVALUATE_VALIDITY.seq IS 'この時点までのリスク評価イベントの件数';
+
+-- 支援実施イベントの有効期間（次の支援実施イベントまで）
+CREATE TABLE SUPPORT_EXECUTE_VALIDITY (
+    project_id INTEGER NOT NULL,
+    event_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    CONSTRAINT fk_support_execute_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_support_execute_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_support_execute_validity_from ON SUPPORT_EXECUTE_VALIDITY(project_id, valid_from, event_id);
+
+COMMENT ON TABLE SUPPORT_EXECUTE_VALIDITY IS '支援実施イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN SUPPORT_EXECUTE_VALIDITY.valid_from IS '実施日時';
+COMMENT ON COLUMN SUPPORT_EXECUTE_VALIDITY.valid_during IS '最新の支援実施イベントだった期間（次の支援実施イベントの日時まで）';
+COMMENT ON COLUMN SUPPORT_EXECUTE_VALIDITY.seq IS 'この時点までの支援実施イベントの件数';
+
+-- プロジェクト完了イベントの有効期間（次のプロジェクト完了イベントまで）
+CREATE TABLE PROJECT_COMPLETE_VALIDITY (
+    project_id INTEGER NOT NULL,
+    event_id INTEGER PRIMARY KEY,
+    valid_from TIMESTAMP WITH TIME ZONE NOT NULL,
+    valid_during tstzrange NOT NULL,
+    seq BIGINT NOT NULL,
+    total_actual_effort NUMERIC NOT NULL,
+    CONSTRAINT fk_project_complete_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_project_complete_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, valid_during WITH &&)
+);
+
+-- 追記時の前後の行の探索・初回日時
+CREATE INDEX idx_project_complete_validity_from ON PROJECT_COMPLETE_VALIDITY(project_id, valid_from, event_id);
+
+COMMENT ON TABLE PROJECT_COMPLETE_VALIDITY IS 'プロジェクト完了イベントの有効期間（イベントから導出）';
+COMMENT ON COLUMN PROJECT_COMPLETE_VALIDITY.valid_from IS '完了日時';
+COMMENT ON COLUMN PROJECT_COMPLETE_VALIDITY.valid_during IS '最新のプロジェクト完了イベントだった期間（次のプロジェクト完了イベントの日時まで）';
+COMMENT ON COLUMN PROJECT_COMPLETE_VALIDITY.seq IS 'この時点までのプロジェクト完了イベントの件数';
+COMMENT ON COLUMN PROJECT_COMPLETE_VALIDITY.total_actual_effort IS 'プロジェクト完了イベントの実績工数の累計（この時点まで）';
+
+-- プロジェクトの組織の有効期間
+CREATE TABLE PROJECT_ORGANIZATION_VALIDITY (
+    project_id INTEGER NOT NULL,
+    organization_id INTEGER NOT NULL,
+    valid_during tstzrange NOT NULL,
+    source_event VARCHAR(63) NOT NULL,
+    source_event_id INTEGER NOT NULL,
+    CONSTRAINT fk_project_organization_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_project_organization_validity_organization FOREIGN KEY (organization_id)
+        REFERENCES ORGANIZATION(organization_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_project_organization_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, organization_id WITH =, valid_during WITH &&)
+);
+
+CREATE INDEX idx_project_organization_validity_organization ON PROJECT_ORGANIZATION_VALIDITY USING gist (organization_id, valid_during);
+
+COMMENT ON TABLE PROJECT_ORGANIZATION_VALIDITY IS 'プロジェクトの組織の有効期間（組織参画以降、イベントから導出）';
+COMMENT ON COLUMN PROJECT_ORGANIZATION_VALIDITY.valid_during IS '有効期間';
+COMMENT ON COLUMN PROJECT_ORGANIZATION_VALIDITY.source_event IS '開始したイベント';
+COMMENT ON COLUMN PROJECT_ORGANIZATION_VALIDITY.source_event_id IS '開始したイベントのID';
+
+-- プロジェクトの人の有効期間
+CREATE TABLE PROJECT_PERSON_VALIDITY (
+    project_id INTEGER NOT NULL,
+    person_id INTEGER NOT NULL,
+    role_id INTEGER NOT NULL,
+    valid_during tstzrange NOT NULL,
+    source_event VARCHAR(63) NOT NULL,
+    source_event_id INTEGER NOT NULL,
+    ended_by_event_id INTEGER,
+    CONSTRAINT fk_project_person_validity_project FOREIGN KEY (project_id)
+        REFERENCES PROJECT(project_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_project_person_validity_person FOREIGN KEY (person_id)
+        REFERENCES PERSON(person_id) ON DELETE RESTRICT,
+    CONSTRAINT fk_project_person_validity_role FOREIGN KEY (role_id)
+        REFERENCES ROLE(role_id) ON DELETE RESTRICT,
+    CONSTRAINT ex_project_person_validity_overlap
+        EXCLUDE USING gist (project_id WITH =, person_id WITH =, role_id WITH =, valid_during WITH &&)
+);
+
+CREATE INDEX idx_project_person_validity_person ON PROJECT_PERSON_VALIDITY USING gist (person_id, valid_during);
+
+COMMENT ON TABLE PROJECT_PERSON_VALIDITY IS 'プロジェクトの人の有効期間（担当者アサインから担当者交代で外れるまで、イベントから導出）';
+COMMENT ON COLUMN PROJECT_PERSON_VALIDITY.valid_during IS '有効期間';
+COMMENT ON COLUMN PROJECT_PERSON_VALIDITY.source_event IS '開始したイベント';
+COMMENT ON COLUMN PROJECT_PERSON_VALIDITY.source_event_id IS '開始したイベントのID';
+COMMENT ON COLUMN PROJECT_PERSON_VALIDITY.ended_by_event_id IS '終了した担当者交代のID';
+
+-- ================================================
+-- 追記トリガー
+-- ================================================
+
+-- プロジェクト開始イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION project_start_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev PROJECT_START_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = NEW.project_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM PROJECT_START_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) < (NEW.start_date_time, NEW.event_id)
+    ORDER BY valid_from DESC, event_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM PROJECT_START_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.start_date_time, NEW.event_id)
+    ORDER BY valid_from, event_id
+    LIMIT 1;
+
+    UPDATE PROJECT_START_VALIDITY SET valid_during = tstzrange(valid_from, NEW.start_date_time)
+    WHERE event_id = prev.event_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE PROJECT_START_VALIDITY SET seq = seq + 1
+        WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.start_date_time, NEW.event_id);
+    END IF;
+    INSERT INTO PROJECT_START_VALIDITY (
+        project_id,
+        event_id,
+        valid_from,
+        valid_during,
+        seq
+    ) VALUES (
+        NEW.project_id,
+        NEW.event_id,
+        NEW.start_date_time,
+        tstzrange(NEW.start_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_project_start_validity AFTER INSERT ON PROJECT_START
+    FOR EACH ROW EXECUTE FUNCTION project_start_validity_apply();
+
+-- 組織参画イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION organization_join_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev ORGANIZATION_JOIN_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = NEW.project_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM ORGANIZATION_JOIN_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) < (NEW.join_date_time, NEW.event_id)
+    ORDER BY valid_from DESC, event_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM ORGANIZATION_JOIN_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.join_date_time, NEW.event_id)
+    ORDER BY valid_from, event_id
+    LIMIT 1;
+
+    UPDATE ORGANIZATION_JOIN_VALIDITY SET valid_during = tstzrange(valid_from, NEW.join_date_time)
+    WHERE event_id = prev.event_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE ORGANIZATION_JOIN_VALIDITY SET seq = seq + 1
+        WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.join_date_time, NEW.event_id);
+    END IF;
+    INSERT INTO ORGANIZATION_JOIN_VALIDITY (
+        project_id,
+        event_id,
+        valid_from,
+        valid_during,
+        seq
+    ) VALUES (
+        NEW.project_id,
+        NEW.event_id,
+        NEW.join_date_time,
+        tstzrange(NEW.join_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_organization_join_validity AFTER INSERT ON ORGANIZATION_JOIN
+    FOR EACH ROW EXECUTE FUNCTION organization_join_validity_apply();
+
+-- 担当者アサインイベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION person_assign_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev PERSON_ASSIGN_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = NEW.project_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM PERSON_ASSIGN_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) < (NEW.assign_date_time, NEW.event_id)
+    ORDER BY valid_from DESC, event_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM PERSON_ASSIGN_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.assign_date_time, NEW.event_id)
+    ORDER BY valid_from, event_id
+    LIMIT 1;
+
+    UPDATE PERSON_ASSIGN_VALIDITY SET valid_during = tstzrange(valid_from, NEW.assign_date_time)
+    WHERE event_id = prev.event_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE PERSON_ASSIGN_VALIDITY SET seq = seq + 1
+        WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.assign_date_time, NEW.event_id);
+    END IF;
+    INSERT INTO PERSON_ASSIGN_VALIDITY (
+        project_id,
+        event_id,
+        valid_from,
+        valid_during,
+        seq
+    ) VALUES (
+        NEW.project_id,
+        NEW.event_id,
+        NEW.assign_date_time,
+        tstzrange(NEW.assign_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_person_assign_validity AFTER INSERT ON PERSON_ASSIGN
+    FOR EACH ROW EXECUTE FUNCTION person_assign_validity_apply();
+
+-- 担当者交代イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION person_replace_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev PERSON_REPLACE_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = NEW.project_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM PERSON_REPLACE_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) < (NEW.replace_date_time, NEW.event_id)
+    ORDER BY valid_from DESC, event_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM PERSON_REPLACE_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.replace_date_time, NEW.event_id)
+    ORDER BY valid_from, event_id
+    LIMIT 1;
+
+    UPDATE PERSON_REPLACE_VALIDITY SET valid_during = tstzrange(valid_from, NEW.replace_date_time)
+    WHERE event_id = prev.event_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE PERSON_REPLACE_VALIDITY SET seq = seq + 1
+        WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.replace_date_time, NEW.event_id);
+    END IF;
+    INSERT INTO PERSON_REPLACE_VALIDITY (
+        project_id,
+        event_id,
+        valid_from,
+        valid_during,
+        seq
+    ) VALUES (
+        NEW.project_id,
+        NEW.event_id,
+        NEW.replace_date_time,
+        tstzrange(NEW.replace_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_person_replace_validity AFTER INSERT ON PERSON_REPLACE
+    FOR EACH ROW EXECUTE FUNCTION person_replace_validity_apply();
+
+-- リスク評価イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION risk_evaluate_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev RISK_EVALUATE_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = NEW.project_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM RISK_EVALUATE_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) < (NEW.evaluate_date_time, NEW.event_id)
+    ORDER BY valid_from DESC, event_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM RISK_EVALUATE_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.evaluate_date_time, NEW.event_id)
+    ORDER BY valid_from, event_id
+    LIMIT 1;
+
+    UPDATE RISK_EVALUATE_VALIDITY SET valid_during = tstzrange(valid_from, NEW.evaluate_date_time)
+    WHERE event_id = prev.event_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE RISK_EVALUATE_VALIDITY SET seq = seq + 1
+        WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.evaluate_date_time, NEW.event_id);
+    END IF;
+    INSERT INTO RISK_EVALUATE_VALIDITY (
+        project_id,
+        event_id,
+        valid_from,
+        valid_during,
+        seq
+    ) VALUES (
+        NEW.project_id,
+        NEW.event_id,
+        NEW.evaluate_date_time,
+        tstzrange(NEW.evaluate_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_risk_evaluate_validity AFTER INSERT ON RISK_EVALUATE
+    FOR EACH ROW EXECUTE FUNCTION risk_evaluate_validity_apply();
+
+-- 支援実施イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION support_execute_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev SUPPORT_EXECUTE_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = NEW.project_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM SUPPORT_EXECUTE_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) < (NEW.execute_date_time, NEW.event_id)
+    ORDER BY valid_from DESC, event_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM SUPPORT_EXECUTE_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.execute_date_time, NEW.event_id)
+    ORDER BY valid_from, event_id
+    LIMIT 1;
+
+    UPDATE SUPPORT_EXECUTE_VALIDITY SET valid_during = tstzrange(valid_from, NEW.execute_date_time)
+    WHERE event_id = prev.event_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE SUPPORT_EXECUTE_VALIDITY SET seq = seq + 1
+        WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.execute_date_time, NEW.event_id);
+    END IF;
+    INSERT INTO SUPPORT_EXECUTE_VALIDITY (
+        project_id,
+        event_id,
+        valid_from,
+        valid_during,
+        seq
+    ) VALUES (
+        NEW.project_id,
+        NEW.event_id,
+        NEW.execute_date_time,
+        tstzrange(NEW.execute_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_support_execute_validity AFTER INSERT ON SUPPORT_EXECUTE
+    FOR EACH ROW EXECUTE FUNCTION support_execute_validity_apply();
+
+-- プロジェクト完了イベントの追記 → 直前の行の期間を閉じ、有効期間を追加
+CREATE OR REPLACE FUNCTION project_complete_validity_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    prev PROJECT_COMPLETE_VALIDITY%ROWTYPE;
+    next_from TIMESTAMP WITH TIME ZONE;
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = NEW.project_id FOR NO KEY UPDATE;
+    SELECT * INTO prev FROM PROJECT_COMPLETE_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) < (NEW.complete_date_time, NEW.event_id)
+    ORDER BY valid_from DESC, event_id DESC
+    LIMIT 1;
+    SELECT valid_from INTO next_from FROM PROJECT_COMPLETE_VALIDITY
+    WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.complete_date_time, NEW.event_id)
+    ORDER BY valid_from, event_id
+    LIMIT 1;
+
+    UPDATE PROJECT_COMPLETE_VALIDITY SET valid_during = tstzrange(valid_from, NEW.complete_date_time)
+    WHERE event_id = prev.event_id;
+    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる
+    IF next_from IS NOT NULL THEN
+        UPDATE PROJECT_COMPLETE_VALIDITY SET seq = seq + 1, total_actual_effort = total_actual_effort + COALESCE(NEW.actual_effort, 0)
+        WHERE project_id = NEW.project_id AND (valid_from, event_id) > (NEW.complete_date_time, NEW.event_id);
+    END IF;
+    INSERT INTO PROJECT_COMPLETE_VALIDITY (
+        project_id,
+        event_id,
+        valid_from,
+        valid_during,
+        seq,
+        total_actual_effort
+    ) VALUES (
+        NEW.project_id,
+        NEW.event_id,
+        NEW.complete_date_time,
+        tstzrange(NEW.complete_date_time, next_from),
+        COALESCE(prev.seq, 0) + 1,
+        COALESCE(prev.total_actual_effort, 0) + COALESCE(NEW.actual_effort, 0)
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_project_complete_validity AFTER INSERT ON PROJECT_COMPLETE
+    FOR EACH ROW EXECUTE FUNCTION project_complete_validity_apply();
+
+-- プロジェクトの組織の組み合わせ 1 つ分の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION refresh_project_organization_validity(p_project_id INTEGER, p_organization_id INTEGER) RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = p_project_id FOR NO KEY UPDATE;
+    DELETE FROM PROJECT_ORGANIZATION_VALIDITY
+    WHERE project_id = p_project_id AND organization_id = p_organization_id;
+    INSERT INTO PROJECT_ORGANIZATION_VALIDITY (project_id, organization_id, valid_during, source_event, source_event_id)
+    SELECT DISTINCT ON (s.project_id, s.organization_id)
+        s.project_id, s.organization_id, tstzrange(s.since, NULL), s.source_event, s.source_event_id
+    FROM (
+        SELECT project_id, organization_id, join_date_time, 'ORGANIZATION_JOIN', event_id FROM ORGANIZATION_JOIN
+        WHERE project_id = p_project_id AND organization_id = p_organization_id
+    ) AS s (project_id, organization_id, since, source_event, source_event_id)
+    ORDER BY s.project_id, s.organization_id, s.since, s.source_event_id;
+END;
+$$;
+
+-- 組織参画の追記 → プロジェクトの組織の有効期間に追加
+CREATE OR REPLACE FUNCTION project_organization_validity_apply_organization_join() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM refresh_project_organization_validity(NEW.project_id, NEW.organization_id);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_organization_join_project_organization_validity AFTER INSERT ON ORGANIZATION_JOIN
+    FOR EACH ROW EXECUTE FUNCTION project_organization_validity_apply_organization_join();
+
+-- プロジェクトの人の組み合わせ 1 つ分の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION refresh_project_person_validity(p_project_id INTEGER, p_person_id INTEGER, p_role_id INTEGER) RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM 1 FROM PROJECT WHERE project_id = p_project_id FOR NO KEY UPDATE;
+    DELETE FROM PROJECT_PERSON_VALIDITY
+    WHERE project_id = p_project_id AND person_id = p_person_id AND role_id = p_role_id;
+    INSERT INTO PROJECT_PERSON_VALIDITY (project_id, person_id, role_id, valid_during, source_event, source_event_id, ended_by_event_id)
+    SELECT DISTINCT ON (s.project_id, s.person_id, s.role_id, e.ended_at)
+        s.project_id, s.person_id, s.role_id, tstzrange(s.since, e.ended_at), s.source_event, s.source_event_id, e.ended_by
+    FROM (
+        SELECT project_id, person_id, role_id, assign_date_time, 'PERSON_ASSIGN', event_id FROM PERSON_ASSIGN
+        WHERE project_id = p_project_id AND person_id = p_person_id AND role_id = p_role_id
+        UNION ALL
+        SELECT project_id, new_person_id, role_id, replace_date_time, 'PERSON_REPLACE', event_id FROM PERSON_REPLACE
+        WHERE project_id = p_project_id AND new_person_id = p_person_id AND role_id = p_role_id
+    ) AS s (project_id, person_id, role_id, since, source_event, source_event_id)
+    LEFT JOIN LATERAL (
+        SELECT r.replace_date_time, r.event_id FROM PERSON_REPLACE r
+        WHERE r.project_id = s.project_id
+          AND r.old_person_id = s.person_id
+          AND r.role_id = s.role_id
+          AND r.replace_date_time > s.since
+        ORDER BY r.replace_date_time, r.event_id
+        LIMIT 1
+    ) AS e (ended_at, ended_by) ON true
+    ORDER BY s.project_id, s.person_id, s.role_id, e.ended_at, s.since, s.source_event_id;
+END;
+$$;
+
+-- 担当者アサインの追記 → プロジェクトの人の有効期間に追加
+CREATE OR REPLACE FUNCTION project_person_validity_apply_person_assign() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM refresh_project_person_validity(NEW.project_id, NEW.person_id, NEW.role_id);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_person_assign_project_person_validity AFTER INSERT ON PERSON_ASSIGN
+    FOR EACH ROW EXECUTE FUNCTION project_person_validity_apply_person_assign();
+
+-- 担当者交代の追記 → プロジェクトの人の有効期間の旧側を閉じ、新側を追加
+CREATE OR REPLACE FUNCTION project_person_validity_apply_person_replace() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM refresh_project_person_validity(NEW.project_id, NEW.old_person_id, NEW.role_id);
+    PERFORM refresh_project_person_validity(NEW.project_id, NEW.new_person_id, NEW.role_id);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_person_replace_project_person_validity AFTER INSERT ON PERSON_REPLACE
+    FOR EACH ROW EXECUTE FUNCTION project_person_validity_apply_person_replace();
+
+-- ================================================
+-- 時点指定の関数
+-- ================================================
+
+-- 指定時点のプロジェクトの状態（PROJECT_STATE の時点指定版）
+CREATE OR REPLACE FUNCTION project_state_as_of(p_project_id INTEGER, p_at TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (
+    project_id INTEGER,
+    project_start_count BIGINT,
+    first_project_start_at TIMESTAMP WITH TIME ZONE,
+    last_project_start_at TIMESTAMP WITH TIME ZONE,
+    last_project_start_id INTEGER,
+    last_project_start_registered_by INTEGER,
+    organization_join_count BIGINT,
+    first_organization_join_at TIMESTAMP WITH TIME ZONE,
+    last_organization_join_at TIMESTAMP WITH TIME ZONE,
+    last_organization_join_id INTEGER,
+    person_assign_count BIGINT,
+    first_person_assign_at TIMESTAMP WITH TIME ZONE,
+    last_person_assign_at TIMESTAMP WITH TIME ZONE,
+    last_person_assign_id INTEGER,
+    person_replace_count BIGINT,
+    first_person_replace_at TIMESTAMP WITH TIME ZONE,
+    last_person_replace_at TIMESTAMP WITH TIME ZONE,
+    last_person_replace_id INTEGER,
+    risk_evaluate_count BIGINT,
+    first_risk_evaluate_at TIMESTAMP WITH TIME ZONE,
+    last_risk_evaluate_at TIMESTAMP WITH TIME ZONE,
+    last_risk_evaluate_id INTEGER,
+    last_risk_evaluate_rank VARCHAR(20),
+    last_risk_evaluate_evaluated_by INTEGER,
+    last_risk_evaluate_is_system_proposed BOOLEAN,
+    last_risk_evaluate_is_manual_adjusted BOOLEAN,
+    support_execute_count BIGINT,
+    first_support_execute_at TIMESTAMP WITH TIME ZONE,
+    last_support_execute_at TIMESTAMP WITH TIME ZONE,
+    last_support_execute_id INTEGER,
+    last_support_execute_type_id INTEGER,
+    last_support_execute_person_id INTEGER,
+    project_complete_count BIGINT,
+    first_project_complete_at TIMESTAMP WITH TIME ZONE,
+    last_project_complete_at TIMESTAMP WITH TIME ZONE,
+    last_project_complete_id INTEGER,
+    last_project_complete_actual_effort DECIMAL(10,2),
+    last_project_complete_registered_by INTEGER,
+    total_actual_effort NUMERIC,
+    remaining_estimated_effort NUMERIC
+) LANGUAGE sql STABLE AS $$
+    SELECT
+        r.project_id,
+        COALESCE(v1.seq, 0),
+        CASE WHEN v1.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM PROJECT_START_VALIDITY f WHERE f.project_id = r.project_id) END,
+        v1.valid_from,
+        v1.event_id,
+        e1.registered_by,
+        COALESCE(v2.seq, 0),
+        CASE WHEN v2.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM ORGANIZATION_JOIN_VALIDITY f WHERE f.project_id = r.project_id) END,
+        v2.valid_from,
+        v2.event_id,
+        COALESCE(v3.seq, 0),
+        CASE WHEN v3.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM PERSON_ASSIGN_VALIDITY f WHERE f.project_id = r.project_id) END,
+        v3.valid_from,
+        v3.event_id,
+        COALESCE(v4.seq, 0),
+        CASE WHEN v4.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM PERSON_REPLACE_VALIDITY f WHERE f.project_id = r.project_id) END,
+        v4.valid_from,
+        v4.event_id,
+        COALESCE(v5.seq, 0),
+        CASE WHEN v5.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM RISK_EVALUATE_VALIDITY f WHERE f.project_id = r.project_id) END,
+        v5.valid_from,
+        v5.event_id,
+        e5.risk_rank,
+        e5.evaluated_by,
+        e5.is_system_proposed,
+        e5.is_manual_adjusted,
+        COALESCE(v6.seq, 0),
+        CASE WHEN v6.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM SUPPORT_EXECUTE_VALIDITY f WHERE f.project_id = r.project_id) END,
+        v6.valid_from,
+        v6.event_id,
+        e6.support_type_id,
+        e6.support_person_id,
+        COALESCE(v7.seq, 0),
+        CASE WHEN v7.seq IS NOT NULL THEN (SELECT MIN(f.valid_from) FROM PROJECT_COMPLETE_VALIDITY f WHERE f.project_id = r.project_id) END,
+        v7.valid_from,
+        v7.event_id,
+        e7.actual_effort,
+        e7.registered_by,
+        COALESCE(v7.total_actual_effort, 0),
+        r.estimated_effort - COALESCE(v7.total_actual_effort, 0)
+    FROM PROJECT r
+    LEFT JOIN PROJECT_START_VALIDITY v1
+        ON v1.project_id = r.project_id AND v1.valid_during @> p_at
+    LEFT JOIN PROJECT_START e1 ON e1.event_id = v1.event_id
+    LEFT JOIN ORGANIZATION_JOIN_VALIDITY v2
+        ON v2.project_id = r.project_id AND v2.valid_during @> p_at
+    LEFT JOIN PERSON_ASSIGN_VALIDITY v3
+        ON v3.project_id = r.project_id AND v3.valid_during @> p_at
+    LEFT JOIN PERSON_REPLACE_VALIDITY v4
+        ON v4.project_id = r.project_id AND v4.valid_during @> p_at
+    LEFT JOIN RISK_EVALUATE_VALIDITY v5
+        ON v5.project_id = r.project_id AND v5.valid_during @> p_at
+    LEFT JOIN RISK_EVALUATE e5 ON e5.event_id = v5.event_id
+    LEFT JOIN SUPPORT_EXECUTE_VALIDITY v6
+        ON v6.project_id = r.project_id AND v6.valid_during @> p_at
+    LEFT JOIN SUPPORT_EXECUTE e6 ON e6.event_id = v6.event_id
+    LEFT JOIN PROJECT_COMPLETE_VALIDITY v7
+        ON v7.project_id = r.project_id AND v7.valid_during @> p_at
+    LEFT JOIN PROJECT_COMPLETE e7 ON e7.event_id = v7.event_id
+    WHERE r.project_id = p_project_id
+$$;
+
+-- 指定時点のプロジェクトの組織
+CREATE OR REPLACE FUNCTION project_organization_as_of(p_project_id INTEGER, p_at TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (
+    organization_id INTEGER,
+    since TIMESTAMP WITH TIME ZONE,
+    source_event VARCHAR(63),
+    source_event_id INTEGER
+) LANGUAGE sql STABLE AS $$
+    SELECT v.organization_id, lower(v.valid_during), v.source_event, v.source_event_id
+    FROM PROJECT_ORGANIZATION_VALIDITY v
+    WHERE v.project_id = p_project_id AND v.valid_during @> p_at
+    ORDER BY v.organization_id
+$$;
+
+-- 指定時点のプロジェクトの人
+CREATE OR REPLACE FUNCTION project_person_as_of(p_project_id INTEGER, p_at TIMESTAMP WITH TIME ZONE)
+RETURNS TABLE (
+    person_id INTEGER,
+    role_id INTEGER,
+    since TIMESTAMP WITH TIME ZONE,
+    source_event VARCHAR(63),
+    source_event_id INTEGER
+) LANGUAGE sql STABLE AS $$
+    SELECT v.person_id, v.role_id, lower(v.valid_during), v.source_event, v.source_event_id
+    FROM PROJECT_PERSON_VALIDITY v
+    WHERE v.project_id = p_project_id AND v.valid_during @> p_at
+    ORDER BY v.role_id, v.person_id
+$$;
+
+-- ================================================
+-- イベントからの再構築
+-- ================================================
+
+-- プロジェクト開始の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_project_start_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE PROJECT_START IN SHARE MODE;
+    TRUNCATE PROJECT_START_VALIDITY;
+    INSERT INTO PROJECT_START_VALIDITY (project_id, event_id, valid_from, valid_during, seq)
+    SELECT project_id, event_id, start_date_time, tstzrange(start_date_time, LEAD(start_date_time) OVER w), ROW_NUMBER() OVER w
+    FROM PROJECT_START
+    WINDOW w AS (PARTITION BY project_id ORDER BY start_date_time, event_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- 組織参画の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_organization_join_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE ORGANIZATION_JOIN IN SHARE MODE;
+    TRUNCATE ORGANIZATION_JOIN_VALIDITY;
+    INSERT INTO ORGANIZATION_JOIN_VALIDITY (project_id, event_id, valid_from, valid_during, seq)
+    SELECT project_id, event_id, join_date_time, tstzrange(join_date_time, LEAD(join_date_time) OVER w), ROW_NUMBER() OVER w
+    FROM ORGANIZATION_JOIN
+    WINDOW w AS (PARTITION BY project_id ORDER BY join_date_time, event_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- 担当者アサインの有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_person_assign_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE PERSON_ASSIGN IN SHARE MODE;
+    TRUNCATE PERSON_ASSIGN_VALIDITY;
+    INSERT INTO PERSON_ASSIGN_VALIDITY (project_id, event_id, valid_from, valid_during, seq)
+    SELECT project_id, event_id, assign_date_time, tstzrange(assign_date_time, LEAD(assign_date_time) OVER w), ROW_NUMBER() OVER w
+    FROM PERSON_ASSIGN
+    WINDOW w AS (PARTITION BY project_id ORDER BY assign_date_time, event_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- 担当者交代の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_person_replace_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE PERSON_REPLACE IN SHARE MODE;
+    TRUNCATE PERSON_REPLACE_VALIDITY;
+    INSERT INTO PERSON_REPLACE_VALIDITY (project_id, event_id, valid_from, valid_during, seq)
+    SELECT project_id, event_id, replace_date_time, tstzrange(replace_date_time, LEAD(replace_date_time) OVER w), ROW_NUMBER() OVER w
+    FROM PERSON_REPLACE
+    WINDOW w AS (PARTITION BY project_id ORDER BY replace_date_time, event_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- リスク評価の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_risk_evaluate_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE RISK_EVALUATE IN SHARE MODE;
+    TRUNCATE RISK_EVALUATE_VALIDITY;
+    INSERT INTO RISK_EVALUATE_VALIDITY (project_id, event_id, valid_from, valid_during, seq)
+    SELECT project_id, event_id, evaluate_date_time, tstzrange(evaluate_date_time, LEAD(evaluate_date_time) OVER w), ROW_NUMBER() OVER w
+    FROM RISK_EVALUATE
+    WINDOW w AS (PARTITION BY project_id ORDER BY evaluate_date_time, event_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- 支援実施の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_support_execute_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE SUPPORT_EXECUTE IN SHARE MODE;
+    TRUNCATE SUPPORT_EXECUTE_VALIDITY;
+    INSERT INTO SUPPORT_EXECUTE_VALIDITY (project_id, event_id, valid_from, valid_during, seq)
+    SELECT project_id, event_id, execute_date_time, tstzrange(execute_date_time, LEAD(execute_date_time) OVER w), ROW_NUMBER() OVER w
+    FROM SUPPORT_EXECUTE
+    WINDOW w AS (PARTITION BY project_id ORDER BY execute_date_time, event_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- プロジェクト完了の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_project_complete_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE PROJECT_COMPLETE IN SHARE MODE;
+    TRUNCATE PROJECT_COMPLETE_VALIDITY;
+    INSERT INTO PROJECT_COMPLETE_VALIDITY (project_id, event_id, valid_from, valid_during, seq, total_actual_effort)
+    SELECT project_id, event_id, complete_date_time, tstzrange(complete_date_time, LEAD(complete_date_time) OVER w), ROW_NUMBER() OVER w, SUM(COALESCE(actual_effort, 0)) OVER w
+    FROM PROJECT_COMPLETE
+    WINDOW w AS (PARTITION BY project_id ORDER BY complete_date_time, event_id);
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- プロジェクトの組織の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_project_organization_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE ORGANIZATION_JOIN IN SHARE MODE;
+    TRUNCATE PROJECT_ORGANIZATION_VALIDITY;
+    INSERT INTO PROJECT_ORGANIZATION_VALIDITY (project_id, organization_id, valid_during, source_event, source_event_id)
+    SELECT DISTINCT ON (s.project_id, s.organization_id)
+        s.project_id, s.organization_id, tstzrange(s.since, NULL), s.source_event, s.source_event_id
+    FROM (
+        SELECT project_id, organization_id, join_date_time, 'ORGANIZATION_JOIN', event_id FROM ORGANIZATION_JOIN
+    ) AS s (project_id, organization_id, since, source_event, source_event_id)
+    ORDER BY s.project_id, s.organization_id, s.since, s.source_event_id;
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+-- プロジェクトの人の有効期間をイベントから作り直す
+CREATE OR REPLACE FUNCTION rebuild_project_person_validity() RETURNS BIGINT LANGUAGE plpgsql AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    LOCK TABLE PERSON_ASSIGN, PERSON_REPLACE IN SHARE MODE;
+    TRUNCATE PROJECT_PERSON_VALIDITY;
+    INSERT INTO PROJECT_PERSON_VALIDITY (project_id, person_id, role_id, valid_during, source_event, source_event_id, ended_by_event_id)
+    SELECT DISTINCT ON (s.project_id, s.person_id, s.role_id, e.ended_at)
+        s.project_id, s.person_id, s.role_id, tstzrange(s.since, e.ended_at), s.source_event, s.source_event_id, e.ended_by
+    FROM (
+        SELECT project_id, person_id, role_id, assign_date_time, 'PERSON_ASSIGN', event_id FROM PERSON_ASSIGN
+        UNION ALL
+        SELECT project_id, new_person_id, role_id, replace_date_time, 'PERSON_REPLACE', event_id FROM PERSON_REPLACE
+    ) AS s (project_id, person_id, role_id, since, source_event, source_event_id)
+    LEFT JOIN LATERAL (
+        SELECT r.replace_date_time, r.event_id FROM PERSON_REPLACE r
+        WHERE r.project_id = s.project_id
+          AND r.old_person_id = s.person_id
+          AND r.role_id = s.role_id
+          AND r.replace_date_time > s.since
+        ORDER BY r.replace_date_time, r.event_id
+        LIMIT 1
+    ) AS e (ended_at, ended_by) ON true
+    ORDER BY s.project_id, s.person_id, s.role_id, e.ended_at, s.since, s.source_event_id;
+    GET DIAGNOSTICS n = ROW_COUNT;
+    RETURN n;
+END;
+$$;
+
+CREATE OR REPLACE PROCEDURE rebuild_validity() LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM rebuild_project_start_validity();
+    PERFORM rebuild_organization_join_validity();
+    PERFORM rebuild_person_assign_validity();
+    PERFORM rebuild_person_replace_validity();
+    PERFORM rebuild_risk_evaluate_validity();
+    PERFORM rebuild_support_execute_validity();
+    PERFORM rebuild_project_complete_validity();
+    PERFORM rebuild_project_organization_validity();
+    PERFORM rebuild_project_person_validity();
+END;
+$$;
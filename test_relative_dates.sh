@@ -1,29 +1,20 @@
 #!/bin/bash
 # 相対日付版サンプルデータのテスト用スクリプト
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
 echo "🔄 既存データをクリアして相対日付版を投入します..."
 
 # コンテナ内でSQLを実行
 docker exec cc-data-modeler-postgres psql -U datamodeler -d immutable_model_db << SQL
--- 既存データ削除（外部キー制約があるので順序に注意）
-DELETE FROM CONFIRMATION_SEND;
-DELETE FROM PAYMENT;
-DELETE FROM INVOICE_SEND;
-DELETE FROM INVOICE;
-DELETE FROM CUSTOMER;
-
--- シーケンスリセット
-ALTER SEQUENCE customer_customerid_seq RESTART WITH 1;
-ALTER SEQUENCE invoice_invoiceid_seq RESTART WITH 1;
-ALTER SEQUENCE invoice_send_eventid_seq RESTART WITH 1;
-ALTER SEQUENCE payment_paymentid_seq RESTART WITH 1;
-ALTER SEQUENCE confirmation_send_confirmationid_seq RESTART WITH 1;
+-- 既存データ削除（TRUNCATE で外部キーの依存先ごと削除し、IDENTITY も 1 から振り直す）
+TRUNCATE CONFIRMATION_SEND, PAYMENT, INVOICE_SEND, INVOICE, CUSTOMER RESTART IDENTITY CASCADE;
 SQL
 
 echo "✅ 既存データクリア完了"
 
 # 相対日付版サンプルデータ投入
-docker exec -i cc-data-modeler-postgres psql -U datamodeler -d immutable_model_db < /Users/akiraabe/practice/cc-data-modeler/artifacts/sample_data_relative.sql
+docker exec -i cc-data-modeler-postgres psql -U datamodeler -d immutable_model_db < "$SCRIPT_DIR/artifacts/invoice-management/sample_data_relative.sql"
 
 echo ""
 echo "📊 投入結果確認:"
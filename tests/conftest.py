@@ -0,0 +1,71 @@
+"""テスト共通のフィクスチャ
+
+PostgreSQL を使うテストは tools.postgres と同じ接続（docker-compose のコンテナ、
+または PSQL 環境変数で指定した psql）で使い捨てのデータベースを作る。
+つながらない環境ではスキップする。
+
+    PSQL="psql -h localhost -U datamodeler" python -m pytest -q
+"""
+
+import json
+import shutil
+import uuid
+
+import pytest
+
+from tools.model import project_dir
+from tools.postgres import run_sql
+
+ARTIFACTS = ("schema.sql", "projections.sql", "temporal.sql")
+
+
+class ScratchDatabase:
+    """テストごとに作って捨てるデータベース"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def run(self, sql):
+        return run_sql(sql, database=self.name)
+
+    def rows(self, sql):
+        """区切り文字 | の素の出力を行ごとのタプルにする"""
+        out = run_sql(sql, database=self.name, extra=("-A", "-t", "-q"))
+        return [tuple(line.split("|")) for line in out.splitlines() if line]
+
+    def load(self, model, names=ARTIFACTS):
+        for name in names:
+            self.run((model.path / name).read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def scratch_db():
+    try:
+        run_sql("SELECT 1", database="postgres")
+    except (OSError, RuntimeError) as exc:
+        pytest.skip(f"PostgreSQL に接続できない: {exc}")
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    run_sql(f"CREATE DATABASE {name}", database="postgres")
+    try:
+        yield ScratchDatabase(name)
+    finally:
+        run_sql(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)", database="postgres")
+
+
+@pytest.fixture
+def base(tmp_path, project):
+    """書き換えてよい成果物ディレクトリの複製（project はテストモジュールのフィクスチャか parametrize で決める）"""
+    path = tmp_path / project
+    shutil.copytree(project_dir(project), path)
+    return path
+
+
+@pytest.fixture
+def edit_model(base):
+    """複製した model.json を edit(data) で書き換え、書き換えた内容を返す関数"""
+    def edit_model(edit):
+        data = json.loads((base / "model.json").read_text(encoding="utf-8"))
+        edit(data)
+        (base / "model.json").write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        return data
+    return edit_model
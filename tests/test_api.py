@@ -0,0 +1,213 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from tools import api
+from tools.api_server import ApiServer, HttpError, _page, load_operations
+
+PROJECT = "project-record-system"
+
+
+@pytest.fixture(scope="module")
+def ops():
+    return {op.operation_id: op for op in load_operations(PROJECT)[0]}
+
+
+class RecordingPool:
+    """実行された SQL と引数を記録する接続プールの代わり"""
+
+    def __init__(self, row=None):
+        self.calls = []
+        self.row = row
+
+    async def fetch(self, sql, *args):
+        self.calls.append((sql, args))
+        return []
+
+    async def fetchrow(self, sql, *args):
+        self.calls.append((sql, args))
+        return self.row
+
+
+def _get(server, target):
+    return asyncio.run(server.dispatch("GET", target, {}))
+
+
+# ------------------------------------------------
+# カーソル
+# ------------------------------------------------
+
+def test_cursor_round_trip():
+    values = ["2026-01-11T10:00:00+09:00", 123]
+    text = api.encode_cursor(values)
+    assert "=" not in text
+    assert api.decode_cursor(text) == values
+    assert api.decode_cursor(api._CURSOR_EXAMPLE) == values
+
+
+@pytest.mark.parametrize("text", ["", "!!!", api.encode_cursor([1]), "eyJ4IjpbMSwyXX0"])
+def test_decode_cursor_rejects_broken_input(text):
+    with pytest.raises(ValueError):
+        api.decode_cursor(text)
+
+
+def test_page_reads_one_extra_row(ops):
+    op = ops["getProjectStartHistory"]
+    keys = op.json_keys
+    rows = [{keys[op.datetime]: f"2026-01-0{i}", keys[op.pk]: i} for i in range(1, 5)]
+    page, cursor = _page(rows, 3, op, [op.datetime, op.pk])
+    assert page == rows[:3]
+    assert api.decode_cursor(cursor) == ["2026-01-03", 3]
+    assert _page(rows[:3], 3, op, [op.datetime, op.pk]) == (rows[:3], None)
+
+
+# ------------------------------------------------
+# 操作の導出
+# ------------------------------------------------
+
+def test_event_keys_are_real_columns(ops):
+    by_path = {op.path: op for op in ops.values()}
+    assert by_path["/api/persons/{eventID}/replace/latest"].key_any == ["old_person_id", "new_person_id"]
+    assert by_path["/api/persons/{eventID}/assign/latest"].key == "person_id"
+    assert by_path["/api/risks/{eventID}/evaluate/latest"].key == "project_id"
+    assert by_path["/api/support_executes/{eventID}/event/latest"].key == "event_id"
+    for op in ops.values():
+        assert op.kind == "list" or op.key in op.types
+        assert set(op.key_any) <= set(op.types)
+
+
+def test_unresolved_event_key_is_an_error():
+    model = api.load_model(PROJECT)
+    doc = api.openapi.load(model.path / "openapi.yaml")
+    get = doc["paths"]["/api/risks/{eventID}/evaluate/latest"]["get"]
+    get["description"] = get["description"].replace("WHERE ProjectID = ?", "WHERE RiskID = ?")
+    with pytest.raises(ValueError, match="RiskID"):
+        api.operations(doc, model, api.parse_schema(model.path / "schema.sql"))
+
+
+def test_person_replace_matches_either_side(ops):
+    sql, params = api.summary_query(ops["getPersonReplaceSummary"], 5)
+    assert "WHERE (old_person_id = $1::INTEGER OR new_person_id = $1::INTEGER)" in sql
+    assert '$1::INTEGER AS "personID"' in sql
+    assert params == [5]
+
+
+def test_members_query_uses_strict_replace_boundary(ops):
+    """同時刻の交代では外れない（projections.sql と同じ境界）"""
+    sql, params = api.members_query(ops["getProjectCurrentPersons"], 7)
+    assert "r.replace_date_time > l.assign_date_time" in sql
+    assert ">=" not in sql
+    assert params == [7]
+
+
+def test_as_of_reads_validity_tables(ops):
+    with_as_of = {op.operation_id: op.validity for op in ops.values() if op.validity is not None}
+    assert with_as_of["getRiskLatestEvaluate"] == "RISK_EVALUATE_VALIDITY"
+    assert with_as_of["getProjectStartSummary"] == "PROJECT_START_VALIDITY"
+    # 担当者の ID で引くアサインと現在のメンバーは、プロジェクトの人の有効期間で引く
+    by_member = {op.operation_id: op.membership.table for op in ops.values() if op.membership is not None}
+    assert by_member == {name: "PROJECT_PERSON_VALIDITY" for name in (
+        "getPersonLatestAssign", "batchGetPersonLatestAssign", "getPersonAssignSummary", "getProjectCurrentPersons")}
+    # イベントID で引くもの・旧側と新側のどちらでも一致させるものには付けない
+    assert not {op.operation_id for op in ops.values() if op.has_as_of} & {
+        "getPersonReplaceSummary", "getSupportExecuteLatestEvent", "getOrganizationJoinEventSummary"}
+
+    sql, params = api.summary_query(ops["getProjectStartSummary"], 1, "2026-03-31T23:59:59+09:00")
+    assert "COALESCE(v.seq, 0)" in sql and "COUNT(*)" not in sql
+    assert params == [1, "2026-03-31T23:59:59+09:00"]
+    sql, params = api.latest_query(ops["getPersonLatestAssign"], 4, "2026-03-31T23:59:59+09:00")
+    assert "FROM PROJECT_PERSON_VALIDITY v" in sql
+    assert "v.person_id = $1::INTEGER AND v.valid_during @> $2" in sql
+    assert params == [4, "2026-03-31T23:59:59+09:00"]
+    sql, params = api.members_query(ops["getProjectCurrentPersons"], 2, "2026-03-31T23:59:59+09:00")
+    assert "FROM project_person_as_of($1::INTEGER, $2::TIMESTAMP WITH TIME ZONE) m" in sql
+    assert params == [2, "2026-03-31T23:59:59+09:00"]
+    with pytest.raises(ValueError, match="as_of"):
+        api.latest_query(ops["getSupportExecuteLatestEvent"], 1, "2026-03-31T23:59:59+09:00")
+
+
+def test_add_as_of_is_idempotent(ops):
+    model = api.load_model(PROJECT)
+    doc = api.openapi.load(model.path / "openapi.yaml")
+    before = api.openapi.dumps(doc)
+    assert api.openapi.dumps(api.add_as_of(doc, list(ops.values()))) == before
+    ref = {"$ref": "#/components/parameters/AsOf"}
+    assert ref not in doc["paths"]["/api/persons/{eventID}/replace/latest"]["get"].get("parameters", [])
+    assert ref in doc["paths"]["/api/risks/{eventID}/evaluate/latest"]["get"]["parameters"]
+    assert ref in doc["paths"]["/api/projects/{eventID}/members/current"]["get"]["parameters"]
+
+
+def test_committed_api_queries_are_current(ops):
+    model = api.load_model(PROJECT)
+    text = (model.path / api.QUERIES_NAME).read_text(encoding="utf-8")
+    assert api.queries_sql(load_operations(PROJECT)[0], PROJECT) == text
+
+
+# ------------------------------------------------
+# 参照サーバー
+# ------------------------------------------------
+
+def test_fixed_paths_route_before_parameters(ops):
+    server = ApiServer(list(ops.values()), RecordingPool())
+    matched = [op.path for pattern, op in server.routes if pattern.match("/api/projects/batch")]
+    assert matched[0] == "/api/projects/batch"
+    assert "/api/projects/{projectID}" in matched[1:]
+
+
+def test_dispatch_builds_person_replace_query(ops):
+    pool = RecordingPool(row={"eventID": 1})
+    server = ApiServer(list(ops.values()), pool)
+    assert _get(server, "/api/persons/5/replace/latest") == {"eventID": 1}
+    sql, args = pool.calls[0]
+    assert "old_person_id = $1::INTEGER OR new_person_id = $1::INTEGER" in sql
+    assert args == (5,)
+
+
+def test_dispatch_passes_as_of_to_members(ops):
+    pool = RecordingPool()
+    server = ApiServer(list(ops.values()), pool)
+    body = _get(server, "/api/projects/2/members/current?as_of=2026-03-31T23:59:59%2B09:00")
+    assert body == {"projectID": 2, "currentPersons": []}
+    sql, args = pool.calls[0]
+    assert "project_person_as_of(" in sql
+    assert args == (2, datetime.fromisoformat("2026-03-31T23:59:59+09:00"))
+
+
+@pytest.mark.parametrize("target, status", [
+    ("/api/projects?limit=0", 400),
+    ("/api/projects?cursor=broken", 400),
+    ("/api/projects/x", 400),
+    ("/api/projects/batch", 400),
+    ("/api/nowhere", 404),
+    ("/api/persons/5/replace/latest?as_of=2026-03-31T00:00:00%2B09:00", 400),
+    ("/api/risks/1/evaluate/latest?as_of=yesterday", 400),
+])
+def test_dispatch_rejects_bad_requests(ops, target, status):
+    server = ApiServer(list(ops.values()), RecordingPool())
+    with pytest.raises(HttpError) as e:
+        _get(server, target)
+    assert e.value.status == status
+
+
+class FailingPool(RecordingPool):
+    async def fetch(self, sql, *args):
+        raise RuntimeError("relation secret_table does not exist")
+
+
+def test_unexpected_error_returns_generic_problem(ops, capsys):
+    """想定外の例外は 500 の一般的な detail で返し、内容は標準エラーにだけ出す"""
+    async def main():
+        server = ApiServer(list(ops.values()), FailingPool())
+        listener = await asyncio.start_server(server.serve_client, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+        writer.write(b"GET /api/projects HTTP/1.1\r\nConnection: close\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        listener.close()
+        return response.decode("utf-8")
+
+    response = asyncio.run(main())
+    assert response.startswith("HTTP/1.1 500 ")
+    assert "secret_table" not in response
+    assert "secret_table" in capsys.readouterr().err
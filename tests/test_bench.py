@@ -0,0 +1,105 @@
+import pytest
+
+from tools.bench import compare, percentile, plan_shape, summarize, template_name
+from tools.model import load_model, project_dir
+from tools.query_examples import QueryExample, parse_query_examples
+
+EXAMPLES = """\
+-- ================================================
+-- クエリ例集
+-- ================================================
+
+-- ================================================
+-- 【クエリ2】二つ目
+-- 説明の 1 行目
+-- 説明の 2 行目
+-- ================================================
+SELECT 2
+-- 本文中のコメントは除く
+FROM t;
+
+-- ================================================
+-- 【クエリ1】一つ目
+-- ================================================
+WITH x AS (SELECT 1)
+SELECT * FROM x;
+
+-- ================================================
+-- 【まとめ】
+-- ✅ 本文のない見出しはクエリにしない
+-- ================================================
+"""
+
+
+def test_parse_query_examples(tmp_path):
+    path = tmp_path / "query_examples.sql"
+    path.write_text(EXAMPLES, encoding="utf-8")
+    assert parse_query_examples(path) == [
+        QueryExample(1, "一つ目", "", "WITH x AS (SELECT 1)\nSELECT * FROM x"),
+        QueryExample(2, "二つ目", "説明の 1 行目 説明の 2 行目", "SELECT 2\nFROM t"),
+    ]
+
+
+@pytest.mark.parametrize("project, count", [("invoice-management", 7), ("project-record-system", 11)])
+def test_committed_query_examples_parse(project, count):
+    base = project_dir(project)
+    queries = parse_query_examples(base / "query_examples.sql")
+    partitioned = parse_query_examples(base / "query_examples_partitioned.sql")
+    assert [q.number for q in queries] == list(range(1, count + 1))
+    assert [q.number for q in partitioned] == [q.number for q in queries]
+    for q in queries:
+        assert q.sql.split()[0] in ("SELECT", "WITH")
+        assert not any(line.lstrip().startswith("--") for line in q.sql.splitlines())
+        assert not q.sql.endswith(";")
+
+
+@pytest.mark.parametrize("project", ["invoice-management", "project-record-system"])
+def test_committed_query_examples_run(scratch_db, project):
+    """ベンチマークが実行するクエリ例はサンプルデータの上でそのまま動く"""
+    model = load_model(project)
+    scratch_db.load(model, ("schema.sql", "sample_data.sql"))
+    for query in parse_query_examples(model.path / "query_examples.sql"):
+        scratch_db.run(f"{query.sql};")
+
+
+def test_template_name():
+    assert template_name("project-record-system", "1m") == "bench_project_record_system_1m"
+    assert template_name("invoice-management", "10k", "schema_partitioned") == \
+        "bench_invoice_management_10k_schema_partitioned"
+
+
+def test_percentile_uses_nearest_rank():
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == 5.0
+    assert percentile([7.0], 99) == 7.0
+
+
+def _explain(ms, index="idx_payment_invoice"):
+    return {"Execution Time": ms, "Planning Time": 0.1,
+            "Plan": {"Node Type": "Nested Loop", "Actual Rows": 3, "Shared Hit Blocks": 10,
+                     "Plans": [{"Node Type": "Seq Scan", "Relation Name": "invoice"},
+                               {"Node Type": "Index Scan", "Relation Name": "payment", "Index Name": index}]}}
+
+
+def test_summarize_and_plan_shape():
+    query = QueryExample(1, "一つ目", "", "SELECT 1")
+    summary, median = summarize(query, [_explain(ms) for ms in (3.0, 1.0, 2.0)])
+    assert (summary["p50_ms"], summary["p95_ms"], summary["runs"]) == (2.0, 3.0, 3)
+    assert median["Execution Time"] == 2.0
+    assert summary["plan_shape"] == plan_shape(median["Plan"]) == [
+        "Nested Loop", "  Seq Scan on invoice", "  Index Scan on payment using idx_payment_invoice"]
+
+
+def test_compare_reports_regressions_and_plan_changes():
+    def result(p50, shape):
+        return {"tiers": {"10k": {"queries": {"1": {"p50_ms": p50, "plan_shape": shape}}}}}
+
+    lines, regressions = compare(result(13.0, ["Seq Scan"]), result(10.0, ["Index Scan"]), threshold=0.2)
+    assert regressions == 1
+    assert "回帰" in lines[0] and "プラン変化" in lines[0]
+
+    lines, regressions = compare(result(7.0, ["Seq Scan"]), result(10.0, ["Seq Scan"]), threshold=0.2)
+    assert regressions == 0
+    assert lines[0].endswith("改善")
+    assert compare(result(7.0, []), {"tiers": {}})[0] == []
@@ -0,0 +1,104 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from tools import datagen
+from tools.datagen import Generator, build_plan, generate, load_table, shards, sort_events_sql, stage_sql
+from tools.model import load_model
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _stream(model, tier="300", **kwargs):
+    out = io.StringIO()
+    generate(model, build_plan(model, tier, now=NOW, **kwargs), stream=out)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("project", ["invoice-management", "project-record-system"])
+def test_same_seed_and_now_give_identical_data(project):
+    model = load_model(project)
+    assert _stream(model) == _stream(model)
+    assert _stream(model) != _stream(model, seed=2)
+
+
+def test_shards_give_the_same_rows_as_one_pass(monkeypatch):
+    """シャードの境界を乱数系列の切り替え単位にそろえているので、分割しても同じ行になる"""
+    monkeypatch.setattr(datagen, "BLOCK_SUBJECTS", 8)
+    monkeypatch.setattr(datagen, "SHARD_SUBJECTS", 32)
+    model = load_model("invoice-management")
+    generator = Generator(model, build_plan(model, "2000", now=NOW))
+    for entity in (model.entity("Payment"), model.entity("InvoiceSend")):
+        parts = shards(generator, entity)
+        assert len(parts) > 1
+        assert all((start - 1) % datagen.SHARD_SUBJECTS == 0 for start, _ in parts)
+        split = [row for start, stop in parts for row in generator.rows(entity, start, stop)]
+        assert split == list(generator.rows(entity))
+
+
+def test_foreign_keys_and_event_datetimes_stay_in_range():
+    model = load_model("invoice-management")
+    plan = build_plan(model, "2000", now=NOW)
+    generator = Generator(model, plan)
+    payment = model.entity("Payment")
+    columns = [a.english for a in datagen.copy_columns(payment)]
+    invoices = {}
+    for values in generator.rows(payment):
+        row = dict(zip(columns, values))
+        invoice = invoices.setdefault(row["InvoiceID"], generator.resource_row(model.entity("Invoice"),
+                                                                                row["InvoiceID"]))
+        assert 1 <= row["InvoiceID"] <= plan.counts["Invoice"]
+        # 請求書の顧客を引き継ぎ、日時は請求書の作成後〜基準時刻
+        assert row["CustomerID"] == invoice["CustomerID"]
+        assert invoice["__created__"] <= row["PaymentDateTime"] <= NOW
+
+
+def test_shares_leave_some_invoices_partially_paid():
+    """入金の合計は請求額を超えず、全額入金と一部入金の請求書がどちらもある"""
+    model = load_model("invoice-management")
+    generator = Generator(model, build_plan(model, "2000", now=NOW))
+    payment = model.entity("Payment")
+    columns = [a.english for a in datagen.copy_columns(payment)]
+    paid = {}
+    for values in generator.rows(payment):
+        row = dict(zip(columns, values))
+        assert Decimal(row["PaymentAmount"]) >= 0
+        paid[row["InvoiceID"]] = paid.get(row["InvoiceID"], 0) + Decimal(row["PaymentAmount"])
+    status = {"full": 0, "partial": 0}
+    for invoice_id, total in paid.items():
+        amount = Decimal(str(generator.resource_row(model.entity("Invoice"), invoice_id)["Amount"]))
+        assert total <= amount
+        status["full" if total == amount else "partial"] += 1
+    assert status["full"] and status["partial"]
+
+
+def test_dated_events_are_copied_to_staging_and_inserted_in_datetime_order():
+    model = load_model("invoice-management")
+    assert load_table(model.entity("Payment")) == "PAYMENT_LOADING"
+    assert load_table(model.entity("Invoice")) == "INVOICE"
+
+    out = io.StringIO()
+    generate(model, build_plan(model, "200", now=NOW), stream=out)
+    text = out.getvalue()
+    assert text.startswith(stage_sql(model))
+    assert text.endswith(sort_events_sql(model))
+    assert "COPY PAYMENT_LOADING (" in text and "COPY PAYMENT (" not in text
+    assert "SELECT invoice_id, customer_id, payment_date_time, payment_amount, payment_method " \
+           "FROM PAYMENT_LOADING ORDER BY payment_date_time, invoice_id," in sort_events_sql(model)
+
+
+def test_loaded_events_are_physically_in_datetime_order(scratch_db):
+    model = load_model("project-record-system")
+    scratch_db.load(model, ("schema_partitioned.sql", "projections.sql"))
+    generate(model, build_plan(model, "5000", now=NOW), load=True, jobs=2, database=scratch_db.name)
+
+    assert scratch_db.rows("SELECT tablename FROM pg_tables WHERE tablename LIKE '%loading'") == []
+    # ID 順（= 追記順）に並べて日時が戻る行がない
+    assert scratch_db.rows(
+        "SELECT count(*) FROM (SELECT evaluate_date_time < lag(evaluate_date_time) OVER (ORDER BY event_id) AS back "
+        "FROM RISK_EVALUATE) t WHERE back") == [("0",)]
+    # 追記トリガーは日時順の INSERT で 1 回ずつ動く
+    assert scratch_db.rows("SELECT (SELECT count(*) FROM RISK_EVALUATE) = "
+                           "(SELECT sum(risk_evaluate_count) FROM PROJECT_STATE)") == [("t",)]
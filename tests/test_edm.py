@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from tools.edm import export_edm, import_edm, read_edm
+from tools.model import load_model, project_dir
+
+PROJECT = "project-record-system"
+EDM_NAME = "data-model-pjm.edm"
+
+
+@pytest.fixture
+def project():
+    return PROJECT
+
+
+def _round_trip(base):
+    """model.json を .edm に書き出し、その .edm を取り込み直す"""
+    out = base / "out.edm"
+    stats = export_edm(load_model(base), base / EDM_NAME, out)
+    model, _ = import_edm(out, base)
+    return stats, model, out
+
+
+def test_import_reproduces_committed_model(base):
+    committed = project_dir(PROJECT)
+    import_edm(committed / EDM_NAME, base)
+    for name in ("model.json", "entities_classified.json"):
+        assert (base / name).read_text(encoding="utf-8") == (committed / name).read_text(encoding="utf-8")
+
+
+def _structure(model):
+    """.edm から読める構造（関連の名前・注記・1:1 は既存の model.json から引き継ぐので除く）"""
+    entities = {e["name"]: (e["type"], e["japanese"], [(a["japanese"], a["english"], a["type"], a["is_primary_key"])
+                                                       for a in e["attributes"]])
+                for e in model["entities"]}
+    relationships = sorted((r["from"], r["to"], r.get("from_attribute"), r.get("to_attribute"),
+                            r.get("junction_table")) for r in model["relationships"])
+    return entities, relationships
+
+
+def test_import_into_empty_directory(tmp_path):
+    """既存の model.json がなくても、エンティティ・種別・属性・関連を .edm だけから復元する"""
+    committed = project_dir(PROJECT)
+    model, _ = import_edm(committed / EDM_NAME, tmp_path / "new")
+    assert {p.name for p in (tmp_path / "new").iterdir()} == {"model.json", "entities_classified.json"}
+    expected = json.loads((committed / "model.json").read_text(encoding="utf-8"))
+    entities, relationships = _structure(model)
+    assert entities == _structure(expected)[0]
+    assert relationships == _structure(expected)[1]
+    assert len(relationships) == 28
+    assert {kind: sum(1 for t, _, _ in entities.values() if t == kind)
+            for kind in ("resource", "event", "junction")} == {"resource": 11, "event": 7, "junction": 3}
+
+
+def test_export_of_unchanged_model_is_identical(base):
+    stats, _, out = _round_trip(base)
+    assert (stats["keep"], stats["rewrite"], stats["add"], stats["drop"]) == (21, 0, 0, 0)
+    assert out.read_bytes() == (project_dir(PROJECT) / EDM_NAME).read_bytes()
+
+
+def test_round_trip_of_changed_and_dropped_entities(base, edit_model):
+    def edit(data):
+        risk = next(e for e in data["entities"] if e["name"] == "RiskEvaluate")
+        risk["attributes"].append({"japanese": "備考", "english": "Note", "type": "VARCHAR(200)",
+                                   "is_primary_key": False})
+        data["entities"] = [e for e in data["entities"] if e["name"] != "SupportExecute"]
+        data["relationships"] = [r for r in data["relationships"]
+                                 if "SupportExecute" not in (r["from"], r["to"])]
+
+    data = edit_model(edit)
+    stats, model, out = _round_trip(base)
+    assert (stats["rewrite"], stats["drop"], stats["relations_dropped"]) == (1, 1, 3)
+    assert model["entities"] == data["entities"]
+    assert model["relationships"] == data["relationships"]
+    assert "support_execute" not in read_edm(out).by_table()
+
+
+def test_round_trip_of_added_entity(base, edit_model):
+    suspend = {
+        "name": "ProjectSuspend", "type": "event", "japanese": "プロジェクト中断",
+        "note": "プロジェクトを中断した事実", "datetime_attribute": "SuspendDateTime",
+        "attributes": [
+            {"japanese": "イベントID", "english": "EventID", "type": "INT", "is_primary_key": True},
+            {"japanese": "プロジェクトID", "english": "ProjectID", "type": "INT", "is_primary_key": False},
+            {"japanese": "中断日時", "english": "SuspendDateTime", "type": "TIMESTAMP", "is_primary_key": False},
+        ],
+    }
+    relationship = {"from": "Project", "to": "ProjectSuspend", "cardinality": "1:N",
+                    "from_attribute": "ProjectID", "to_attribute": "ProjectID", "relationship_type": "suspended"}
+
+    def edit(data):
+        data["entities"].append(suspend)
+        data["relationships"].append(relationship)
+
+    data = edit_model(edit)
+    stats, model, out = _round_trip(base)
+    assert (stats["add"], stats["relations_added"]) == (1, 1)
+    assert model["entities"] == data["entities"]
+    assert relationship in model["relationships"]
+
+    # 追加したエンティティはメインのモデルビューに配置され、ID は元の MAXID の後から振る
+    original, index = read_edm(base / EDM_NAME), read_edm(out)
+    added = index.by_table()["project_suspend"]
+    assert added.layout is not None
+    assert original.max_id < int(added.id) <= index.max_id
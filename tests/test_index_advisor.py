@@ -0,0 +1,194 @@
+import pytest
+
+from tools.index_advisor import (MIGRATION_NAME, Group, WorkloadAnalyzer, collect_workload, deletable_entities,
+                                 id_columns, index_section, migration, previous_indexes, recommend,
+                                 removed_indexes, resolve_openapi_columns, tokenize)
+from tools.model import load_model
+from tools.schema import Index, index_section_span, parse_schema, replace_index_section, split_top_level
+
+PROJECT = "project-record-system"
+
+
+@pytest.fixture(scope="module")
+def model():
+    return load_model(PROJECT)
+
+
+@pytest.fixture(scope="module")
+def schema(model):
+    return parse_schema(model.path / "schema.sql")
+
+
+def _patterns(schema, sql):
+    analyzer = WorkloadAnalyzer(schema)
+    analyzer.analyze(sql, "test")
+    return analyzer.patterns
+
+
+def test_tokenize_nests_groups_and_drops_comments():
+    tokens = tokenize("SELECT a.b, 'x''y' -- コメント\n FROM t WHERE (x IN (SELECT 1)) AND y::int >= $1;")
+    assert [t.text for t in tokens[:4]] == ["SELECT", "a.b", ",", "'x''y'"]
+    group = tokens[7]
+    assert isinstance(group, Group) and not group.has_select()
+    assert isinstance(group[2], Group) and group[2].has_select()
+    assert [t.kind for t in tokens[-5:]] == ["word", "op", "word", "op", "param"]
+
+
+def test_latest_pattern(schema):
+    [p] = _patterns(schema, "SELECT * FROM PERSONASSIGN WHERE PersonID = ? ORDER BY AssignDateTime DESC LIMIT 1")
+    assert (p.table, p.kind, p.eq, p.order) == ("PERSON_ASSIGN", "latest", ["person_id"],
+                                                [("assign_date_time", True)])
+
+
+def test_correlated_not_exists(schema):
+    patterns = _patterns(schema, """
+        SELECT pa.person_id FROM PERSON_ASSIGN pa
+        WHERE pa.project_id = ?
+          AND NOT EXISTS (SELECT 1 FROM PERSON_REPLACE pr
+                          WHERE pr.project_id = pa.project_id
+                            AND pr.old_person_id = pa.person_id
+                            AND pr.replace_date_time > pa.assign_date_time)""")
+    [inner] = [p for p in patterns if p.table == "PERSON_REPLACE"]
+    assert inner.kind == "correlated"
+    assert set(inner.eq) == {"project_id", "old_person_id"}
+    assert inner.range == "replace_date_time"
+
+
+def test_window_in_cte(schema):
+    """CTE 内の PARTITION BY ... ORDER BY は各グループの最新行を索引順に読む"""
+    [p] = _patterns(schema, """
+        WITH r AS (SELECT project_id, risk_rank,
+                          ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY evaluate_date_time DESC) AS rn
+                   FROM RISK_EVALUATE)
+        SELECT p.project_name FROM PROJECT p LEFT JOIN r ON r.project_id = p.project_id AND r.rn = 1""")
+    assert (p.table, p.kind, p.eq, p.order) == ("RISK_EVALUATE", "window", ["project_id"],
+                                                [("evaluate_date_time", True)])
+    assert p.include == ["risk_rank"]
+
+
+def test_join_indexes_only_the_inner_side(schema):
+    [p] = _patterns(schema, """
+        SELECT s.event_id FROM PROJECT p
+        JOIN SUPPORT_EXECUTE s ON s.project_id = p.project_id
+        WHERE p.project_id = ?""")
+    assert (p.table, p.kind, p.eq) == ("SUPPORT_EXECUTE", "join", ["project_id"])
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT project_id, MIN(start_date_time), MAX(start_date_time) FROM PROJECT_START "
+     "WHERE project_id = ? GROUP BY project_id",
+     ("summary", ["project_id"], [("start_date_time", False)], None, None)),
+    ("SELECT * FROM PROJECT_START WHERE project_id = ? "
+     "ORDER BY start_date_time DESC, event_id DESC LIMIT 20 OFFSET 20",
+     ("history", ["project_id"], [("start_date_time", True), ("event_id", True)], None, None)),
+    ("SELECT * FROM RISK_EVALUATE WHERE evaluate_date_time BETWEEN ? AND ? AND project_id = ?",
+     ("filter", ["project_id"], [], "evaluate_date_time", None)),
+    ("SELECT * FROM RISK_EVALUATE WHERE risk_rank IS NOT NULL AND project_id = ?",
+     ("filter", ["project_id"], [], None, "risk_rank IS NOT NULL")),
+])
+def test_single_table_patterns(schema, sql, expected):
+    [p] = _patterns(schema, sql)
+    assert (p.kind, p.eq, p.order, p.range, p.where) == expected
+
+
+def test_or_conditions_are_not_indexed(schema):
+    assert _patterns(schema, "SELECT * FROM RISK_EVALUATE WHERE project_id = ? OR evaluated_by = ?") == []
+
+
+def test_primary_key_lookup_needs_no_index(schema):
+    """主キーの全列が等価条件なら、並び替えがあっても主キー索引で足りる"""
+    assert _patterns(schema, "SELECT * FROM SUPPORTEXECUTE WHERE EventID = ? ORDER BY ExecuteDateTime DESC LIMIT 1") == []
+
+
+def test_id_columns(model, schema):
+    columns = schema.tables["PERSON_REPLACE"].columns
+    replace = model.entities["PersonReplace"]
+    assert id_columns("PersonID", replace, model, columns) == ["old_person_id", "new_person_id"]
+    assert id_columns("ProjectID", replace, model, columns) == ["project_id"]
+    assert id_columns("PersonReplaceID", replace, model, columns) == ["event_id"]
+    assert id_columns("RiskID", replace, model, columns) == []
+
+
+def test_resolve_openapi_columns(model, schema):
+    analyzer = WorkloadAnalyzer(schema)
+    sql = "SELECT * FROM PERSONREPLACE WHERE PersonID = ? ORDER BY ReplaceDateTime DESC LIMIT 1;"
+    variants = resolve_openapi_columns(sql, analyzer, model)
+    assert [v.split("WHERE ")[1].split(" =")[0] for v in variants] == ["old_person_id", "new_person_id"]
+    with pytest.raises(ValueError, match="RiskID"):
+        resolve_openapi_columns("SELECT * FROM RISKEVALUATE WHERE RiskID = ?;", analyzer, model)
+
+
+def test_workload_has_no_unresolved_endpoints(model, schema):
+    _, warnings = collect_workload(model.path, schema, model)
+    assert warnings == []
+
+
+@pytest.mark.parametrize("project", ["invoice-management", PROJECT])
+def test_committed_index_section_is_current(project):
+    """コミット済みの schema.sql と index_migration.sql から実行し直しても変わらない"""
+    committed = load_model(project)
+    schema = parse_schema(committed.path / "schema.sql")
+    patterns, _ = collect_workload(committed.path, schema, committed)
+    migration_path = committed.path / MIGRATION_NAME
+    previous = previous_indexes(schema, migration_path)
+    recommendations = recommend(schema, committed, patterns, previous)
+    removed = removed_indexes(previous, recommendations)
+    assert replace_index_section(schema.text, index_section(schema, recommendations, removed, project)) == schema.text
+    assert migration(recommendations, removed, previous, project) == migration_path.read_text(encoding="utf-8")
+
+
+def test_previous_indexes_ignore_removed_list(tmp_path, schema):
+    """移行前の構成は実在したインデックスだけ。作成しないインデックスのコメント行は読まない"""
+    text = schema.text + "\n--   idx_phantom ON PROJECT(project_name): ワークロードにない\n"
+    (tmp_path / "schema.sql").write_text(text, encoding="utf-8")
+    (tmp_path / MIGRATION_NAME).write_text(
+        "CREATE INDEX CONCURRENTLY idx_new ON PROJECT(project_name);\n"
+        "DROP INDEX CONCURRENTLY IF EXISTS idx_old;  -- 理由\n"
+        "--   元の定義: CREATE INDEX idx_old ON PROJECT(project_name);\n", encoding="utf-8")
+    previous = {i.name for i in previous_indexes(parse_schema(tmp_path / "schema.sql"), tmp_path / MIGRATION_NAME)}
+    assert "idx_phantom" not in previous
+    assert "idx_old" in previous
+    assert previous - {"idx_old"} == {i.name for i in schema.indexes}
+
+
+def test_foreign_keys_of_deletable_parents_keep_indexes(model, schema):
+    deletable = deletable_entities(model, model.path)
+    assert {"Organization", "Person", "Project"} <= set(deletable)
+    patterns, _ = collect_workload(model.path, schema, model)
+    recommendations = recommend(schema, model, patterns)
+    keys = {(r.index.table, r.key[0]) for r in recommendations}
+    assert {("ORGANIZATION_JOIN", "organization_id"), ("SUPPORT_EXECUTE", "support_type_id"),
+            ("SUPPORT_EXECUTE", "support_person_id"), ("ORGANIZATION", "parent_organization_id")} <= keys
+
+
+def test_split_top_level_keeps_parentheses():
+    assert split_top_level("a NUMERIC(10, 2), b INT, PRIMARY KEY (a, b)") == \
+        ["a NUMERIC(10, 2)", "b INT", "PRIMARY KEY (a, b)"]
+
+
+def test_parse_schema_reads_indexes(schema):
+    by_name = {i.name: i for i in schema.indexes}
+    for index in schema.indexes:
+        assert index.table in schema.tables
+        assert all(c in schema.tables[index.table].columns for c in index.key)
+        assert index.ddl() in schema.text
+    assert any(i.include for i in by_name.values())
+    assert Index("idx_x", "T", [("a", False), ("b", True)], include=["c"], where="c IS NULL").ddl() == \
+        "CREATE INDEX idx_x ON T(a, b DESC) INCLUDE (c) WHERE c IS NULL;"
+
+
+def test_replace_index_section(tmp_path):
+    head = "CREATE TABLE T (\n    a INTEGER PRIMARY KEY\n);\n"
+    section = "-- " + "=" * 48 + "\n-- インデックス\n-- " + "=" * 48 + "\n\nCREATE INDEX idx_t_a ON T(a);\n"
+    assert index_section_span(head) == (len(head), len(head))
+
+    text = replace_index_section(head, section)
+    assert text == head + "\n" + section
+    assert index_section_span(text) == (len(head) + 1, len(text))
+    assert replace_index_section(text, section) == text
+    replaced = replace_index_section(text, section.replace("(a)", "(a DESC)"))
+    assert replaced.startswith(head) and replaced.endswith("ON T(a DESC);\n")
+
+    (tmp_path / "schema.sql").write_text(text, encoding="utf-8")
+    [index] = parse_schema(tmp_path / "schema.sql").indexes
+    assert (index.name, index.table, index.columns) == ("idx_t_a", "T", [("a", False)])
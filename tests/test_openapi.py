@@ -0,0 +1,26 @@
+import pytest
+
+from tools import openapi
+from tools.model import load_model
+
+
+def test_committed_openapi_round_trips_byte_identical():
+    path = load_model("project-record-system").path / "openapi.yaml"
+    text = path.read_text(encoding="utf-8")
+    assert openapi.dumps(openapi.loads(text)) == text
+
+
+@pytest.mark.parametrize("value", [
+    {"a": "plain", "b": "yes", "c": "012", "d": "1.5", "e": "2026-01-01", "f": ""},
+    {"text": "行1\n\n行2\n```sql\nSELECT 1;\n```", "quoted": "it's \"both\"", "colon": "a: b"},
+    {"list": [1, "two", None, True, {"k": ["x", "y"]}], "empty": [], "nested": {"m": {}}},
+])
+def test_dump_load_round_trip(value):
+    assert openapi.loads(openapi.dumps(value)) == value
+
+
+def test_scalar_quotes_like_pyyaml():
+    assert openapi.scalar("true") == "'true'"
+    assert openapi.scalar("123") == "'123'"
+    assert openapi.scalar("#/components/schemas/X") == "'#/components/schemas/X'"
+    assert openapi.scalar("plain text") == "plain text"
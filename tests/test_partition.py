@@ -0,0 +1,58 @@
+import pytest
+
+from tools.model import load_model
+from tools.partition import (DEFAULT_AHEAD, DEFAULT_HISTORY, DEFAULT_INTERVAL, DEFAULT_WINDOW, INTERVALS,
+                             QUERIES_NAME, SCHEMA_NAME, add_time_window, event_tables, is_history_query,
+                             partitioned_queries, partitioned_schema, _event_scans)
+from tools.query_examples import parse_query_examples
+from tools.schema import parse_schema
+
+PROJECT = "project-record-system"
+
+
+@pytest.fixture(scope="module")
+def events():
+    return event_tables(load_model(PROJECT))
+
+
+@pytest.mark.parametrize("project", ["invoice-management", PROJECT])
+def test_committed_partitioned_files_are_current(project):
+    model = load_model(project)
+    events = event_tables(model)
+    ddl = partitioned_schema(model, parse_schema(model.path / "schema.sql"), events,
+                             INTERVALS[DEFAULT_INTERVAL], DEFAULT_HISTORY, DEFAULT_AHEAD)
+    queries, _ = partitioned_queries(
+        model, parse_query_examples(model.path / "query_examples.sql"), events, DEFAULT_WINDOW)
+    assert ddl == (model.path / SCHEMA_NAME).read_text(encoding="utf-8")
+    assert queries == (model.path / QUERIES_NAME).read_text(encoding="utf-8")
+
+
+def test_history_query_gets_time_window(events):
+    sql = "SELECT re.event_id\nFROM RISK_EVALUATE re\nWHERE re.project_id = 1 OR re.project_id = 2\n" \
+          "ORDER BY re.evaluate_date_time DESC"
+    scans = _event_scans(sql, events)
+    assert [(alias, dt) for _, _, alias, dt in scans] == [("re", "evaluate_date_time")]
+    assert is_history_query(sql, scans)
+    # OR を含む条件は括弧で囲んでから日時範囲を加える
+    assert add_time_window(sql, scans, "12 months") == (
+        "SELECT re.event_id\nFROM RISK_EVALUATE re\nWHERE\n"
+        "    (re.project_id = 1 OR re.project_id = 2)\n"
+        "    AND re.evaluate_date_time >= CURRENT_TIMESTAMP - INTERVAL '12 months'\n"
+        "ORDER BY re.evaluate_date_time DESC")
+
+
+def test_non_history_query_is_unchanged(events):
+    sql = "SELECT project_id, COUNT(*) FROM RISK_EVALUATE GROUP BY project_id ORDER BY project_id"
+    assert not is_history_query(sql, _event_scans(sql, events))
+
+
+@pytest.mark.parametrize("project", ["invoice-management", PROJECT])
+def test_partitioned_schema_loads_sample_data(scratch_db, project):
+    """パーティション版の DDL にサンプルデータを投入でき、クエリ例がすべて実行できる"""
+    model = load_model(project)
+    scratch_db.load(model, (SCHEMA_NAME, "sample_data.sql"))
+    for query in parse_query_examples(model.path / QUERIES_NAME):
+        scratch_db.run(f"EXPLAIN {query.sql};")
+    for _, _, dt in event_tables(model):
+        brin = f"SELECT COUNT(*) > 0 FROM pg_indexes WHERE indexdef LIKE '%USING brin ({dt})%'"
+        assert scratch_db.rows(brin) == [("t",)]
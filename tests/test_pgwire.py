@@ -0,0 +1,281 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import struct
+
+import pytest
+
+from tools.pgwire import Connection, Pool, PostgresError, _encode, _error_fields, _message, _Scram, _timestamp
+
+PASSWORD = "secret"
+
+# (列名, 型 OID, 値のテキスト)。None は NULL
+COLUMNS = [("id", 23, "7"), ("name", 25, "計画"), ("at", 1184, "2024-04-01 09:00:00+09"),
+           ("ok", 16, "t"), ("data", 3802, '{"a": [1, 2]}'), ("amount", 1700, "1200.50"), ("note", 25, None)]
+
+
+def _cstring(text):
+    return text.encode("utf-8") + b"\0"
+
+
+class FakeBackend:
+    """プロトコル v3 のサーバー側を最小限に真似る（1 接続 1 コルーチン）
+
+    SQL に crash を含む問い合わせは Bind の時点で接続を切り、boom を含むものは
+    ErrorResponse を返す。
+    """
+
+    def __init__(self, auth="trust"):
+        self.auth = auth
+        self.connections = 0
+        self.parsed = []
+        self.binds = []
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+    def connect_args(self, password=PASSWORD):
+        return {"host": "127.0.0.1", "port": self.port, "user": "u", "password": password, "database": "d"}
+
+    async def _read(self, reader):
+        kind = await reader.readexactly(1)
+        length = struct.unpack("!i", await reader.readexactly(4))[0]
+        return kind, await reader.readexactly(length - 4)
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            length = struct.unpack("!i", await reader.readexactly(4))[0]
+            startup = await reader.readexactly(length - 4)
+            assert struct.unpack("!i", startup[:4])[0] == 196608
+            if self.auth == "scram" and not await self._scram(reader, writer):
+                return
+            writer.write(_message(b"R", struct.pack("!i", 0))
+                         + _message(b"S", _cstring("server_version") + _cstring("16.0"))
+                         + _message(b"Z", b"I"))
+            await self._serve(reader, writer)
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    async def _scram(self, reader, writer):
+        writer.write(_message(b"R", struct.pack("!i", 10) + _cstring("SCRAM-SHA-256") + b"\0"))
+        _, payload = await self._read(reader)
+        mechanism, rest = payload.split(b"\0", 1)
+        assert mechanism == b"SCRAM-SHA-256"
+        client_first = rest[4:4 + struct.unpack("!i", rest[:4])[0]].decode()
+        assert client_first.startswith("n,,")
+        first_bare = client_first[3:]
+        nonce = dict(p.split("=", 1) for p in first_bare.split(","))["r"] + "srv"
+        salt, iterations = b"salt1234", 4096
+        server_first = f"r={nonce},s={base64.b64encode(salt).decode()},i={iterations}"
+        writer.write(_message(b"R", struct.pack("!i", 11) + server_first.encode()))
+
+        _, payload = await self._read(reader)
+        client_final = payload.decode()
+        without_proof, proof = client_final.rsplit(",p=", 1)
+        salted = hashlib.pbkdf2_hmac("sha256", PASSWORD.encode(), salt, iterations)
+        client_key = hmac.digest(salted, b"Client Key", "sha256")
+        stored_key = hashlib.sha256(client_key).digest()
+        auth_message = f"{first_bare},{server_first},{without_proof}".encode()
+        signature = hmac.digest(stored_key, auth_message, "sha256")
+        recovered = bytes(a ^ b for a, b in zip(base64.b64decode(proof), signature))
+        if hashlib.sha256(recovered).digest() != stored_key:
+            writer.write(_message(b"E", b"SFATAL\0C28P01\0Mpassword authentication failed\0\0"))
+            return False
+        server_key = hmac.digest(salted, b"Server Key", "sha256")
+        verifier = base64.b64encode(hmac.digest(server_key, auth_message, "sha256")).decode()
+        writer.write(_message(b"R", struct.pack("!i", 12) + f"v={verifier}".encode()))
+        return True
+
+    async def _serve(self, reader, writer):
+        statements, pending = {}, []
+        while True:
+            kind, payload = await self._read(reader)
+            if kind == b"X":
+                return
+            if kind != b"S":
+                pending.append((kind, payload))
+                continue
+            out = b""
+            for kind, payload in pending:
+                if kind == b"P":
+                    name, sql, _ = payload.split(b"\0", 2)
+                    statements[name] = sql.decode()
+                    self.parsed.append(sql.decode())
+                    out += _message(b"1")
+                elif kind == b"D":
+                    out += _message(b"T", self._row_description())
+                elif kind == b"B":
+                    portal_end = payload.index(b"\0")
+                    name = payload[portal_end + 1:payload.index(b"\0", portal_end + 1)]
+                    sql = statements[name]
+                    self.binds.append((sql, payload))
+                    if "crash" in sql:
+                        return
+                    if "boom" in sql:
+                        out += _message(b"E", b"SERROR\0C22P02\0Minvalid input\0\0")
+                        break
+                    out += _message(b"2")
+                elif kind == b"E":
+                    out += _message(b"D", self._data_row()) + _message(b"C", _cstring("SELECT 1"))
+            pending = []
+            writer.write(out + _message(b"Z", b"I"))
+            await writer.drain()
+
+    @staticmethod
+    def _row_description():
+        body = struct.pack("!h", len(COLUMNS))
+        for name, oid, _ in COLUMNS:
+            body += _cstring(name) + struct.pack("!ihihih", 0, 0, oid, -1, -1, 0)
+        return body
+
+    @staticmethod
+    def _data_row():
+        body = struct.pack("!h", len(COLUMNS))
+        for _, _, value in COLUMNS:
+            if value is None:
+                body += struct.pack("!i", -1)
+            else:
+                data = value.encode("utf-8")
+                body += struct.pack("!i", len(data)) + data
+        return body
+
+
+# ------------------------------------------------
+# メッセージと値の変換
+# ------------------------------------------------
+
+def test_message_length_includes_itself():
+    assert _message(b"Q", b"SELECT 1\0") == b"Q\x00\x00\x00\x0dSELECT 1\0"
+    assert _message(b"S") == b"S\x00\x00\x00\x04"
+
+
+def test_error_fields():
+    fields = _error_fields(b"SERROR\0C42P01\0Mrelation does not exist\0\0")
+    assert fields == {"S": "ERROR", "C": "42P01", "M": "relation does not exist"}
+    assert PostgresError(fields).code == "42P01"
+
+
+def test_encode_parameters():
+    assert _encode(None) is None
+    assert _encode(True) == b"true"
+    assert _encode(12) == b"12"
+    assert _encode([1, None, 'a"b']) == b'{1,NULL,"a\\"b"}'
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2024-04-01 09:00:00+09", "2024-04-01T09:00:00+09:00"),
+    ("2024-04-01 09:00:00+05:30", "2024-04-01T09:00:00+05:30"),
+    ("2024-04-01 09:00:00", "2024-04-01T09:00:00"),
+])
+def test_timestamp(text, expected):
+    assert _timestamp(text) == expected
+
+
+def test_scram_rejects_wrong_server_signature():
+    scram = _Scram(PASSWORD)
+    nonce = scram.nonce + "srv"
+    scram.client_final(f"r={nonce},s={base64.b64encode(b'salt').decode()},i=4096")
+    with pytest.raises(PostgresError, match="signature"):
+        scram.verify("v=" + base64.b64encode(b"x" * 32).decode())
+    with pytest.raises(PostgresError, match="nonce"):
+        _Scram(PASSWORD).client_final("r=other,s=c2FsdA==,i=4096")
+
+
+# ------------------------------------------------
+# 接続と問い合わせ
+# ------------------------------------------------
+
+@pytest.mark.parametrize("auth", ["trust", "scram"])
+def test_fetch_decodes_rows_and_caches_statements(auth):
+    async def main():
+        async with FakeBackend(auth) as backend:
+            conn = await Connection.connect(**backend.connect_args())
+            try:
+                assert conn.parameters == {"server_version": "16.0"}
+                rows = await conn.fetch("SELECT * FROM t WHERE id = $1", 7)
+                await conn.fetchrow("SELECT * FROM t WHERE id = $1", None)
+            finally:
+                conn.close()
+            return backend, rows
+
+    backend, rows = asyncio.run(main())
+    assert rows == [{"id": 7, "name": "計画", "at": "2024-04-01T09:00:00+09:00", "ok": True,
+                     "data": {"a": [1, 2]}, "amount": "1200.50", "note": None}]
+    # Parse は初回だけ。2 回目は Bind だけで、NULL は長さ -1 で送る
+    assert backend.parsed == ["SELECT * FROM t WHERE id = $1"]
+    first, second = (payload for _, payload in backend.binds)
+    assert first.endswith(b"\0\0\0\x017" + b"\0\0")
+    assert second.endswith(b"\xff\xff\xff\xff" + b"\0\0")
+
+
+def test_scram_with_wrong_password_fails():
+    async def main():
+        async with FakeBackend("scram") as backend:
+            await Connection.connect(**backend.connect_args(password="wrong"))
+
+    with pytest.raises(PostgresError) as excinfo:
+        asyncio.run(main())
+    assert excinfo.value.code == "28P01"
+
+
+# ------------------------------------------------
+# 接続プール
+# ------------------------------------------------
+
+def test_pool_keeps_connection_after_server_error():
+    async def main():
+        async with FakeBackend() as backend:
+            pool = await Pool(min_size=1, max_size=1, **backend.connect_args()).open()
+            with pytest.raises(PostgresError):
+                await pool.fetch("SELECT boom")
+            rows = await pool.fetch("SELECT 1")
+            pool.close()
+            return backend, rows
+
+    backend, rows = asyncio.run(main())
+    assert backend.connections == 1
+    assert rows[0]["id"] == 7
+
+
+def test_pool_wakes_waiter_when_broken_connection_is_discarded():
+    """満杯のプールで切れた接続を捨てたら、待っている acquire が新しい接続を開く"""
+    async def main():
+        async with FakeBackend() as backend:
+            pool = await Pool(min_size=1, max_size=1, **backend.connect_args()).open()
+            waiter = None
+            with pytest.raises(asyncio.IncompleteReadError):
+                async with pool.acquire() as conn:
+                    waiter = asyncio.create_task(pool.fetch("SELECT 1"))
+                    await asyncio.sleep(0)
+                    assert not waiter.done()
+                    await conn.fetch("SELECT crash")
+            rows = await asyncio.wait_for(waiter, timeout=5)
+            size = pool._size
+            pool.close()
+            return backend, rows, size
+
+    backend, rows, size = asyncio.run(main())
+    assert rows[0]["id"] == 7
+    assert (backend.connections, size) == (2, 1)
+
+
+def test_pool_never_exceeds_max_size():
+    async def main():
+        async with FakeBackend() as backend:
+            pool = await Pool(min_size=0, max_size=3, **backend.connect_args()).open()
+            await asyncio.gather(*(pool.fetch("SELECT 1") for _ in range(20)))
+            size = pool._size
+            pool.close()
+            return backend, size
+
+    backend, size = asyncio.run(main())
+    assert backend.connections == size == 3
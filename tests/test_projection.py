@@ -0,0 +1,92 @@
+import pytest
+
+from tools.model import load_model
+from tools.projection import build_states, find_memberships, projection_sql
+from tools.schema import parse_schema
+
+PROJECT = "project-record-system"
+
+# 日時の順と追記の順を入れ替えたイベント（過去の日時の追記を含む）
+OUT_OF_ORDER_EVENTS = """
+INSERT INTO PERSON_ASSIGN (project_id, person_id, role_id, assign_date_time, registered_by) VALUES
+    (2, 4, 1, '2030-01-01 09:00+09', 1),
+    (2, 4, 1, '2030-03-01 09:00+09', 1);
+INSERT INTO PERSON_REPLACE (project_id, old_person_id, new_person_id, role_id, replace_date_time, registered_by) VALUES
+    (2, 4, 5, 1, '2030-02-01 09:00+09', 1);
+INSERT INTO PERSON_REPLACE (project_id, old_person_id, new_person_id, role_id, replace_date_time, registered_by) VALUES
+    (3, 5, 6, 2, '2030-05-01 09:00+09', 1);
+INSERT INTO PERSON_REPLACE (project_id, old_person_id, new_person_id, role_id, replace_date_time, registered_by) VALUES
+    (3, 4, 5, 2, '2030-04-01 09:00+09', 1);
+INSERT INTO PERSON_ASSIGN (project_id, person_id, role_id, assign_date_time, registered_by) VALUES
+    (3, 4, 2, '2030-03-01 09:00+09', 1),
+    (3, 4, 2, '2030-04-01 09:00+09', 1);
+INSERT INTO ORGANIZATION_JOIN (project_id, organization_id, join_date_time, registered_by) VALUES
+    (2, 3, '2030-02-01 09:00+09', 1),
+    (2, 3, '2030-01-01 09:00+09', 1);
+INSERT INTO RISK_EVALUATE (project_id, risk_rank, evaluate_date_time, evaluated_by, is_system_proposed, is_manual_adjusted) VALUES
+    (2, 'HIGH', '2030-02-01 09:00+09', 1, false, false),
+    (2, 'LOW', '2030-01-01 09:00+09', 1, false, false);
+"""
+
+
+@pytest.fixture(scope="module")
+def model():
+    return load_model(PROJECT)
+
+
+@pytest.fixture(scope="module")
+def schema(model):
+    return parse_schema(model.path / "schema.sql")
+
+
+def test_person_membership_has_replace(model):
+    by_table = {m.table: m for m in find_memberships(model)}
+    person = by_table["PROJECT_PERSON_CURRENT"]
+    assert person.replace.table == "PERSON_REPLACE"
+    assert (person.old_member, person.new_member) == ("old_person_id", "new_person_id")
+    assert [d[0] for d in person.dims] == ["role_id"]
+    assert by_table["PROJECT_ORGANIZATION_CURRENT"].replace is None
+
+
+def test_state_excludes_membership_only_columns(model, schema):
+    states = build_states(model, schema, find_memberships(model))
+    project = next(s for s in states if s.table == "PROJECT_STATE")
+    names = {c.name for c in project.columns}
+    assert {"project_id", "risk_evaluate_count", "last_risk_evaluate_rank", "remaining_estimated_effort"} <= names
+
+
+@pytest.mark.parametrize("project", ["invoice-management", PROJECT])
+def test_committed_projections_are_current(project):
+    committed = load_model(project)
+    sql = projection_sql(committed, parse_schema(committed.path / "schema.sql"))
+    assert sql == (committed.path / "projections.sql").read_text(encoding="utf-8")
+
+
+def test_replace_trigger_recomputes_key(model, schema):
+    """交代の追記は差分で消さず、組み合わせごとにイベントから導き直す"""
+    sql = projection_sql(model, schema)
+    assert "CREATE OR REPLACE FUNCTION refresh_project_person_current(" in sql
+    assert "PERFORM refresh_project_person_current(NEW.project_id, NEW.old_person_id, NEW.role_id);" in sql
+    assert "since < NEW.replace_date_time" not in sql
+
+
+def _snapshot(db, tables):
+    # updated_at は追記時刻なので比較から外す
+    return {t: db.rows(f"SELECT (to_jsonb(t) - 'updated_at')::text AS r FROM {t} t ORDER BY r")
+            for t in tables}
+
+
+def test_triggers_match_rebuild_after_out_of_order_inserts(scratch_db, model, schema):
+    scratch_db.load(model, ("schema.sql", "projections.sql", "sample_data.sql"))
+    scratch_db.run(OUT_OF_ORDER_EVENTS)
+    tables = [s.table for s in build_states(model, schema, find_memberships(model))]
+    tables += [m.table for m in find_memberships(model)]
+
+    by_trigger = _snapshot(scratch_db, tables)
+    scratch_db.run("CALL rebuild_projections();")
+    assert _snapshot(scratch_db, tables) == by_trigger
+
+    # t1 アサイン → t3 アサイン → t2 交代（遅れて到着）: t3 のアサインが残る
+    assert scratch_db.rows(
+        "SELECT since::date, source_event FROM PROJECT_PERSON_CURRENT "
+        "WHERE project_id = 2 AND person_id = 4 AND role_id = 1") == [("2030-03-01", "PERSON_ASSIGN")]
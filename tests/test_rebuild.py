@@ -0,0 +1,96 @@
+import pytest
+
+from tools.model import load_model, project_dir
+from tools.rebuild import STATE_NAME, fingerprint, make_plan, read_build, rebuild, write_build
+
+PROJECT = "invoice-management"
+
+
+@pytest.fixture
+def project():
+    return PROJECT
+
+
+def _add_note(data):
+    send = next(e for e in data["entities"] if e["name"] == "InvoiceSend")
+    send["attributes"].append({"japanese": "備考", "english": "Note", "type": "VARCHAR(200)",
+                               "is_primary_key": False})
+
+
+@pytest.mark.parametrize("project", [PROJECT, "project-record-system"])
+def test_committed_build_is_current(project):
+    base = project_dir(project)
+    current = fingerprint(base)
+    assert read_build(base / STATE_NAME) == current
+    assert make_plan(current, current).affected == []
+
+
+@pytest.mark.parametrize("project", [PROJECT, "project-record-system"])
+def test_full_rebuild_reproduces_artifacts(project):
+    """全エンティティを作り直しても、コミット済みの成果物と同じテキストになる"""
+    model = load_model(project)
+    results, _ = rebuild(model, make_plan(None, fingerprint(model.path)))
+    assert {"schema.sql", "er_diagram.mmd", "sample_data.sql"} <= set(results)
+    for name, (old, new) in results.items():
+        assert new == old, name
+
+
+def test_fingerprint_ignores_formatting(base, edit_model):
+    before = fingerprint(base)
+    edit_model(lambda data: None)
+    after = fingerprint(base)
+    assert after.inputs["model.json"] != before.inputs["model.json"]
+    assert after.entities == before.entities
+    assert make_plan(before, after).changed == []
+
+
+def test_plan_adds_neighbours_of_changed_entity(base, edit_model):
+    before = fingerprint(base)
+    edit_model(_add_note)
+    plan = make_plan(before, fingerprint(base))
+    assert plan.changed == ["InvoiceSend"]
+    assert plan.removed == []
+    assert plan.affected == ["Customer", "Invoice", "InvoiceSend"]
+
+
+def test_plan_uses_previous_neighbours_of_removed_entity(base, edit_model):
+    def remove(data):
+        data["entities"] = [e for e in data["entities"] if e["name"] != "ConfirmationSend"]
+        data["relationships"] = [r for r in data["relationships"] if "ConfirmationSend" not in (r["from"], r["to"])]
+
+    before = fingerprint(base)
+    edit_model(remove)
+    plan = make_plan(before, fingerprint(base))
+    assert plan.removed == ["ConfirmationSend"]
+    assert set(plan.affected) >= {"Customer", "Invoice"}
+
+    results, _ = rebuild(load_model(base), plan)
+    schema = results["schema.sql"][1]
+    assert "CREATE TABLE CONFIRMATION_SEND" not in schema
+    assert "CREATE INDEX idx_confirmation_send" not in schema
+    assert "CONFIRMATION_SEND" not in results["er_diagram.mmd"][1]
+
+
+def test_incremental_rebuild_matches_full_rebuild(base, edit_model):
+    before = fingerprint(base)
+    edit_model(_add_note)
+    current = fingerprint(base)
+    model = load_model(base)
+    incremental, notes = rebuild(model, make_plan(before, current))
+    full, _ = rebuild(model, make_plan(before, current, everything=True))
+    assert notes
+    assert "    note VARCHAR(200)" in incremental["schema.sql"][1]
+    assert "COMMENT ON COLUMN INVOICE_SEND.note IS '備考';" in incremental["schema.sql"][1]
+    assert {name: new for name, (_, new) in incremental.items()} == \
+        {name: new for name, (_, new) in full.items()}
+
+
+def test_write_build_keeps_other_keys(base, edit_model):
+    path = base / STATE_NAME
+    text = path.read_text(encoding="utf-8")
+    head = text[:text.index("build:")]
+    edit_model(_add_note)
+    current = fingerprint(base)
+    write_build(path, current)
+    assert path.read_text(encoding="utf-8").startswith(head)
+    assert read_build(path) == current
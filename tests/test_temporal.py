@@ -0,0 +1,148 @@
+import pytest
+
+from tools import api
+from tools.api_server import load_operations
+from tools.model import load_model
+from tools.schema import parse_schema
+from tools.temporal import find_validities, temporal_sql
+
+# 日時の順と追記の順を入れ替えたイベント（過去の日時の追記・同時刻のイベントを含む）
+OUT_OF_ORDER_EVENTS = {
+    "project-record-system": """
+INSERT INTO RISK_EVALUATE (project_id, risk_rank, evaluate_date_time, evaluated_by, is_system_proposed, is_manual_adjusted) VALUES
+    (2, 'HIGH', '2030-03-01 09:00+09', 1, false, false),
+    (2, 'LOW', '2030-01-01 09:00+09', 1, false, false);
+INSERT INTO RISK_EVALUATE (project_id, risk_rank, evaluate_date_time, evaluated_by, is_system_proposed, is_manual_adjusted) VALUES
+    (2, 'MEDIUM', '2030-02-01 09:00+09', 1, false, false),
+    (2, 'HIGH', '2030-02-01 09:00+09', 1, true, false);
+INSERT INTO PERSON_ASSIGN (project_id, person_id, role_id, assign_date_time, registered_by) VALUES
+    (2, 4, 1, '2030-01-01 09:00+09', 1),
+    (2, 4, 1, '2030-03-01 09:00+09', 1);
+INSERT INTO PERSON_REPLACE (project_id, old_person_id, new_person_id, role_id, replace_date_time, registered_by) VALUES
+    (2, 4, 5, 1, '2030-02-01 09:00+09', 1);
+INSERT INTO PROJECT_COMPLETE (project_id, complete_date_time, actual_effort, registered_by) VALUES
+    (2, '2030-06-01 09:00+09', 10, 1);
+INSERT INTO PROJECT_COMPLETE (project_id, complete_date_time, actual_effort, registered_by) VALUES
+    (2, '2030-04-01 09:00+09', 20, 1);
+""",
+    "invoice-management": """
+INSERT INTO PAYMENT (invoice_id, customer_id, payment_date_time, payment_amount, payment_method) VALUES
+    (2, 1, '2024-06-10 16:00:00+09', 100.00, '銀行振込');
+INSERT INTO PAYMENT (invoice_id, customer_id, payment_date_time, payment_amount, payment_method) VALUES
+    (2, 1, '2024-04-20 16:00:00+09', 200.00, '銀行振込'),
+    (2, 1, '2024-05-10 16:00:00+09', 300.00, '現金');
+INSERT INTO INVOICE_SEND (invoice_id, customer_id, send_date_time, send_method) VALUES
+    (2, 1, '2024-03-20 10:00:00+09', '郵送');
+""",
+}
+
+
+def test_validity_ranges_follow_event_datetime_type():
+    model = load_model("invoice-management")
+    schema = parse_schema(model.path / "schema.sql")
+    _, events, members = find_validities(model, schema)
+    assert {v.table: v.range for v in events} == {
+        "INVOICE_SEND_VALIDITY": "tstzrange", "PAYMENT_VALIDITY": "tstzrange",
+        "CONFIRMATION_SEND_VALIDITY": "tstzrange"}
+    assert members == []
+
+
+@pytest.mark.parametrize("project", ["invoice-management", "project-record-system"])
+def test_committed_temporal_is_current(project):
+    model = load_model(project)
+    sql = temporal_sql(model, parse_schema(model.path / "schema.sql"))
+    assert sql == (model.path / "temporal.sql").read_text(encoding="utf-8")
+
+
+def _snapshot(db, tables):
+    return {t: db.rows(f"SELECT to_jsonb(t)::text AS r FROM {t} t ORDER BY r") for t in tables}
+
+
+@pytest.mark.parametrize("project", ["invoice-management", "project-record-system"])
+def test_triggers_match_rebuild_validity(scratch_db, project):
+    """追記トリガーで保った有効期間が rebuild_validity() の結果と一致する"""
+    model = load_model(project)
+    scratch_db.load(model, ("schema.sql", "projections.sql", "temporal.sql", "sample_data.sql"))
+    scratch_db.run(OUT_OF_ORDER_EVENTS[project])
+    _, events, members = find_validities(model, parse_schema(model.path / "schema.sql"))
+    tables = [v.table for v in events + members]
+
+    by_trigger = _snapshot(scratch_db, tables)
+    scratch_db.run("CALL rebuild_validity();")
+    assert _snapshot(scratch_db, tables) == by_trigger
+
+
+def _execute(db, sql, args):
+    literals = ", ".join("'{" + ",".join(map(str, a)) + "}'" if isinstance(a, list) else f"'{a}'"
+                         for a in args)
+    return db.rows(f"PREPARE q AS {sql};\nEXECUTE q({literals});")
+
+
+def _scan(op, key, as_of):
+    """as_of 以前の履歴を走査する定義どおりのクエリ（有効期間テーブルを使う版と比べる）"""
+    where = f"WHERE {op.key} = {key} AND {op.datetime} <= '{as_of}'"
+    if op.kind == "summary":
+        items = [str(key)] + [api._SUMMARY[k].format(dt=op.datetime) for k in op.summary_keys]
+        return f"SELECT {', '.join(items)} FROM {op.table} {where}"
+    return (f"SELECT {op.select_list()} FROM {op.table} {where} "
+            f"ORDER BY {op.datetime} DESC, {op.pk} DESC LIMIT 1")
+
+
+def test_api_as_of_matches_history_scan(scratch_db):
+    project = "project-record-system"
+    model = load_model(project)
+    scratch_db.load(model, ("schema.sql", "projections.sql", "temporal.sql", "sample_data.sql"))
+    scratch_db.run(OUT_OF_ORDER_EVENTS[project])
+    ops = [op for op in load_operations(project)[0] if op.validity is not None]
+    assert {op.table for op in ops} == {"PROJECT_START", "RISK_EVALUATE", "PROJECT_COMPLETE"}
+
+    for op in ops:
+        times = [t for (t,) in scratch_db.rows(f"SELECT DISTINCT {op.datetime} FROM {op.table}")]
+        times += ["1900-01-01 00:00+00", "2100-01-01 00:00+00", "2030-02-01 08:59:59+09"]
+        for key in (1, 2, 99):
+            for at in times:
+                if op.kind == "latest_batch":
+                    sql, args = api.latest_batch_query(op, [key], at)
+                elif op.kind == "latest":
+                    sql, args = api.latest_query(op, key, at)
+                else:
+                    sql, args = api.summary_query(op, key, at)
+                assert _execute(scratch_db, sql, args) == scratch_db.rows(_scan(op, key, at)), (op.path, key, at)
+
+
+def test_api_member_as_of(scratch_db):
+    """担当者の ID で引くアサインと現在のメンバーの as_of（プロジェクトの人の有効期間）"""
+    project = "project-record-system"
+    model = load_model(project)
+    scratch_db.load(model, ("schema.sql", "projections.sql", "temporal.sql", "sample_data.sql"))
+    scratch_db.run(OUT_OF_ORDER_EVENTS[project])
+    ops = {op.operation_id: op for op in load_operations(project)[0]}
+    members, latest, batch, summary = (ops[name] for name in (
+        "getProjectCurrentPersons", "getPersonLatestAssign", "batchGetPersonLatestAssign", "getPersonAssignSummary"))
+
+    # 十分先の時点のメンバーは、現在のメンバー（交代で外れたアサインを除く）と同じ
+    for (key,) in scratch_db.rows("SELECT project_id FROM PROJECT"):
+        assert _execute(scratch_db, *api.members_query(members, key, "2100-01-01 00:00+00")) == \
+            _execute(scratch_db, *api.members_query(members, key)), key
+
+    # 担当者 4 はプロジェクト 2 に 1/1 にアサインされ、2/1 の交代で外れ、3/1 に再びアサインされる
+    def assigned(at):
+        rows = _execute(scratch_db, *api.members_query(members, 2, at))
+        return [(person, dt) for _, _, person, role, dt, _ in rows if role == "1"]
+
+    def latest_of(at):
+        row = _execute(scratch_db, *api.latest_query(latest, 4, at))
+        assert _execute(scratch_db, *api.latest_batch_query(batch, [4], at)) == row
+        return [(project_id, dt) for _, project_id, _, _, dt, _ in row]
+
+    jan, mar = "2030-01-01 00:00:00+00", "2030-03-01 00:00:00+00"
+    assert ("4", jan) in assigned("2030-01-15 00:00+09")
+    assert not [p for p, dt in assigned("2030-02-15 00:00+09") if dt.startswith("2030")]
+    assert ("4", mar) in assigned("2030-03-15 00:00+09")
+    assert latest_of("2030-01-15 00:00+09") == [("2", jan)]
+    assert latest_of("2030-02-15 00:00+09")[0][1] < jan
+    assert latest_of("2030-03-15 00:00+09") == [("2", mar)]
+    counts = {at: _execute(scratch_db, *api.summary_query(summary, 4, at))[0][1]
+              for at in ("2030-01-15 00:00+09", "2030-02-15 00:00+09")}
+    assert int(counts["2030-01-15 00:00+09"]) == int(counts["2030-02-15 00:00+09"]) + 1
+    assert _execute(scratch_db, *api.summary_query(summary, 99, "2030-01-15 00:00+09")) == [("99", "0", "", "")]
@@ -0,0 +1,122 @@
+import json
+import shutil
+
+import pytest
+
+from tools.model import load_model, project_dir
+from tools.validate import Graph, Validator, find_cycles
+
+
+def _attr(english, type_="INT", pk=False):
+    return {"japanese": english, "english": english, "type": type_, "is_primary_key": pk}
+
+
+def _fk(parent, child, attribute, to_attribute=None, cardinality="1:N"):
+    return {"from": parent, "to": child, "cardinality": cardinality,
+            "from_attribute": attribute, "to_attribute": to_attribute or attribute}
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    """invoice-management の model.json に規則違反を 1 つずつ仕込んだもの"""
+    shutil.copy(project_dir("invoice-management") / "model.json", tmp_path / "model.json")
+    data = json.loads((tmp_path / "model.json").read_text(encoding="utf-8"))
+    entities = {e["name"]: e for e in data["entities"]}
+    entities["InvoiceSend"]["attributes"].append(_attr("ReceivedDateTime", "TIMESTAMP"))
+    entities["Customer"]["attributes"] += [_attr("UpdatedAt", "TIMESTAMP"), _attr("LastInvoiceID")]
+    entities["Invoice"]["attributes"].append(_attr("due_note", "VARCHAR(50)"))
+    for attr in entities["Payment"]["attributes"]:
+        if attr["english"] == "CustomerID":
+            attr["type"] = "VARCHAR(10)"
+    data["relationships"] += [
+        _fk("Invoice", "Customer", "InvoiceID", "LastInvoiceID"),       # Customer ⇄ Invoice の循環
+        _fk("Customer", "Customer", "CustomerID"),                     # 主キー自身の自己参照
+        {"from": "Customer", "to": "Invoice", "cardinality": "M:N"},   # 交差テーブルのない多対多
+    ]
+    (tmp_path / "model.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return load_model(tmp_path)
+
+
+def _messages(validator, level):
+    return [(i.check, i.entity, i.message) for i in validator.issues() if i.level == level]
+
+
+@pytest.mark.parametrize("project", ["invoice-management", "project-record-system"])
+def test_artifact_models_are_valid(project):
+    validator = Validator()
+    validator.run(load_model(project))
+    result = validator.to_json()
+    assert result["is_valid"]
+    assert result["errors"] == [] and result["warnings"] == []
+    assert all(d["passed"] for d in result["validation_details"].values())
+
+
+def test_seeded_violations_are_reported(seeded):
+    validator = Validator()
+    validator.run(seeded)
+    errors = _messages(validator, "error")
+    expected = [
+        ("event_datetime_check", "InvoiceSend", "日時属性が複数あります"),
+        ("resource_check", "Customer", "UpdatedAt：リソースは更新日時を持ちません"),
+        ("naming_check", "Invoice", "属性名 due_note は PascalCase"),
+        ("relationship_check", "Payment", "CustomerID の型 VARCHAR(10) が参照先の主キー CustomerID の型"),
+        ("relationship_check", "Customer", "CustomerID が自分自身の主キーを参照しています"),
+        ("relationship_check", "Customer", "多対多の関連 Customer → Invoice は交差テーブル"),
+        ("relationship_check", "Customer", "外部キーが循環しています（Customer → Invoice → Customer）"),
+    ]
+    for check, entity, text in expected:
+        assert any(c == check and e == entity and text in m for c, e, m in errors), text
+    assert len(errors) == len(expected)
+
+    result = validator.to_json()
+    assert not result["is_valid"]
+    failed = {check for check, detail in result["validation_details"].items() if not detail["passed"]}
+    assert failed == {"event_datetime_check", "resource_check", "relationship_check", "naming_check"}
+
+
+def test_find_cycles_ignores_self_references_and_respects_roots(seeded):
+    graph = Graph(seeded)
+    assert find_cycles(graph) == [["Customer", "Invoice"]]
+    assert find_cycles(graph, ["Invoice"]) == [["Customer", "Invoice"]]
+    assert find_cycles(graph, ["Payment"]) == []
+    assert find_cycles(Graph(load_model("project-record-system"))) == []
+
+
+def test_partial_run_matches_full_run(seeded):
+    """--watch のように変わったエンティティだけ検査し直しても、全件の検査と同じ結果になる"""
+    validator = Validator()
+    validator.run(load_model("invoice-management"))
+    validator.run(seeded, ["Customer", "Invoice", "InvoiceSend", "Payment"])
+
+    full = Validator()
+    full.run(seeded)
+    assert validator.to_json() == full.to_json()
+
+
+def test_partial_run_rechecks_attributes_named_after_changed_primary_keys(tmp_path):
+    """主キー名の持ち主が増減したら、関連のない同名属性を持つエンティティも検査し直す"""
+    data = json.loads((project_dir("invoice-management") / "model.json").read_text(encoding="utf-8"))
+    customer = next(e for e in data["entities"] if e["name"] == "Customer")
+    customer["attributes"].append(_attr("RegionID"))
+    without = tmp_path / "without"
+    without.mkdir()
+    (without / "model.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    data["entities"].append({"name": "Region", "type": "resource", "japanese": "地域",
+                             "attributes": [_attr("RegionID", pk=True), _attr("RegionName", "VARCHAR(50)")]})
+    added = tmp_path / "added"
+    added.mkdir()
+    (added / "model.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    validator = Validator()
+    validator.run(load_model(without))
+    assert validator.run(load_model(added), ["Region"]) == ["Region", "Customer"]
+    full = Validator()
+    full.run(load_model(added))
+    assert validator.to_json() == full.to_json()
+    assert ("relationship_check", "Customer", "RegionID は Region の主キーと同名ですが関連が定義されていません") \
+        in _messages(validator, "warning")
+
+    # 持ち主がいなくなった場合も同じ
+    validator.run(load_model(without), ["Region"])
+    full.run(load_model(without))
+    assert validator.to_json() == full.to_json()
@@ -0,0 +1,5 @@
+"""cc-data-modeler 補助ツール群
+
+artifacts/{プロジェクト名}/ 配下の model.json・entities_classified.json を入力に、
+スキルの出力を補う決定的（LLMを介さない）な生成・検証処理を提供する。
+"""
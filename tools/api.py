@@ -0,0 +1,899 @@
+"""API のページネーションとバッチ取得、操作ごとの SQL（/openapi-generator の追加出力）
+
+openapi.yaml の一覧・履歴エンドポイントを LIMIT / OFFSET からキーセット（カーソル）
+ページネーションに書き換え、ID を複数まとめて引くバッチ取得エンドポイントを加える。
+あわせて GET 操作ごとの SQL を model.json / schema.sql から導出し、api_queries.sql に
+書き出す。参照サーバー（tools.api_server）は同じ定義から SQL を組み立てる。
+
+- 一覧: (ソート列, 主キー) をカーソルにし、前ページ末尾の行より後ろだけを読む。
+  NULL を許すソート列は NULLS LAST で並べ、カーソルが NULL 区間に入ったら主キーで進む
+- 履歴: (イベント日時, イベントID) をカーソルにする
+- OFFSET と違い読み飛ばす行がないので、深いページでもインデックスの範囲走査 1 回で済む。
+  総件数（total）は全件の走査になるため返さず、次ページの有無を nextCursor で示す
+- バッチ: GET /api/{リソース}/batch?ids=1,2,3（主キー参照）と
+  GET /api/{リソース}/{イベント}/latest?ids=1,2,3（ID ごとに最新 1 件）
+- 時点指定: 主体リソースの ID で引く最新取得・サマリーに as_of（日時）を加える。temporal.sql の
+  {イベント}_VALIDITY から as_of を含む行を GiST インデックスで 1 件引き、最新の行はそのイベントID、
+  件数は seq、最新日時は valid_from から返す（as_of までの履歴は走査しない）。
+  イベント経由の多対多の相手側の ID で引くもの（/persons/{ID}/assign/latest など）は
+  {リソース}_{相手}_VALIDITY を相手側の (ID, valid_during) の GiST インデックスで引き、その時点で
+  有効だった組み合わせから返す。現在のメンバー（/members/current）は {リソース}_{相手}_as_of() で引く。
+  どちらの有効期間テーブルもない操作（イベントID で引くものなど）には as_of を付けない。
+  as_of を使う DB には temporal.sql が要る
+
+使い方:
+    python -m tools.api project-record-system            # 操作ごとの SQL を表示
+    python -m tools.api project-record-system --write    # openapi.yaml を書き換え、api_queries.sql を出力
+"""
+
+import argparse
+import base64
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+
+from tools import openapi
+from tools.index_advisor import WorkloadAnalyzer, id_columns
+from tools.model import load_model, to_snake
+from tools.projection import find_memberships
+from tools.schema import parse_schema
+from tools.temporal import find_validities
+
+QUERIES_NAME = "api_queries.sql"
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+MAX_BATCH = 100
+
+_RULE = "-- " + "=" * 48
+_SQL_EXAMPLE = re.compile(r"```sql(.*?)```", re.S)
+_WHERE_KEY = re.compile(r"\bWHERE\s+(?:\w+\.)?(\w+)\s*=", re.I)
+_PAGE_PARAMS = ("limit", "offset", "cursor", "sort")
+_SUMMARY = {"eventCount": "COUNT(*)", "latestEvent": "MAX({dt})", "firstEvent": "MIN({dt})"}
+# as_of 指定のサマリー: 時点を含む有効期間の行（v）の件数と開始日時、初回は主体の最初の行
+_VALIDITY_SUMMARY = {"eventCount": "COALESCE(v.seq, 0)", "latestEvent": "v.valid_from",
+                     "firstEvent": "(SELECT MIN(f.valid_from) FROM {table} f WHERE f.{key} = v.{key})"}
+# 組み合わせの有効期間で引くサマリー: 時点で有効だった組み合わせ（v）の件数と開始日時
+_MEMBER_SUMMARY = {"eventCount": "COUNT(v.source_event_id)", "latestEvent": "MAX(lower(v.valid_during))",
+                   "firstEvent": "MIN(lower(v.valid_during))"}
+_CURSOR_EXAMPLE = "eyJ2IjpbIjIwMjYtMDEtMTFUMTA6MDA6MDArMDk6MDAiLDEyM119"
+
+
+# ------------------------------------------------
+# カーソル
+# ------------------------------------------------
+
+def encode_cursor(values):
+    """前ページ末尾の行のキー値を URL に載せられる不透明な文字列にする"""
+    raw = json.dumps({"v": values}, ensure_ascii=False, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(text):
+    """encode_cursor の逆。壊れたカーソルは ValueError"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(text + "=" * (-len(text) % 4)))
+        values = data["v"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"invalid cursor: {text}") from e
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError(f"invalid cursor: {text}")
+    return values
+
+
+# ------------------------------------------------
+# 操作の定義
+# ------------------------------------------------
+
+@dataclass
+class Filter:
+    param: str
+    column: str
+    operator: str                # =, >=, <=, contains（部分一致）
+    type: str
+
+
+@dataclass
+class Operation:
+    operation_id: str
+    path: str
+    kind: str                    # list / get / batch / latest / latest_batch / history / summary / members
+    table: str
+    fields: list                 # [(列, JSON キー)]
+    types: dict                  # {列: 型}
+    key: str = None              # パスパラメータ・ids で絞り込む列
+    key_any: list = field(default_factory=list)   # いずれかが一致すればよい列（旧側・新側の外部キーなど）
+    pk: str = None               # 並びを一意にする列（主キー）
+    datetime: str = None         # イベント日時の列
+    response_key: str = None     # 一覧・バッチの配列のキー / サマリーの ID のキー
+    filters: list = field(default_factory=list)
+    sorts: dict = field(default_factory=dict)     # {sort の値: (列, 降順か)}
+    default_sort: str = None
+    nullable: set = field(default_factory=set)
+    summary_keys: list = field(default_factory=list)
+    exclude: tuple = None        # members: (交代イベントのテーブル, 主体列, 旧側の列, 日時列, [(共通の列)])
+    validity: str = None         # as_of で引く有効期間テーブル（temporal.sql の {イベント}_VALIDITY）
+    membership: object = None    # as_of で引く組み合わせの有効期間（temporal.MembershipValidity）
+
+    @property
+    def json_keys(self):
+        return dict(self.fields)
+
+    @property
+    def has_as_of(self):
+        return self.validity is not None or self.membership is not None
+
+    def cast(self, column):
+        return self.types[column]
+
+    def select_list(self, alias=None, indent="    "):
+        prefix = f"{alias}." if alias else ""
+        items = [f"{prefix}{c}" if c == k else f'{prefix}{c} AS "{k}"' for c, k in self.fields]
+        return f",\n{indent}".join(items)
+
+
+class _Args:
+    """$n プレースホルダと引数を対応づけて積む"""
+
+    def __init__(self):
+        self.values = []
+
+    def add(self, value, type_=None):
+        self.values.append(value)
+        return f"${len(self.values)}::{type_}" if type_ else f"${len(self.values)}"
+
+
+def _key_match(op, value):
+    """絞り込み列の条件（key_any があれば、いずれかの列が一致する行）"""
+    if not op.key_any:
+        return f"{op.key} = {value}"
+    return "(" + " OR ".join(f"{column} = {value}" for column in op.key_any) + ")"
+
+
+def _where(conditions):
+    if not conditions:
+        return []
+    return ["WHERE " + conditions[0]] + [f"  AND {c}" for c in conditions[1:]]
+
+
+def _keyset(op, column, desc, cursor, args):
+    """(column, pk) が前ページ末尾の行より後ろにある条件"""
+    pk_type = op.cast(op.pk)
+    after = "<" if desc else ">"
+    if column == op.pk:
+        return f"{op.pk} {after} {args.add(cursor[1], pk_type)}"
+    if column not in op.nullable:
+        return (f"({column}, {op.pk}) {after} "
+                f"({args.add(cursor[0], op.cast(column))}, {args.add(cursor[1], pk_type)})")
+    if cursor[0] is None:
+        return f"{column} IS NULL AND {op.pk} {after} {args.add(cursor[1], pk_type)}"
+    value = args.add(cursor[0], op.cast(column))
+    return (f"({column} {after} {value} OR ({column} = {value} AND {op.pk} {after} "
+            f"{args.add(cursor[1], pk_type)}) OR {column} IS NULL)")
+
+
+def _order(op, column, desc):
+    direction = " DESC" if desc else ""
+    if column == op.pk:
+        return f"{op.pk}{direction}"
+    nulls = " NULLS LAST" if desc and column in op.nullable else ""
+    return f"{column}{direction}{nulls}, {op.pk}{direction}"
+
+
+def list_query(op, filters=None, sort=None, cursor=None, limit=DEFAULT_LIMIT):
+    """一覧の 1 ページ分（limit + 1 行を読み、余った 1 行で次ページの有無を判定する）"""
+    filters = filters or {}
+    column, desc = op.sorts[sort or op.default_sort]
+    args, conditions = _Args(), []
+    for f in op.filters:
+        if f.param not in filters:
+            continue
+        if f.operator == "contains":
+            conditions.append(f"strpos({f.column}, {args.add(filters[f.param], 'TEXT')}) > 0")
+        else:
+            conditions.append(f"{f.column} {f.operator} {args.add(filters[f.param], f.type)}")
+    if cursor is not None:
+        conditions.append(_keyset(op, column, desc, cursor, args))
+    lines = ["SELECT", "    " + op.select_list(), f"FROM {op.table}"]
+    lines += _where(conditions)
+    lines += [f"ORDER BY {_order(op, column, desc)}", f"LIMIT {args.add(limit + 1)}"]
+    return "\n".join(lines), args.values
+
+
+def history_query(op, key, cursor=None, limit=DEFAULT_LIMIT):
+    """イベント履歴の 1 ページ分（(日時, イベントID) の昇順）"""
+    args = _Args()
+    conditions = [_key_match(op, args.add(key, op.cast(op.key)))]
+    if cursor is not None:
+        conditions.append(
+            f"({op.datetime}, {op.pk}) > "
+            f"({args.add(cursor[0], op.cast(op.datetime))}, {args.add(cursor[1], op.cast(op.pk))})")
+    lines = ["SELECT", "    " + op.select_list(), f"FROM {op.table}"]
+    lines += _where(conditions)
+    lines += [f"ORDER BY {op.datetime}, {op.pk}", f"LIMIT {args.add(limit + 1)}"]
+    return "\n".join(lines), args.values
+
+
+def get_query(op, key):
+    sql = "\n".join([
+        "SELECT", "    " + op.select_list(), f"FROM {op.table}",
+        f"WHERE {op.key} = $1::{op.cast(op.key)}",
+    ])
+    return sql, [key]
+
+
+def batch_query(op, keys):
+    """主キーの一括参照（ids の指定順で返す）"""
+    sql = "\n".join([
+        "SELECT", "    " + op.select_list("t"),
+        f"FROM unnest($1::{op.cast(op.key)}[]) WITH ORDINALITY AS ids(id, n)",
+        f"JOIN {op.table} t ON t.{op.key} = ids.id",
+        "ORDER BY ids.n",
+    ])
+    return sql, [keys]
+
+
+def _valid_at(op, key, as_of, args):
+    """有効期間テーブルで key の as_of を含む行を引く条件"""
+    if op.validity is None:
+        raise ValueError(f"GET {op.path}: as_of を引く有効期間テーブルがない")
+    return f"v.{op.key} = {key} AND v.valid_during @> {args.add(as_of, op.cast(op.datetime))}"
+
+
+def _member_valid_at(op, key, as_of, args):
+    """組み合わせの有効期間テーブルで、相手側 key の as_of に有効だった組み合わせ（op のイベントで始まったもの）"""
+    v = op.membership
+    return (f"v.{v.membership.member_key} = {key} AND v.valid_during @> {args.add(as_of, op.cast(op.datetime))}"
+            f" AND v.source_event = '{op.table}'")
+
+
+def _member_latest(op, key, as_of, args, indent=""):
+    """相手側 key の as_of に有効だった組み合わせのうち、最も新しく始まった 1 件"""
+    return [
+        f"{indent}SELECT", f"{indent}    " + op.select_list("e", indent=indent + "    "),
+        f"{indent}FROM {op.membership.table} v",
+        f"{indent}JOIN {op.table} e ON e.{op.pk} = v.source_event_id",
+        f"{indent}WHERE " + _member_valid_at(op, key, as_of, args),
+        f"{indent}ORDER BY e.{op.datetime} DESC, e.{op.pk} DESC",
+        f"{indent}LIMIT 1",
+    ]
+
+
+def latest_query(op, key, as_of=None):
+    """最新 1 件（as_of を渡すと、有効期間テーブルからその時点で最新だった 1 件）"""
+    args = _Args()
+    key_param = args.add(key, op.cast(op.key))
+    if as_of is not None and op.membership is not None:
+        return "\n".join(_member_latest(op, key_param, as_of, args)), args.values
+    if as_of is not None:
+        sql = "\n".join([
+            "SELECT", "    " + op.select_list("e"),
+            f"FROM {op.validity} v",
+            f"JOIN {op.table} e ON e.{op.pk} = v.{op.pk}",
+            "WHERE " + _valid_at(op, key_param, as_of, args),
+        ])
+        return sql, args.values
+    lines = ["SELECT", "    " + op.select_list(), f"FROM {op.table}"]
+    lines += _where([_key_match(op, key_param)])
+    lines += [f"ORDER BY {op.datetime} DESC, {op.pk} DESC", "LIMIT 1"]
+    return "\n".join(lines), args.values
+
+
+def latest_batch_query(op, keys, as_of=None):
+    """ID ごとの最新 1 件（ID ごとにインデックスを 1 回引く LATERAL 結合）"""
+    args = _Args()
+    ids = args.add(keys, f"{op.cast(op.key)}[]")
+    if as_of is not None and op.membership is not None:
+        sql = "\n".join([
+            "SELECT e.*",
+            f"FROM unnest({ids}) WITH ORDINALITY AS ids(id, n)",
+            "CROSS JOIN LATERAL (",
+            *_member_latest(op, "ids.id", as_of, args, indent="    "),
+            ") e",
+            "ORDER BY ids.n",
+        ])
+        return sql, args.values
+    if as_of is not None:
+        sql = "\n".join([
+            "SELECT", "    " + op.select_list("e"),
+            f"FROM unnest({ids}) WITH ORDINALITY AS ids(id, n)",
+            f"JOIN {op.validity} v ON " + _valid_at(op, "ids.id", as_of, args),
+            f"JOIN {op.table} e ON e.{op.pk} = v.{op.pk}",
+            "ORDER BY ids.n",
+        ])
+        return sql, args.values
+    conditions = [_key_match(op, "ids.id")]
+    sql = "\n".join([
+        "SELECT e.*",
+        f"FROM unnest({ids}) WITH ORDINALITY AS ids(id, n)",
+        "CROSS JOIN LATERAL (",
+        "    SELECT", "        " + op.select_list(indent="        "),
+        f"    FROM {op.table}",
+        *("    " + c for c in _where(conditions)),
+        f"    ORDER BY {op.datetime} DESC, {op.pk} DESC",
+        "    LIMIT 1",
+        ") e",
+        "ORDER BY ids.n",
+    ])
+    return sql, args.values
+
+
+def summary_query(op, key, as_of=None):
+    """イベントの件数・初回/最新日時（as_of を渡すと、その時点の有効期間の行の累計から返す。
+    組み合わせの有効期間で引くものは、その時点で有効だった組み合わせの件数・開始日時）
+    """
+    args = _Args()
+    key_param = args.add(key, op.cast(op.key))
+    if as_of is not None and op.membership is not None:
+        items = [f'ids.id AS "{op.response_key}"']
+        items += [f'{_MEMBER_SUMMARY[k]} AS "{k}"' for k in op.summary_keys]
+        sql = "\n".join([
+            "SELECT", "    " + ",\n    ".join(items),
+            f"FROM (VALUES ({key_param})) AS ids(id)",
+            f"LEFT JOIN {op.membership.table} v ON " + _member_valid_at(op, "ids.id", as_of, args),
+            "GROUP BY ids.id",
+        ])
+        return sql, args.values
+    if as_of is not None:
+        items = [f'ids.id AS "{op.response_key}"']
+        items += [f'{_VALIDITY_SUMMARY[k].format(table=op.validity, key=op.key)} AS "{k}"'
+                  for k in op.summary_keys]
+        sql = "\n".join([
+            "SELECT", "    " + ",\n    ".join(items),
+            f"FROM (VALUES ({key_param})) AS ids(id)",
+            f"LEFT JOIN {op.validity} v ON " + _valid_at(op, "ids.id", as_of, args),
+        ])
+        return sql, args.values
+    items = [f'{key_param} AS "{op.response_key}"']
+    items += [f'{_SUMMARY[k].format(dt=op.datetime)} AS "{k}"' for k in op.summary_keys]
+    lines = ["SELECT", "    " + ",\n    ".join(items), f"FROM {op.table}"]
+    lines += _where([_key_match(op, key_param)])
+    return "\n".join(lines), args.values
+
+
+def members_query(op, key, as_of=None):
+    """交代で外れたアサインを除いた現在のメンバー（as_of を渡すと、{リソース}_{相手}_as_of() でその時点のメンバー）"""
+    if as_of is not None:
+        if op.membership is None:
+            raise ValueError(f"GET {op.path}: as_of を引く有効期間テーブルがない")
+        sql = "\n".join([
+            "SELECT", "    " + op.select_list("l"),
+            f"FROM {op.membership.function}($1::{op.cast(op.key)}, $2::{op.cast(op.datetime)}) m",
+            f"JOIN {op.table} l ON l.{op.pk} = m.source_event_id",
+            f"WHERE m.source_event = '{op.table}'",
+            f"ORDER BY l.{op.datetime}, l.{op.pk}",
+        ])
+        return sql, [key, as_of]
+    table, subject, old, dt, shared = op.exclude
+    lines = [
+        "SELECT", "    " + op.select_list("l"), f"FROM {op.table} l",
+        f"WHERE l.{op.key} = $1::{op.cast(op.key)}",
+    ]
+    if table:
+        conditions = [f"r.{subject} = l.{op.key}", f"r.{old} = l.{shared[0]}"]
+        conditions += [f"r.{c} = l.{c}" for c in shared[1:]]
+        # 同時刻の交代では外れない（projections.sql・query_examples.sql と同じ境界）
+        conditions.append(f"r.{dt} > l.{op.datetime}")
+        lines += ["  AND NOT EXISTS (", f"      SELECT 1 FROM {table} r",
+                  "      WHERE " + "\n        AND ".join(conditions), "  )"]
+    lines.append(f"ORDER BY l.{op.datetime}, l.{op.pk}")
+    return "\n".join(lines), [key]
+
+
+# ------------------------------------------------
+# openapi.yaml からの導出
+# ------------------------------------------------
+
+def _ref_name(schema):
+    ref = (schema or {}).get("$ref", "")
+    return ref.rsplit("/", 1)[-1] if ref.startswith("#/components/schemas/") else None
+
+
+def _response_schema(get):
+    try:
+        return get["responses"]["200"]["content"]["application/json"]["schema"]
+    except (KeyError, TypeError):
+        return None
+
+
+def _array_property(schema):
+    for key, prop in (schema.get("properties") or {}).items():
+        if prop.get("type") == "array":
+            return key, _ref_name(prop.get("items"))
+    return None, None
+
+
+def _fields(doc, schema_name, table):
+    props = doc["components"]["schemas"][schema_name].get("properties", {})
+    return [(to_snake(key), key) for key in props if to_snake(key) in table.columns]
+
+
+def _entity_by_schema(model, name):
+    entity = model.entities.get(name)
+    if entity is None or entity.pk is None:
+        return None
+    return entity
+
+
+class _Deriver:
+    def __init__(self, doc, model, schema):
+        self.doc = doc
+        self.model = model
+        self.schema = schema
+        self.analyzer = WorkloadAnalyzer(schema)
+        self.memberships = find_memberships(model)
+        # (イベントのテーブル, 主体の列) → 有効期間テーブル
+        _, events, members = find_validities(model, schema)
+        self.validities = {(v.event.table, v.key): v.table for v in events}
+        # (組み合わせを作るイベントのテーブル, 相手側の列) → 組み合わせの有効期間
+        self.member_validities = {(v.membership.link.table, v.membership.link_member): v for v in members}
+        self.membership_validities = {v.membership.table: v for v in members}
+        self.warnings = []
+
+    def base(self, path, get, kind, entity, **kwargs):
+        table = self.schema.table(entity.table)
+        op = Operation(
+            operation_id=get["operationId"], path=path, kind=kind, table=table.name,
+            fields=_fields(self.doc, entity.name, table),
+            types={c.name: c.type for c in table.columns.values()},
+            nullable={c.name for c in table.columns.values() if not c.not_null},
+            pk=entity.pk.column,
+            datetime=entity.event_datetime.column if entity.is_event else None,
+            **kwargs)
+        if kind in _AS_OF_NOTES and kind != "members" and not op.key_any:
+            op.validity = self.validities.get((op.table, op.key))
+            if op.validity is None:
+                op.membership = self.member_validities.get((op.table, op.key))
+        return op
+
+    def event_key(self, path, get, entity):
+        """SQL 例の WHERE 句の ID 列から絞り込み列を決める（{key, key_any} を返す）
+
+        対応づけは index_advisor.id_columns と同じ。列が 1 つに決まらないもの
+        （PERSON_REPLACE の PersonID → 旧側・新側）は key_any に全列を入れる。
+        対応する列がなければ ValueError（別の列に読み替えると別の行を返すため）。
+        """
+        example = _SQL_EXAMPLE.search(get.get("description", ""))
+        match = example and _WHERE_KEY.search(example.group(1))
+        if not match:
+            raise ValueError(f"GET {path}: SQL 例の WHERE 句から絞り込み列を読めない")
+        columns = id_columns(match.group(1), entity, self.model, self.schema.table(entity.table).columns)
+        if not columns:
+            raise ValueError(f"GET {path}: {match.group(1)} に当たる列が {entity.table} にない"
+                             "（openapi.yaml の SQL 例を実在する列で書き直してください）")
+        return {"key": columns[0], "key_any": columns if len(columns) > 1 else []}
+
+    def operation(self, path, get):
+        response = _response_schema(get)
+        if response is None:
+            return None
+        ref = _ref_name(response)
+        if ref is not None:
+            entity = _entity_by_schema(self.model, ref)
+            if entity is None:
+                return None
+            if entity.is_event:
+                return self.base(path, get, "latest", entity, **self.event_key(path, get, entity))
+            return self.base(path, get, "get", entity, key=entity.pk.column)
+
+        props = response.get("properties") or {}
+        array_key, item = _array_property(response)
+        if item is None:
+            if "eventCount" in props:
+                return self.summary(path, get, props)
+            return None
+        entity = _entity_by_schema(self.model, item)
+        if entity is None:
+            return None
+        if path.endswith("/members/current"):
+            return self.members(path, get, entity, array_key)
+        if path.endswith("/history"):
+            return self.base(path, get, "history", entity, response_key=array_key,
+                             **self.event_key(path, get, entity))
+        if path.endswith("/latest"):
+            return self.base(path, get, "latest_batch", entity, response_key=array_key,
+                             **self.event_key(path, get, entity))
+        if path.endswith("/batch"):
+            return self.base(path, get, "batch", entity, response_key=array_key, key=entity.pk.column)
+        return self.listing(path, get, entity, array_key)
+
+    def listing(self, path, get, entity, array_key):
+        op = self.base(path, get, "list", entity, response_key=array_key)
+        columns = self.schema.table(entity.table).columns
+        for param in get.get("parameters", []):
+            name = param.get("name")
+            if name == "sort":
+                for value in param["schema"].get("enum", []):
+                    column = to_snake(value.lstrip("-"))
+                    if column in columns:
+                        op.sorts[value] = (column, value.startswith("-"))
+                op.default_sort = param["schema"].get("default")
+                continue
+            if name is None or name in _PAGE_PARAMS:
+                continue
+            column, operator = to_snake(name), "="
+            if name.endswith("From") and to_snake(name[:-4]) in columns:
+                column, operator = to_snake(name[:-4]), ">="
+            elif name.endswith("To") and to_snake(name[:-2]) in columns:
+                column, operator = to_snake(name[:-2]), "<="
+            if column not in columns:
+                self.warnings.append(f"GET {path}: パラメータ {name} に対応する列がないため無視した")
+                continue
+            if columns[column].type.upper() == "TEXT" or "部分一致" in param.get("description", ""):
+                operator = "contains"
+            op.filters.append(Filter(name, column, operator, columns[column].type))
+        if not op.sorts:
+            op.sorts[op.pk] = (op.pk, False)
+        if op.default_sort not in op.sorts:
+            op.default_sort = next(iter(op.sorts))
+        return op
+
+    def summary(self, path, get, props):
+        example = _SQL_EXAMPLE.search(get.get("description", ""))
+        table = example and self.analyzer.table_name(re.search(r"\bFROM\s+(\w+)", example.group(1)).group(1))
+        entity = next((e for e in self.model.events if e.table == table), None)
+        if entity is None:
+            return None
+        keys = list(props)
+        return self.base(path, get, "summary", entity, **self.event_key(path, get, entity),
+                         response_key=keys[0], summary_keys=[k for k in keys[1:] if k in _SUMMARY])
+
+    def members(self, path, get, entity, array_key):
+        membership = next((m for m in self.memberships if m.link is entity), None)
+        if membership is None:
+            return None
+        op = self.base(path, get, "members", entity, response_key=array_key,
+                       key=membership.link_subject)
+        op.membership = self.membership_validities.get(membership.table)
+        op.exclude = (None, None, None, None, None)
+        if membership.replace is not None:
+            op.exclude = (membership.replace.table, membership.replace_subject, membership.old_member,
+                          membership.replace.event_datetime.column,
+                          [membership.link_member] + [c for c, _, _ in membership.dims])
+        return op
+
+
+def operations(doc, model, schema):
+    """openapi.yaml の GET 操作を Operation にする。(操作の一覧, 警告) を返す"""
+    deriver = _Deriver(doc, model, schema)
+    ops = []
+    for path, item in doc.get("paths", {}).items():
+        get = item.get("get")
+        if get is None:
+            continue
+        op = deriver.operation(path, get)
+        if op is not None:
+            ops.append(op)
+    return ops, deriver.warnings
+
+
+# ------------------------------------------------
+# openapi.yaml の書き換え
+# ------------------------------------------------
+
+def _cursor_parameter():
+    return {
+        "name": "cursor",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string"},
+        "description": "前ページのレスポンスの nextCursor（省略時は先頭ページ）",
+    }
+
+
+def _next_cursor_property(annotated=False):
+    prop = {"type": "string"}
+    if annotated:
+        prop["description"] = ("項目名: nextCursor\nドメイン: nextCursor\n制約:\n  - 型: 文字列\n"
+                               "  - 最大長: 255文字\n  - 文字種: ASCII文字（英数字、記号）\n  - 必須: いいえ")
+    else:
+        prop["description"] = "次ページのカーソル（最終ページでは null）"
+    prop["nullable"] = True
+    prop["example"] = _CURSOR_EXAMPLE
+    if annotated:
+        prop["x-field-extra-annotation"] = '@nablarch.core.validation.ee.Domain("nextCursor")'
+    return prop
+
+
+def _without_offset(properties, annotated=False):
+    """total / offset を除き、limit の直後に nextCursor を置いたプロパティ"""
+    result = {}
+    for key, prop in properties.items():
+        if key in ("total", "offset"):
+            continue
+        result[key] = prop
+        if key == "limit":
+            result["nextCursor"] = _next_cursor_property(annotated)
+    return result
+
+
+def _paginate_operation(get, order_columns=None):
+    params = get.get("parameters", [])
+    if not any(p.get("name") == "offset" for p in params):
+        return False
+    get["parameters"] = [_cursor_parameter() if p.get("name") == "offset" else p for p in params]
+    schema = _response_schema(get)
+    schema["properties"] = _without_offset(schema["properties"])
+    if "required" in schema:
+        schema["required"] = ["nextCursor" if r == "offset" else r for r in schema["required"] if r != "total"]
+    description = get.get("description", "")
+    if order_columns is None:
+        get["description"] = description.replace("ページネーション、", "カーソルページネーション、", 1)
+    else:
+        get["description"] = _keyset_description(description, *order_columns)
+    return True
+
+
+def _keyset_description(description, datetime, pk):
+    """履歴の説明と SQL 例を OFFSET からキーセットに書き換える"""
+    head, sep, rest = description.partition("\n\n")
+    note = (f"nextCursor を cursor に渡すと、前ページ末尾の ({datetime}, {pk}) より後ろを読みます"
+            "（OFFSET による読み飛ばしはしません）。")
+    description = f"{head}{sep}{note}\n\n{rest}" if sep else f"{head}\n\n{note}"
+    return re.sub(
+        r"ORDER BY (\w+) ASC\nLIMIT \? OFFSET \?;",
+        lambda m: f"AND ({m.group(1)}, {pk}) > (?, ?)\nORDER BY {m.group(1)} ASC, {pk} ASC\nLIMIT ?;",
+        description)
+
+
+def _ids_parameter():
+    return {
+        "name": "ids",
+        "in": "query",
+        "required": True,
+        "style": "form",
+        "explode": False,
+        "schema": {"type": "array", "items": {"type": "integer"}, "minItems": 1, "maxItems": MAX_BATCH},
+        "description": f"取得するIDのカンマ区切りリスト（最大{MAX_BATCH}件）",
+    }
+
+
+def _batch_get(get, operation_id, summary, description, sql, array_key, item_ref):
+    return {"get": {
+        "summary": summary,
+        "description": f"{description}\n\nSQL例:\n```sql\n{sql}\n```",
+        "operationId": operation_id,
+        "tags": [operation_id] + get["tags"][1:],
+        "responses": {
+            "200": {"description": "成功", "content": {"application/json": {"schema": {
+                "type": "object",
+                "required": [array_key],
+                "properties": {array_key: {"type": "array", "items": {"$ref": item_ref}}},
+            }}}},
+            "400": {"$ref": "#/components/responses/BadRequest"},
+            "500": {"$ref": "#/components/responses/InternalServerError"},
+        },
+        "parameters": [{"$ref": "#/components/parameters/Ids"}],
+        "security": [{"BearerAuth": []}],
+    }}
+
+
+def _batch_paths(path, get, model):
+    """単体取得・最新取得の GET から、対応するバッチ取得の (パス, 定義) を作る"""
+    response = _response_schema(get) or {}
+    name = _ref_name(response)
+    entity = _entity_by_schema(model, name) if name else None
+    if entity is None:
+        return None
+    compact = entity.table.replace("_", "")
+    operation_id = "batch" + get["operationId"][:1].upper() + get["operationId"][1:]
+    if entity.is_resource and re.search(r"/\{\w+\}$", path):
+        pk = entity.pk.english
+        sql = f"SELECT * FROM {compact}\nWHERE {pk} = ANY(?);"
+        return re.sub(r"/\{\w+\}$", "/batch", path), _batch_get(
+            get, operation_id, f"{entity.name}を複数まとめて取得",
+            f"指定したIDの{entity.name}をまとめて取得します（最大{MAX_BATCH}件）。\n\n"
+            "結果は ids の指定順で、存在しないIDは含めません。",
+            sql, path.split("/")[2], response["$ref"])
+    if entity.is_event and path.endswith("/latest") and "{" in path:
+        example = _SQL_EXAMPLE.search(get.get("description", ""))
+        match = example and _WHERE_KEY.search(example.group(1))
+        if not match:
+            return None
+        key, dt = match.group(1), entity.event_datetime.english
+        sql = (f"SELECT DISTINCT ON ({key}) * FROM {compact}\nWHERE {key} = ANY(?)\n"
+               f"ORDER BY {key}, {dt} DESC, {entity.pk.english} DESC;")
+        return re.sub(r"/\{\w+\}/", "/", path), _batch_get(
+            get, operation_id, get["summary"].replace("を取得", "を複数まとめて取得"),
+            f"{get['description'].split(chr(10))[0]}\n\n"
+            f"ids に指定したIDごとに最新の1件を返します（最大{MAX_BATCH}件）。"
+            "イベントのないIDは含めません。",
+            sql, "events", response["$ref"])
+    return None
+
+
+def paginate(doc, model):
+    """openapi.yaml をキーセットページネーションとバッチ取得に書き換える（何度実行しても同じ結果）"""
+    paths = {}
+    for path, item in doc["paths"].items():
+        paths[path] = item
+        get = item.get("get")
+        if get is None:
+            continue
+        response = _response_schema(get) or {}
+        _, item_name = _array_property(response) if "properties" in response else (None, None)
+        entity = _entity_by_schema(model, item_name) if item_name else None
+        if path.endswith("/history") and entity is not None and entity.is_event:
+            _paginate_operation(get, (entity.event_datetime.english, entity.pk.english))
+        else:
+            _paginate_operation(get)
+        batch = _batch_paths(path, get, model)
+        if batch is not None and batch[0] not in doc["paths"]:
+            paths[batch[0]] = batch[1]
+    doc["paths"] = paths
+
+    components = doc["components"]
+    parameters = {}
+    for key, param in components["parameters"].items():
+        if key == "Offset":
+            key, param = "Cursor", _cursor_parameter()
+        parameters[key] = param
+        if key == "Cursor" and "Ids" not in components["parameters"]:
+            parameters["Ids"] = _ids_parameter()
+    components["parameters"] = parameters
+
+    paginated = components["schemas"].get("PaginatedResponse")
+    if paginated is not None and "offset" in paginated["properties"]:
+        paginated["required"] = ["nextCursor" if r == "offset" else r
+                                 for r in paginated["required"] if r != "total"]
+        paginated["properties"] = _without_offset(paginated["properties"], annotated=True)
+    example = components.get("examples", {}).get("PaginatedList", {}).get("value")
+    if example is not None and "offset" in example:
+        components["examples"]["PaginatedList"]["value"] = {
+            "limit": example["limit"], "nextCursor": _CURSOR_EXAMPLE,
+            **{k: v for k, v in example.items() if k not in ("total", "limit", "offset")}}
+    return doc
+
+
+_AS_OF_NOTES = {
+    "latest": "as_of を指定すると、その日時の時点で最新だった1件を返します（有効期間テーブルを時点で1回引きます）。",
+    "latest_batch": "as_of を指定すると、IDごとにその日時の時点で最新だった1件を返します。",
+    "summary": "as_of を指定すると、その日時の時点の件数・最新日時を返します（有効期間テーブルの累計を使います）。",
+    "members": "as_of を指定すると、その日時の時点のメンバーを返します（組み合わせの有効期間テーブルを時点で引きます）。",
+}
+# 組み合わせの有効期間で引く操作の説明（その時点で有効だった組み合わせから返す）
+_MEMBER_AS_OF_NOTES = {
+    "latest": "as_of を指定すると、その日時の時点で有効だったもののうち最新の1件を返します（組み合わせの有効期間テーブルを時点で引きます）。",
+    "latest_batch": "as_of を指定すると、IDごとにその日時の時点で有効だったもののうち最新の1件を返します。",
+    "summary": "as_of を指定すると、その日時の時点で有効だったものの件数・開始日時を返します（組み合わせの有効期間テーブルを使います）。",
+}
+_AS_OF_NOTE_PREFIX = "as_of を指定すると、"
+
+
+def _as_of_parameter():
+    return {
+        "name": "as_of",
+        "in": "query",
+        "required": False,
+        "schema": {"type": "string", "format": "date-time"},
+        "description": "この日時の時点の値を返す（ISO 8601、省略時は現在）",
+    }
+
+
+def _without_as_of(get, ref):
+    """as_of のパラメータと説明を外す"""
+    if ref in get.get("parameters", []):
+        get["parameters"] = [p for p in get["parameters"] if p != ref]
+        if not get["parameters"]:
+            del get["parameters"]
+    paragraphs = get.get("description", "").split("\n\n")
+    get["description"] = "\n\n".join(p for p in paragraphs if not p.startswith(_AS_OF_NOTE_PREFIX))
+
+
+def add_as_of(doc, ops):
+    """有効期間テーブルのある最新取得・サマリー・現在のメンバーの GET に時点指定（as_of）を加える
+
+    それ以外の操作からは外す（何度実行しても同じ結果）。
+    """
+    ref = {"$ref": "#/components/parameters/AsOf"}
+    supported = {op.path: op for op in ops if op.has_as_of}
+    for path, item in doc["paths"].items():
+        get = item.get("get")
+        if get is None:
+            continue
+        _without_as_of(get, ref)
+        op = supported.get(path)
+        if op is None:
+            continue
+        notes = _MEMBER_AS_OF_NOTES if op.membership is not None and op.kind != "members" else _AS_OF_NOTES
+        description, note = get.get("description", ""), notes[op.kind]
+        if "\n\nSQL例:" in description:
+            get["description"] = description.replace("\n\nSQL例:", f"\n\n{note}\n\nSQL例:", 1)
+        else:
+            get["description"] = f"{description}\n\n{note}"
+        params = get.get("parameters", []) + [ref]
+        # parameters は responses の後に置く（他の操作と同じ並び）
+        get.pop("parameters", None)
+        security = get.pop("security", None)
+        get["parameters"] = params
+        if security is not None:
+            get["security"] = security
+    parameters = doc["components"]["parameters"]
+    if "AsOf" not in parameters:
+        parameters["AsOf"] = _as_of_parameter()
+    return doc
+
+
+# ------------------------------------------------
+# api_queries.sql
+# ------------------------------------------------
+
+_CURSOR_PLACEHOLDER = ["<前ページ末尾のソート値>", "<前ページ末尾のID>"]
+
+
+def _statements(op):
+    """操作の代表的な SQL を (見出し, SQL, 引数の説明) で返す"""
+    key = " / ".join(op.key_any) if op.key_any else op.key
+    if op.kind == "list":
+        filters = {f.param: "" for f in op.filters}
+        labels = [f.param for f in op.filters]
+        column = op.sorts[op.default_sort][0]
+        cursor = ["<前ページ末尾のID>"] if column == op.pk else _CURSOR_PLACEHOLDER
+        return [("先頭ページ", list_query(op, filters)[0], labels + ["limit + 1"]),
+                (f"次ページ、sort={op.default_sort}", list_query(op, filters, cursor=["", ""])[0],
+                 labels + cursor + ["limit + 1"])]
+    if op.kind == "history":
+        first, _ = history_query(op, "")
+        rest, _ = history_query(op, "", cursor=["", ""])
+        return [("先頭ページ", first, [key, "limit + 1"]),
+                ("次ページ", rest, [key, f"前ページ末尾の {op.datetime}", f"前ページ末尾の {op.pk}",
+                                    "limit + 1"])]
+    builder = {"latest": latest_query, "summary": summary_query, "latest_batch": latest_batch_query,
+               "get": get_query, "members": members_query, "batch": batch_query}[op.kind]
+    arg, label = ([], f"{key} の配列") if op.kind in ("batch", "latest_batch") else ("", key)
+    statements = [("", builder(op, arg)[0], [label])]
+    if op.has_as_of:
+        statements.append(("as_of 指定", builder(op, arg, "")[0], [label, "as_of"]))
+    return statements
+
+
+def queries_sql(ops, project):
+    lines = [
+        _RULE,
+        "-- API の GET 操作ごとの SQL（参照サーバー tools.api_server が実行するもの）",
+        f"-- {project}",
+        f"-- 生成: python -m tools.api {project} --write",
+        _RULE,
+        "--",
+        "-- 引数はすべて $n のプレースホルダ（プリペアドステートメントとして接続ごとに再利用）。",
+        "-- 一覧・履歴は limit + 1 行を読み、余った 1 行があれば最後の行のキーを nextCursor にする。",
+    ]
+    for op in ops:
+        for title, sql, params in _statements(op):
+            lines += ["", _RULE, f"-- {op.operation_id}: GET {op.path}" + (f"（{title}）" if title else "")]
+            lines += [f"-- ${i} = {p}" for i, p in enumerate(params, 1)]
+            lines += [_RULE, sql + ";"]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="openapi.yaml をキーセットページネーションにし、操作ごとの SQL を生成する")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--write", action="store_true",
+                        help=f"openapi.yaml を書き換え、artifacts/{{project}}/{QUERIES_NAME} に書き出す")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.project)
+    spec_path = model.path / "openapi.yaml"
+    if not spec_path.exists():
+        print(f"{spec_path} がありません", file=sys.stderr)
+        return 1
+    schema = parse_schema(model.path / "schema.sql")
+    doc = paginate(openapi.load(spec_path), model)
+    ops, warnings = operations(doc, model, schema)
+    add_as_of(doc, ops)
+    for warning in warnings:
+        print(f"警告: {warning}", file=sys.stderr)
+    sql = queries_sql(ops, model.project)
+    if args.write:
+        openapi.save(spec_path, doc)
+        out = model.path / QUERIES_NAME
+        out.write_text(sql, encoding="utf-8")
+        print(f"{spec_path}, {out}: {len(ops)} 操作", file=sys.stderr)
+    else:
+        sys.stdout.write(sql)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""API の参照サーバー（asyncio + 接続プール）
+
+openapi.yaml の GET 操作を tools.api の定義（api_queries.sql と同じ SQL）でそのまま
+提供する、標準ライブラリだけで動く HTTP/1.1 サーバー。ドライバの代わりに tools.pgwire の
+接続プールを使い、SQL は接続ごとにプリペアドステートメントとして再利用する。
+HTTP はキープアライブに対応し、エラーは RFC 7807（application/problem+json）で返す。
+
+参照系（Query）の性能確認用で、POST / PATCH / DELETE のコマンドは扱わない（405）。
+
+使い方:
+    docker compose up -d
+    python -m tools.api_server project-record-system --port 3000 --pool-max 20
+    curl 'http://localhost:3000/api/projects?limit=20&sort=projectName'
+    curl 'http://localhost:3000/api/projects/start/latest?ids=1,2,3'
+    curl 'http://localhost:3000/api/risks/1/evaluate/latest?as_of=2026-01-31T23:59:59%2B09:00'
+
+as_of は temporal.sql の有効期間テーブルを引く。tools.bench のデータなど、temporal.sql を入れずに
+作った DB で使う場合は、temporal.sql を流してから CALL rebuild_validity(); で有効期間を作っておく。
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import traceback
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from tools import api, openapi, postgres
+from tools.model import load_model
+from tools.pgwire import Pool, PostgresError
+from tools.schema import parse_schema
+
+DEFAULT_PORT = 3000
+MAX_HEADER_BYTES = 16 * 1024
+INTEGER_TYPES = ("INTEGER", "BIGINT", "SMALLINT")
+
+
+class HttpError(Exception):
+    def __init__(self, status, detail=""):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def _problem(status, detail, instance):
+    status = HTTPStatus(status)
+    return {"type": "about:blank", "title": status.phrase, "status": status.value,
+            "detail": detail, "instance": instance}
+
+
+def _route_pattern(path):
+    """/api/projects/{projectID} → 正規表現（パスパラメータは 1 セグメント）"""
+    parts = re.split(r"(\{\w+\})", path)
+    regex = "".join("([^/]+)" if p.startswith("{") else re.escape(p) for p in parts)
+    return re.compile(f"^{regex}$")
+
+
+def _integer(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"{name} は整数で指定してください: {value}") from None
+
+
+def _key(op, value, name):
+    return _integer(value, name) if op.cast(op.key).upper() in INTEGER_TYPES else value
+
+
+def _limit(query):
+    if "limit" not in query:
+        return api.DEFAULT_LIMIT
+    limit = _integer(query["limit"], "limit")
+    if not 1 <= limit <= api.MAX_LIMIT:
+        raise HttpError(400, f"limit は 1〜{api.MAX_LIMIT} で指定してください")
+    return limit
+
+
+def _cursor(query):
+    if not query.get("cursor"):
+        return None
+    try:
+        return api.decode_cursor(query["cursor"])
+    except ValueError:
+        raise HttpError(400, "cursor が不正です（前ページの nextCursor をそのまま渡してください）") from None
+
+
+def _ids(op, query):
+    values = [v for v in query.get("ids", "").split(",") if v]
+    if not values:
+        raise HttpError(400, "ids を指定してください")
+    ids = list(dict.fromkeys(_key(op, v, "ids") for v in values))
+    if len(ids) > api.MAX_BATCH:
+        raise HttpError(400, f"ids は最大 {api.MAX_BATCH} 件です")
+    return ids
+
+
+def _as_of(op, query):
+    if not query.get("as_of"):
+        return None
+    if not op.has_as_of:
+        raise HttpError(400, "このエンドポイントは as_of を指定できません（有効期間テーブルがありません）")
+    try:
+        return datetime.fromisoformat(query["as_of"])
+    except ValueError:
+        raise HttpError(400, f"as_of は ISO 8601 の日時で指定してください: {query['as_of']}") from None
+
+
+def _page(rows, limit, op, columns):
+    """limit + 1 行目があれば最後の行のキーを次ページのカーソルにする"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    keys = op.json_keys
+    return rows, api.encode_cursor([rows[-1][keys[c]] for c in columns])
+
+
+class ApiServer:
+    def __init__(self, ops, pool, token=None):
+        self.pool = pool
+        self.token = token
+        # 固定パス（/api/projects/batch）をパスパラメータ付き（/api/projects/{projectID}）より先に照合する
+        ordered = sorted(ops, key=lambda op: op.path.count("{"))
+        self.routes = [(_route_pattern(op.path), op) for op in ordered]
+
+    # ------------------------------------------------
+    # 操作
+    # ------------------------------------------------
+
+    async def handle(self, op, params, query):
+        kind = op.kind
+        if kind == "list":
+            limit = _limit(query)
+            sort = query.get("sort", op.default_sort)
+            if sort not in op.sorts:
+                raise HttpError(400, f"sort に指定できるのは {', '.join(op.sorts)} です")
+            filters = {}
+            for f in op.filters:
+                if f.param in query:
+                    value = query[f.param]
+                    filters[f.param] = _integer(value, f.param) if f.type.upper() in INTEGER_TYPES else value
+            sql, args = api.list_query(op, filters, sort, _cursor(query), limit)
+            rows, cursor = _page(await self.pool.fetch(sql, *args), limit, op, [op.sorts[sort][0], op.pk])
+            return {"limit": limit, "nextCursor": cursor, op.response_key: rows}
+        if kind == "history":
+            limit = _limit(query)
+            sql, args = api.history_query(op, _key(op, params[0], "ID"), _cursor(query), limit)
+            rows, cursor = _page(await self.pool.fetch(sql, *args), limit, op, [op.datetime, op.pk])
+            return {"limit": limit, "nextCursor": cursor, op.response_key: rows}
+        if kind == "batch":
+            sql, args = api.batch_query(op, _ids(op, query))
+            return {op.response_key: await self.pool.fetch(sql, *args)}
+        if kind == "latest_batch":
+            sql, args = api.latest_batch_query(op, _ids(op, query), _as_of(op, query))
+            return {op.response_key: await self.pool.fetch(sql, *args)}
+
+        key = _key(op, params[0], "ID")
+        if kind == "members":
+            sql, args = api.members_query(op, key, _as_of(op, query))
+            return {op.json_keys[op.key]: key, op.response_key: await self.pool.fetch(sql, *args)}
+        if kind == "get":
+            sql, args = api.get_query(op, key)
+        else:
+            builder = {"latest": api.latest_query, "summary": api.summary_query}[kind]
+            sql, args = builder(op, key, _as_of(op, query))
+        row = await self.pool.fetchrow(sql, *args)
+        if row is None or (kind == "summary" and not row["eventCount"]):
+            raise HttpError(404, f"{op.table} に該当する行がありません: {key}")
+        return row
+
+    async def dispatch(self, method, target, headers):
+        url = urlsplit(target)
+        if self.token is not None and headers.get("authorization") != f"Bearer {self.token}":
+            raise HttpError(401, "Authorization: Bearer <token> が必要です")
+        for pattern, op in self.routes:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            if method not in ("GET", "HEAD"):
+                raise HttpError(405, "参照サーバーは GET のみ扱います")
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                return await self.handle(op, match.groups(), query)
+            except PostgresError as e:
+                # 22xxx（データ例外: 日付の書式など）は入力の誤り
+                if e.code.startswith("22"):
+                    raise HttpError(400, e.message) from None
+                raise
+        raise HttpError(404, f"{url.path} に対応する操作がありません")
+
+    # ------------------------------------------------
+    # HTTP/1.1
+    # ------------------------------------------------
+
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, 431, _problem(431, "ヘッダーが大きすぎます", ""), False)
+                    break
+                except asyncio.IncompleteReadError:
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    await self._send(writer, 400, _problem(400, "リクエスト行が不正です", ""), False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                if headers.get("content-length"):
+                    await reader.readexactly(int(headers["content-length"]))
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                try:
+                    status, body = 200, await self.dispatch(method, target, headers)
+                except HttpError as e:
+                    status, body = e.status, _problem(e.status, e.detail, target)
+                except Exception:
+                    # 例外の内容（SQL やテーブル名）は応答に含めず、標準エラーにだけ出す
+                    print(f"{method} {target}:", file=sys.stderr)
+                    traceback.print_exc(file=sys.stderr)
+                    status, body = 500, _problem(500, "サーバー内部でエラーが発生しました", target)
+                await self._send(writer, status, body, keep_alive, head_only=method == "HEAD")
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, status, body, keep_alive, head_only=False):
+        payload = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        content_type = "application/json" if status < 400 else "application/problem+json"
+        head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: {content_type}; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + (b"" if head_only else payload))
+        await writer.drain()
+
+
+def load_operations(project):
+    """openapi.yaml（tools.api で書き換え済みのもの）から GET 操作を読む"""
+    model = load_model(project)
+    spec = openapi.load(model.path / "openapi.yaml")
+    ops, warnings = api.operations(spec, model, parse_schema(model.path / "schema.sql"))
+    return ops, warnings
+
+
+async def serve(args):
+    ops, warnings = load_operations(args.project)
+    for warning in warnings:
+        print(f"警告: {warning}", file=sys.stderr)
+    pool = await Pool(min_size=args.pool_min, max_size=args.pool_max,
+                      database=args.database).open()
+    app = ApiServer(ops, pool, token=args.token)
+    server = await asyncio.start_server(app.serve_client, args.host, args.port,
+                                        limit=MAX_HEADER_BYTES, backlog=1024)
+    print(f"http://{args.host}:{args.port} で {len(ops)} 操作を提供"
+          f"（{postgres.HOST}:{postgres.PORT}/{args.database}、プール {args.pool_min}〜{args.pool_max}）",
+          file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="openapi.yaml の GET 操作を提供する参照サーバー")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--database", default=postgres.DATABASE,
+                        help="接続先データベース（tools.bench のデータで試す場合は、接続を受け付けない"
+                             "テンプレートではなく CREATE DATABASE api_1m TEMPLATE "
+                             "bench_project_record_system_1m で複製したもの）")
+    parser.add_argument("--pool-min", type=int, default=4, help="起動時に開く接続数")
+    parser.add_argument("--pool-max", type=int, default=20, help="接続数の上限")
+    parser.add_argument("--token", help="指定すると Authorization: Bearer <token> を要求する")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""query_examples.sql のベンチマーク（/postgres-test のベンチマークモード）
+
+PERFORMANCE_QUICK_REFERENCE.md の実測値を再現可能にするため、
+番号付きクエリブロックをデータ規模ごとに EXPLAIN (ANALYZE, BUFFERS) で繰り返し計測し、
+p50 / p95 レイテンシを機械可読な JSON に書き出す。
+
+データ規模ごとに「スキーマ + 合成データ」を投入したテンプレートデータベースを一度だけ作り、
+計測前のリセットは CREATE DATABASE ... TEMPLATE によるファイルコピーで行う
+（行単位の DELETE やシーケンスのリセットは行わない）。
+
+使い方:
+    python -m tools.bench project-record-system --tiers 10k,1m --runs 20
+    python -m tools.bench invoice-management --baseline artifacts/invoice-management/benchmark_results.json
+    python -m tools.bench project-record-system --schema artifacts/project-record-system/schema_partitioned.sql \
+        --queries-file artifacts/project-record-system/query_examples_partitioned.sql \
+        --out /tmp/partitioned.json --baseline artifacts/project-record-system/benchmark_results.json
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from tools import postgres
+from tools.datagen import build_plan, generate
+from tools.model import load_model
+from tools.query_examples import parse_query_examples
+
+DEFAULT_TIERS = "10k,1m"
+RESULTS_NAME = "benchmark_results.json"
+PLANS_NAME = "benchmark_plans.json"
+
+# 計測用データベース（テンプレートから毎回作り直す）
+RUN_DATABASE = "bench_run"
+
+# ベースライン比較で回帰とみなす p50 の悪化率
+REGRESSION_THRESHOLD = 0.2
+
+_SEPARATOR = "@@explain@@"
+
+
+def template_name(project, tier, variant=None):
+    name = f"bench_{project.replace('-', '_')}_{tier}"
+    if variant:
+        name += f"_{variant}"
+    return name.lower()
+
+
+def _admin(sql):
+    return postgres.run_sql(sql, database="postgres", extra=("-At",))
+
+
+def database_exists(name):
+    return _admin(f"SELECT 1 FROM pg_database WHERE datname = '{name}';").strip() == "1"
+
+
+def _template_anchor(name):
+    """テンプレート作成時に記録した相対日時の基準時刻"""
+    comment = _admin(f"SELECT shobj_description(oid, 'pg_database') FROM pg_database "
+                     f"WHERE datname = '{name}';").strip()
+    try:
+        return json.loads(comment).get("now")
+    except ValueError:
+        return None
+
+
+def build_template(model, tier, seed, rebuild=False, jobs=None, schema=None):
+    """スキーマと合成データを投入したテンプレートデータベースを用意する
+
+    schema を指定した場合（例: schema_partitioned.sql）は、そのファイル名を付けた別のテンプレートにする。
+    """
+    schema = Path(schema) if schema else model.path / "schema.sql"
+    variant = schema.stem if schema.name != "schema.sql" else None
+    name = template_name(model.project, tier, variant)
+    if database_exists(name):
+        if not rebuild:
+            return name, 0.0
+        _admin(f"ALTER DATABASE {name} IS_TEMPLATE false;\n"
+               f"DROP DATABASE {name} WITH (FORCE);")
+    started = time.perf_counter()
+    _admin(f"CREATE DATABASE {name};")
+    postgres.run_sql(schema.read_text(encoding="utf-8"), database=name)
+    plan = build_plan(model, tier, seed=seed)
+    generate(model, plan, load=True, jobs=jobs, database=name)
+    postgres.run_sql("VACUUM ANALYZE;\n", database=name)
+    meta = json.dumps({"tier": tier, "seed": seed, "now": plan.now.isoformat()})
+    _admin(f"COMMENT ON DATABASE {name} IS '{meta}';\n"
+           f"ALTER DATABASE {name} IS_TEMPLATE true ALLOW_CONNECTIONS false;")
+    return name, time.perf_counter() - started
+
+
+def reset(template):
+    """テンプレートから計測用データベースを作り直し、所要秒数を返す"""
+    started = time.perf_counter()
+    _admin(f"DROP DATABASE IF EXISTS {RUN_DATABASE} WITH (FORCE);\n"
+           f"CREATE DATABASE {RUN_DATABASE} TEMPLATE {template} STRATEGY FILE_COPY;")
+    return time.perf_counter() - started
+
+
+def row_counts(database):
+    out = postgres.run_sql(
+        "SELECT relname, reltuples::bigint FROM pg_class "
+        "WHERE relkind IN ('r', 'p') AND relnamespace = 'public'::regnamespace ORDER BY relname;\n",
+        database=database, extra=("-At", "-F", "\t"))
+    counts = {}
+    for line in out.splitlines():
+        name, _, value = line.partition("\t")
+        counts[name.upper()] = max(0, int(value or 0))
+    return counts
+
+
+def explain_runs(sql, runs, warmup, database):
+    """EXPLAIN (ANALYZE, BUFFERS) を 1 セッションで繰り返し、計測分の結果を返す"""
+    statement = f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)\n{sql};\n"
+    script = "".join(f"\\echo {_SEPARATOR}\n{statement}" for _ in range(warmup + runs))
+    out = postgres.run_sql(script, database=database, extra=("-At",))
+    results = [json.loads(chunk)[0] for chunk in out.split(_SEPARATOR) if chunk.strip()]
+    return results[warmup:]
+
+
+def percentile(values, pct):
+    """最近傍順位法によるパーセンタイル"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def plan_shape(node, depth=0):
+    """プランの形（ノード種別と対象リレーション）を前順で列挙する"""
+    label = node.get("Node Type", "")
+    if node.get("Relation Name"):
+        label += f" on {node['Relation Name']}"
+    if node.get("Index Name"):
+        label += f" using {node['Index Name']}"
+    shape = [("  " * depth) + label]
+    for child in node.get("Plans", []):
+        shape += plan_shape(child, depth + 1)
+    return shape
+
+
+def summarize(query, explains):
+    execution = [e["Execution Time"] for e in explains]
+    planning = [e.get("Planning Time", 0.0) for e in explains]
+    median = explains[execution.index(percentile(execution, 50))]
+    top = median["Plan"]
+    return {
+        "title": query.title,
+        "runs": len(execution),
+        "p50_ms": round(percentile(execution, 50), 3),
+        "p95_ms": round(percentile(execution, 95), 3),
+        "mean_ms": round(statistics.fmean(execution), 3),
+        "min_ms": round(min(execution), 3),
+        "max_ms": round(max(execution), 3),
+        "planning_p50_ms": round(percentile(planning, 50), 3),
+        "rows": top.get("Actual Rows"),
+        "shared_hit_blocks": top.get("Shared Hit Blocks", 0),
+        "shared_read_blocks": top.get("Shared Read Blocks", 0),
+        "temp_written_blocks": top.get("Temp Written Blocks", 0),
+        "plan_shape": plan_shape(top),
+    }, median
+
+
+def run_tier(model, queries, tier, args):
+    template, build_seconds = build_template(model, tier, args.seed, args.rebuild, args.jobs, args.schema)
+    reset_seconds = [reset(template)]
+    tier_result = {
+        "template": template,
+        "data_anchor": _template_anchor(template),
+        "template_build_seconds": round(build_seconds, 3),
+        "row_counts": row_counts(RUN_DATABASE),
+        "queries": {},
+    }
+    plans = {}
+    for query in queries:
+        if args.reset_each and len(plans):
+            reset_seconds.append(reset(template))
+        explains = explain_runs(query.sql, args.runs, args.warmup, RUN_DATABASE)
+        tier_result["queries"][query.key], plans[query.key] = summarize(query, explains)
+        q = tier_result["queries"][query.key]
+        print(f"  [{tier}] クエリ{query.number:<3} p50={q['p50_ms']:>10.3f} ms  "
+              f"p95={q['p95_ms']:>10.3f} ms  {query.title}", file=sys.stderr)
+    tier_result["reset_seconds"] = round(statistics.fmean(reset_seconds), 3)
+    return tier_result, plans
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """ベースラインとの p50 比較。(行のリスト, 回帰の件数) を返す"""
+    lines, regressions = [], 0
+    for tier, tier_result in results["tiers"].items():
+        base_tier = baseline.get("tiers", {}).get(tier)
+        if not base_tier:
+            continue
+        for key, q in tier_result["queries"].items():
+            base = base_tier["queries"].get(key)
+            if not base or not base["p50_ms"]:
+                continue
+            ratio = q["p50_ms"] / base["p50_ms"]
+            if ratio > 1 + threshold:
+                status, regressions = "回帰", regressions + 1
+            elif ratio < 1 - threshold:
+                status = "改善"
+            else:
+                status = "変化なし"
+            plan_changed = "プラン変化" if q["plan_shape"] != base.get("plan_shape") else ""
+            lines.append(f"  [{tier}] クエリ{key:<3} {base['p50_ms']:>10.3f} → {q['p50_ms']:>10.3f} ms "
+                         f"(x{ratio:.2f}) {status} {plan_changed}".rstrip())
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="query_examples.sql をデータ規模ごとに計測する")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--tiers", default=DEFAULT_TIERS, help="データ規模（カンマ区切り、tools.datagen のティア）")
+    parser.add_argument("--queries", help="計測するクエリ番号（カンマ区切り、既定: すべて）")
+    parser.add_argument("--schema", help="投入する DDL（既定: artifacts/{project}/schema.sql）")
+    parser.add_argument("--queries-file", help="計測するクエリ例（既定: artifacts/{project}/query_examples.sql）")
+    parser.add_argument("--runs", type=int, default=20, help="計測回数")
+    parser.add_argument("--warmup", type=int, default=3, help="計測前のウォームアップ回数")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=None, help="データ投入の並列プロセス数")
+    parser.add_argument("--rebuild", action="store_true", help="テンプレートデータベースを作り直す")
+    parser.add_argument("--reset-each", action="store_true", help="クエリごとにテンプレートから作り直す")
+    parser.add_argument("--out", help=f"結果ファイル（既定: artifacts/{{project}}/{RESULTS_NAME}）")
+    parser.add_argument("--baseline", help="比較するベースラインの結果ファイル")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="回帰とみなす p50 の悪化率（既定: 0.2 = 20%%）")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.project)
+    queries = parse_query_examples(args.queries_file or model.path / "query_examples.sql")
+    if args.queries:
+        wanted = {int(n) for n in args.queries.split(",")}
+        queries = [q for q in queries if q.number in wanted]
+    # ベースラインを上書きする前に読み込んでおく
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    started = time.perf_counter()
+    results = {
+        "project": model.project,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "server_version": _admin("SHOW server_version;").strip(),
+        "runs": args.runs,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "schema": Path(args.schema).name if args.schema else "schema.sql",
+        "tiers": {},
+    }
+    all_plans = {}
+    for tier in [t.strip() for t in args.tiers.split(",") if t.strip()]:
+        results["tiers"][tier], all_plans[tier] = run_tier(model, queries, tier, args)
+    _admin(f"DROP DATABASE IF EXISTS {RUN_DATABASE} WITH (FORCE);")
+    results["total_seconds"] = round(time.perf_counter() - started, 3)
+
+    if args.out:
+        out = Path(args.out)
+        plans_out = out.with_name(f"{out.stem}_plans{out.suffix}")
+    else:
+        out, plans_out = model.path / RESULTS_NAME, model.path / PLANS_NAME
+    out.write_text(json.dumps(results, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    # 中央値の実行プラン全体は差分が大きいため別ファイルに保存する
+    plans_out.write_text(json.dumps(all_plans, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"結果: {out}（{results['total_seconds']:.1f} 秒）", file=sys.stderr)
+
+    if baseline is not None:
+        lines, regressions = compare(results, baseline, args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{regressions} 件のクエリで p50 が {args.threshold:.0%} 以上悪化しました", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
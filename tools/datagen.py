@@ -0,0 +1,694 @@
+"""model.json からスケール別の合成データを COPY 形式で生成する
+
+sample_data_relative.sql は動作確認用の手書きデータ（十数件）のため、
+性能検証に必要な件数（1万〜5,000万イベント）はここで機械的に生成する。
+
+- 件数の規模: --tier で総イベント件数を指定（10k / 1m / 50m）
+- 分布: リソースあたりのイベント件数・文字列の語彙はサンプルデータから取得
+- 外部キー: 各行の値は (シード, テーブル, 行番号) の純関数で決まるため、
+  行を保持せずにどのテーブルからでも参照先と整合した値を再計算できる
+- 日時: 実行時点を基準にした相対日時（直近 --days 日間）で生成
+- 金額: 主体の金額（請求額など）をイベントに不揃いに按分する。一部の主体は合計が金額に
+  届かないようにし、未入金残高・残工数を持つ行を作る
+- 並列化: テーブル単位でプロセスを分け、COPY ... FROM STDIN を逐次書き出す
+- 物理順: イベントは主体ごとに生成されるため、一時テーブル（{イベント}_LOADING）に COPY し、
+  最後にイベント日時順に INSERT する（実運用の追記順 = 日時順にそろえ、BRIN・日時の範囲走査を
+  実データと同じ条件で測る）。並べ替えは PostgreSQL に任せるので生成側のメモリは一定のまま
+
+使い方:
+    # 標準出力にストリーム（psql にパイプ）
+    python -m tools.datagen project-record-system --tier 10k | docker exec -i cc-data-modeler-postgres psql -U datamodeler -d immutable_model_db
+
+    # テーブルごとのファイルに並列出力
+    python -m tools.datagen project-record-system --tier 1m --out-dir /tmp/scale-1m
+
+    # docker-compose の PostgreSQL に直接並列ロード（既存データは削除）
+    python -m tools.datagen invoice-management --tier 50m --load --truncate
+
+IDENTITY 列は COPY の順序どおりに 1 から採番される前提のため、
+空のテーブル（または --truncate 指定）に対してロードすること。
+イベントの ID は最後の INSERT で日時順に採番される（イベントは他から参照されない）。
+"""
+
+import argparse
+import math
+import random
+import re
+import statistics
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from tools import postgres
+from tools.model import load_model
+from tools.sample_data import parse_sample_data
+
+# スケールティア（総イベント件数）
+TIERS = {"10k": 10_000, "1m": 1_000_000, "50m": 50_000_000}
+
+# サンプルデータにイベントがない場合のリソースあたり件数の分布
+DEFAULT_CARDINALITY = [0, 1, 1, 2, 3]
+
+# 主体の金額をイベントに按分するとき、合計が金額に届かない（一部入金・未完了の）主体の割合と、
+# その場合に按分する合計の割合の範囲
+PARTIAL_SHARE_RATIO = 0.3
+PARTIAL_SHARE_RANGE = (0.1, 0.9)
+
+# 直接の親リソース（顧客など）は主体リソースのこの割合で生成する
+PARENT_RATIO = 10
+
+# 書き出しバッファ（行数）
+BUFFER_ROWS = 10_000
+
+# イベント・ジャンクションの乱数系列を切り替える主体リソースの件数単位。
+# 分割数によらず同じデータになるよう、シャード境界はこの倍数に揃える。
+BLOCK_SUBJECTS = 4096
+
+# イベント・ジャンクションを並列ロード用に分割する主体リソースの件数
+SHARD_SUBJECTS = 64 * BLOCK_SUBJECTS
+
+SAMPLE_FILES = ("sample_data_relative.sql", "sample_data.sql")
+
+_MASK = (1 << 64) - 1
+_IDENTIFYING_SUFFIXES = ("name", "number", "username", "code")
+_LENGTH = re.compile(r"\((\d+)(?:\s*,\s*(\d+))?\)")
+
+
+def _mix(*values):
+    """splitmix64 による決定的ハッシュ"""
+    h = 0x9E3779B97F4A7C15
+    for value in values:
+        h = (h + value * 0x9E3779B97F4A7C15) & _MASK
+        h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+        h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK
+        h ^= h >> 31
+    return h
+
+
+def _unit(*values):
+    """[0, 1) の決定的な一様乱数"""
+    return _mix(*values) / 2 ** 64
+
+
+def _name_hash(name):
+    return zlib.crc32(name.encode("utf-8"))
+
+
+@dataclass
+class Plan:
+    """生成計画（ワーカープロセスへ渡すため pickle 可能な値のみ保持する）"""
+    project_path: str
+    tier: str
+    seed: int
+    days: int
+    now: datetime
+    counts: dict
+    cardinality: dict
+    vocabulary: dict = field(default_factory=dict)
+    numeric_range: dict = field(default_factory=dict)
+    true_ratio: dict = field(default_factory=dict)
+
+
+def _load_sample(model):
+    for name in SAMPLE_FILES:
+        path = model.path / name
+        if path.exists():
+            return parse_sample_data(path)
+    return parse_sample_data(model.path / SAMPLE_FILES[0])
+
+
+def _owner_relationship(model, junction):
+    for rel in model.relationships:
+        if rel.junction_table == junction.name:
+            return rel
+    return None
+
+
+def _cardinality(model, sample):
+    """サンプルデータからリソースあたりの子行数の分布を求める"""
+    result = {}
+    for entity in model.events + model.junctions:
+        if entity.is_event:
+            rel = model.subject(entity.name)
+            owner = rel.from_entity if rel else None
+            column = entity.attribute(rel.to_attribute).column if rel else None
+        else:
+            rel = _owner_relationship(model, entity)
+            owner = rel.from_entity if rel else None
+            column = model.entity(owner).pk.column if owner else None
+        n = sample.count(model.entity(owner).table) if owner else 0
+        counts = sample.counts_per_parent(entity.table, column, n) if n else []
+        result[entity.table] = counts if any(counts) else list(DEFAULT_CARDINALITY)
+    return result
+
+
+def _value_statistics(model, sample):
+    vocabulary, numeric_range, true_ratio = {}, {}, {}
+    for entity in model.entities.values():
+        for attr in entity.attributes:
+            key = f"{entity.table}.{attr.column}"
+            values = sample.column_values(entity.table, attr.column)
+            words = sample.vocabulary(entity.table, attr.column)
+            numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            flags = [v for v in values if isinstance(v, bool)]
+            if words:
+                vocabulary[key] = words
+            if numbers:
+                numeric_range[key] = (min(numbers), max(numbers))
+            if flags:
+                true_ratio[key] = sum(flags) / len(flags)
+    return vocabulary, numeric_range, true_ratio
+
+
+def build_plan(model, tier, seed=1, days=365, rows=None, now=None):
+    """ティアとサンプルデータの分布から各リソースの生成件数を決める"""
+    sample = _load_sample(model)
+    cardinality = _cardinality(model, sample)
+    overrides = dict(rows or {})
+    target = TIERS[tier] if tier in TIERS else int(tier)
+
+    per_subject = {}
+    for event in model.events:
+        rel = model.subject(event.name)
+        if rel is not None:
+            dist = cardinality[event.table]
+            per_subject[rel.from_entity] = per_subject.get(rel.from_entity, 0) + statistics.fmean(dist)
+
+    counts = {}
+    for name, per in per_subject.items():
+        counts[name] = overrides.get(name) or max(1, round(target / (len(per_subject) * max(per, 0.1))))
+
+    largest = max(counts.values(), default=1)
+    sample_largest = max((sample.count(model.entity(n).table) for n in counts), default=0) or 1
+    growth = max(1.0, largest / sample_largest)
+    for entity in reversed(model.topological_order()):
+        if entity.name in counts or not entity.is_resource:
+            continue
+        if entity.name in overrides:
+            counts[entity.name] = overrides[entity.name]
+            continue
+        base = sample.count(entity.table) or 3
+        children = [counts[r.to_entity] for r in model.children(entity.name)
+                    if r.to_entity in per_subject and r.to_entity in counts]
+        if children:
+            counts[entity.name] = max(base, max(children) // PARENT_RATIO)
+        else:
+            counts[entity.name] = max(base, round(base * math.sqrt(growth)))
+
+    # 1:1 関連の子は親の件数を超えられない（参照先が一意になるように）
+    for rel in model.relationships:
+        if rel.cardinality == "1:1" and rel.is_foreign_key and rel.to_entity in counts:
+            counts[rel.to_entity] = min(counts[rel.to_entity], counts[rel.from_entity])
+
+    vocabulary, numeric_range, true_ratio = _value_statistics(model, sample)
+    return Plan(
+        project_path=str(model.path),
+        tier=tier,
+        seed=seed,
+        days=days,
+        now=(now or datetime.now(timezone.utc)).replace(microsecond=0),
+        counts=counts,
+        cardinality=cardinality,
+        vocabulary=vocabulary,
+        numeric_range=numeric_range,
+        true_ratio=true_ratio,
+    )
+
+
+def copy_columns(entity):
+    """COPY 対象のカラム（IDENTITY の単一主キーは除く）"""
+    if entity.is_junction:
+        return list(entity.attributes)
+    return [a for a in entity.attributes if not a.is_primary_key]
+
+
+def _escape(value):
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    text = str(value)
+    if "\\" in text or "\t" in text or "\n" in text or "\r" in text:
+        text = (text.replace("\\", "\\\\").replace("\t", "\\t")
+                .replace("\n", "\\n").replace("\r", "\\r"))
+    return text
+
+
+@dataclass
+class _ColumnSpec:
+    """値生成のためにカラムごとに前計算しておく情報"""
+    english: str
+    base: str
+    length: int
+    scale: int
+    low: float
+    high: float
+    words: list
+    true_ratio: float
+    is_email: bool
+    is_identifying: bool
+
+
+class Generator:
+    """計画に従って各テーブルの行を生成する"""
+
+    def __init__(self, model, plan):
+        self.model = model
+        self.plan = plan
+        self.counts = plan.counts
+        self._fk = {name: {r.to_attribute: r for r in model.parents(name)}
+                    for name in model.entities}
+        self._hash = {name: _name_hash(name) for name in model.entities}
+        self._specs = {name: [self._spec(entity, a) for a in entity.attributes]
+                       for name, entity in model.entities.items()}
+
+    def _spec(self, entity, attr):
+        key = f"{entity.table}.{attr.column}"
+        size = _LENGTH.search(attr.type)
+        length = int(size.group(1)) if size else 0
+        scale = int(size.group(2) or 0) if size else 0
+        default_high = 10 ** max(1, (length or 10) - scale - 2)
+        low, high = self.plan.numeric_range.get(key, (1, default_high))
+        return _ColumnSpec(
+            english=attr.english,
+            base=attr.base_type,
+            length=length,
+            scale=scale,
+            low=low,
+            high=high,
+            words=self.plan.vocabulary.get(key, []),
+            true_ratio=self.plan.true_ratio.get(key, 0.5),
+            is_email="email" in attr.column,
+            is_identifying=entity.is_resource and attr.column.endswith(_IDENTIFYING_SUFFIXES),
+        )
+
+    # ---- 値の生成 ---------------------------------------------------------
+
+    def _created(self, entity, i):
+        """リソース行の作成日時（直近 days 日間に分布）"""
+        x = _unit(self.plan.seed, self._hash[entity.name], i, 0)
+        return self.plan.now - timedelta(seconds=int(self.plan.days * 86400 * (0.1 + 0.9 * x)))
+
+    def _foreign_key(self, rel, i, x):
+        n = self.counts[rel.from_entity]
+        if rel.is_self_reference:
+            roots = max(1, n // 20)
+            return None if i <= roots else 1 + int(x * (i - 1))
+        if rel.cardinality == "1:1":
+            return (i - 1) % n + 1
+        return 1 + int(x * n)
+
+    @staticmethod
+    def _scalar(spec, i, x, moment, last_date):
+        base = spec.base
+        if base in ("VARCHAR", "CHAR", "TEXT"):
+            if spec.is_email:
+                text = f"user{i}@example.com"
+            elif spec.words:
+                text = spec.words[int(x * len(spec.words))]
+                if spec.is_identifying:
+                    text = f"{text}-{i}"
+            else:
+                text = f"{spec.english}-{i}"
+            return text[:spec.length] if spec.length else text
+        if base == "BOOLEAN":
+            return x < spec.true_ratio
+        if base in ("INT", "INTEGER", "BIGINT", "SMALLINT"):
+            return int(spec.low + x * (spec.high - spec.low + 1))
+        if base in ("DECIMAL", "NUMERIC"):
+            return f"{spec.low * 0.5 + x * (spec.high * 1.5 - spec.low * 0.5):.{spec.scale}f}"
+        if base == "DATE":
+            # 最初の日付は作成日、以降は前の日付から後ろへ進める（発行日 → 支払期日など）
+            return last_date if x is None else last_date + timedelta(days=1 + int(x * 90))
+        if base in ("TIMESTAMP", "DATETIME"):
+            return moment
+        return None
+
+    def resource_row(self, entity, i):
+        """リソースの i 行目（IDENTITY 値 = i）を属性名→値の辞書で返す"""
+        h = self._hash[entity.name]
+        seed = self.plan.seed
+        created = self._created(entity, i)
+        fks = self._fk[entity.name]
+        last_date, first_date = created.date(), True
+        row = {}
+        for k, (attr, spec) in enumerate(zip(entity.attributes, self._specs[entity.name]), start=1):
+            if attr.is_primary_key:
+                row[attr.english] = i
+            elif attr.english in fks:
+                row[attr.english] = self._foreign_key(fks[attr.english], i, _unit(seed, h, i, k))
+            elif spec.base == "DATE":
+                last_date = self._scalar(spec, i, None if first_date else _unit(seed, h, i, k),
+                                         created, last_date)
+                first_date = False
+                row[attr.english] = last_date
+            else:
+                row[attr.english] = self._scalar(spec, i, _unit(seed, h, i, k), created, last_date)
+        row["__created__"] = created
+        return row
+
+    # ---- テーブル単位の行生成 ---------------------------------------------
+
+    def owner_count(self, entity):
+        """行を生成する単位となるリソースの件数（イベントは主体、ジャンクションは所有側）"""
+        if entity.is_resource:
+            return self.counts[entity.name]
+        if entity.is_junction:
+            return self.counts[_owner_relationship(self.model, entity).from_entity]
+        return self.counts[self.model.subject(entity.name).from_entity]
+
+    def rows(self, entity, start=1, stop=None):
+        """start 以上 stop 未満の（主体）リソース番号に対応する行を生成する"""
+        stop = stop or self.owner_count(entity) + 1
+        if entity.is_resource:
+            return self._resource_rows(entity, start, stop)
+        if entity.is_junction:
+            return self._junction_rows(entity, start, stop)
+        return self._event_rows(entity, start, stop)
+
+    def _blocks(self, entity, start, stop):
+        """BLOCK_SUBJECTS 件ごとに乱数系列を切り替えながら (番号, 乱数) を返す"""
+        h = self._hash[entity.name]
+        rng = None
+        for sid in range(start, stop):
+            if rng is None or (sid - 1) % BLOCK_SUBJECTS == 0:
+                rng = random.Random(_mix(self.plan.seed, h, (sid - 1) // BLOCK_SUBJECTS))
+            yield sid, rng
+
+    def _resource_rows(self, entity, start, stop):
+        columns = [a.english for a in copy_columns(entity)]
+        for i in range(start, stop):
+            row = self.resource_row(entity, i)
+            yield [row[c] for c in columns]
+
+    def _junction_rows(self, entity, start, stop):
+        rel = _owner_relationship(self.model, entity)
+        refs = dict(self.model.junction_refs(entity.name))
+        owner, other = rel.from_entity, rel.to_entity
+        dist = self.plan.cardinality[entity.table]
+        n_other = self.counts[other]
+        owner_first = copy_columns(entity)[0].english == refs[owner].english
+        for oid, rng in self._blocks(entity, start, stop):
+            k = min(rng.choice(dist), n_other)
+            for tid in sorted(rng.sample(range(1, n_other + 1), k)):
+                yield [oid, tid] if owner_first else [tid, oid]
+
+    def _event_rows(self, entity, start, stop):
+        rel = self.model.subject(entity.name)
+        subject = self.model.entity(rel.from_entity)
+        dist = self.plan.cardinality[entity.table]
+        fks = self._fk[entity.name]
+        dt_name = entity.event_datetime.english if entity.event_datetime else None
+        amount = next((a.english for a in subject.attributes
+                       if a.base_type in ("DECIMAL", "NUMERIC")), None)
+        specs = {s.english: s for s in self._specs[entity.name]}
+
+        # カラムごとの値の決め方を前もって分類しておく
+        plan = []
+        for attr in copy_columns(entity):
+            fk = fks.get(attr.english)
+            spec = specs[attr.english]
+            if attr.english == rel.to_attribute:
+                plan.append(("subject", None))
+            elif attr.english == dt_name:
+                plan.append(("moment", None))
+            elif fk is not None and fk.from_attribute == fk.to_attribute \
+                    and subject.attribute(attr.english) is not None:
+                # 主体リソースと同じ外部キーは主体の値を引き継ぐ（請求書の顧客IDなど）
+                plan.append(("inherit", attr.english))
+            elif fk is not None:
+                plan.append(("fk", fk))
+            elif amount and spec.base in ("DECIMAL", "NUMERIC"):
+                # 主体の金額・工数をイベントに按分する（分割入金・一部入金など）
+                plan.append(("share", spec.scale))
+            else:
+                plan.append(("scalar", spec))
+
+        now = self.plan.now
+        for sid, rng in self._blocks(entity, start, stop):
+            k = rng.choice(dist)
+            if k == 0:
+                continue
+            srow = self.resource_row(subject, sid)
+            created = srow["__created__"]
+            span = (now - created).total_seconds()
+            moments = sorted(created + timedelta(seconds=int(span * rng.random())) for _ in range(k))
+            shares = {}
+            for n, moment in enumerate(moments):
+                values = []
+                for kind, arg in plan:
+                    if kind == "subject":
+                        values.append(sid)
+                    elif kind == "moment":
+                        values.append(moment)
+                    elif kind == "inherit":
+                        values.append(srow[arg])
+                    elif kind == "fk":
+                        values.append(self._foreign_key(arg, sid, rng.random()))
+                    elif kind == "share":
+                        if arg not in shares:
+                            shares[arg] = _split_total(srow[amount], k, arg, rng)
+                        values.append(shares[arg][n])
+                    else:
+                        values.append(self._scalar(arg, sid, rng.random(), moment, moment.date()))
+                yield values
+
+
+def _split_total(amount, k, scale, rng):
+    """主体の金額を k 件のイベントに按分する
+
+    PARTIAL_SHARE_RATIO の主体は金額の一部だけを按分し、残高の残る主体を作る。
+    各件は不揃いの重みで分け、端数は最後の件に寄せて合計を最小単位で合わせる。
+    """
+    unit = 10 ** scale
+    total = round(float(amount) * unit)
+    if rng.random() < PARTIAL_SHARE_RATIO:
+        total = int(total * rng.uniform(*PARTIAL_SHARE_RANGE))
+    weights = [rng.random() + 0.5 for _ in range(k)]
+    parts = [int(total * w / sum(weights)) for w in weights[:-1]]
+    parts.append(total - sum(parts))
+    return [f"{p / unit:.{scale}f}" for p in parts]
+
+
+def copy_header(entity):
+    columns = ", ".join(a.column for a in copy_columns(entity))
+    return f"COPY {load_table(entity)} ({columns}) FROM STDIN;\n"
+
+
+def write_copy(generator, entity, out, start=1, stop=None):
+    """1テーブル分（またはシャード分）の COPY ブロックを書き出し、行数を返す"""
+    out.write(copy_header(entity))
+    buffer, total = [], 0
+    for values in generator.rows(entity, start, stop):
+        buffer.append("\t".join(_escape(v) for v in values))
+        if len(buffer) >= BUFFER_ROWS:
+            out.write("\n".join(buffer) + "\n")
+            total += len(buffer)
+            buffer.clear()
+    if buffer:
+        out.write("\n".join(buffer) + "\n")
+        total += len(buffer)
+    out.write("\\.\n")
+    return total
+
+
+def load_levels(model):
+    """外部キーの依存段数ごとにエンティティをまとめる（同じ段は並列ロード可能）"""
+    level = {}
+    for entity in model.topological_order():
+        deps = [r.from_entity for r in model.parents(entity.name) if not r.is_self_reference]
+        if entity.is_junction:
+            deps += [ref for ref, _ in model.junction_refs(entity.name)]
+        level[entity.name] = 1 + max((level[d] for d in deps), default=-1)
+    levels = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for entity in model.topological_order():
+        levels[level[entity.name]].append(entity)
+    return levels
+
+
+def truncate_sql(model):
+    tables = ", ".join(e.table for e in model.topological_order())
+    return f"TRUNCATE {tables} RESTART IDENTITY CASCADE;\n"
+
+
+def _sorted_events(model):
+    """日時順に入れ直すイベント（日時のないイベントは生成順のまま直接 COPY する）"""
+    return [e for e in model.events if e.event_datetime is not None]
+
+
+def load_table(entity):
+    """COPY の投入先（日時順に入れ直すイベントは一時テーブル）"""
+    if entity.is_event and entity.event_datetime is not None:
+        return f"{entity.table}_LOADING"
+    return entity.table
+
+
+def stage_sql(model):
+    """イベントの一時テーブル（COPY 対象の列だけを持つ UNLOGGED テーブル）を作る SQL"""
+    lines = []
+    for entity in _sorted_events(model):
+        columns = ", ".join(a.column for a in copy_columns(entity))
+        lines += [f"DROP TABLE IF EXISTS {load_table(entity)};",
+                  f"CREATE UNLOGGED TABLE {load_table(entity)} AS SELECT {columns} FROM {entity.table} WITH NO DATA;"]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def sort_events_sql(model):
+    """一時テーブルのイベントを日時順に本体へ INSERT する SQL
+
+    生成は主体ごとなので、そのまま COPY すると物理順と日時の相関がなく、日時の BRIN が
+    どの範囲にも当たってしまう。同じ日時の行は残りの列で並べ、ID の採番を決定的にする。
+    追記トリガー（projections.sql・temporal.sql）はこの INSERT で日時順に 1 回ずつ動く。
+    """
+    lines = []
+    for entity in _sorted_events(model):
+        dt = entity.event_datetime.column
+        columns = [a.column for a in copy_columns(entity)]
+        order = [dt] + [c for c in columns if c != dt]
+        lines += [
+            f"INSERT INTO {entity.table} ({', '.join(columns)})",
+            f"SELECT {', '.join(columns)} FROM {load_table(entity)} ORDER BY {', '.join(order)};",
+            f"DROP TABLE {load_table(entity)};",
+        ]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def shards(generator, entity):
+    """テーブルを (開始番号, 終了番号) の範囲に分割する
+
+    リソースは IDENTITY の採番順を保つため 1 本の COPY で流す。
+    イベント・ジャンクションは他から参照されないため主体リソースの範囲で分割できる。
+    """
+    total = generator.owner_count(entity)
+    if entity.is_resource or total <= SHARD_SUBJECTS:
+        return [(1, total + 1)]
+    return [(lo, min(lo + SHARD_SUBJECTS, total + 1))
+            for lo in range(1, total + 1, SHARD_SUBJECTS)]
+
+
+def _generate_shard(plan, entity_name, start, stop, target, database=None):
+    """ワーカープロセス: 1シャードをファイルまたは psql に書き出す"""
+    model = load_model(plan.project_path)
+    entity = model.entity(entity_name)
+    generator = Generator(model, plan)
+    started = time.perf_counter()
+    if target == "psql":
+        proc = postgres.open_stream(database)
+        try:
+            rows = write_copy(generator, entity, proc.stdin, start, stop)
+        finally:
+            proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"{entity.table}: {proc.stderr.read().strip()}")
+    else:
+        with open(target, "w", encoding="utf-8", newline="\n") as out:
+            rows = write_copy(generator, entity, out, start, stop)
+    return entity.table, rows, time.perf_counter() - started
+
+
+def _report(table, rows, seconds):
+    rate = rows / seconds if seconds else 0
+    print(f"  {table:<32} {rows:>12,} rows  {seconds:8.1f}s  ({rate:,.0f} rows/s)", file=sys.stderr)
+
+
+def _tasks(generator, level, target):
+    for entity in level:
+        parts = shards(generator, entity)
+        for n, (start, stop) in enumerate(parts):
+            yield entity, start, stop, target(entity, n, len(parts))
+
+
+def generate(model, plan, out_dir=None, load=False, truncate=False, jobs=None,
+             stream=sys.stdout, database=None):
+    levels = load_levels(model)
+    generator = Generator(model, plan)
+    if load:
+        if truncate:
+            postgres.run_sql(truncate_sql(model), database)
+        postgres.run_sql(stage_sql(model), database)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # 段ごとに待ち合わせ、参照先がロード済みの状態で次の段を流す
+            for level in levels:
+                futures = [pool.submit(_generate_shard, plan, e.name, start, stop, target, database)
+                           for e, start, stop, target in _tasks(generator, level, lambda *_: "psql")]
+                for future in futures:
+                    _report(*future.result())
+        started = time.perf_counter()
+        postgres.run_sql(sort_events_sql(model), database)
+        print(f"  イベント日時順に INSERT {time.perf_counter() - started:8.1f}s", file=sys.stderr)
+        postgres.run_sql("ANALYZE;\n", database)
+        return
+    if out_dir:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if truncate:
+            (out_dir / "L00_truncate.sql").write_text(truncate_sql(model), encoding="utf-8")
+        (out_dir / "L00_stage.sql").write_text(stage_sql(model), encoding="utf-8")
+
+        def target(entity, n, total, level_no):
+            suffix = f".{n:03d}" if total > 1 else ""
+            return str(out_dir / f"L{level_no:02d}_{entity.table}{suffix}.sql")
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_generate_shard, plan, e.name, start, stop, path)
+                       for no, level in enumerate(levels, start=1)
+                       for e, start, stop, path in _tasks(
+                           generator, level, lambda e, n, t, no=no: target(e, n, t, no))]
+            for future in futures:
+                _report(*future.result())
+        # すべての段のロード後に流す
+        (out_dir / f"L{len(levels) + 1:02d}_sort_events.sql").write_text(sort_events_sql(model), encoding="utf-8")
+        return
+    if truncate:
+        stream.write(truncate_sql(model))
+    stream.write(stage_sql(model))
+    for level in levels:
+        for entity in level:
+            started = time.perf_counter()
+            rows = write_copy(generator, entity, stream)
+            _report(entity.table, rows, time.perf_counter() - started)
+    stream.write(sort_events_sql(model))
+
+
+def _parse_rows(items):
+    rows = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        rows[name] = int(value)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="model.json からスケール別の合成データを COPY 形式で生成する")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--tier", default="10k", help="総イベント件数（10k / 1m / 50m または整数）")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--days", type=int, default=365, help="データの日時範囲（実行時点から遡る日数）")
+    parser.add_argument("--now", type=datetime.fromisoformat,
+                        help="相対日時の基準時刻（既定: 実行時刻。再現性が必要な場合に固定する）")
+    parser.add_argument("--rows", action="append", metavar="ENTITY=N",
+                        help="リソースの件数を個別に指定（例: --rows Role=4）")
+    parser.add_argument("--out-dir", help="テーブルごとの COPY ファイルを並列出力するディレクトリ")
+    parser.add_argument("--load", action="store_true", help="docker-compose の PostgreSQL に直接並列ロード")
+    parser.add_argument("--truncate", action="store_true", help="ロード前に全テーブルを TRUNCATE ... RESTART IDENTITY")
+    parser.add_argument("--jobs", type=int, default=None, help="並列プロセス数（既定: CPU数）")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.project)
+    plan = build_plan(model, args.tier, seed=args.seed, days=args.days,
+                      rows=_parse_rows(args.rows), now=args.now)
+    print(f"{model.project}: tier={args.tier} counts={plan.counts}", file=sys.stderr)
+    generate(model, plan, out_dir=args.out_dir, load=args.load,
+             truncate=args.truncate, jobs=args.jobs)
+
+
+if __name__ == "__main__":
+    main()
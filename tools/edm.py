@@ -0,0 +1,902 @@
+"""A5:SQL Mk-2 の ER 図ファイル（.edm）の取り込みと書き出し
+
+数千テーブル・数百 MB の .edm でも扱えるよう、ファイル全体を DOM として読み込まない。
+
+- 取り込み（import）: ElementTree.iterparse で先頭から順に読み、トップレベルの要素を
+  処理するたびに捨てる。DATAMAP・TYPETABLE・STORAGE・フォント指定などは読み流し、
+  残すのはエンティティ・属性・関連の名前と型と ID だけ（メモリはファイルサイズではなく
+  モデルの列数に比例する）。model.json と entities_classified.json を書き出す
+- 書き出し（export）: 既存の .edm を 2 回読む。1 回目で上記の索引を作って model.json との
+  差分を決め、2 回目で行単位に読みながら出力ファイルへ順に書く。変わっていない
+  エンティティ・関連はブロックをそのまま（レイアウトの座標や ID も含めて）写し、
+  変わったものだけ作り直す。新しい要素の属性の並びは同じファイル内の既存要素に合わせる
+
+model.json にない情報（エンティティの注記、関連の種類、1:1 の多重度、イベント日時属性、
+英語名の大文字小文字）は、取り込み先の既存の model.json / entities_classified.json から
+引き継ぐ。
+
+使い方:
+    python -m tools.edm import artifacts/project-record-system/data-model-pjm.edm project-record-system
+    python -m tools.edm import big.edm /tmp/big-model --dry-run
+    python -m tools.edm export project-record-system                       # 成果物ディレクトリの .edm を更新
+    python -m tools.edm export project-record-system --base old.edm --out new.edm
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from tools.model import RESERVED_TABLE_NAMES, load_model, project_dir, to_snake
+from tools.rebuild import _read_json, fk_name, foreign_keys
+
+EVENT_SUFFIX = "イベント"
+DEFAULT_RELATIONSHIP_TYPE = "has"  # .edm の VERBP-C が空で、既存の model.json にもない関連の種類
+ROW_HEIGHT = 14                   # レイアウト上の 1 属性あたりの高さ（A5:SQL の既定フォント）
+HEADER_HEIGHT = 32
+GRID = 16
+
+_EDM_TYPES = {"INT": "INTEGER", "INT4": "INTEGER", "DECIMAL": "NUMERIC",
+              "TIMESTAMP": "TIMESTAMPTZ", "DATETIME": "TIMESTAMPTZ", "BOOL": "BOOLEAN"}
+_MODEL_TYPES = {"INTEGER": "INT", "INT4": "INT", "NUMERIC": "DECIMAL",
+                "TIMESTAMPTZ": "TIMESTAMP", "BOOL": "BOOLEAN"}
+_LENGTH_TYPES = ("VARCHAR", "CHAR", "NUMERIC", "DECIMAL")
+
+
+# ------------------------------------------------
+# 読み込み（iterparse による索引）
+# ------------------------------------------------
+
+@dataclass
+class EdmAttribute:
+    id: str
+    column: str
+    datatype: str
+    length: int
+    scale: int
+    primary_key: bool
+    comment: str
+    fk: tuple = None              # (RELATION の ID, 参照先 ATTR の ID)
+
+    @property
+    def model_type(self):
+        """model.json の型（例: NUMERIC / 10 / 2 → DECIMAL(10,2)）"""
+        base = _MODEL_TYPES.get(self.datatype, self.datatype)
+        if self.datatype in _LENGTH_TYPES and self.length:
+            return f"{base}({self.length},{self.scale})" if self.scale else f"{base}({self.length})"
+        return base
+
+
+@dataclass
+class EdmEntity:
+    id: str
+    table: str                    # L-NAME（小文字のテーブル名）
+    comment: str
+    dependent: bool
+    attributes: list
+    indexes: list                 # [(ID, 名前, I-TYPE, [ATTR の ID])]
+    layout: tuple = None          # MODELVIEW の (LEFT, TOP, RIGHT, BOTTOM)
+
+    def attribute(self, attr_id):
+        return next((a for a in self.attributes if a.id == attr_id), None)
+
+    @property
+    def primary_index(self):
+        return next((i for i in self.indexes if i[2] == "0"), None)
+
+
+@dataclass
+class EdmRelation:
+    id: str
+    name: str
+    parent: str                   # 親エンティティの ID
+    child: str                    # 子エンティティの ID
+    verb: str = ""
+
+
+@dataclass
+class EdmIndex:
+    max_id: int = 0
+    entities: dict = field(default_factory=dict)     # ID → EdmEntity（ファイル順）
+    relations: dict = field(default_factory=dict)    # ID → EdmRelation
+    templates: dict = field(default_factory=dict)    # 要素の種類 → 最初に現れた要素の属性
+    newline: str = "\n"
+
+    def by_table(self):
+        return {e.table: e for e in self.entities.values()}
+
+
+def _flag(value):
+    return str(value).strip() == "1"
+
+
+def _int(value):
+    try:
+        return int(value or 0)
+    except ValueError:
+        return 0
+
+
+def _newline(path):
+    with open(path, "rb") as f:
+        return "\r\n" if b"\r\n" in f.readline() else "\n"
+
+
+def _remember(templates, kind, attrib):
+    if kind not in templates:
+        templates[kind] = dict(attrib)
+
+
+def _read_entity(elem, templates):
+    _remember(templates, "entity", elem.attrib)
+    attributes, indexes = [], []
+    for child in elem:
+        if child.tag == "ATTR":
+            _remember(templates, "attr", child.attrib)
+            fk = child.find("FK")
+            if fk is not None:
+                _remember(templates, "fk", fk.attrib)
+            attributes.append(EdmAttribute(
+                id=child.get("ID"), column=child.get("P-NAME") or child.get("L-NAME"),
+                datatype=(child.get("DATATYPE") or "").upper(),
+                length=_int(child.get("LENGTH")), scale=_int(child.get("SCALE")),
+                primary_key=_flag(child.get("PK")), comment=child.get("COMMENT", ""),
+                fk=(fk.get("RELATION"), fk.get("ATTR")) if fk is not None else None))
+        elif child.tag == "INDEX":
+            _remember(templates, "index", child.attrib)
+            for grandchild in child:
+                if grandchild.tag == "STORAGE":
+                    _remember(templates, "index_storage", grandchild.attrib)
+            indexes.append((child.get("ID"), child.get("P-NAME"), child.get("I-TYPE"),
+                            [c.get("ID") for c in child if c.tag == "COLUMN"]))
+        elif child.tag == "INMEMORY-TABLE":
+            _remember(templates, "inmemory_table", child.attrib)
+        elif child.tag == "INMEMORY-COLUMN":
+            _remember(templates, "inmemory_column", child.attrib)
+        elif child.tag == "STORAGE":
+            _remember(templates, "storage", child.attrib)
+    return EdmEntity(id=elem.get("ID"), table=(elem.get("P-NAME") or elem.get("L-NAME")).lower(),
+                     comment=elem.get("COMMENT", ""), dependent=_flag(elem.get("DEPENDENT")),
+                     attributes=attributes, indexes=indexes)
+
+
+def read_edm(path):
+    """.edm を先頭から読み、エンティティ・関連・レイアウトの索引を作る
+
+    トップレベルの要素は処理したらすぐに捨てるので、DATAMAP などの大きな定義や
+    エンティティごとの STORAGE・フォント指定はメモリに残らない。レイアウトは最初の
+    MODELVIEW（A5:SQL のメインモデル）から読む。
+    """
+    index = EdmIndex(newline=_newline(path))
+    depth, root, view, layouts = 0, None, None, {}
+    in_view = False
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                root = elem
+                index.max_id = _int(elem.get("MAXID"))
+            elif depth == 2 and elem.tag == "MODELVIEW" and view is None:
+                view, in_view = elem, True
+            continue
+        depth -= 1
+        if depth == 1:
+            if elem.tag == "ENTITY":
+                entity = _read_entity(elem, index.templates)
+                index.entities[entity.id] = entity
+            elif elem.tag == "RELATION":
+                _remember(index.templates, "relation", elem.attrib)
+                for child in elem:
+                    _remember(index.templates, child.tag.lower().replace("-", "_"), child.attrib)
+                index.relations[elem.get("ID")] = EdmRelation(
+                    id=elem.get("ID"), name=elem.get("P-NAME", ""), parent=elem.get("P-ENTITY"),
+                    child=elem.get("C-ENTITY"), verb=elem.get("VERBP-C", ""))
+            elif elem is view:
+                in_view = False
+            root.clear()
+        elif depth == 2 and in_view:
+            if elem.tag == "ENTITY":
+                _remember(index.templates, "view_entity", elem.attrib)
+                layouts[elem.get("ID")] = tuple(_int(elem.get(k)) for k in ("LEFT", "TOP", "RIGHT", "BOTTOM"))
+            elif elem.tag == "RELATION":
+                _remember(index.templates, "view_relation", elem.attrib)
+                for pos in elem:
+                    _remember(index.templates, "pos", pos.attrib)
+            view.clear()
+    for entity_id, layout in layouts.items():
+        if entity_id in index.entities:
+            index.entities[entity_id].layout = layout
+    return index
+
+
+# ------------------------------------------------
+# 取り込み（.edm → model.json / entities_classified.json）
+# ------------------------------------------------
+
+_RESERVED_REVERSE = {table.lower(): name.lower() for name, table in RESERVED_TABLE_NAMES.items()}
+
+
+def to_pascal(snake):
+    """lower_snake を PascalCase にする（id は ID、例: customer_id → CustomerID）"""
+    return "".join("ID" if part == "id" else part[:1].upper() + part[1:]
+                   for part in snake.split("_") if part)
+
+
+def entity_name(table):
+    """テーブル名からエンティティ名を求める（予約語の置き換えを戻す、例: user_account → User）"""
+    return to_pascal(_RESERVED_REVERSE.get(table, table))
+
+
+def _classify(entity, previous):
+    if previous:
+        return previous
+    keys = [a for a in entity.attributes if a.primary_key]
+    if entity.dependent or (len(keys) > 1 and all(a.fk for a in keys)):
+        return "junction"
+    if entity.comment.endswith(EVENT_SUFFIX) or [a.column for a in keys] == ["event_id"]:
+        return "event"
+    return "resource"
+
+
+def _relationship_key(rel):
+    if rel.get("junction_table"):
+        return (rel["junction_table"],)
+    return rel.get("from"), rel.get("to"), rel.get("to_attribute")
+
+
+def to_model(index, previous_model=None, previous_classified=None):
+    """索引から model.json と entities_classified.json の内容を組み立てる"""
+    previous_model = previous_model or {}
+    old_entities = {to_snake(e["name"]): e for e in previous_model.get("entities", [])}
+    old_items = {}
+    for group in (previous_classified or {}).values():
+        if isinstance(group, list):
+            for item in group:
+                old_items[item.get("english")] = item
+
+    # 既存の model.json がイベントに datetime_attribute を書いていれば、新しいイベントにも書く
+    with_datetime = any("datetime_attribute" in e for e in previous_model.get("entities", []))
+    entities, names, columns = [], {}, {}
+    for edm in index.entities.values():
+        name = entity_name(edm.table)
+        old = old_entities.get(to_snake(name)) or {}
+        name = old.get("name", name)
+        kind = _classify(edm, old.get("type"))
+        english = {to_snake(a["english"]): a["english"] for a in old.get("attributes", [])}
+        comment = edm.comment
+        if kind == "event" and comment.endswith(EVENT_SUFFIX):
+            comment = comment[:-len(EVENT_SUFFIX)]
+        attributes = [{"japanese": a.comment, "english": english.get(a.column, to_pascal(a.column)),
+                       "type": a.model_type, "is_primary_key": a.primary_key}
+                      for a in edm.attributes]
+        entity = {"name": name, "japanese": comment, "type": kind}
+        if kind == "event" and (with_datetime or "datetime_attribute" in old):
+            present = [a["english"] for a in attributes]
+            datetime_attribute = old.get("datetime_attribute")
+            if datetime_attribute not in present:
+                datetime_attribute = next((a for a in present if a.endswith("DateTime")), None)
+            if datetime_attribute:
+                entity["datetime_attribute"] = datetime_attribute
+        entity["attributes"] = attributes
+        if old.get("note"):
+            entity["note"] = old["note"]
+        entities.append(entity)
+        names[edm.id] = name
+        for attr, data in zip(edm.attributes, entity["attributes"]):
+            columns[attr.id] = data["english"]
+
+    order = {e["name"]: i for i, e in enumerate(previous_model.get("entities", []))}
+    entities.sort(key=lambda e: order.get(e["name"], len(order)))
+    types = {e["name"]: e["type"] for e in entities}
+
+    links = {}
+    for edm in index.entities.values():
+        for attr in edm.attributes:
+            if attr.fk and attr.fk[0] in index.relations:
+                links.setdefault(attr.fk[0], []).append((columns[attr.id], columns.get(attr.fk[1])))
+
+    relationships, junctions = [], {}
+    for relation in index.relations.values():
+        parent, child = names.get(relation.parent), names.get(relation.child)
+        if parent is None or child is None:
+            continue
+        if types[child] == "junction":
+            junctions.setdefault(child, []).append(parent)
+            continue
+        for to_attribute, from_attribute in links.get(relation.id, []):
+            relationships.append({"from": parent, "to": child, "cardinality": "1:N",
+                                  "from_attribute": from_attribute, "to_attribute": to_attribute,
+                                  "relationship_type": relation.verb or DEFAULT_RELATIONSHIP_TYPE})
+    for junction, parents in junctions.items():
+        if len(parents) == 2:
+            relationships.append({"from": parents[0], "to": parents[1], "cardinality": "M:N",
+                                  "junction_table": junction,
+                                  "relationship_type": DEFAULT_RELATIONSHIP_TYPE})
+
+    # 関連の種類・多重度・注記と並び順は、同じ関連（ジャンクション名、または親・子・外部キー列）から引き継ぐ
+    previous = {_relationship_key(r): (i, r) for i, r in enumerate(previous_model.get("relationships", []))}
+    for rel in relationships:
+        _, old = previous.get(_relationship_key(rel), (None, None))
+        if old:
+            columns = {k: rel[k] for k in ("from_attribute", "to_attribute") if k in rel}
+            rel.update(old)
+            rel.update(columns)
+    relationships.sort(key=lambda r: previous.get(_relationship_key(r), (len(previous),))[0])
+
+    classified = {"resources": [], "events": []}
+    for entity in entities:
+        if entity["type"] == "junction":
+            continue
+        old = old_items.get(entity["name"], {})
+        item = {"japanese": entity["japanese"], "english": entity["name"]}
+        if entity["type"] == "event":
+            english = old.get("datetime_attribute", {}).get("english") if isinstance(
+                old.get("datetime_attribute"), dict) else old.get("datetime_attribute")
+            candidates = [a for a in entity["attributes"] if a["english"] == english] or \
+                [a for a in entity["attributes"] if a["english"].endswith("DateTime")]
+            if candidates:
+                item["datetime_attribute"] = {k: candidates[0][k] for k in ("japanese", "english", "type")}
+        item["attributes"] = entity["attributes"]
+        if entity.get("note") or old.get("note"):
+            item["note"] = entity.get("note") or old["note"]
+        classified["resources" if entity["type"] == "resource" else "events"].append(item)
+    return {"entities": entities, "relationships": relationships}, classified
+
+
+def _write_model(f, model):
+    """model.json と同じ書式（属性は 1 行 1 件）でエンティティを 1 件ずつ書く"""
+    f.write('{\n  "entities": [\n')
+    for i, entity in enumerate(model["entities"]):
+        f.write("    {\n")
+        for key, value in entity.items():
+            if key == "attributes":
+                rows = ",\n".join("        " + json.dumps(a, ensure_ascii=False) for a in value)
+                f.write(f'      "attributes": [\n{rows}\n      ]')
+            else:
+                f.write(f"      {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}")
+            f.write(",\n" if key != list(entity)[-1] else "\n")
+        f.write("    }" + ("," if i < len(model["entities"]) - 1 else "") + "\n")
+    f.write('  ],\n  "relationships": [\n')
+    for i, rel in enumerate(model["relationships"]):
+        body = json.dumps(rel, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+        f.write("    " + body + ("," if i < len(model["relationships"]) - 1 else "") + "\n")
+    f.write("  ]\n}\n")
+
+
+def _write_classified(f, classified):
+    f.write("{\n")
+    for n, (group, items) in enumerate(classified.items()):
+        f.write(f'  "{group}": [\n')
+        for i, item in enumerate(items):
+            body = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+            f.write("    " + body + ("," if i < len(items) - 1 else "") + "\n")
+        f.write("  ]" + ("," if n < len(classified) - 1 else "") + "\n")
+    f.write("}\n")
+
+
+def _commit(tmp, path, like=None):
+    """一時ファイルで置き換える（既存ファイル、なければ like のパーミッションを引き継ぐ）"""
+    source = path if Path(path).exists() else like
+    if source and Path(source).exists():
+        shutil.copymode(source, tmp)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+    os.replace(tmp, path)
+
+
+def _replace(path, writer, value):
+    """一時ファイルに書いてから置き換える（途中で失敗しても元のファイルを壊さない）"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            writer(f, value)
+        _commit(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def import_edm(edm_path, base, dry_run=False):
+    index = read_edm(edm_path)
+    model, classified = to_model(index, _read_json(base / "model.json"),
+                                 _read_json(base / "entities_classified.json"))
+    counts = {kind: sum(1 for e in model["entities"] if e["type"] == kind)
+              for kind in ("resource", "event", "junction")}
+    print(f"{edm_path}: エンティティ {len(model['entities'])}（リソース {counts['resource']} / "
+          f"イベント {counts['event']} / ジャンクション {counts['junction']}）、"
+          f"関連 {len(model['relationships'])}", file=sys.stderr)
+    if not dry_run:
+        base.mkdir(parents=True, exist_ok=True)
+        _replace(base / "model.json", _write_model, model)
+        _replace(base / "entities_classified.json", _write_classified, classified)
+        print(f"出力: {base / 'model.json'}, {base / 'entities_classified.json'}", file=sys.stderr)
+    return model, classified
+
+
+# ------------------------------------------------
+# 書き出し（model.json → .edm）
+# ------------------------------------------------
+
+def _edm_type(type_text):
+    """model.json の型 → (DATATYPE, LENGTH, SCALE)"""
+    match = re.match(r"\s*(\w+)\s*(?:\(\s*(\d+)\s*(?:,\s*(\d+))?\s*\))?", type_text.upper())
+    base, length, scale = match.group(1), int(match.group(2) or 0), int(match.group(3) or 0)
+    return _EDM_TYPES.get(base, base), length, scale
+
+
+def _type_key(type_text):
+    datatype, length, scale = _edm_type(type_text)
+    return datatype, length if datatype in _LENGTH_TYPES else 0, scale if datatype in _LENGTH_TYPES else 0
+
+
+def _quote(value):
+    return escape(str(value), {'"': "&quot;", "\n": "&#10;", "\r": "&#13;"})
+
+
+def _tag(tag, attrib, indent, close="/>"):
+    body = " ".join(f'{k}="{_quote(v)}"' for k, v in attrib.items())
+    return f"{' ' * indent}<{tag} {body}{close}"
+
+
+def _with(template, **values):
+    """テンプレートの属性の並びを保ったまま値を差し替える（A5:SQL の属性名は - を含む）"""
+    attrib = dict(template)
+    for key, value in values.items():
+        attrib[key.replace("__", "-")] = value
+    return attrib
+
+
+def _set(line, name, value):
+    """既存の行の属性値だけを書き換える"""
+    text = _quote(value)
+    pattern = re.compile(rf'(\s{re.escape(name)}=")[^"]*(")')
+    if pattern.search(line):
+        return pattern.sub(lambda m: m.group(1) + text + m.group(2), line, count=1)
+    return line
+
+
+@dataclass
+class _Plan:
+    """書き出しの計画（ID の割り当てと、エンティティ・関連ごとの扱い）"""
+    max_id: int
+    keep: set = field(default_factory=set)           # そのまま写すエンティティの ID
+    rewrite: dict = field(default_factory=dict)      # 作り直すエンティティの ID → Entity
+    drop: set = field(default_factory=set)           # 削除するエンティティの ID
+    added: list = field(default_factory=list)        # 追加する (テーブル名, ID, Entity)
+    attr_ids: dict = field(default_factory=dict)     # (テーブル名, カラム) → ATTR の ID
+    index_ids: dict = field(default_factory=dict)    # テーブル名 → 主キーインデックスの ID
+    entity_ids: dict = field(default_factory=dict)   # テーブル名 → ENTITY の ID
+    fks: dict = field(default_factory=dict)          # (テーブル名, カラム) → (RELATION の ID, 参照先テーブル名, 参照先カラム)
+    keep_relations: set = field(default_factory=set)
+    new_relations: list = field(default_factory=list)  # [(ID, 制約名, 親テーブル名, 子テーブル名)]
+    layouts: dict = field(default_factory=dict)      # 追加・高さを変えたエンティティの ID → (LEFT, TOP, RIGHT, BOTTOM)
+
+    def next_id(self):
+        self.max_id += 1
+        return str(self.max_id)
+
+
+def _edm_table(entity):
+    return entity.table.lower()
+
+
+def _model_spec(model, entity):
+    """エンティティの比較用の形（.edm 側の _edm_spec と同じ形）"""
+    fks = {column: (model.entities[parent].table.lower(), parent_column)
+           for column, parent, parent_column in foreign_keys(model, entity)}
+    comment = entity.japanese + (EVENT_SUFFIX if entity.is_event else "")
+    return comment, [(a.column, _type_key(a.type), a.is_primary_key, a.japanese, fks.get(a.column))
+                     for a in entity.attributes]
+
+
+def _edm_spec(index, edm):
+    attributes = []
+    for attr in edm.attributes:
+        fk = None
+        if attr.fk and attr.fk[0] in index.relations:
+            parent = index.entities.get(index.relations[attr.fk[0]].parent)
+            parent_attr = parent.attribute(attr.fk[1]) if parent else None
+            fk = (parent.table, parent_attr.column) if parent_attr else None
+        key = (attr.datatype, attr.length if attr.datatype in _LENGTH_TYPES else 0,
+               attr.scale if attr.datatype in _LENGTH_TYPES else 0)
+        attributes.append((attr.column, key, attr.primary_key, attr.comment, fk))
+    return edm.comment, attributes
+
+
+def _size(entity):
+    width = max(100, 7 * max([len(entity.table)] + [len(a.column) for a in entity.attributes]) + 16)
+    return width, HEADER_HEIGHT + ROW_HEIGHT * len(entity.attributes)
+
+
+def plan_export(index, model):
+    plan = _Plan(max_id=index.max_id)
+    existing = index.by_table()
+    entities = {_edm_table(e): e for e in model.entities.values()}
+
+    for table, edm in existing.items():
+        plan.entity_ids[table] = edm.id
+        if table not in entities:
+            plan.drop.add(edm.id)
+            continue
+        for attr in edm.attributes:
+            plan.attr_ids[(table, attr.column)] = attr.id
+        primary = edm.primary_index
+        if primary:
+            plan.index_ids[table] = primary[0]
+        if _edm_spec(index, edm) == _model_spec(model, entities[table]):
+            plan.keep.add(edm.id)
+        else:
+            plan.rewrite[edm.id] = entities[table]
+
+    for entity in model.topological_order():
+        table = _edm_table(entity)
+        if table not in existing:
+            entity_id = plan.next_id()
+            plan.entity_ids[table] = entity_id
+            plan.added.append((table, entity_id, entity))
+        for attr in entity.attributes:
+            if (table, attr.column) not in plan.attr_ids:
+                plan.attr_ids[(table, attr.column)] = plan.next_id()
+        if table not in plan.index_ids:
+            plan.index_ids[table] = plan.next_id()
+
+    # 関連: (子テーブル, 子カラム) と親テーブルが同じものは ID と線の形を引き継ぐ
+    current = {}
+    for edm in existing.values():
+        if edm.id in plan.drop:
+            continue
+        for attr in edm.attributes:
+            if attr.fk and attr.fk[0] in index.relations:
+                parent = index.entities.get(index.relations[attr.fk[0]].parent)
+                if parent is not None and parent.id not in plan.drop:
+                    current[(edm.table, attr.column)] = (attr.fk[0], parent.table)
+    for entity in model.entities.values():
+        table = _edm_table(entity)
+        fks = foreign_keys(model, entity)
+        named = [(column, model.entities[parent].table, parent_column) for column, parent, parent_column in fks]
+        for column, parent, parent_column in fks:
+            parent_table = _edm_table(model.entities[parent])
+            old = current.get((table, column))
+            if old and old[1] == parent_table:
+                relation_id = old[0]
+                plan.keep_relations.add(relation_id)
+            else:
+                relation_id = plan.next_id()
+                name = fk_name(entity.table, column, model.entities[parent].table, named)
+                plan.new_relations.append((relation_id, name, parent_table, table))
+            plan.fks[(table, column)] = (relation_id, parent_table, parent_column)
+
+    # レイアウト: 既存は座標を保ち、属性数が変わったものは高さだけ合わせる。追加分は最下段に並べる
+    bottom = max([e.layout[3] for e in existing.values() if e.layout] + [0])
+    left, top, row = GRID, bottom + 2 * GRID if bottom else GRID, 0
+    for entity_id, entity in plan.rewrite.items():
+        layout = index.entities[entity_id].layout
+        if layout:
+            plan.layouts[entity_id] = (layout[0], layout[1], layout[2], layout[1] + _size(entity)[1])
+    for _, entity_id, entity in plan.added:
+        width, height = _size(entity)
+        if left > GRID and left + width > 1200:
+            left, top, row = GRID, top + row + 2 * GRID, 0
+        plan.layouts[entity_id] = (left, top, left + width, top + height)
+        left += width + 2 * GRID
+        row = max(row, height)
+    return plan
+
+
+# ---- 要素の生成 ----
+
+def _attr_lines(plan, index, table, entity, attr, line=None):
+    """ATTR 要素（外部キーなら FK 子要素付き）の行"""
+    datatype, length, scale = _edm_type(attr.type)
+    fk = plan.fks.get((table, attr.column))
+    attr_id = plan.attr_ids[(table, attr.column)]
+    values = {"DATATYPE": datatype, "LENGTH": length, "SCALE": scale, "COMMENT": attr.japanese,
+              "PK": "1" if attr.is_primary_key else "0"}
+    if attr.is_primary_key or fk:
+        values["NULL"] = "1"                      # 主キー・外部キーは NOT NULL
+    if line is None:
+        attrib = _with(index.templates.get("attr", {}), ID=attr_id, L__NAME=attr.column, P__NAME=attr.column,
+                       NULL="0", DEF="")
+        start = _tag("ATTR", _with(attrib, **values), 4, ">" if fk else "/>")
+    else:
+        start = line.rstrip()
+        start = start[:-2] if start.endswith("/>") else start[:-1]
+        for key, value in values.items():
+            start = _set(start, key, value)
+        start += ">" if fk else "/>"
+    if not fk:
+        return [start]
+    relation_id, parent_table, parent_column = fk
+    parent_attr = plan.attr_ids[(parent_table, parent_column)]
+    return [start, _tag("FK", _with(index.templates.get("fk", {}), RELATION=relation_id, ATTR=parent_attr), 6),
+            "    </ATTR>"]
+
+
+def _column_lines(columns):
+    return [f'      <COLUMN ID="{c}"/>' for c in columns]
+
+
+def _index_lines(index, name, index_id, columns):
+    """主キーインデックス（I-TYPE="0"）の INDEX 要素の行"""
+    lines = [_tag("INDEX", _with(index.templates.get("index", {}), ID=index_id, L__NAME=name,
+                                 P__NAME=name, I__TYPE="0"), 4, ">")]
+    lines += _column_lines(columns)
+    if "index_storage" in index.templates:
+        lines.append(_tag("STORAGE", index.templates["index_storage"], 6))
+    return lines + ["    </INDEX>"]
+
+
+def _children(lines):
+    """ENTITY ブロックの行を直下の子要素ごとに分ける [(タグ, [行])]"""
+    children, i = [], 1
+    while i < len(lines) - 1:
+        match = re.match(r"\s*<([\w-]+)", lines[i])
+        tag = match.group(1) if match else ""
+        end = i
+        if not lines[i].rstrip().endswith("/>"):
+            closing = f"</{tag}>"
+            while end < len(lines) - 1 and lines[end].strip() != closing:
+                end += 1
+        children.append((tag, lines[i:end + 1]))
+        i = end + 1
+    return children
+
+
+def _entity_lines(plan, index, table, entity, lines=None):
+    """ENTITY ブロックを作る（既存ブロックがあれば変わっていない子要素の行を残す）"""
+    comment = entity.japanese + (EVENT_SUFFIX if entity.is_event else "")
+    children = _children(lines) if lines else []
+    existing = {}
+    for tag, child in children:
+        if tag == "ATTR":
+            column = re.search(r'\sP-NAME="([^"]*)"', child[0]) or re.search(r'\sL-NAME="([^"]*)"', child[0])
+            existing[column.group(1).lower()] = child[0]
+    if lines:
+        head = _set(lines[0], "COMMENT", comment)
+        head = _set(head, "DEPENDENT", "1" if entity.is_junction else "0")
+    else:
+        head = _tag("ENTITY", _with(index.templates.get("entity", {}), ID=plan.entity_ids[table], L__NAME=table,
+                                    P__NAME=table, COMMENT=comment,
+                                    DEPENDENT="1" if entity.is_junction else "0"), 2, ">")
+    out = [head]
+    for attr in entity.attributes:
+        out += _attr_lines(plan, index, table, entity, attr, existing.get(attr.column))
+
+    ids = {plan.attr_ids[(table, a.column)] for a in entity.attributes}
+    keys = [plan.attr_ids[(table, a.column)] for a in entity.primary_keys]
+    primary_written = False
+    for tag, child in children:
+        if tag != "INDEX":
+            continue
+        columns = re.findall(r'<COLUMN ID="([^"]+)"', "\n".join(child))
+        if re.search(r'\sI-TYPE="0"', child[0]):
+            # 主キーは列だけ差し替え、名前・格納設定は元の行を残す
+            rest = [line for line in child[1:] if not line.lstrip().startswith("<COLUMN ")]
+            out += [child[0]] + _column_lines(keys) + rest
+            primary_written = True
+        elif columns and all(c in ids for c in columns):
+            out += child
+    if not primary_written and keys:
+        out += _index_lines(index, f"{table}_pkey", plan.index_ids[table], keys)
+
+    inmemory_table = next((child for tag, child in children if tag == "INMEMORY-TABLE"), None)
+    if inmemory_table:
+        out += inmemory_table
+    elif "inmemory_table" in index.templates:
+        out.append(_tag("INMEMORY-TABLE", index.templates["inmemory_table"], 4))
+    if "inmemory_column" in index.templates:
+        out += [_tag("INMEMORY-COLUMN", _with(index.templates["inmemory_column"], COLNAME=a.column), 4)
+                for a in entity.attributes]
+    storage = next((child for tag, child in children if tag == "STORAGE"), None)
+    if storage:
+        out += storage
+    elif "storage" in index.templates:
+        out.append(_tag("STORAGE", index.templates["storage"], 4))
+    for tag, child in children:
+        if tag not in ("ATTR", "INDEX", "INMEMORY-TABLE", "INMEMORY-COLUMN", "STORAGE"):
+            out += child
+    return out + ["  </ENTITY>"]
+
+
+def _relation_lines(plan, index, model_tables, relation_id, name, parent, child):
+    junction = model_tables[child].is_junction
+    attrib = _with(index.templates.get("relation", {}), ID=relation_id, P__NAME=name,
+                   INDEX=plan.index_ids[parent], R__TYPE="0" if junction else "1",
+                   NULL="1" if junction else "0", P__ENTITY=plan.entity_ids[parent],
+                   C__ENTITY=plan.entity_ids[child])
+    lines = [_tag("RELATION", attrib, 2, ">")]
+    for kind, tag in (("p_action", "P-ACTION"), ("c_action", "C-ACTION")):
+        if kind in index.templates:
+            lines.append(_tag(tag, index.templates[kind], 4))
+    return lines + ["  </RELATION>"]
+
+
+def _route(parent, child):
+    """関連線の (P-ANCHOR, C-ANCHOR, 折れ点)。アンカーは 0: 左 1: 上 2: 右 3: 下"""
+    pl, pt, pr, pb = parent
+    cl, ct, cr, cb = child
+    px, py, cx, cy = (pl + pr) // 2, (pt + pb) // 2, (cl + cr) // 2, (ct + cb) // 2
+    if parent == child:
+        return 2, 3, [(pr, py), (pr + GRID, py), (pr + GRID, pb + GRID), (px, pb + GRID), (px, pb)]
+    if ct >= pb:
+        mid = (pb + ct) // 2
+        return 3, 1, [(px, pb - 1), (px, mid), (cx, mid), (cx, ct)]
+    if cb <= pt:
+        mid = (cb + pt) // 2
+        return 1, 3, [(px, pt), (px, mid), (cx, mid), (cx, cb - 1)]
+    if cl >= pr:
+        mid = (pr + cl) // 2
+        return 2, 0, [(pr, py), (mid, py), (mid, cy), (cl, cy)]
+    mid = (cr + pl) // 2
+    return 0, 2, [(pl, py), (mid, py), (mid, cy), (cr - 1, cy)]
+
+
+def _view_relation_lines(index, relation_id, parent, child):
+    p_anchor, c_anchor, points = _route(parent, child)
+    attrib = _with(index.templates.get("view_relation", {}), ID=relation_id,
+                   P__ANCHOR=p_anchor, C__ANCHOR=c_anchor)
+    pos = index.templates.get("pos", {"LEFT": "0", "TOP": "0"})
+    return ([_tag("RELATION", attrib, 4, ">")]
+            + [_tag("POS", _with(pos, LEFT=x, TOP=y), 6) for x, y in points]
+            + ["    </RELATION>"])
+
+
+def _block_end(line):
+    """ブロックの開始行から終了行（同じインデントの閉じタグ）を求める"""
+    match = re.match(r"(\s*)<([\w-]+)", line)
+    if line.rstrip().endswith("/>"):
+        return None
+    return f"{match.group(1)}</{match.group(2)}>"
+
+
+def export_edm(model, base_path, out_path):
+    """base_path の .edm を model.json に合わせて out_path に書き出す（2 パス、行単位のストリーム）"""
+    index = read_edm(base_path)
+    plan = plan_export(index, model)
+    model_tables = {_edm_table(e): e for e in model.entities.values()}
+    tables_by_id = {entity_id: table for table, entity_id in plan.entity_ids.items()}
+    newline = index.newline
+    pending_entities = deque(sorted(plan.added, key=lambda a: a[0]))
+    layouts = {entity_id: e.layout for entity_id, e in index.entities.items() if e.layout}
+    layouts.update(plan.layouts)
+    dropped_relations = set(index.relations) - plan.keep_relations
+    stats = {"keep": len(plan.keep), "rewrite": len(plan.rewrite), "add": len(plan.added),
+             "drop": len(plan.drop), "relations_added": len(plan.new_relations),
+             "relations_dropped": len(dropped_relations)}
+
+    fd, tmp = tempfile.mkstemp(dir=Path(out_path).resolve().parent, prefix=".edm.")
+    state = {"relations_flushed": False, "view_entities_flushed": False, "in_view": False, "first_view": True}
+    try:
+        with open(base_path, encoding="utf-8", newline="") as src, \
+                os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+            def write(lines):
+                for line in lines:
+                    out.write(line + newline)
+
+            def flush_entities(before=None):
+                """追加するエンティティを、テーブル名の順で before より前のものまで書く"""
+                while pending_entities and (before is None or pending_entities[0][0] < before):
+                    table, _, entity = pending_entities.popleft()
+                    write(_entity_lines(plan, index, table, entity))
+
+            def flush_relations():
+                if not state["relations_flushed"]:
+                    flush_entities()
+                    for relation_id, name, parent, child in plan.new_relations:
+                        write(_relation_lines(plan, index, model_tables, relation_id, name, parent, child))
+                    state["relations_flushed"] = True
+
+            def flush_view_entities():
+                if state["first_view"] and not state["view_entities_flushed"]:
+                    for _, entity_id, _ in plan.added:
+                        left, top, right, bottom = plan.layouts[entity_id]
+                        write([_tag("ENTITY", _with(index.templates.get("view_entity", {}), ID=entity_id,
+                                                    LEFT=left, TOP=top, RIGHT=right, BOTTOM=bottom), 4)])
+                    state["view_entities_flushed"] = True
+
+            lines = iter(src)
+            for raw in lines:
+                line = raw.rstrip("\r\n")
+                stripped = line.lstrip()
+                indent = len(line) - len(stripped)
+                if line.startswith("<ERD "):
+                    write([_set(line, "MAXID", plan.max_id)])
+                    continue
+                # ENTITY / RELATION は閉じタグまでをまとめて扱う（それ以外は 1 行ずつ流す）
+                block = [line]
+                closing = _block_end(line) if indent in (2, 4) and \
+                    stripped.startswith(("<ENTITY ", "<RELATION ")) else None
+                if closing:
+                    for raw in lines:
+                        block.append(raw.rstrip("\r\n"))
+                        if block[-1] == closing:
+                            break
+                element_id = (re.search(r'\sID="([^"]*)"', line) or [None, None])[1]
+
+                if indent == 2 and stripped.startswith("<ENTITY "):
+                    table = tables_by_id.get(element_id)
+                    flush_entities(before=table)
+                    if element_id in plan.drop:
+                        continue
+                    if element_id in plan.rewrite:
+                        block = _entity_lines(plan, index, table, plan.rewrite[element_id], block)
+                elif indent == 2 and stripped.startswith("<RELATION "):
+                    flush_entities()
+                    if element_id in dropped_relations:
+                        continue
+                elif indent == 2 and stripped.startswith(("<COLORS", "<MODELVIEW", "</ERD")):
+                    flush_relations()
+                    state["in_view"] = stripped.startswith("<MODELVIEW")
+                elif line.startswith("  </MODELVIEW"):
+                    flush_view_entities()
+                    if state["first_view"]:
+                        for relation_id, _, parent, child in plan.new_relations:
+                            write(_view_relation_lines(index, relation_id, layouts[plan.entity_ids[parent]],
+                                                       layouts[plan.entity_ids[child]]))
+                    state["first_view"] = state["in_view"] = False
+                elif state["in_view"] and indent == 4 and stripped.startswith("<ENTITY "):
+                    if element_id in plan.drop:
+                        continue
+                    if element_id in plan.rewrite:
+                        # 位置と幅はそのまま、属性数に合わせて高さだけ変える
+                        top = _int(re.search(r'\sTOP="([^"]*)"', line).group(1))
+                        block = [_set(line, "BOTTOM", top + _size(plan.rewrite[element_id])[1])]
+                elif state["in_view"] and indent == 4 and stripped.startswith("<RELATION "):
+                    flush_view_entities()
+                    if element_id in dropped_relations:
+                        continue
+                write(block)
+            flush_relations()
+        _commit(tmp, out_path, like=base_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A5:SQL Mk-2 の .edm と model.json を相互に変換する")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_import = sub.add_parser("import", help=".edm から model.json / entities_classified.json を作る")
+    p_import.add_argument("edm", help="読み込む .edm")
+    p_import.add_argument("project", help="出力先（artifacts 配下のプロジェクト名またはディレクトリ）")
+    p_import.add_argument("--dry-run", action="store_true", help="件数だけ表示して書き出さない")
+    p_export = sub.add_parser("export", help="model.json の内容を .edm に書き出す")
+    p_export.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    p_export.add_argument("--base", help="元にする .edm（既定: 成果物ディレクトリの .edm）")
+    p_export.add_argument("--out", help="出力する .edm（既定: --base を上書き）")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        import_edm(args.edm, project_dir(args.project), dry_run=args.dry_run)
+        return 0
+
+    model = load_model(args.project)
+    base = Path(args.base) if args.base else None
+    if base is None:
+        candidates = sorted(model.path.glob("*.edm"))
+        if len(candidates) != 1:
+            raise SystemExit(f"{model.path} の .edm を 1 つに決められません。--base で指定してください"
+                             "（新規作成は A5:SQL Mk-2 で作った .edm を元にします）")
+        base = candidates[0]
+    out = Path(args.out) if args.out else base
+    stats = export_edm(model, base, out)
+    print(f"{out}: 維持 {stats['keep']} / 更新 {stats['rewrite']} / 追加 {stats['add']} / "
+          f"削除 {stats['drop']} エンティティ、関連 +{stats['relations_added']} "
+          f"-{stats['relations_dropped']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
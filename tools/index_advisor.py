@@ -0,0 +1,921 @@
+"""ワークロードに基づくインデックス設計（/ddl-generator のインデックス節）
+
+外部キー列・日時列ごとに単一列インデックスを機械的に作る代わりに、
+query_examples.sql の番号付きクエリと openapi.yaml の SQL 例
+（/latest, /history, /summary など）からアクセスパターンを取り出し、
+複合・カバリング（INCLUDE）・部分インデックスを導出する。
+
+- 等価条件の列を先頭に、並び替え・範囲条件の列を末尾に置く
+- 先頭列が別のインデックスに含まれるものは統合し、どのパターンにも使われない
+  既存インデックスは削除する
+- 削除できる参照先（openapi.yaml に DELETE があるリソース。openapi.yaml がなければ
+  すべてのリソース）を指す外部キー列は、ON DELETE RESTRICT の検査で子テーブルを
+  引くため、その列を先頭に持つインデックスを残す
+- 生成するインデックスごとに、根拠となったクエリ・エンドポイントをコメントで残す
+- 「作成しないインデックス」と移行 SQL は、移行前のインデックス（schema.sql から前回の
+  index_migration.sql で作成したものを除き、削除・作り直したものを元の定義で戻したもの）に対して求める
+
+使い方:
+    python -m tools.index_advisor project-record-system            # インデックス節を表示
+    python -m tools.index_advisor project-record-system --write    # schema.sql と index_migration.sql を更新
+    python -m tools.index_advisor invoice-management --migration /tmp/migrate.sql
+"""
+
+import argparse
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+
+from tools import openapi
+from tools.model import load_model, to_snake
+from tools.query_examples import parse_query_examples
+from tools.rebuild import foreign_keys
+from tools.schema import Index, parse_indexes, parse_schema, replace_index_section
+
+# INCLUDE に含める列数の上限（これを超える場合はヒープ参照に任せる）
+MAX_INCLUDE = 4
+# INCLUDE に含めない型（可変長で索引を肥大化させる）
+WIDE_TYPES = ("TEXT", "JSON", "JSONB", "BYTEA")
+
+_TOKEN = re.compile(r"""
+    (?P<comment>--[^\n]*)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<qident>"(?:[^"]|"")*")
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<param>\?|\$\d+)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_]*(?:\.(?:[A-Za-z_][A-Za-z0-9_]*|\*))?)
+  | (?P<op>::|<>|!=|<=|>=|\|\||[(),;=<>+\-*/%.])
+  | (?P<space>\s+)
+  | (?P<other>.)
+""", re.X)
+
+_CLAUSES = ("SELECT", "FROM", "WHERE", "GROUP", "HAVING", "ORDER", "LIMIT", "OFFSET", "WINDOW")
+_JOIN_WORDS = ("INNER", "LEFT", "RIGHT", "FULL", "OUTER", "CROSS", "JOIN", "NATURAL", "LATERAL")
+_SET_OPERATORS = ("UNION", "INTERSECT", "EXCEPT")
+_COMPARISONS = ("=", "<", ">", "<=", ">=")
+
+_OPENAPI_PATH = re.compile(r"^  (/\S*):\s*$", re.M)
+_OPENAPI_METHOD = re.compile(r"^    (get|post|put|patch|delete):\s*$", re.M)
+_OPENAPI_SQL = re.compile(r"```sql(.*?)```", re.S)
+
+MIGRATION_NAME = "index_migration.sql"
+
+# 移行 SQL で作成するインデックスと、削除・作り直す前の定義の行
+_MIGRATION_CREATE = re.compile(r"^CREATE (?:UNIQUE )?INDEX CONCURRENTLY (\w+) ", re.M)
+_MIGRATION_ORIGINAL = re.compile(r"^--   元の定義: (.*)$", re.M)
+
+
+# ------------------------------------------------
+# SQL の字句解析
+# ------------------------------------------------
+
+@dataclass
+class Token:
+    kind: str
+    text: str
+
+    @property
+    def upper(self):
+        return self.text.upper() if self.kind == "word" else self.text
+
+    def __repr__(self):
+        return self.text
+
+
+class Group(list):
+    """括弧で囲まれたトークン列"""
+
+    def has_select(self):
+        return bool(self) and isinstance(self[0], Token) and self[0].upper in ("SELECT", "WITH")
+
+
+def tokenize(sql):
+    tokens = []
+    for match in _TOKEN.finditer(sql):
+        kind = match.lastgroup
+        if kind in ("comment", "space"):
+            continue
+        tokens.append(Token(kind, match.group()))
+    return _nest(tokens)
+
+
+def _nest(tokens):
+    root, stack = [], []
+    current = root
+    for tok in tokens:
+        if tok.text == "(":
+            group = Group()
+            current.append(group)
+            stack.append(current)
+            current = group
+        elif tok.text == ")":
+            current = stack.pop() if stack else root
+        elif tok.text != ";":
+            current.append(tok)
+    return root
+
+
+def _is_word(tok, *words):
+    return isinstance(tok, Token) and tok.kind == "word" and tok.upper in words
+
+
+def _split(tokens, *words):
+    """トップレベルのキーワードで分割する（キーワード自体は区切りとして捨てる）"""
+    parts, current = [], []
+    for tok in tokens:
+        if _is_word(tok, *words):
+            parts.append(current)
+            current = []
+        else:
+            current.append(tok)
+    parts.append(current)
+    return parts
+
+
+def _walk(tokens, into_selects=True):
+    for tok in tokens:
+        if isinstance(tok, Group):
+            if into_selects or not tok.has_select():
+                yield from _walk(tok, into_selects)
+        else:
+            yield tok
+
+
+# ------------------------------------------------
+# アクセスパターン
+# ------------------------------------------------
+
+@dataclass
+class AccessPattern:
+    table: str
+    source: str
+    kind: str                                   # filter / join / correlated / window / latest / history / summary / range / foreign_key
+    eq: list = field(default_factory=list)      # 等価条件の列（出現順）
+    order: list = field(default_factory=list)   # [(列, 降順か)]
+    range: str = None
+    include: list = field(default_factory=list)
+    where: str = None
+
+    def describe(self):
+        eq = ", ".join(self.eq)
+        order = ", ".join(f"{c} DESC" if d else c for c, d in self.order)
+        if self.kind == "window":
+            text = f"PARTITION BY {eq} ORDER BY {order} — 各グループの最新行をソートなしで取得"
+        elif self.kind == "latest":
+            text = f"{eq} = ? ORDER BY {order} LIMIT 1 — 索引の端から 1 件で終了" if eq \
+                else f"ORDER BY {order} LIMIT — 索引順に上位のみ読む"
+        elif self.kind == "history":
+            text = f"{eq} = ? ORDER BY {order} LIMIT — 索引順の範囲走査でソート不要（キーセットの続きも同じ索引）"
+        elif self.kind == "summary":
+            text = f"{eq} = ? の MIN/MAX({self.order[0][0]}) — 索引の両端から取得"
+        elif self.kind == "correlated":
+            text = f"相関サブクエリ {eq} = 外側の列" + (f" AND {self.range} 範囲" if self.range else "") \
+                + " — 外側の行ごとに索引で存在確認・参照"
+        elif self.kind == "join":
+            text = f"結合条件 {eq} — ネステッドループ結合の内側を索引で参照"
+        elif self.kind == "range":
+            text = f"範囲条件 {self.range}" + (f"（{eq} = ?）" if eq else "")
+        elif self.kind == "foreign_key":
+            text = f"外部キー {eq} — 参照先の削除時に ON DELETE RESTRICT の参照行の確認を索引で行う"
+        else:
+            text = f"{eq} = ?" + (f" AND {self.range} 範囲" if self.range else "")
+        return f"{self.source}: {text}"
+
+
+class _Scope:
+    def __init__(self, schema, outer=None):
+        self.schema = schema
+        self.outer = outer
+        self.aliases = {}          # 別名 → テーブル名（CTE・導出表は None）
+        self.left_joined = set()   # LEFT JOIN の内側（NULL 拡張される）別名
+
+    def lookup(self, alias):
+        scope, depth = self, 0
+        while scope is not None:
+            if alias in scope.aliases:
+                return depth, scope.aliases[alias]
+            scope, depth = scope.outer, depth + 1
+        return None, None
+
+    def resolve(self, tok):
+        """トークンを ('local', 別名, 列) / ('outer',) / ('value',) / ('other',) に分類する"""
+        if not isinstance(tok, Token):
+            return ("other",)
+        if tok.kind in ("param", "number", "string"):
+            return ("value",)
+        if tok.kind != "word":
+            return ("other",)
+        if "." in tok.text:
+            alias, column = tok.text.split(".", 1)
+            alias, column = alias.lower(), to_snake(column)
+            depth, table = self.lookup(alias)
+            if depth is None:
+                return ("other",)
+            if depth > 0:
+                return ("outer",)
+            if table and column in self.schema.tables[table].columns:
+                return ("local", alias, column)
+            return ("other",)
+        column = to_snake(tok.text)
+        owners = [a for a, t in self.aliases.items()
+                  if t and column in self.schema.tables[t].columns]
+        if len(owners) == 1:
+            return ("local", owners[0], column)
+        if owners:
+            return ("other",)
+        scope = self.outer
+        while scope is not None:
+            if any(t and column in self.schema.tables[t].columns for t in scope.aliases.values()):
+                return ("outer",)
+            scope = scope.outer
+        # 列でない語（CURRENT_DATE など）は定数として扱う
+        return ("value",) if tok.upper.startswith("CURRENT_") or tok.upper in ("NOW", "TRUE", "FALSE") \
+            else ("other",)
+
+
+class WorkloadAnalyzer:
+    """SQL からテーブルごとのアクセスパターンを取り出す"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._compact = {name.replace("_", ""): name for name in schema.tables}
+        self.patterns = []
+
+    def table_name(self, word):
+        name = word.upper()
+        if name in self.schema.tables:
+            return name
+        return self._compact.get(name.replace("_", ""))
+
+    def analyze(self, sql, source):
+        self._statement(tokenize(sql), source, None, set())
+
+    def _statement(self, tokens, source, outer, ctes):
+        if not tokens:
+            return
+        ctes = set(ctes)
+        if _is_word(tokens[0], "WITH"):
+            i = 1
+            if _is_word(tokens[i], "RECURSIVE"):
+                i += 1
+            while i + 2 < len(tokens) and isinstance(tokens[i + 2], Group):
+                ctes.add(tokens[i].text.lower())
+                self._statement(list(tokens[i + 2]), source, outer, ctes)
+                i += 3
+                if i < len(tokens) and tokens[i].text == ",":
+                    i += 1
+                else:
+                    break
+            tokens = tokens[i:]
+        if not tokens or not _is_word(tokens[0], "SELECT"):
+            return
+        for part in _split(tokens, *_SET_OPERATORS):
+            if part and _is_word(part[0], "ALL", "DISTINCT"):
+                part = part[1:]
+            if part:
+                self._select(part, source, outer, ctes)
+
+    def _clauses(self, tokens):
+        clauses, name = {}, None
+        for tok in tokens:
+            if _is_word(tok, *_CLAUSES):
+                name = tok.upper
+                clauses.setdefault(name, [])
+            elif _is_word(tok, "BY") and name in ("GROUP", "ORDER"):
+                continue
+            elif name:
+                clauses[name].append(tok)
+        return clauses
+
+    def _from(self, tokens, scope, source, ctes):
+        """FROM 句を解析し、(別名, ON 条件) の一覧を返す"""
+        items, current, on, join_type = [], [], None, None
+
+        def flush():
+            if not current:
+                return
+            head = current[0]
+            alias = None
+            rest = [t for t in current[1:] if not _is_word(t, "AS")]
+            if rest and isinstance(rest[0], Token) and rest[0].kind == "word":
+                alias = rest[0].text.lower()
+            if isinstance(head, Group):
+                self._statement(list(head), source, scope.outer, ctes)
+                scope.aliases[alias or ""] = None
+                items.append((alias, on))
+                return
+            name = head.text.lower()
+            table = None if name in ctes else self.table_name(head.text)
+            alias = alias or name
+            scope.aliases[alias] = table
+            if join_type == "LEFT":
+                scope.left_joined.add(alias)
+            items.append((alias, on))
+
+        for tok in tokens:
+            if _is_word(tok, *_JOIN_WORDS) or (isinstance(tok, Token) and tok.text == ","):
+                if on is not None or current:
+                    flush()
+                current, on = [], None
+                if _is_word(tok, "LEFT", "RIGHT", "FULL"):
+                    join_type = tok.upper
+                elif _is_word(tok, "INNER", "CROSS") or tok.text == ",":
+                    join_type = "INNER"
+            elif _is_word(tok, "ON"):
+                on = []
+            elif on is not None:
+                on.append(tok)
+            else:
+                current.append(tok)
+        flush()
+        return items
+
+    def _conjuncts(self, tokens):
+        parts, current, between = [], [], False
+        for tok in tokens:
+            if _is_word(tok, "BETWEEN"):
+                between = True
+            if _is_word(tok, "AND"):
+                if between:
+                    between = False
+                else:
+                    parts.append(current)
+                    current = []
+                    continue
+            current.append(tok)
+        parts.append(current)
+        return [p for p in parts if p and not any(_is_word(t, "OR") for t in p)]
+
+    def _conditions(self, tokens, scope):
+        """結合・絞り込み条件を (別名, 列, 種類, 相手) に分解する"""
+        found = []
+        for conj in self._conjuncts(tokens):
+            if len(conj) == 3 and isinstance(conj[1], Token) and conj[1].text in _COMPARISONS:
+                left, right = scope.resolve(conj[0]), scope.resolve(conj[2])
+                op = conj[1].text
+                for this, other in ((left, right), (right, left)):
+                    if this[0] == "local" and other[0] != "local" or (
+                            this[0] == "local" and other[0] == "local" and this[1] != other[1]):
+                        kind = "eq" if op == "=" else "range"
+                        found.append((this[1], this[2], kind, other[0]))
+            elif len(conj) >= 3 and _is_word(conj[1], "BETWEEN"):
+                this = scope.resolve(conj[0])
+                if this[0] == "local":
+                    found.append((this[1], this[2], "range", "value"))
+            elif len(conj) in (3, 4) and _is_word(conj[1], "IS") and _is_word(conj[-1], "NULL"):
+                this = scope.resolve(conj[0])
+                if this[0] == "local":
+                    predicate = f"{this[2]} IS {'NOT ' if len(conj) == 4 else ''}NULL"
+                    found.append((this[1], this[2], "partial", predicate))
+        return found
+
+    def _select(self, tokens, source, outer, ctes):
+        scope = _Scope(self.schema, outer)
+        clauses = self._clauses(tokens)
+        items = self._from(clauses.get("FROM", []), scope, source, ctes)
+
+        # 条件式・選択リスト中のサブクエリはこのスコープを外側として解析する
+        for name in ("SELECT", "WHERE", "HAVING", "ORDER"):
+            for tok in clauses.get(name, []):
+                self._subqueries(tok, source, scope, ctes)
+        for _, on in items:
+            for tok in on or []:
+                self._subqueries(tok, source, scope, ctes)
+
+        conditions = [(c, None) for c in self._conditions(clauses.get("WHERE", []), scope)]
+        for alias, on in items:
+            if on:
+                conditions += [(c, alias) for c in self._conditions(on, scope)]
+
+        tables = {a: t for a, t in scope.aliases.items() if t}
+        for alias, table in tables.items():
+            eq, ranges, partial, kinds = [], [], None, set()
+            for (cond_alias, column, kind, other), joined in conditions:
+                if cond_alias != alias:
+                    continue
+                if joined is not None and joined != alias:
+                    # 他のテーブルの ON 条件に現れる列（駆動側）は索引を引かない
+                    continue
+                if kind == "eq" and column not in eq:
+                    eq.append(column)
+                    kinds.add("join" if joined else "correlated" if other == "outer" else "filter")
+                elif kind == "range":
+                    ranges.append(column)
+                    kinds.add("correlated" if other == "outer" else "range")
+                elif kind == "partial" and alias not in scope.left_joined:
+                    partial = other
+            self._window_patterns(clauses, scope, alias, table, eq, source)
+            pattern = AccessPattern(table, source, "filter", list(eq), where=partial)
+            if ranges:
+                pattern.range = ranges[0]
+            self._order_patterns(clauses, scope, alias, tables, pattern)
+            if pattern.kind == "filter":
+                for kind in ("correlated", "join", "filter", "range"):
+                    if kind in kinds:
+                        pattern.kind = kind
+                        break
+            if pattern.kind == "correlated":
+                pattern.include = self._include(tokens, scope, alias, table, pattern)
+            if pattern.eq or pattern.order or pattern.range:
+                self._add(pattern)
+
+    def _subqueries(self, tok, source, scope, ctes):
+        if not isinstance(tok, Group):
+            return
+        if tok.has_select():
+            self._statement(list(tok), source, scope, ctes)
+            return
+        for inner in tok:
+            self._subqueries(inner, source, scope, ctes)
+
+    def _window_patterns(self, clauses, scope, alias, table, eq, source):
+        select = clauses.get("SELECT", [])
+        for i, tok in enumerate(select):
+            if not (_is_word(tok, "OVER") and i + 1 < len(select) and isinstance(select[i + 1], Group)):
+                continue
+            spec = self._clauses_window(list(select[i + 1]))
+            partition = [scope.resolve(t) for t in spec["PARTITION"] if isinstance(t, Token) and t.kind == "word"]
+            order = [(scope.resolve(t), d) for t, d in spec["ORDER"]]
+            if not partition or not order:
+                continue
+            if any(p[0] != "local" or p[1] != alias for p in partition):
+                continue
+            if any(o[0][0] != "local" or o[0][1] != alias for o in order):
+                continue
+            pattern = AccessPattern(table, source, "window",
+                                    eq + [p[2] for p in partition if p[2] not in eq],
+                                    order=[(o[0][2], o[1]) for o in order])
+            pattern.include = self._include(clauses.get("SELECT", []) + clauses.get("WHERE", []),
+                                            scope, alias, table, pattern)
+            self._add(pattern)
+
+    def _clauses_window(self, tokens):
+        spec, name = {"PARTITION": [], "ORDER": []}, None
+        for tok in tokens:
+            if _is_word(tok, "PARTITION", "ORDER"):
+                name = tok.upper
+            elif _is_word(tok, "BY", "ROWS", "RANGE"):
+                continue
+            elif name:
+                spec[name].append(tok)
+        spec["ORDER"] = _order_items(spec["ORDER"])
+        return spec
+
+    def _order_patterns(self, clauses, scope, alias, tables, pattern):
+        """ORDER BY ... LIMIT と GROUP BY + MIN/MAX を索引順の読み出しに対応付ける"""
+        if len(tables) != 1:
+            return
+        order = [(scope.resolve(t), d) for t, d in _order_items(clauses.get("ORDER", []))]
+        if "LIMIT" in clauses and order and all(o[0] == "local" and o[1] == alias for o, _ in order):
+            pattern.order = [(o[2], d) for o, d in order]
+            history = "OFFSET" in clauses or any(_is_word(t, "OFFSET") for t in clauses["LIMIT"])
+            pattern.kind = "history" if history or not order[0][1] else "latest"
+            return
+        if "GROUP" in clauses and pattern.eq:
+            select = clauses.get("SELECT", [])
+            for i, tok in enumerate(select):
+                if _is_word(tok, "MIN", "MAX") and i + 1 < len(select) and isinstance(select[i + 1], Group):
+                    inner = list(select[i + 1])
+                    ref = scope.resolve(inner[0]) if len(inner) == 1 else ("other",)
+                    if ref[0] == "local" and ref[1] == alias:
+                        pattern.order = [(ref[2], False)]
+                        pattern.kind = "summary"
+                        return
+
+    def _include(self, tokens, scope, alias, table, pattern):
+        """パターンが参照する残りの列（Index Only Scan 用）"""
+        key = set(pattern.eq) | {c for c, _ in pattern.order} | {pattern.range}
+        columns = self.schema.tables[table].columns
+        include = []
+        for tok in _walk(tokens):
+            if tok.kind != "word":
+                continue
+            if tok.text.lower() in (f"{alias}.*", "*"):
+                return []
+            ref = scope.resolve(tok)
+            if ref[0] == "local" and ref[1] == alias and ref[2] not in key and ref[2] not in include:
+                include.append(ref[2])
+        if len(include) > MAX_INCLUDE:
+            return []
+        if any(columns[c].type.split("(")[0].upper() in WIDE_TYPES for c in include):
+            return []
+        return include
+
+    def _add(self, pattern):
+        pk = self.schema.tables[pattern.table].primary_key
+        # 主キーの全列が等価条件なら 1 行に決まるので、並び替え・範囲があっても主キー索引で足りる
+        if pk and set(pk) <= set(pattern.eq):
+            return
+        if pk and not pattern.order and not pattern.range:
+            # ジャンクションは主キーの先頭列で引ける
+            if set(pattern.eq) == set(pk[:len(pattern.eq)]):
+                return
+        self.patterns.append(pattern)
+
+
+def _order_items(tokens):
+    """ORDER BY の各項目を (先頭トークン, 降順か) にする"""
+    items = []
+    for part in _split_commas(tokens):
+        if part:
+            items.append((part[0], any(_is_word(t, "DESC") for t in part)))
+    return items
+
+
+def _split_commas(tokens):
+    parts, current = [], []
+    for tok in tokens:
+        if isinstance(tok, Token) and tok.text == ",":
+            parts.append(current)
+            current = []
+        else:
+            current.append(tok)
+    parts.append(current)
+    return parts
+
+
+# ------------------------------------------------
+# ワークロードの収集
+# ------------------------------------------------
+
+def _decode_yaml_text(raw):
+    """openapi.yaml の説明文中の SQL を取り出す（ダブルクォート・折り返しの両形式）"""
+    if "\\n" in raw:
+        text = raw.replace("\\n", "\n").replace('\\"', '"')
+    else:
+        text = raw.replace("''", "'")
+    lines = [line.strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def openapi_queries(path):
+    """openapi.yaml の各 GET 操作の SQL 例を (ラベル, SQL) で返す"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    paths = list(_OPENAPI_PATH.finditer(text))
+    queries = []
+    for i, match in enumerate(paths):
+        end = paths[i + 1].start() if i + 1 < len(paths) else len(text)
+        block = text[match.end():end]
+        methods = list(_OPENAPI_METHOD.finditer(block))
+        for j, method in enumerate(methods):
+            if method.group(1) != "get":
+                continue
+            body = block[method.end():methods[j + 1].start() if j + 1 < len(methods) else len(block)]
+            for sql in _OPENAPI_SQL.finditer(body):
+                queries.append((f"GET {match.group(1)}", _decode_yaml_text(sql.group(1))))
+    return queries
+
+
+def id_columns(word, entity, model, columns):
+    """SQL 例の ID 列名（例: PersonID）に当たるイベントテーブルの実在列を返す
+
+    列がそのまま存在すればその列、イベント自身の ID（例: SUPPORT_EXECUTE の
+    SupportExecuteID）なら主キー、イベントが参照するリソースの ID なら、列名がその ID 名で
+    終わる外部キーすべて（PERSON_REPLACE の PersonID → old_person_id, new_person_id。
+    いずれかが一致する行が該当。登録者の RegisteredBy のような別の役割の参照は含めない）。
+    どれにも当たらなければ空のリストを返し、主体の外部キーなどに読み替えて推測はしない。
+    """
+    column = to_snake(word)
+    if column in columns:
+        return [column]
+    if entity is None or not word.endswith("ID"):
+        return []
+    name = word[:-2]
+    if name == entity.name and entity.pk is not None:
+        return [entity.pk.column]
+    return [to_snake(rel.to_attribute) for rel in model.parents(entity.name)
+            if rel.from_entity == name and rel.to_attribute.endswith(word)
+            and to_snake(rel.to_attribute) in columns]
+
+
+def resolve_openapi_columns(sql, analyzer, model):
+    """SQL 例の ID 列名（例: PersonID）を実在する列に置き換えた SQL を返す
+
+    対応づけは id_columns による。1 つの ID が複数の列に当たる場合（旧側・新側）は、
+    列ごとの SQL を返す（OR の各枝がそれぞれの索引を引くため）。
+    実在する列に対応づけられない ID があれば ValueError（推測した条件から索引は作らない）。
+    """
+    match = re.search(r"\bFROM\s+(\w+)", sql, re.I)
+    table = analyzer.table_name(match.group(1)) if match else None
+    if not table:
+        return [sql]
+    columns = analyzer.schema.tables[table].columns
+    entity = next((e for e in model.entities.values() if e.table == table), None)
+    words = dict.fromkeys(w for w in re.findall(r"(?<![\w.])[A-Z]\w*ID\b", sql)
+                          if to_snake(w) not in columns and not analyzer.table_name(w))
+    variants = [sql]
+    for word in words:
+        found = id_columns(word, entity, model, columns)
+        if not found:
+            raise ValueError(f"{word} に当たる列が {table} にない")
+        variants = [re.sub(rf"(?<![\w.]){word}\b", to_snake(c), v) for v in variants for c in found]
+    return variants
+
+
+def deletable_entities(model, project_path):
+    """行を削除しうるリソース（openapi.yaml に DELETE があるもの。なければすべてのリソース）"""
+    openapi_path = project_path / "openapi.yaml"
+    if not openapi_path.exists():
+        return [e.name for e in model.entities.values() if e.is_resource]
+    names = []
+    for path, item in openapi.load(openapi_path).get("paths", {}).items():
+        match = re.search(r"\{(\w+)ID\}$", path)
+        if match and "delete" in item:
+            name = match.group(1)[:1].upper() + match.group(1)[1:]
+            if name in model.entities and model.entities[name].is_resource:
+                names.append(name)
+    return names
+
+
+def foreign_key_patterns(schema, model, deletable):
+    """削除しうる参照先を指す外部キー列の参照（ON DELETE RESTRICT の検査）"""
+    patterns = []
+    for entity in model.entities.values():
+        table = schema.tables.get(entity.table)
+        if table is None:
+            continue
+        for column, parent, _ in foreign_keys(model, entity):
+            if parent not in deletable or column not in table.columns:
+                continue
+            # 主キー・一意インデックスの先頭列なら、その索引で検査できる
+            if table.primary_key[:1] == [column] or any(
+                    i.unique and i.table == table.name and i.key[:1] == (column,) for i in schema.indexes):
+                continue
+            patterns.append(AccessPattern(table.name, f"{model.entities[parent].table} の削除", "foreign_key",
+                                          [column]))
+    return patterns
+
+
+def collect_workload(project_path, schema, model):
+    """query_examples.sql と openapi.yaml からアクセスパターンを集める
+
+    削除しうる参照先を指す外部キー列の検査もパターンに含める。
+    """
+    analyzer = WorkloadAnalyzer(schema)
+    warnings = []
+    queries_path = project_path / "query_examples.sql"
+    if queries_path.exists():
+        for query in parse_query_examples(queries_path):
+            analyzer.analyze(query.sql, f"クエリ{query.number}（{query.title}）")
+    openapi_path = project_path / "openapi.yaml"
+    if openapi_path.exists():
+        for label, sql in openapi_queries(openapi_path):
+            try:
+                variants = resolve_openapi_columns(sql, analyzer, model)
+            except ValueError as e:
+                warnings.append(f"{label}: {e}（このエンドポイントはインデックスの根拠にしない）")
+                continue
+            for variant in variants:
+                analyzer.analyze(variant, label)
+    patterns = analyzer.patterns + foreign_key_patterns(schema, model, deletable_entities(model, project_path))
+    return patterns, warnings
+
+
+# ------------------------------------------------
+# インデックスの導出
+# ------------------------------------------------
+
+@dataclass
+class Recommendation:
+    index: Index
+    patterns: list
+
+    @property
+    def key(self):
+        return self.index.key
+
+
+def _short(column, datetime_columns):
+    if column in datetime_columns:
+        return "datetime"
+    return column[:-3] if column.endswith("_id") else column
+
+
+def _index_name(table, columns, where, datetime_columns, taken):
+    name = f"idx_{table.lower()}_" + "_".join(_short(c, datetime_columns) for c in columns)
+    if where:
+        name += "_notnull" if "NOT NULL" in where else "_partial"
+    candidate, n = name, 2
+    while candidate in taken:
+        candidate, n = f"{name}_{n}", n + 1
+    taken.add(candidate)
+    return candidate
+
+
+def _key_order(patterns, subject_column):
+    """等価条件の列を、多くのパターンで共有される順（同数なら主体の外部キー優先）に並べる"""
+    freq = Counter(c for p in patterns for c in set(p.eq))
+
+    def key(pattern):
+        eq = sorted(pattern.eq, key=lambda c: (-freq[c], c != subject_column, pattern.eq.index(c)))
+        if pattern.order:
+            tail = [(c, d) for c, d in pattern.order if c not in eq]
+        elif pattern.range and pattern.range not in eq:
+            tail = [(pattern.range, False)]
+        else:
+            tail = []
+        return [(c, False) for c in eq] + tail
+
+    return key
+
+
+def recommend(schema, model, patterns, previous=None):
+    """アクセスパターンからインデックスを導出し、テーブル定義順に返す
+
+    previous（移行前のインデックス）と同じ定義のものは同じ名前にする。
+    """
+    by_table = {}
+    for pattern in patterns:
+        by_table.setdefault(pattern.table, []).append(pattern)
+
+    entities = {e.table: e for e in model.entities.values()}
+    previous = schema.indexes if previous is None else previous
+    existing = {(i.table, i.key, i.where): i.name for i in previous}
+    taken = {i.name for i in previous}
+    result = []
+    for table in schema.tables:
+        table_patterns = by_table.get(table, [])
+        if not table_patterns:
+            continue
+        entity = entities.get(table)
+        subject = model.subject(entity.name) if entity is not None and entity.is_event else None
+        subject_column = to_snake(subject.to_attribute) if subject else None
+        datetime_columns = {entity.event_datetime.column} if entity is not None and entity.event_datetime else set()
+        key_of = _key_order(table_patterns, subject_column)
+        columns = schema.tables[table].columns
+
+        candidates = []
+        for pattern in table_patterns:
+            where = pattern.where
+            # 等価結合では NULL は一致しないため、NULL 可の結合キーは部分インデックスにする
+            if where is None and pattern.kind == "join" and len(pattern.eq) == 1 \
+                    and not columns[pattern.eq[0]].not_null:
+                where = f"{pattern.eq[0]} IS NOT NULL"
+            candidates.append((key_of(pattern), list(pattern.include), where, [pattern]))
+        # 外部キーの検査は、同じ先頭列の索引があればそれで足りるので最後に統合する
+        candidates.sort(key=lambda c: (-len(c[0]), c[3][0].kind == "foreign_key", c[2] is not None))
+
+        merged = []
+        for key, include, where, sources in candidates:
+            names = [c for c, _ in key]
+            for other in merged:
+                other_names = [c for c, _ in other[0]]
+                # 外部キーの検査（列 = $1）は NULL を除いた部分インデックスでも引ける
+                checks_only = sources[0].kind == "foreign_key" and other[2] == f"{names[0]} IS NOT NULL"
+                if other_names[:len(names)] == names and (other[2] is None or other[2] == where or checks_only):
+                    other[1].extend(c for c in include if c not in other_names and c not in other[1])
+                    other[3].extend(sources)
+                    break
+            else:
+                merged.append((key, include, where, sources))
+
+        for key, include, where, sources in merged:
+            names = tuple(c for c, _ in key)
+            name = existing.get((table, names, where))
+            if name is None:
+                name = _index_name(table, names, where, datetime_columns, taken)
+            result.append(Recommendation(Index(name, table, key, include, where), sources))
+    return result
+
+
+def previous_indexes(schema, migration_path=None):
+    """移行前のインデックス（稼働中の DB にあるもの）
+
+    schema.sql のインデックスから、前回の移行 SQL で作成したものを除き、
+    その移行で削除・作り直したものを元の定義で戻す。移行 SQL がなければ schema.sql のまま。
+    """
+    if migration_path is None or not migration_path.exists():
+        return list(schema.indexes)
+    text = migration_path.read_text(encoding="utf-8")
+    created = set(_MIGRATION_CREATE.findall(text))
+    originals = parse_indexes("\n".join(_MIGRATION_ORIGINAL.findall(text)))
+    return [i for i in schema.indexes if i.name not in created] + originals
+
+
+def removed_indexes(previous, recommendations):
+    """推奨に含まれない移行前のインデックスと、その理由"""
+    kept = {r.index.name for r in recommendations}
+    removed = []
+    for index in previous:
+        if index.unique or index.name in kept:
+            continue
+        names = list(index.key)
+        covering = next((r for r in recommendations if r.index.table == index.table
+                         and list(r.key[:len(names)]) == names and r.index.where is None), None)
+        partial = next((r for r in recommendations if r.index.table == index.table
+                        and list(r.key) == names and r.index.where), None)
+        if covering is not None:
+            reason = f"{covering.index.name} の先頭列で代替"
+        elif partial is not None:
+            reason = f"部分インデックス {partial.index.name} で代替"
+        else:
+            reason = f"ワークロードに {', '.join(names)} を使う検索・結合・並び替えがない"
+        removed.append((index, reason))
+    return removed
+
+
+# ------------------------------------------------
+# 出力
+# ------------------------------------------------
+
+def index_section(schema, recommendations, removed, project):
+    lines = [
+        "-- " + "=" * 48,
+        "-- インデックス（パフォーマンス最適化）",
+        "-- query_examples.sql / openapi.yaml のアクセスパターンから導出",
+        f"-- 生成: python -m tools.index_advisor {project} --write",
+        "-- " + "=" * 48,
+    ]
+    for table in schema.tables.values():
+        recs = [r for r in recommendations if r.index.table == table.name]
+        if not recs:
+            continue
+        lines += ["", f"-- {table.comment or table.name}インデックス"]
+        for rec in recs:
+            seen = []
+            for pattern in rec.patterns:
+                text = pattern.describe()
+                if text not in seen:
+                    seen.append(text)
+            lines += [f"-- {text}" for text in seen]
+            if rec.index.include:
+                lines.append(f"-- INCLUDE ({', '.join(rec.index.include)}): 参照列を索引に含めて Index Only Scan にする")
+            if rec.index.where:
+                lines.append(f"-- WHERE {rec.index.where}: 結合で一致しない NULL 行を索引から除外")
+            lines.append(rec.index.ddl())
+    if removed:
+        lines += ["", "-- 作成しないインデックス（どのクエリ・エンドポイント・外部キーの検査にも使わない。",
+                  "-- 未使用の索引は挿入性能を下げる）"]
+        lines += [f"--   {index.name} ON {index.table}({', '.join(index.key)}): {reason}"
+                  for index, reason in removed]
+    return "\n".join(lines) + "\n"
+
+
+def migration(recommendations, removed, previous, project):
+    """稼働中のデータベースを推奨構成へ移行する SQL（先に作成してから削除する）
+
+    削除・作り直すインデックスは元の定義をコメントで残す（次回の実行で移行前の構成を求めるため）。
+    """
+    current = {i.name: i for i in previous}
+    lines = [
+        f"-- インデックス移行: {project}",
+        "-- CONCURRENTLY はトランザクション外で実行する（psql -f でそのまま流せる）",
+        "",
+    ]
+    for rec in recommendations:
+        before = current.get(rec.index.name)
+        if before is not None and before.ddl() == rec.index.ddl():
+            continue
+        lines.append(f"-- {' / '.join(dict.fromkeys(p.source for p in rec.patterns))}")
+        if before is not None:
+            # 同名で定義（INCLUDE など）が変わるものは作り直す
+            lines.append(f"DROP INDEX CONCURRENTLY IF EXISTS {before.name};")
+            lines.append(f"--   元の定義: {before.ddl()}")
+        lines.append(rec.index.ddl(concurrently=True))
+    lines.append("")
+    for index, reason in removed:
+        lines.append(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name};  -- {reason}")
+        lines.append(f"--   元の定義: {index.ddl()}")
+    lines.append("")
+    lines.append("ANALYZE;")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ワークロードからインデックスを設計する")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--write", action="store_true",
+                        help=f"schema.sql のインデックス節と {MIGRATION_NAME} を書き換える")
+    parser.add_argument("--migration", help="稼働中の DB 向け移行 SQL の出力先（--write なしで別の場所に出す）")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.project)
+    schema_path = model.path / "schema.sql"
+    schema = parse_schema(schema_path)
+    patterns, warnings = collect_workload(model.path, schema, model)
+    for warning in warnings:
+        print(f"警告: {warning}", file=sys.stderr)
+
+    migration_path = model.path / MIGRATION_NAME
+    previous = previous_indexes(schema, migration_path)
+    recommendations = recommend(schema, model, patterns, previous)
+    removed = removed_indexes(previous, recommendations)
+    section = index_section(schema, recommendations, removed, model.project)
+    sql = migration(recommendations, removed, previous, model.project)
+
+    if args.migration:
+        with open(args.migration, "w", encoding="utf-8") as f:
+            f.write(sql)
+    if args.write:
+        schema_path.write_text(replace_index_section(schema.text, section), encoding="utf-8")
+        migration_path.write_text(sql, encoding="utf-8")
+        print(f"{schema_path}: {len(recommendations)} 件作成 / {len(removed)} 件削除", file=sys.stderr)
+    else:
+        sys.stdout.write(section)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""参照サーバー（tools.api_server）の負荷試験
+
+openapi.yaml の GET 操作ごとに、同時接続数 × 時間を決めてキープアライブの HTTP 接続から
+リクエストを流し続け、スループット（req/s）とレイテンシ（p50 / p95 / p99 / 最大）を
+操作ごとに集計する。
+
+- 準備段階で一覧エンドポイントをカーソルで辿り、リソースごとの実在 ID を集める
+- 単体取得・最新・サマリー・現在のメンバーは集めた ID から無作為に選ぶ
+- 一覧・履歴は nextCursor を辿ってページを進め、最終ページで先頭に戻る
+  （OFFSET と違って深いページでも遅くならないことを確認する）
+- バッチ取得は ids に --batch-size 件を並べる
+
+使い方:
+    python -m tools.api_server project-record-system &
+    python -m tools.loadtest project-record-system --concurrency 32 --duration 30
+    python -m tools.loadtest project-record-system --ops listProjects,getProjectStartHistory --out /tmp/load.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+
+from tools.api_server import DEFAULT_PORT, load_operations
+from tools.bench import percentile
+
+DEFAULT_URL = f"http://127.0.0.1:{DEFAULT_PORT}"
+DEFAULT_HARVEST = 1000
+DEFAULT_BATCH_SIZE = 20
+
+
+class HttpClient:
+    """1 本のキープアライブ接続で GET を順に送る最小クライアント"""
+
+    def __init__(self, url, token=None):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.token = token
+        self._reader = self._writer = None
+
+    async def get(self, target):
+        """(ステータス, 本文のバイト列) を返す。切れていたら 1 回だけつなぎ直す"""
+        for attempt in range(2):
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await self._request(target)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                if attempt:
+                    raise
+        raise AssertionError("unreachable")
+
+    async def _request(self, target):
+        head = f"GET {target} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+        if self.token:
+            head += f"Authorization: Bearer {self.token}\r\n"
+        self._writer.write((head + "\r\n").encode("latin-1"))
+        await self._writer.drain()
+        response = (await self._reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(response[0].split(" ", 2)[1])
+        length, close = 0, False
+        for line in response[1:]:
+            name, _, value = line.partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "connection" and value.strip().lower() == "close":
+                close = True
+        body = await self._reader.readexactly(length)
+        if close:
+            self.close()
+        return status, body
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+def _fill(path, key):
+    """パスパラメータ（1 つ目）を実際の ID に置き換える"""
+    head, brace, rest = path.partition("{")
+    if not brace:
+        return path
+    return head + str(key) + rest.partition("}")[2]
+
+
+async def harvest(client, ops, limit):
+    """一覧エンドポイントをカーソルで辿り、主キー列ごとの ID を集める"""
+    ids = {}
+    for op in ops:
+        if op.kind != "list":
+            continue
+        keys, cursor = [], None
+        pk_key = op.json_keys[op.pk]
+        while len(keys) < limit:
+            query = {"limit": min(500, limit - len(keys))}
+            if cursor:
+                query["cursor"] = cursor
+            status, body = await client.get(f"{op.path}?{urlencode(query)}")
+            if status != 200:
+                print(f"警告: {op.operation_id} の ID 収集に失敗（{status}）", file=sys.stderr)
+                break
+            page = json.loads(body)
+            keys += [row[pk_key] for row in page[op.response_key]]
+            cursor = page.get("nextCursor")
+            if not cursor:
+                break
+        ids[op.pk] = keys
+    return ids
+
+
+class Scenario:
+    """操作ごとのリクエストを組み立てる（一覧・履歴はワーカーごとにカーソルを持つ）"""
+
+    def __init__(self, ops, ids, batch_size, page_size):
+        self.ops = [op for op in ops if op.kind == "list" or ids.get(op.key)]
+        self.ids = ids
+        self.batch_size = batch_size
+        self.page_size = page_size
+
+    def target(self, op, state):
+        if op.kind == "list":
+            query = {"limit": self.page_size}
+            if state.get(op.operation_id):
+                query["cursor"] = state[op.operation_id][1]
+            return f"{op.path}?{urlencode(query)}"
+        keys = self.ids[op.key]
+        if op.kind in ("batch", "latest_batch"):
+            sample = random.sample(keys, min(self.batch_size, len(keys)))
+            return f"{op.path}?ids={','.join(map(str, sample))}"
+        if op.kind == "history":
+            walk = state.get(op.operation_id)
+            if walk is None:
+                walk = (random.choice(keys), None)
+            query = {"limit": self.page_size}
+            if walk[1]:
+                query["cursor"] = walk[1]
+            state[op.operation_id] = walk
+            return f"{_fill(op.path, walk[0])}?{urlencode(query)}"
+        return _fill(op.path, random.choice(keys))
+
+    def advance(self, op, state, body):
+        """一覧・履歴は nextCursor で次ページへ、最終ページなら最初からやり直す"""
+        if op.kind not in ("list", "history"):
+            return
+        cursor = json.loads(body).get("nextCursor")
+        if cursor:
+            key = state[op.operation_id][0] if op.kind == "history" else None
+            state[op.operation_id] = (key, cursor)
+        else:
+            state.pop(op.operation_id, None)
+
+
+async def worker(client, scenario, deadline, samples, errors):
+    state = {}
+    while time.perf_counter() < deadline:
+        op = random.choice(scenario.ops)
+        target = scenario.target(op, state)
+        started = time.perf_counter()
+        try:
+            status, body = await client.get(target)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            errors[op.operation_id].append(repr(e))
+            continue
+        elapsed = time.perf_counter() - started
+        if status == 200:
+            samples[op.operation_id].append(elapsed)
+            scenario.advance(op, state, body)
+        else:
+            errors[op.operation_id].append(status)
+            state.pop(op.operation_id, None)
+    client.close()
+
+
+def summarize(samples, errors, seconds):
+    operations = {}
+    for name in samples:
+        values = samples[name]
+        entry = {"requests": len(values), "errors": len(errors[name]),
+                 "rps": round(len(values) / seconds, 1)}
+        if values:
+            ms = [v * 1000 for v in values]
+            entry.update({
+                "p50_ms": round(percentile(ms, 50), 3),
+                "p95_ms": round(percentile(ms, 95), 3),
+                "p99_ms": round(percentile(ms, 99), 3),
+                "max_ms": round(max(ms), 3),
+            })
+        operations[name] = entry
+    all_ms = [v * 1000 for values in samples.values() for v in values]
+    total = {"requests": len(all_ms), "errors": sum(len(e) for e in errors.values()),
+             "rps": round(len(all_ms) / seconds, 1)}
+    if all_ms:
+        total.update({"p50_ms": round(percentile(all_ms, 50), 3),
+                      "p95_ms": round(percentile(all_ms, 95), 3),
+                      "p99_ms": round(percentile(all_ms, 99), 3),
+                      "max_ms": round(max(all_ms), 3)})
+    return total, operations
+
+
+def report_lines(total, operations):
+    header = f"{'操作':<40} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'err':>5}"
+    lines = [header, "-" * len(header)]
+
+    def line(name, entry):
+        cols = [f"{entry.get(k, 0):>8.2f}" for k in ("p50_ms", "p95_ms", "p99_ms", "max_ms")]
+        return f"{name:<40} {entry['rps']:>9.1f} {' '.join(cols)} {entry['errors']:>5}"
+
+    for name, entry in sorted(operations.items()):
+        lines.append(line(name, entry))
+    lines += ["-" * len(header), line("合計", total), "（レイテンシは ms）"]
+    return lines
+
+
+async def run(args):
+    ops, _ = load_operations(args.project)
+    if args.ops:
+        wanted = set(args.ops.split(","))
+        ops = [op for op in ops if op.operation_id in wanted or op.kind == "list"]
+        run_ops = wanted
+    else:
+        run_ops = {op.operation_id for op in ops}
+
+    setup = HttpClient(args.url, args.token)
+    ids = await harvest(setup, ops, args.harvest)
+    setup.close()
+    scenario = Scenario([op for op in ops if op.operation_id in run_ops], ids,
+                        args.batch_size, args.page_size)
+    if not scenario.ops:
+        raise SystemExit("実行できる操作がありません（ID を収集できたか確認してください）")
+    print(f"{len(scenario.ops)} 操作 / 同時接続 {args.concurrency} / {args.duration} 秒", file=sys.stderr)
+
+    samples = {op.operation_id: [] for op in scenario.ops}
+    errors = {op.operation_id: [] for op in scenario.ops}
+    if args.warmup:
+        deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*(worker(HttpClient(args.url, args.token), scenario, deadline,
+                                      {k: [] for k in samples}, {k: [] for k in errors})
+                               for _ in range(args.concurrency)))
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(HttpClient(args.url, args.token), scenario, deadline, samples, errors)
+                           for _ in range(args.concurrency)))
+    seconds = time.perf_counter() - started
+    return samples, errors, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="参照サーバーのスループットとテールレイテンシを計測する")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--url", default=DEFAULT_URL, help="参照サーバーの URL")
+    parser.add_argument("--concurrency", type=int, default=16, help="同時接続数")
+    parser.add_argument("--duration", type=float, default=30, help="計測時間（秒）")
+    parser.add_argument("--warmup", type=float, default=3, help="計測前のウォームアップ（秒）")
+    parser.add_argument("--ops", help="計測する operationId（カンマ区切り、既定: すべての GET）")
+    parser.add_argument("--harvest", type=int, default=DEFAULT_HARVEST, help="リソースごとに集める ID の数")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="バッチ取得の ids の件数")
+    parser.add_argument("--page-size", type=int, default=50, help="一覧・履歴の limit")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--token", help="Authorization: Bearer に付けるトークン")
+    parser.add_argument("--out", help="結果の JSON ファイル")
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    samples, errors, seconds = asyncio.run(run(args))
+    total, operations = summarize(samples, errors, seconds)
+    print("\n".join(report_lines(total, operations)))
+    if args.out:
+        results = {
+            "project": args.project,
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "url": args.url,
+            "concurrency": args.concurrency,
+            "duration_seconds": round(seconds, 3),
+            "total": total,
+            "operations": operations,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(json.dumps(results, ensure_ascii=False, indent=2) + "\n")
+        print(f"結果: {args.out}", file=sys.stderr)
+    return 1 if total["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
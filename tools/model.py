@@ -0,0 +1,289 @@
+"""model.json / entities_classified.json の読み込みと命名規則
+
+スキルが生成した成果物をデータクラスに読み込み、schema.sql と同じ命名規則
+（テーブル名は UPPER_SNAKE、カラム名は lower_snake）で参照できるようにする。
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+ARTIFACTS_DIR = Path(__file__).resolve().parent.parent / "artifacts"
+
+# PostgreSQLの予約語と衝突するテーブル名の置き換え（schema.sql の実績に合わせる）
+RESERVED_TABLE_NAMES = {"USER": "USER_ACCOUNT"}
+
+_SNAKE_1 = re.compile(r"([A-Z]+)([A-Z][a-z])")
+_SNAKE_2 = re.compile(r"([a-z0-9])([A-Z])")
+
+
+@lru_cache(maxsize=None)
+def to_snake(name):
+    """PascalCase を lower_snake に変換する（例: CustomerID → customer_id）"""
+    return _SNAKE_2.sub(r"\1_\2", _SNAKE_1.sub(r"\1_\2", name)).lower()
+
+
+@lru_cache(maxsize=None)
+def to_table_name(entity_name):
+    """エンティティ名をテーブル名に変換する（例: PersonAssign → PERSON_ASSIGN）"""
+    table = to_snake(entity_name).upper()
+    return RESERVED_TABLE_NAMES.get(table, table)
+
+
+def to_camel(name):
+    """PascalCase を OpenAPI の camelCase に変換する（例: CustomerID → customerID）"""
+    return name[:1].lower() + name[1:]
+
+
+def project_dir(project):
+    """プロジェクト名またはディレクトリパスから成果物ディレクトリを解決する"""
+    path = Path(project)
+    if path.is_dir():
+        return path
+    return ARTIFACTS_DIR / project
+
+
+@dataclass
+class Attribute:
+    english: str
+    japanese: str
+    type: str
+    is_primary_key: bool = False
+
+    @property
+    def column(self):
+        return to_snake(self.english)
+
+    @property
+    def base_type(self):
+        """型名から桁指定を除いたもの（例: DECIMAL(10,2) → DECIMAL）"""
+        return self.type.split("(", 1)[0].strip().upper()
+
+    @property
+    def is_temporal(self):
+        return self.base_type in ("DATE", "TIMESTAMP", "DATETIME")
+
+
+@dataclass
+class Entity:
+    name: str
+    type: str
+    attributes: list
+    japanese: str = ""
+    note: str = ""
+    datetime_attribute: str = None
+
+    @property
+    def table(self):
+        return to_table_name(self.name)
+
+    @property
+    def primary_keys(self):
+        return [a for a in self.attributes if a.is_primary_key]
+
+    @property
+    def pk(self):
+        """単一主キー（ジャンクションテーブルは None）"""
+        pks = self.primary_keys
+        return pks[0] if len(pks) == 1 else None
+
+    @property
+    def is_resource(self):
+        return self.type == "resource"
+
+    @property
+    def is_event(self):
+        return self.type == "event"
+
+    @property
+    def is_junction(self):
+        return self.type == "junction"
+
+    @property
+    def event_datetime(self):
+        """イベントの日時属性（イベント以外は None）"""
+        if not self.is_event:
+            return None
+        if self.datetime_attribute:
+            return self.attribute(self.datetime_attribute)
+        candidates = [a for a in self.attributes if a.english.endswith("DateTime")]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def attribute(self, english):
+        for attr in self.attributes:
+            if attr.english == english:
+                return attr
+        return None
+
+
+@dataclass
+class Relationship:
+    from_entity: str
+    to_entity: str
+    cardinality: str
+    relationship_type: str = ""
+    from_attribute: str = None
+    to_attribute: str = None
+    junction_table: str = None
+    note: str = ""
+
+    @property
+    def is_foreign_key(self):
+        """子側に外部キー属性を持つ関連か（M:N のタグ関連は False）"""
+        return bool(self.from_attribute and self.to_attribute)
+
+    @property
+    def is_self_reference(self):
+        return self.from_entity == self.to_entity
+
+
+@dataclass
+class Model:
+    project: str
+    entities: dict
+    relationships: list
+    path: Path = None
+    _parents: dict = field(default=None, repr=False)
+
+    def entity(self, name):
+        return self.entities[name]
+
+    def by_type(self, entity_type):
+        return [e for e in self.entities.values() if e.type == entity_type]
+
+    @property
+    def resources(self):
+        return self.by_type("resource")
+
+    @property
+    def events(self):
+        return self.by_type("event")
+
+    @property
+    def junctions(self):
+        return self.by_type("junction")
+
+    def parents(self, entity_name):
+        """エンティティが外部キーで参照する関連の一覧（モデル定義順）"""
+        if self._parents is None:
+            self._parents = {name: [] for name in self.entities}
+            for rel in self.relationships:
+                if rel.is_foreign_key and rel.to_entity in self._parents:
+                    self._parents[rel.to_entity].append(rel)
+        return self._parents.get(entity_name, [])
+
+    def children(self, entity_name):
+        """エンティティを外部キーで参照する関連の一覧"""
+        return [r for r in self.relationships
+                if r.is_foreign_key and r.from_entity == entity_name]
+
+    def junction_refs(self, entity_name):
+        """ジャンクションテーブルが参照する (リソース名, 属性) の一覧"""
+        junction = self.entities[entity_name]
+        refs = []
+        for attr in junction.primary_keys:
+            for other in self.resources:
+                if other.pk is not None and other.pk.english == attr.english:
+                    refs.append((other.name, attr))
+                    break
+        return refs
+
+    def subject(self, event_name):
+        """イベントの主体となるリソースへの関連を返す
+
+        同名の外部キー（ProjectID → ProjectID）で参照するリソースのうち、
+        他の候補を親に持つもの（例: Customer より Invoice）を優先し、
+        同順位ならモデル定義順で先頭のものを選ぶ。
+        """
+        candidates = [r for r in self.parents(event_name)
+                      if r.from_attribute == r.to_attribute
+                      and self.entities[r.from_entity].is_resource]
+        if not candidates:
+            return None
+        names = {r.from_entity for r in candidates}
+
+        def depth(rel):
+            return sum(1 for p in self.parents(rel.from_entity)
+                       if p.from_entity in names and not p.is_self_reference)
+
+        return max(candidates, key=depth)
+
+    def topological_order(self):
+        """外部キーの依存順にエンティティを並べる（自己参照は無視）"""
+        order, done = [], set()
+
+        def visit(name, trail):
+            if name in done or name in trail:
+                return
+            trail.add(name)
+            deps = [r.from_entity for r in self.parents(name) if not r.is_self_reference]
+            if self.entities[name].is_junction:
+                deps += [ref for ref, _ in self.junction_refs(name)]
+            for dep in deps:
+                visit(dep, trail)
+            done.add(name)
+            order.append(self.entities[name])
+
+        for name in self.entities:
+            visit(name, set())
+        return order
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _attributes(raw):
+    return [Attribute(a["english"], a.get("japanese", ""), a["type"],
+                      bool(a.get("is_primary_key", False)))
+            for a in raw]
+
+
+def load_model(project):
+    """成果物ディレクトリから Model を構築する
+
+    model.json を正とし、entities_classified.json があれば和名・注記・
+    イベント日時属性を補完する。
+    """
+    base = project_dir(project)
+    raw = _load_json(base / "model.json")
+    classified = {}
+    classified_path = base / "entities_classified.json"
+    if classified_path.exists():
+        data = _load_json(classified_path)
+        for group in data.values():
+            if isinstance(group, list):
+                for item in group:
+                    classified[item.get("english")] = item
+
+    entities = {}
+    for item in raw.get("entities", []):
+        extra = classified.get(item["name"], {})
+        dt = extra.get("datetime_attribute")
+        entities[item["name"]] = Entity(
+            name=item["name"],
+            type=item.get("type", "resource"),
+            attributes=_attributes(item.get("attributes", [])),
+            japanese=item.get("japanese") or extra.get("japanese", ""),
+            note=item.get("note") or extra.get("note", ""),
+            datetime_attribute=dt.get("english") if isinstance(dt, dict) else dt,
+        )
+
+    relationships = [
+        Relationship(
+            from_entity=r["from"],
+            to_entity=r["to"],
+            cardinality=r.get("cardinality", ""),
+            relationship_type=r.get("relationship_type", ""),
+            from_attribute=r.get("from_attribute"),
+            to_attribute=r.get("to_attribute"),
+            junction_table=r.get("junction_table"),
+            note=r.get("note", ""),
+        )
+        for r in raw.get("relationships", [])
+    ]
+    return Model(project=base.name, entities=entities,
+                 relationships=relationships, path=base)
@@ -0,0 +1,264 @@
+"""openapi.yaml の読み書き
+
+/openapi-generator の出力（PyYAML のブロック形式: インデント 2、リスト項目は親キーと
+同じ桁、複数行の説明はクォート付きスカラー）に限って読み書きする。標準ライブラリ
+だけで動かすための最小実装で、読んでそのまま書き戻すと元のファイルと同じテキストに
+なる（キーの順序・クォートの付け方を保つ）ので、書き換えた箇所だけが差分に出る。
+"""
+
+import json
+import re
+
+_PLAIN_INT = re.compile(r"^-?\d+$")
+_PLAIN_FLOAT = re.compile(r"^-?\d+\.\d+$")
+_PLAIN_DATE = re.compile(r"^\d{4}-\d\d?-\d\d?(?:[Tt ].*)?$")
+_NEEDS_QUOTE = re.compile(r"^(?:[,\[\]{}#&*!|>'\"%@`\s]|[-?:](?:\s|$))|: | #|\s$")
+_RESERVED = {"true", "false", "null", "~", "yes", "no", "on", "off", ""}
+_ESCAPES = {"n": "\n", "t": "\t", '"': '"', "\\": "\\", "/": "/", "0": "\0"}
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(" "))
+
+
+def _split_key(text):
+    """'key: value' を (キー, 値の文字列) に分ける。キーでなければ None"""
+    if text.startswith("'"):
+        end = text.index("'", 1)
+        key, rest = text[1:end], text[end + 1:]
+    else:
+        match = re.match(r"([^\s'\"#][^:]*?):(?= |$)", text)
+        if not match:
+            return None
+        key, rest = match.group(1), text[match.end(1):]
+    if not rest.startswith(":"):
+        return None
+    return key, rest[1:].strip()
+
+
+def _plain(text):
+    if text == "[]":
+        return []
+    if text == "{}":
+        return {}
+    if text in ("true", "false"):
+        return text == "true"
+    if text in ("null", "~"):
+        return None
+    if _PLAIN_INT.match(text):
+        return int(text)
+    if _PLAIN_FLOAT.match(text):
+        return float(text)
+    return text
+
+
+def _fold(parts):
+    """クォート付きスカラーの複数行を折り返し規則に従って連結する"""
+    value, pending = parts[0], 0
+    for n, part in enumerate(parts[1:], 2):
+        if part == "" and n < len(parts):
+            pending += 1
+            continue
+        value += "\n" * pending if pending else " "
+        value += part
+        pending = 0
+    return value
+
+
+def _unescape(text):
+    out, i = [], 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            nxt = text[i + 1]
+            if nxt == "u":
+                out.append(chr(int(text[i + 2:i + 6], 16)))
+                i += 6
+                continue
+            out.append(_ESCAPES.get(nxt, nxt))
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _scalar(lines, i, text):
+    """値の文字列（行 i から始まる）を読み、(値, 次の行) を返す"""
+    if not text or text[0] not in "'\"":
+        return _plain(text), i + 1
+    quote = text[0]
+    parts, body, j = [], text[1:], i
+    while True:
+        if quote == "'":
+            closing = re.search(r"(?<!')'(?!')", body.replace("''", "\0\0"))
+        else:
+            closing = re.search(r'(?<!\\)"', body.replace("\\\\", "\0\0"))
+        if closing:
+            parts.append(body[:closing.start()].strip() if j > i else body[:closing.start()])
+            break
+        parts.append(body.strip() if j > i else body.rstrip())
+        j += 1
+        body = lines[j]
+    value = _fold(parts)
+    value = value.replace("''", "'") if quote == "'" else _unescape(value)
+    return value, j + 1
+
+
+def _skip_blank(lines, i):
+    while i < len(lines) and not lines[i].strip():
+        i += 1
+    return i
+
+
+def _block(lines, i, indent):
+    """行 i から始まる indent 桁のブロック（マッピングかリスト）を読む"""
+    i = _skip_blank(lines, i)
+    if i < len(lines) and lines[i][indent:].startswith("- "):
+        return _sequence(lines, i, indent)
+    return _mapping(lines, i, indent)
+
+
+def _value(lines, i, indent, text):
+    """キーの値を読む。text が空なら次行以降の子ブロックを読む"""
+    if text:
+        return _scalar(lines, i, text)
+    j = _skip_blank(lines, i + 1)
+    if j >= len(lines):
+        return None, j
+    child = _indent(lines[j])
+    if child > indent or (child == indent and lines[j][indent:].startswith("- ")):
+        return _block(lines, j, child)
+    return None, i + 1
+
+
+def _mapping(lines, i, indent, first=None):
+    result = {}
+    while True:
+        i = _skip_blank(lines, i)
+        if first is None:
+            if i >= len(lines) or _indent(lines[i]) != indent or lines[i][indent:].startswith("- "):
+                return result, i
+            text = lines[i][indent:]
+        else:
+            text, first = first, None
+        key, rest = _split_key(text)
+        value, end = _value(lines, i, indent, rest)
+        result[key] = value
+        i = end
+
+
+def _sequence(lines, i, indent):
+    result = []
+    while True:
+        i = _skip_blank(lines, i)
+        if i >= len(lines) or _indent(lines[i]) != indent or not lines[i][indent:].startswith("- "):
+            return result, i
+        text = lines[i][indent + 2:]
+        if _split_key(text) is not None:
+            value, end = _mapping(lines, i, indent + 2, first=text)
+        else:
+            value, end = _scalar(lines, i, text)
+        result.append(value)
+        i = end
+
+
+def loads(text):
+    """YAML テキストを dict / list / スカラーに読む"""
+    document, _ = _mapping(text.split("\n"), 0, 0)
+    return document
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return loads(f.read())
+
+
+# ------------------------------------------------
+# 書き出し
+# ------------------------------------------------
+
+def scalar(value):
+    """1行のスカラーを PyYAML と同じ見た目にする"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if "\n" in value or '"' in value and "'" in value:
+        return json.dumps(value, ensure_ascii=False)
+    if (value.lower() in _RESERVED or _NEEDS_QUOTE.search(value)
+            or _PLAIN_INT.match(value) or _PLAIN_FLOAT.match(value) or _PLAIN_DATE.match(value)):
+        return "'" + value.replace("'", "''") + "'"
+    return value
+
+
+def _text_lines(value, indent):
+    """値の書き出し（1行目は "key: " の後ろに続く）
+
+    改行を含む文字列は PyYAML と同じく、行頭・行末に空白がなければ複数行の
+    シングルクォート（改行1つを空行1つで表す）、あれば1行のダブルクォートにする。
+    """
+    if isinstance(value, dict):
+        return ["{}"]
+    if isinstance(value, list):
+        return ["[]"]
+    if not isinstance(value, str) or "\n" not in value:
+        return [scalar(value)]
+    segments = value.replace("'", "''").split("\n")
+    if any(s != s.strip() or "\t" in s for s in segments):
+        return [json.dumps(value, ensure_ascii=False)]
+    pad = " " * (indent + 2)
+    lines, blanks = ["'" + segments[0]], 0
+    for segment in segments[1:]:
+        blanks += 1
+        if segment:
+            lines.extend([""] * blanks)
+            lines.append(pad + segment)
+            blanks = 0
+    if blanks:
+        lines.extend([""] * blanks)
+        lines.append(pad + "'")
+    else:
+        lines[-1] += "'"
+    return lines
+
+
+def dump(value, indent=0):
+    """dict / list を PyYAML のブロック形式の行のリストにする"""
+    pad = " " * indent
+    lines = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            head = f"{pad}{scalar(str(key))}:"
+            if isinstance(item, dict) and item:
+                lines.append(head)
+                lines.extend(dump(item, indent + 2))
+            elif isinstance(item, list) and item:
+                lines.append(head)
+                lines.extend(dump(item, indent))
+            else:
+                text = _text_lines(item, indent)
+                lines.append(f"{head} {text[0]}")
+                lines.extend(text[1:])
+        return lines
+    for item in value:
+        if isinstance(item, dict) and item:
+            inner = dump(item, indent + 2)
+            lines.append(f"{pad}- {inner[0][indent + 2:]}")
+            lines.extend(inner[1:])
+        else:
+            text = _text_lines(item, indent)
+            lines.append(f"{pad}- {text[0]}")
+            lines.extend(text[1:])
+    return lines
+
+
+def dumps(document):
+    return "\n".join(dump(document)) + "\n"
+
+
+def save(path, document):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(dumps(document))
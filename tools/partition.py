@@ -0,0 +1,400 @@
+"""イベントテーブルの時間範囲パーティション版 DDL（/ddl-generator のパーティションモード）
+
+PERFORMANCE_QUICK_REFERENCE.md の「レベル4」（100万行超でのパーティショニング）を
+生成物にする。schema.sql を入力に、イベントに分類されたすべてのテーブルを
+イベント日時列で PARTITION BY RANGE し、次を加えた schema_partitioned.sql を出力する。
+
+- パーティションの事前作成関数（create_time_partitions / create_event_partitions）と
+  範囲外の行を受けるデフォルトパーティション
+- イベント日時列の BRIN インデックス（追記順 = 日時順のため数ページで済む）。
+  日時列を先頭に持つ B-tree インデックスは BRIN で置き換える
+- 主キーはパーティションキーを含む (イベントID, イベント日時) にする
+
+あわせて、query_examples.sql の履歴クエリ（イベント日時で並べる一覧）に
+日時範囲の条件を加えた query_examples_partitioned.sql を出力する。
+範囲条件がないとすべてのパーティションを走査するため、直近の期間に絞って刈り込みを効かせる。
+
+使い方:
+    python -m tools.partition invoice-management                    # DDL を表示
+    python -m tools.partition project-record-system --write         # 2 ファイルを出力
+    python -m tools.partition project-record-system --interval month --history "24 months" --write
+"""
+
+import argparse
+import re
+import sys
+
+from tools.model import load_model
+from tools.query_examples import parse_query_examples
+from tools.schema import Index, index_section_span, parse_schema
+
+SCHEMA_NAME = "schema_partitioned.sql"
+QUERIES_NAME = "query_examples_partitioned.sql"
+
+INTERVALS = {"month": "1 month", "quarter": "3 months", "year": "1 year"}
+DEFAULT_INTERVAL = "quarter"
+# DDL 実行時に作成しておく範囲（過去分と先行分）
+DEFAULT_HISTORY = "36 months"
+DEFAULT_AHEAD = "3 months"
+# 履歴クエリを絞り込む直近の期間
+DEFAULT_WINDOW = "12 months"
+# BRIN の 1 範囲あたりのページ数（小さいほど絞り込みが細かく、索引は大きくなる）
+BRIN_PAGES_PER_RANGE = 32
+
+_RULE = "-- " + "=" * 48
+_BOUNDARY_WORDS = ("WHERE", "GROUP", "HAVING", "ORDER", "LIMIT", "OFFSET", "WINDOW",
+                   "UNION", "INTERSECT", "EXCEPT")
+_JOIN_WORDS = ("INNER", "LEFT", "RIGHT", "FULL", "CROSS", "JOIN", "NATURAL", "LATERAL", "ON")
+_WORD = re.compile(r'"(?:[^"]|"")*"|\'(?:[^\']|\'\')*\'|\w+|[()]|.', re.S)
+
+
+def event_tables(model):
+    """パーティション化するイベント（テーブル名, 主キー列, 日時列）"""
+    result = []
+    for event in model.events:
+        dt = event.event_datetime
+        if dt is None or len(event.primary_keys) != 1:
+            print(f"警告: {event.table} はイベント日時列が 1 つに定まらないためパーティション化しない",
+                  file=sys.stderr)
+            continue
+        result.append((event, event.pk.column, dt.column))
+    return result
+
+
+# ------------------------------------------------
+# DDL の書き換え
+# ------------------------------------------------
+
+def _table_end(text, start):
+    """CREATE TABLE の開き括弧位置から、閉じ括弧の位置を返す"""
+    depth = 0
+    for pos in range(start, len(text)):
+        if text[pos] == "(":
+            depth += 1
+        elif text[pos] == ")":
+            depth -= 1
+            if depth == 0:
+                return pos
+    raise ValueError("unterminated CREATE TABLE")
+
+
+def _partition_table(text, table, pk, dt):
+    """イベントテーブルの CREATE TABLE を日時列の範囲パーティションに書き換える"""
+    match = re.search(rf"^CREATE TABLE {table} \($", text, re.M)
+    if match is None:
+        raise ValueError(f"schema.sql に {table} がない")
+    start = match.end() - 1
+    end = _table_end(text, start)
+    body = text[start + 1:end]
+    body, count = re.subn(rf"^(    {pk} .*?) PRIMARY KEY,$", r"\1,", body, count=1, flags=re.M)
+    if not count:
+        raise ValueError(f"{table}.{pk} の主キー定義が見つからない")
+    # パーティションテーブルの一意制約はパーティションキーを含む必要がある
+    body = body.rstrip("\n") + f",\n    PRIMARY KEY ({pk}, {dt})\n"
+    tail = text[end:]
+    assert tail.startswith(");")
+    return text[:start + 1] + body + f") PARTITION BY RANGE ({dt});" + tail[2:]
+
+
+def _partition_functions(events, step, history, ahead):
+    lines = [
+        "",
+        _RULE,
+        "-- パーティション管理",
+        _RULE,
+        "",
+        "-- parent の範囲パーティションを step 単位で from_ts から to_ts まで作成する（作成済みは飛ばす）",
+        "-- パーティション名は {テーブル}_p{開始日}。境界はセッションのタイムゾーンで年初から step ごとに揃える",
+        "CREATE OR REPLACE FUNCTION create_time_partitions(",
+        "    parent REGCLASS, from_ts TIMESTAMPTZ, to_ts TIMESTAMPTZ, step INTERVAL",
+        ") RETURNS INTEGER LANGUAGE plpgsql AS $$",
+        "DECLARE",
+        "    lo TIMESTAMPTZ := date_trunc('year', from_ts);",
+        "    hi TIMESTAMPTZ;",
+        "    parent_name TEXT;",
+        "    key_column TEXT;",
+        "    default_part REGCLASS;",
+        "    part TEXT;",
+        "    misplaced BOOLEAN;",
+        "    created INTEGER := 0;",
+        "BEGIN",
+        "    SELECT c.relname, a.attname INTO parent_name, key_column",
+        "    FROM pg_partitioned_table pt",
+        "        JOIN pg_class c ON c.oid = pt.partrelid",
+        "        JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]",
+        "    WHERE pt.partrelid = parent;",
+        "    IF parent_name IS NULL THEN",
+        "        RAISE EXCEPTION '% はパーティションテーブルではありません', parent;",
+        "    END IF;",
+        "    SELECT i.inhrelid::REGCLASS INTO default_part",
+        "    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid",
+        "    WHERE i.inhparent = parent AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT';",
+        "",
+        "    WHILE lo + step <= from_ts LOOP",
+        "        lo := lo + step;",
+        "    END LOOP;",
+        "    WHILE lo < to_ts LOOP",
+        "        hi := lo + step;",
+        "        part := format('%s_p%s', parent_name, to_char(lo, 'YYYYMMDD'));",
+        "        IF to_regclass(quote_ident(part)) IS NULL THEN",
+        "            -- デフォルトパーティションに範囲内の行があると作成できない（行の移動はプロジェクションの再計算を伴うため自動では行わない）",
+        "            IF default_part IS NOT NULL THEN",
+        "                EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE %I >= $1 AND %I < $2)',",
+        "                               default_part, key_column, key_column)",
+        "                    INTO misplaced USING lo, hi;",
+        "                IF misplaced THEN",
+        "                    RAISE EXCEPTION '% に [%, %) の行があるため % を作成できません', default_part, lo, hi, part",
+        "                        USING HINT = '行を退避してから作成し、元のテーブルに戻してください';",
+        "                END IF;",
+        "            END IF;",
+        "            EXECUTE format('CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',",
+        "                           part, parent, lo, hi);",
+        "            created := created + 1;",
+        "        END IF;",
+        "        lo := hi;",
+        "    END LOOP;",
+        "    RETURN created;",
+        "END;",
+        "$$;",
+        "",
+        "-- すべてのイベントテーブルに、現在から ahead 先までのパーティションを作成する",
+        "-- 定期実行する（例: pg_cron で毎月 SELECT create_event_partitions();）",
+        "CREATE OR REPLACE FUNCTION create_event_partitions(",
+        f"    ahead INTERVAL DEFAULT INTERVAL '{ahead}', history INTERVAL DEFAULT INTERVAL '0 months'",
+        ") RETURNS INTEGER LANGUAGE plpgsql AS $$",
+        "DECLARE",
+        "    created INTEGER := 0;",
+        "BEGIN",
+    ]
+    for event, _, _ in events:
+        lines.append(f"    created := created + create_time_partitions('{event.table}', "
+                     f"CURRENT_TIMESTAMP - history, CURRENT_TIMESTAMP + ahead, INTERVAL '{step}');")
+    lines += ["    RETURN created;", "END;", "$$;", "",
+              "-- 範囲外（作成前の未来日時・作成範囲より前の過去日時）の行を受けるデフォルトパーティション"]
+    for event, _, _ in events:
+        lines.append(f"CREATE TABLE {event.table}_DEFAULT PARTITION OF {event.table} DEFAULT;")
+    lines += ["", f"SELECT create_event_partitions(INTERVAL '{ahead}', INTERVAL '{history}');"]
+    return lines
+
+
+def _brin_index(table, dt):
+    return Index(name=f"brin_{table.lower()}_datetime", table=table, columns=[(dt, False)],
+                 method="brin", storage=f"pages_per_range = {BRIN_PAGES_PER_RANGE}, autosummarize = on")
+
+
+def _rewrite_index_section(section, schema, events):
+    """日時列を先頭に持つ B-tree を BRIN に置き換え、イベントごとに BRIN を加える"""
+    datetime_of = {event.table: dt for event, _, dt in events}
+    replaced = {}
+    for index in schema.indexes:
+        if (index.table in datetime_of and index.method == "btree"
+                and index.columns[0][0] == datetime_of[index.table]):
+            replaced[index.name] = index
+
+    lines = []
+    for line in section.splitlines():
+        match = re.match(r"^CREATE (?:UNIQUE )?INDEX (\w+) ", line)
+        if match and match.group(1) in replaced:
+            lines.append(f"-- {match.group(1)}: 日時列の範囲走査は {replaced[match.group(1)].table} の BRIN で代替")
+            continue
+        lines.append(line)
+
+    brin = ["-- 日時列の BRIN インデックス（イベントは日時順に追記されるため、ページ範囲ごとの最小・最大値で",
+            "-- 範囲条件を絞り込める。B-tree に比べて数百分の一の大きさで、追記時の更新もほぼない）"]
+    for event, _, dt in events:
+        brin.append(_brin_index(event.table, dt).ddl())
+    # 「作成しないインデックス」の注記より前に置く
+    for pos, line in enumerate(lines):
+        if line.startswith("-- 作成しないインデックス"):
+            lines[pos:pos] = brin + [""]
+            break
+    else:
+        lines += [""] + brin
+    return "\n".join(lines).rstrip("\n") + "\n"
+
+
+def partitioned_schema(model, schema, events, step, history, ahead):
+    text = schema.text
+    start, _ = index_section_span(text)
+    head, section = text[:start], text[start:]
+    for event, pk, dt in events:
+        head = _partition_table(head, event.table, pk, dt)
+
+    # 冒頭の見出しにパーティション版であることを記す
+    header_end = head.index(_RULE, len(_RULE)) if head.startswith(_RULE) else 0
+    note = [
+        f"-- パーティション版（イベントテーブルを日時列で {step} ごとに範囲分割）",
+        f"-- 生成: python -m tools.partition {model.project} --write",
+    ]
+    if header_end:
+        head = head[:header_end] + "\n".join(note) + "\n" + head[header_end:]
+    else:
+        head = "\n".join(note) + "\n\n" + head
+
+    head = head.rstrip("\n") + "\n" + "\n".join(_partition_functions(events, step, history, ahead)) + "\n\n"
+    return head + _rewrite_index_section(section, schema, events)
+
+
+# ------------------------------------------------
+# 履歴クエリの書き換え
+# ------------------------------------------------
+
+def _scan(sql, start=0):
+    """(位置, 字句) を返す。文字列・引用識別子は 1 字句として扱う"""
+    for match in _WORD.finditer(sql, start):
+        if not match.group().isspace():
+            yield match.start(), match.group()
+
+
+def _boundary(sql, start):
+    """start 以降で、同じ括弧の深さにある次の句の開始位置と語（なければ末尾）"""
+    depth = 0
+    for pos, tok in _scan(sql, start):
+        if tok == "(":
+            depth += 1
+        elif tok == ")":
+            if depth == 0:
+                return pos, ")"
+            depth -= 1
+        elif depth == 0 and tok.upper() in _BOUNDARY_WORDS:
+            return pos, tok.upper()
+    return len(sql), None
+
+
+def _has_top_level_or(sql, start, end):
+    depth = 0
+    for _pos, tok in _scan(sql[:end], start):
+        if tok == "(":
+            depth += 1
+        elif tok == ")":
+            depth -= 1
+        elif depth == 0 and tok.upper() == "OR":
+            return True
+    return False
+
+
+def _event_scans(sql, events):
+    """FROM 句で駆動表として読むイベントテーブル（位置, 別名, 日時列）"""
+    scans = []
+    for event, _, dt in events:
+        pattern = re.compile(rf"\bFROM\s+{event.table}\b(?:\s+(?:AS\s+)?(\w+))?", re.I)
+        for match in pattern.finditer(sql):
+            alias = match.group(1)
+            if alias is None or alias.upper() in _JOIN_WORDS + _BOUNDARY_WORDS:
+                alias = event.table
+            scans.append((match.start(), match.end(), alias, dt))
+    return scans
+
+
+def _final_order_by(sql):
+    """トップレベルの最後の ORDER BY の並び（なければ空）"""
+    depth, last = 0, None
+    tokens = list(_scan(sql))
+    for i, (_pos, tok) in enumerate(tokens):
+        if tok == "(":
+            depth += 1
+        elif tok == ")":
+            depth -= 1
+        elif depth == 0 and tok.upper() == "ORDER" and i + 1 < len(tokens) and tokens[i + 1][1].upper() == "BY":
+            last = tokens[i + 1][0] + 2
+    if last is None:
+        return []
+    end, _ = _boundary(sql, last)
+    return [item.strip().split()[0] for item in sql[last:end].split(",") if item.strip()]
+
+
+def is_history_query(sql, scans):
+    """イベント日時（またはその別名）で並べる一覧か"""
+    datetimes = {f"{alias}.{dt}".lower() for _, _, alias, dt in scans} | {dt for _, _, _, dt in scans}
+    names = set(datetimes)
+    for item in datetimes:
+        if "." in item:
+            for match in re.finditer(rf"\b{re.escape(item)}\s+AS\s+(\"(?:[^\"]|\"\")*\"|\w+)", sql, re.I):
+                names.add(match.group(1).lower())
+    # UNION・CTE の外側では列の別名（例: event_date_time, "発生日時"）で並べるため、別名も対象
+    return any(item.lower() in names for item in _final_order_by(sql))
+
+
+def _indent_of(sql, pos):
+    line_start = sql.rfind("\n", 0, pos) + 1
+    return sql[line_start:pos]
+
+
+def add_time_window(sql, scans, window):
+    """各イベントテーブルの読み取りに日時範囲の条件を加える（後ろから挿入して位置を保つ）"""
+    for start, end, alias, dt in sorted(scans, reverse=True):
+        predicate = f"{alias}.{dt} >= CURRENT_TIMESTAMP - INTERVAL '{window}'"
+        indent = _indent_of(sql, start)
+        pos, word = _boundary(sql, end)
+        if word == "WHERE":
+            where_start = pos + len("WHERE")
+            where_end, _ = _boundary(sql, where_start)
+            insert_at = len(sql[:where_end].rstrip())
+            if _has_top_level_or(sql, where_start, where_end):
+                body = sql[where_start:insert_at].strip()
+                sql = (sql[:where_start] + f"\n{indent}    ({body})\n{indent}    AND {predicate}"
+                       + sql[insert_at:])
+            else:
+                sql = sql[:insert_at] + f"\n{indent}    AND {predicate}" + sql[insert_at:]
+        else:
+            insert_at = len(sql[:pos].rstrip())
+            sql = sql[:insert_at] + f"\n{indent}WHERE\n{indent}    {predicate}" + sql[insert_at:]
+    return sql
+
+
+def partitioned_queries(model, queries, events, window):
+    lines = [
+        _RULE,
+        "-- クエリ例（パーティション版）",
+        f"-- 生成: python -m tools.partition {model.project} --write",
+        f"-- 履歴クエリはイベント日時を直近 {window} に限定し、範囲外のパーティションを刈り込む",
+        "-- （CURRENT_TIMESTAMP は実行開始時に確定するため、実行時の刈り込みで対象外のパーティションを読まない）",
+        "-- その他のクエリは query_examples.sql と同じ",
+        _RULE,
+    ]
+    rewritten = []
+    for query in queries:
+        sql = query.sql
+        scans = _event_scans(sql, events)
+        description = query.description
+        if scans and is_history_query(sql, scans):
+            sql = add_time_window(sql, scans, window)
+            tables = ", ".join(dict.fromkeys(alias for _, _, alias, _ in sorted(scans)))
+            description = f"パーティション刈り込み: 直近 {window}（{tables}）"
+            rewritten.append(query.number)
+        lines += ["", _RULE, f"-- 【クエリ{query.number}】{query.title}", f"-- {description}", _RULE, sql + ";"]
+    return "\n".join(lines) + "\n", rewritten
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="イベントテーブルを日時列で範囲パーティション化した DDL を生成する")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--interval", choices=sorted(INTERVALS), default=DEFAULT_INTERVAL,
+                        help="パーティションの幅（既定: quarter）")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="DDL 実行時に作成する過去分（既定: 36 months）")
+    parser.add_argument("--ahead", default=DEFAULT_AHEAD, help="先行して作成する未来分（既定: 3 months）")
+    parser.add_argument("--window", default=DEFAULT_WINDOW, help="履歴クエリを絞り込む直近の期間（既定: 12 months）")
+    parser.add_argument("--write", action="store_true",
+                        help=f"artifacts/{{project}}/{SCHEMA_NAME} と {QUERIES_NAME} に書き出す")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.project)
+    schema = parse_schema(model.path / "schema.sql")
+    events = event_tables(model)
+    ddl = partitioned_schema(model, schema, events, INTERVALS[args.interval], args.history, args.ahead)
+    queries, rewritten = partitioned_queries(
+        model, parse_query_examples(model.path / "query_examples.sql"), events, args.window)
+
+    if not args.write:
+        sys.stdout.write(ddl)
+        return 0
+    for name, text in ((SCHEMA_NAME, ddl), (QUERIES_NAME, queries)):
+        out = model.path / name
+        out.write_text(text, encoding="utf-8")
+        print(f"{out}", file=sys.stderr)
+    print(f"日時範囲を加えた履歴クエリ: {', '.join(map(str, rewritten)) or 'なし'}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
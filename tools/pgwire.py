@@ -0,0 +1,403 @@
+"""PostgreSQL フロントエンド/バックエンドプロトコル（v3）の最小クライアント
+
+参照サーバー（tools.api_server）をドライバなし・標準ライブラリだけで動かすための
+asyncio 実装。拡張問い合わせプロトコルを使い、SQL ごとのプリペアドステートメントを
+接続単位でキャッシュする（Parse は初回だけ、以降は Bind / Execute のみ）。結果は
+テキスト形式で受け取り、型 OID ごとに Python の値へ変換する。
+
+認証は trust / password / md5 / SCRAM-SHA-256 に対応する（PostgreSQL 16 の既定は
+SCRAM-SHA-256）。TLS とバイナリ形式には対応しない。
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import struct
+from contextlib import asynccontextmanager
+
+from tools import postgres
+
+PROTOCOL_VERSION = 196608  # 3.0
+
+_AUTH_OK = 0
+_AUTH_CLEARTEXT = 3
+_AUTH_MD5 = 5
+_AUTH_SASL = 10
+_AUTH_SASL_CONTINUE = 11
+_AUTH_SASL_FINAL = 12
+
+_TZ_HOURS = re.compile(r"[+-]\d\d$")
+
+
+def _timestamp(text):
+    """'2024-04-01 09:00:00+09' を ISO 8601（'2024-04-01T09:00:00+09:00'）にする"""
+    text = text.replace(" ", "T", 1)
+    return text + ":00" if _TZ_HOURS.search(text) else text
+
+
+# 型 OID ごとの変換。numeric と日付はテキストのまま返す（精度と桁を落とさない）
+_CONVERTERS = {
+    16: lambda v: v == "t",     # bool
+    20: int,                    # int8
+    21: int,                    # int2
+    23: int,                    # int4
+    26: int,                    # oid
+    700: float,                 # float4
+    701: float,                 # float8
+    114: json.loads,            # json
+    3802: json.loads,           # jsonb
+    1114: _timestamp,           # timestamp
+    1184: _timestamp,           # timestamptz
+}
+
+
+class PostgresError(Exception):
+    """サーバーが返した ErrorResponse（code は SQLSTATE）"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.code = fields.get("C", "")
+        self.message = fields.get("M", "")
+        super().__init__(f"{fields.get('S', 'ERROR')}: {self.message} ({self.code})")
+
+
+def _cstring(text):
+    return text.encode("utf-8") + b"\0"
+
+
+def _message(kind, payload=b""):
+    return kind + struct.pack("!i", len(payload) + 4) + payload
+
+
+def _error_fields(payload):
+    fields = {}
+    for part in payload.split(b"\0"):
+        if part:
+            fields[chr(part[0])] = part[1:].decode("utf-8", "replace")
+    return fields
+
+
+def _array_literal(values):
+    items = []
+    for value in values:
+        if value is None:
+            items.append("NULL")
+        elif isinstance(value, (int, float)):
+            items.append(str(value))
+        else:
+            items.append('"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return "{" + ",".join(items) + "}"
+
+
+def _encode(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        text = "true" if value else "false"
+    elif isinstance(value, (list, tuple)):
+        text = _array_literal(value)
+    else:
+        text = str(value)
+    return text.encode("utf-8")
+
+
+class _Statement:
+    __slots__ = ("name", "columns")
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = columns          # [(列名, 変換関数)]
+
+
+class Connection:
+    """1本のサーバー接続。同時に1つの問い合わせだけを流す（並行利用は Pool 経由で）"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._statements = {}
+        self.parameters = {}
+        self.closed = False
+
+    @classmethod
+    async def connect(cls, host=None, port=None, user=None, password=None, database=None):
+        host = host or postgres.HOST
+        port = port or postgres.PORT
+        user = user or postgres.USER
+        password = postgres.PASSWORD if password is None else password
+        reader, writer = await asyncio.open_connection(host, port)
+        conn = cls(reader, writer)
+        try:
+            await conn._startup(user, password, database or postgres.DATABASE)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    # ------------------------------------------------
+    # 送受信
+    # ------------------------------------------------
+
+    async def _read(self):
+        header = await self._reader.readexactly(5)
+        kind, length = header[:1], struct.unpack("!i", header[1:])[0]
+        payload = await self._reader.readexactly(length - 4) if length > 4 else b""
+        return kind, payload
+
+    async def _until_ready(self, handle=None):
+        """ReadyForQuery まで読み、途中の ErrorResponse があれば読み切ってから送出する"""
+        error = None
+        while True:
+            kind, payload = await self._read()
+            if kind == b"Z":
+                break
+            if kind == b"E":
+                error = PostgresError(_error_fields(payload))
+            elif kind in (b"N", b"S"):
+                if kind == b"S":
+                    name, value = payload.rstrip(b"\0").split(b"\0", 1)
+                    self.parameters[name.decode()] = value.decode()
+            elif handle is not None:
+                handle(kind, payload)
+        if error is not None:
+            raise error
+
+    async def _startup(self, user, password, database):
+        body = struct.pack("!i", PROTOCOL_VERSION)
+        for key, value in (("user", user), ("database", database),
+                           ("application_name", "cc-data-modeler"), ("client_encoding", "UTF8")):
+            body += _cstring(key) + _cstring(value)
+        body += b"\0"
+        self._writer.write(struct.pack("!i", len(body) + 4) + body)
+        await self._writer.drain()
+
+        scram = None
+        while True:
+            kind, payload = await self._read()
+            if kind == b"E":
+                raise PostgresError(_error_fields(payload))
+            if kind != b"R":
+                break
+            code = struct.unpack("!i", payload[:4])[0]
+            if code == _AUTH_OK:
+                break
+            if code == _AUTH_CLEARTEXT:
+                self._writer.write(_message(b"p", _cstring(password)))
+            elif code == _AUTH_MD5:
+                inner = hashlib.md5((password + user).encode()).hexdigest()
+                digest = hashlib.md5(inner.encode() + payload[4:8]).hexdigest()
+                self._writer.write(_message(b"p", _cstring("md5" + digest)))
+            elif code == _AUTH_SASL:
+                mechanisms = payload[4:].split(b"\0")
+                if b"SCRAM-SHA-256" not in mechanisms:
+                    raise PostgresError({"M": f"unsupported SASL mechanisms: {mechanisms}"})
+                scram = _Scram(password)
+                first = scram.client_first().encode()
+                self._writer.write(_message(
+                    b"p", _cstring("SCRAM-SHA-256") + struct.pack("!i", len(first)) + first))
+            elif code == _AUTH_SASL_CONTINUE:
+                self._writer.write(_message(b"p", scram.client_final(payload[4:].decode()).encode()))
+            elif code == _AUTH_SASL_FINAL:
+                scram.verify(payload[4:].decode())
+            else:
+                raise PostgresError({"M": f"unsupported authentication method: {code}"})
+            await self._writer.drain()
+
+        # ParameterStatus / BackendKeyData を読み流して ReadyForQuery を待つ
+        await self._until_ready()
+
+    # ------------------------------------------------
+    # 問い合わせ
+    # ------------------------------------------------
+
+    async def _prepare(self, sql):
+        statement = self._statements.get(sql)
+        if statement is not None:
+            return statement
+        name = f"s{len(self._statements)}"
+        self._writer.write(
+            _message(b"P", _cstring(name) + _cstring(sql) + struct.pack("!h", 0))
+            + _message(b"D", b"S" + _cstring(name))
+            + _message(b"S"))
+        await self._writer.drain()
+        columns = []
+
+        def handle(kind, payload):
+            if kind == b"T":
+                count, pos = struct.unpack("!h", payload[:2])[0], 2
+                for _ in range(count):
+                    end = payload.index(b"\0", pos)
+                    column = payload[pos:end].decode()
+                    oid = struct.unpack("!i", payload[end + 7:end + 11])[0]
+                    columns.append((column, _CONVERTERS.get(oid)))
+                    pos = end + 19
+
+        await self._until_ready(handle)
+        statement = self._statements[sql] = _Statement(name, columns)
+        return statement
+
+    async def fetch(self, sql, *args):
+        """SQL を実行し、行を {列名: 値} の dict のリストで返す"""
+        statement = await self._prepare(sql)
+        bind = _cstring("") + _cstring(statement.name) + struct.pack("!hh", 0, len(args))
+        for arg in args:
+            data = _encode(arg)
+            bind += struct.pack("!i", -1) if data is None else struct.pack("!i", len(data)) + data
+        bind += struct.pack("!h", 0)
+        self._writer.write(
+            _message(b"B", bind) + _message(b"E", _cstring("") + struct.pack("!i", 0)) + _message(b"S"))
+        await self._writer.drain()
+        rows, columns = [], statement.columns
+
+        def handle(kind, payload):
+            if kind != b"D":
+                return
+            row, pos = {}, 2
+            for name, convert in columns:
+                length = struct.unpack("!i", payload[pos:pos + 4])[0]
+                pos += 4
+                if length < 0:
+                    row[name] = None
+                    continue
+                text = payload[pos:pos + length].decode("utf-8")
+                pos += length
+                row[name] = convert(text) if convert else text
+            rows.append(row)
+
+        await self._until_ready(handle)
+        return rows
+
+    async def fetchrow(self, sql, *args):
+        rows = await self.fetch(sql, *args)
+        return rows[0] if rows else None
+
+    async def execute(self, sql):
+        """単純問い合わせプロトコルで SQL を実行する（SET などの設定用）"""
+        self._writer.write(_message(b"Q", _cstring(sql)))
+        await self._writer.drain()
+        await self._until_ready()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._writer.write(_message(b"X"))
+        except (OSError, RuntimeError):
+            pass
+        self._writer.close()
+
+
+class _Scram:
+    """SCRAM-SHA-256（RFC 7677）のクライアント側。チャネルバインディングなし"""
+
+    def __init__(self, password):
+        self.password = password
+        self.nonce = base64.b64encode(os.urandom(18)).decode()
+        self.first_bare = f"n=,r={self.nonce}"
+        self.auth_message = None
+        self.salted = None
+
+    def client_first(self):
+        return "n,," + self.first_bare
+
+    def client_final(self, server_first):
+        fields = dict(part.split("=", 1) for part in server_first.split(","))
+        if not fields["r"].startswith(self.nonce):
+            raise PostgresError({"M": "SCRAM nonce mismatch"})
+        self.salted = hashlib.pbkdf2_hmac(
+            "sha256", self.password.encode(), base64.b64decode(fields["s"]), int(fields["i"]))
+        client_key = hmac.digest(self.salted, b"Client Key", "sha256")
+        without_proof = f"c=biws,r={fields['r']}"
+        self.auth_message = f"{self.first_bare},{server_first},{without_proof}".encode()
+        signature = hmac.digest(hashlib.sha256(client_key).digest(), self.auth_message, "sha256")
+        proof = bytes(a ^ b for a, b in zip(client_key, signature))
+        return f"{without_proof},p={base64.b64encode(proof).decode()}"
+
+    def verify(self, server_final):
+        server_key = hmac.digest(self.salted, b"Server Key", "sha256")
+        expected = hmac.digest(server_key, self.auth_message, "sha256")
+        if server_final.split("v=", 1)[-1] != base64.b64encode(expected).decode():
+            raise PostgresError({"M": "SCRAM server signature mismatch"})
+
+
+class Pool:
+    """接続プール。min_size 本を先に開き、足りなければ max_size 本まで増やす
+
+    貸し出し中の本数をセマフォで max_size までに抑え、返却・破棄のたびに解放して
+    待っている acquire を起こす。PostgresError を返した接続は ReadyForQuery まで
+    読み切っているのでそのまま戻し、通信が切れた接続だけを捨てる。
+    """
+
+    def __init__(self, min_size=2, max_size=10, **connect_args):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.connect_args = connect_args
+        self._idle = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(max_size)
+        self._size = 0
+
+    async def open(self):
+        self._size += self.min_size
+        try:
+            conns = await asyncio.gather(
+                *(Connection.connect(**self.connect_args) for _ in range(self.min_size)))
+        except BaseException:
+            self._size -= self.min_size
+            raise
+        for conn in conns:
+            self._idle.put_nowait(conn)
+        return self
+
+    async def _get(self):
+        await self._slots.acquire()
+        if not self._idle.empty():
+            return self._idle.get_nowait()
+        # 空きがなければ新しく開く（貸し出し中と待機中を合わせて max_size を超えない）
+        self._size += 1
+        try:
+            return await Connection.connect(**self.connect_args)
+        except BaseException:
+            self._size -= 1
+            self._slots.release()
+            raise
+
+    def _release(self, conn):
+        self._idle.put_nowait(conn)
+        self._slots.release()
+
+    def _discard(self, conn):
+        conn.close()
+        self._size -= 1
+        self._slots.release()
+
+    @asynccontextmanager
+    async def acquire(self):
+        conn = await self._get()
+        try:
+            yield conn
+        except PostgresError:
+            self._release(conn)
+            raise
+        except BaseException:
+            # 応答の途中で切れた・取り消された接続は状態が分からないので捨てる
+            self._discard(conn)
+            raise
+        self._release(conn)
+
+    async def fetch(self, sql, *args):
+        async with self.acquire() as conn:
+            return await conn.fetch(sql, *args)
+
+    async def fetchrow(self, sql, *args):
+        async with self.acquire() as conn:
+            return await conn.fetchrow(sql, *args)
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+            self._size -= 1
@@ -0,0 +1,47 @@
+"""docker-compose の PostgreSQL コンテナへの psql 接続
+
+ドライバを追加せず、docker-compose.yml のコンテナ内 psql に標準入力で SQL を流す。
+PSQL 環境変数でコマンドを差し替えられる（例: ローカルの psql を直接使う場合）。
+TCP で直接つなぐツール（tools.pgwire）向けの接続先も PGHOST / PGPORT / PGPASSWORD
+環境変数で上書きできる。
+"""
+
+import os
+import shlex
+import subprocess
+
+CONTAINER = "cc-data-modeler-postgres"
+USER = "datamodeler"
+DATABASE = "immutable_model_db"
+
+# docker-compose.yml が公開しているポートと認証情報
+HOST = os.environ.get("PGHOST", "localhost")
+PORT = int(os.environ.get("PGPORT", "5432"))
+PASSWORD = os.environ.get("PGPASSWORD", "datamodeler123")
+
+
+def psql_command(database=None, extra=()):
+    """psql 起動コマンドを組み立てる"""
+    database = database or DATABASE
+    custom = os.environ.get("PSQL")
+    if custom:
+        base = shlex.split(custom)
+    else:
+        base = ["docker", "exec", "-i", CONTAINER, "psql", "-U", USER]
+    return base + ["-X", "-q", "-v", "ON_ERROR_STOP=1", "-d", database, *extra]
+
+
+def run_sql(sql, database=None, extra=(), check=True):
+    """SQL を psql に流し、標準出力を文字列で返す"""
+    result = subprocess.run(psql_command(database, extra), input=sql,
+                            capture_output=True, text=True)
+    if check and result.returncode != 0:
+        raise RuntimeError(f"psql failed ({result.returncode}): {result.stderr.strip()}")
+    return result.stdout
+
+
+def open_stream(database=None):
+    """COPY データを流し込むための psql プロセスを起動する"""
+    return subprocess.Popen(psql_command(database), stdin=subprocess.PIPE,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            text=True, encoding="utf-8")
@@ -0,0 +1,661 @@
+"""現在状態プロジェクションの DDL 生成（/ddl-generator の追加出力）
+
+現在状態（未入金残高・現在の担当者・最新のリスク評価など）を読み出しのたびに
+イベント全件から集約する代わりに、model.json のリソース→イベント関連から
+リソースごとの状態テーブルを導出し、イベントの追記トリガーで 1 行ずつ更新する。
+
+- {リソース}_STATE: 主体リソース 1 行につき、イベントごとの件数・初回/最新日時・
+  最新イベントの値・数値属性の累計（対応する数値属性があれば残高）を持つ
+- {リソース}_{相手}_CURRENT: 「イベント経由の多対多」関連の現在の組み合わせ。
+  交代イベント（Old〜/New〜 の組）があれば、旧側を外して新側を加える
+- イベントテーブルは UPDATE / DELETE を拒否し、状態がイベントとずれないようにする
+- rebuild_projections() でイベントから全件を作り直せる（復旧・一括投入後）
+
+使い方:
+    python -m tools.projection invoice-management            # DDL を表示
+    python -m tools.projection project-record-system --write # projections.sql を出力
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass, field
+
+from tools.model import load_model, to_snake
+from tools.schema import parse_schema
+
+OUTPUT_NAME = "projections.sql"
+NUMERIC_TYPES = ("DECIMAL", "NUMERIC")
+# 最新値として持たない型（可変長で状態行を肥大化させる）
+WIDE_TYPES = ("TEXT", "JSON", "JSONB", "BYTEA")
+# 交代イベントの旧側・新側を表す属性名の接頭辞と関連種別の接尾辞
+OLD_PREFIXES, NEW_PREFIXES = ("Old", "Previous", "From"), ("New", "Next", "To")
+OLD_SUFFIX, NEW_SUFFIX = "_from", "_to"
+
+_RULE = "-- " + "=" * 48
+
+
+@dataclass
+class StateColumn:
+    name: str
+    type: str
+    comment: str
+    default: str = None
+
+
+@dataclass
+class EventProjection:
+    """主体リソースの状態に反映する 1 つのイベント"""
+    entity: object
+    table: str
+    pk: str
+    subject_column: str
+    datetime: str = None
+    latest: list = field(default_factory=list)     # [(イベント列, 状態列)]
+    totals: list = field(default_factory=list)     # [(イベント列, 状態列)]
+    remaining: tuple = None                        # (リソース列, 状態列, 累計の状態列)
+
+    @property
+    def prefix(self):
+        return self.table.lower()
+
+
+@dataclass
+class StateProjection:
+    resource: object
+    table: str
+    key: str
+    events: list
+    columns: list
+
+
+@dataclass
+class Membership:
+    """イベント経由の多対多関連の現在の組み合わせ"""
+    subject: object
+    member: object
+    table: str
+    subject_key: str
+    member_key: str
+    dims: list                  # [(列, 参照先テーブル, 参照先列)]
+    link: object                # 組み合わせを作るイベント
+    link_subject: str
+    link_member: str
+    replace: object = None      # 交代イベント
+    replace_subject: str = None
+    old_member: str = None
+    new_member: str = None
+
+
+def _tokens(column):
+    return column.split("_")
+
+
+def _strip_overlap(event_table, column):
+    """イベント名と重なる先頭の語を列名から除く（例: PAYMENT + payment_amount → amount）"""
+    words = set(_tokens(event_table.lower()))
+    tokens = _tokens(column)
+    while len(tokens) > 1 and tokens[0] in words:
+        tokens = tokens[1:]
+    return "_".join(tokens)
+
+
+def _column_type(schema, table, column):
+    return schema.tables[table].columns[column].type
+
+
+def _is_link_relationship(rel):
+    return "多対多" in (rel.note or "")
+
+
+def find_memberships(model):
+    memberships = []
+    for event in model.events:
+        subject_rel = model.subject(event.name)
+        if subject_rel is None:
+            continue
+        for rel in model.parents(event.name):
+            member = model.entity(rel.from_entity)
+            if rel is subject_rel or not member.is_resource or rel.from_attribute != rel.to_attribute:
+                continue
+            replace = _find_replace(model, subject_rel.from_entity, member, event)
+            if replace is None and not _is_link_relationship(rel):
+                continue
+            subject = model.entity(subject_rel.from_entity)
+            dims = []
+            if replace is not None:
+                replace_event, _, _ = replace
+                shared = {a.english for a in replace_event.attributes}
+                for other in model.parents(event.name):
+                    if (other.from_attribute == other.to_attribute and other.to_attribute in shared
+                            and other.from_entity not in (subject.name, member.name)):
+                        ref = model.entity(other.from_entity)
+                        dims.append((to_snake(other.to_attribute), ref.table, ref.pk.column))
+            membership = Membership(
+                subject=subject, member=member,
+                table=f"{subject.table}_{member.table}_CURRENT",
+                subject_key=subject.pk.column, member_key=member.pk.column,
+                dims=dims, link=event, link_subject=to_snake(subject_rel.to_attribute),
+                link_member=to_snake(rel.to_attribute),
+            )
+            if replace is not None:
+                membership.replace, membership.old_member, membership.new_member = replace
+                membership.replace_subject = to_snake(model.subject(membership.replace.name).to_attribute)
+            memberships.append(membership)
+    return memberships
+
+
+def _find_replace(model, subject_name, member, link_event):
+    """同じ主体で、相手リソースへの旧側・新側の外部キーを持つイベントを探す"""
+    for event in model.events:
+        if event is link_event:
+            continue
+        subject_rel = model.subject(event.name)
+        if subject_rel is None or subject_rel.from_entity != subject_name:
+            continue
+        old = new = None
+        for rel in model.parents(event.name):
+            if rel.from_entity != member.name or rel.from_attribute == rel.to_attribute:
+                continue
+            attr = rel.to_attribute
+            if attr.startswith(OLD_PREFIXES) or rel.relationship_type.endswith(OLD_SUFFIX):
+                old = to_snake(attr)
+            elif attr.startswith(NEW_PREFIXES) or rel.relationship_type.endswith(NEW_SUFFIX):
+                new = to_snake(attr)
+        if old and new:
+            return event, old, new
+    return None
+
+
+def build_states(model, schema, memberships):
+    membership_events = {m.link.name for m in memberships} | {m.replace.name for m in memberships if m.replace}
+    by_subject = {}
+    for event in model.events:
+        rel = model.subject(event.name)
+        if rel is not None:
+            by_subject.setdefault(rel.from_entity, []).append((event, rel))
+
+    states = []
+    for resource in model.resources:
+        if resource.name not in by_subject:
+            continue
+        key = resource.pk.column
+        columns = [StateColumn(key, _column_type(schema, resource.table, key).replace(" GENERATED ALWAYS AS IDENTITY", ""),
+                               resource.pk.japanese)]
+        resource_numeric = [a for a in resource.attributes
+                            if a.base_type in NUMERIC_TYPES and not a.is_primary_key]
+        resource_attrs = {a.english for a in resource.attributes}
+        used = {key}
+        events = []
+        for event, rel in by_subject[resource.name]:
+            label = schema.tables[event.table].comment or event.japanese
+            projection = EventProjection(event, event.table, event.pk.column, to_snake(rel.to_attribute))
+            prefix = projection.prefix
+            columns.append(StateColumn(f"{prefix}_count", "BIGINT", f"{label}の件数", "0"))
+            dt = event.event_datetime
+            if dt is not None:
+                projection.datetime = dt.column
+                dt_type = _column_type(schema, event.table, dt.column)
+                columns += [
+                    StateColumn(f"first_{prefix}_at", dt_type, f"最初の{label}の{dt.japanese}"),
+                    StateColumn(f"last_{prefix}_at", dt_type, f"最新の{label}の{dt.japanese}"),
+                    StateColumn(f"last_{prefix}_id", _column_type(schema, event.table, event.pk.column),
+                                f"最新の{label}の{event.pk.japanese}"),
+                ]
+                if event.name not in membership_events:
+                    for attr in event.attributes:
+                        if (attr.is_primary_key or attr is dt or attr.english in resource_attrs
+                                or attr.base_type in WIDE_TYPES):
+                            continue
+                        name = f"last_{prefix}_{_strip_overlap(event.table, attr.column)}"
+                        projection.latest.append((attr.column, name))
+                        columns.append(StateColumn(name, _column_type(schema, event.table, attr.column),
+                                                   f"最新の{label}の{attr.japanese}"))
+            for attr in event.attributes:
+                if attr.base_type not in NUMERIC_TYPES:
+                    continue
+                name = f"total_{attr.column}"
+                if name in used:
+                    name = f"total_{prefix}_{_strip_overlap(event.table, attr.column)}"
+                used.add(name)
+                projection.totals.append((attr.column, name))
+                columns.append(StateColumn(name, "NUMERIC", f"{label}の{attr.japanese}の累計", "0"))
+                # 同じ語で終わるリソースの数値属性（例: 請求金額 - 入金額）は残高として持つ
+                for res_attr in resource_numeric:
+                    if _tokens(res_attr.column)[-1] == _tokens(attr.column)[-1] and projection.remaining is None:
+                        remaining = f"remaining_{res_attr.column}"
+                        if remaining in used:
+                            continue
+                        used.add(remaining)
+                        projection.remaining = (res_attr.column, remaining, name)
+                        columns.append(StateColumn(
+                            remaining, "NUMERIC",
+                            f"残{res_attr.japanese}（{res_attr.japanese} - {attr.japanese}の累計）"))
+            events.append(projection)
+        columns.append(StateColumn("updated_at", "TIMESTAMP WITH TIME ZONE", "更新日時", "CURRENT_TIMESTAMP"))
+        states.append(StateProjection(resource, f"{resource.table}_STATE", key, events, columns))
+    return states
+
+
+# ------------------------------------------------
+# SQL 出力
+# ------------------------------------------------
+
+def _section(title):
+    return ["", _RULE, f"-- {title}", _RULE]
+
+
+def _create_state_table(state):
+    lines = ["", f"-- {state.resource.japanese}の現在状態", f"CREATE TABLE {state.table} ("]
+    defs = []
+    for col in state.columns:
+        text = f"    {col.name} {col.type}"
+        if col.name == state.key:
+            text += " PRIMARY KEY"
+        elif col.default is not None:
+            text += f" NOT NULL DEFAULT {col.default}"
+        defs.append(text)
+    defs.append(f"    CONSTRAINT fk_{state.table.lower()}_{state.resource.table.lower()} "
+                f"FOREIGN KEY ({state.key})\n        REFERENCES {state.resource.table}({state.key}) ON DELETE RESTRICT")
+    lines.append(",\n".join(defs))
+    lines += [");", "", f"COMMENT ON TABLE {state.table} IS '{state.resource.japanese}の現在状態（イベントから導出）';"]
+    lines += [f"COMMENT ON COLUMN {state.table}.{col.name} IS '{col.comment}';" for col in state.columns]
+    return lines
+
+
+def _create_membership_table(m, schema):
+    keys = [m.subject_key, m.member_key] + [d[0] for d in m.dims]
+    link_dt = m.link.event_datetime.column
+    lines = ["", f"-- {m.subject.japanese}の現在の{m.member.japanese}", f"CREATE TABLE {m.table} ("]
+    defs = [f"    {m.subject_key} {_column_type(schema, m.link.table, m.link_subject)} NOT NULL",
+            f"    {m.member_key} {_column_type(schema, m.link.table, m.link_member)} NOT NULL"]
+    defs += [f"    {col} {_column_type(schema, m.link.table, col)} NOT NULL" for col, _, _ in m.dims]
+    defs += [f"    since {_column_type(schema, m.link.table, link_dt)} NOT NULL",
+             "    source_event VARCHAR(63) NOT NULL",
+             "    source_event_id INTEGER NOT NULL",
+             f"    PRIMARY KEY ({', '.join(keys)})",
+             f"    CONSTRAINT fk_{m.table.lower()}_{m.subject.table.lower()} FOREIGN KEY ({m.subject_key})\n"
+             f"        REFERENCES {m.subject.table}({m.subject_key}) ON DELETE RESTRICT",
+             f"    CONSTRAINT fk_{m.table.lower()}_{m.member.table.lower()} FOREIGN KEY ({m.member_key})\n"
+             f"        REFERENCES {m.member.table}({m.member_key}) ON DELETE RESTRICT"]
+    defs += [f"    CONSTRAINT fk_{m.table.lower()}_{ref.lower()} FOREIGN KEY ({col})\n"
+             f"        REFERENCES {ref}({ref_col}) ON DELETE RESTRICT" for col, ref, ref_col in m.dims]
+    lines.append(",\n".join(defs))
+    lines += [");", ""]
+    # 相手側からの逆引き（例: ある人が現在担当しているプロジェクト）
+    member = m.member_key[:-3] if m.member_key.endswith("_id") else m.member_key
+    lines.append(f"CREATE INDEX idx_{m.table.lower()}_{member} ON {m.table}({m.member_key});")
+    description = f"{m.link.japanese}" + (f"から{m.replace.japanese}で外れたものを除く" if m.replace else "")
+    lines += ["", f"COMMENT ON TABLE {m.table} IS '{m.subject.japanese}の現在の{m.member.japanese}（{description}）';",
+              f"COMMENT ON COLUMN {m.table}.since IS '開始日時';",
+              f"COMMENT ON COLUMN {m.table}.source_event IS '開始したイベント';",
+              f"COMMENT ON COLUMN {m.table}.source_event_id IS '開始したイベントのID';"]
+    return lines
+
+
+def _latest_case(state_col, dt_col):
+    return (f"CASE WHEN s.{dt_col} IS NULL OR EXCLUDED.{dt_col} >= s.{dt_col} "
+            f"THEN EXCLUDED.{state_col} ELSE s.{state_col} END")
+
+
+def _apply_function(state, ev):
+    name = f"{state.table.lower()}_apply_{ev.prefix}"
+    p = ev.prefix
+    cols, values, updates = [state.key, f"{p}_count"], [f"NEW.{ev.subject_column}", "1"], \
+        [f"{p}_count = s.{p}_count + 1"]
+    if ev.datetime:
+        cols += [f"first_{p}_at", f"last_{p}_at", f"last_{p}_id"]
+        values += [f"NEW.{ev.datetime}", f"NEW.{ev.datetime}", f"NEW.{ev.pk}"]
+        updates += [f"first_{p}_at = LEAST(s.first_{p}_at, EXCLUDED.first_{p}_at)",
+                    f"last_{p}_at = GREATEST(s.last_{p}_at, EXCLUDED.last_{p}_at)",
+                    f"last_{p}_id = {_latest_case(f'last_{p}_id', f'last_{p}_at')}"]
+        for event_col, state_col in ev.latest:
+            cols.append(state_col)
+            values.append(f"NEW.{event_col}")
+            updates.append(f"{state_col} = {_latest_case(state_col, f'last_{p}_at')}")
+    for event_col, state_col in ev.totals:
+        cols.append(state_col)
+        values.append(f"COALESCE(NEW.{event_col}, 0)")
+        updates.append(f"{state_col} = s.{state_col} + EXCLUDED.{state_col}")
+    if ev.remaining:
+        resource_col, remaining, total = ev.remaining
+        event_col = next(e for e, s in ev.totals if s == total)
+        cols.append(remaining)
+        values.append(f"(SELECT r.{resource_col} FROM {state.resource.table} r "
+                      f"WHERE r.{state.key} = NEW.{ev.subject_column}) - COALESCE(NEW.{event_col}, 0)")
+        updates.append(f"{remaining} = s.{remaining} - EXCLUDED.{total}")
+    updates.append("updated_at = CURRENT_TIMESTAMP")
+
+    indent = "        "
+    return [
+        "",
+        f"-- {ev.entity.japanese}の追記 → {state.resource.japanese}の現在状態",
+        f"CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$",
+        "BEGIN",
+        f"    INSERT INTO {state.table} AS s (",
+        indent + (",\n" + indent).join(cols),
+        "    ) VALUES (",
+        indent + (",\n" + indent).join(values),
+        "    )",
+        f"    ON CONFLICT ({state.key}) DO UPDATE SET",
+        indent + (",\n" + indent).join(updates) + ";",
+        "    RETURN NULL;",
+        "END;",
+        "$$;",
+        "",
+        f"CREATE TRIGGER trg_{ev.prefix}_{state.table.lower()} AFTER INSERT ON {ev.table}",
+        f"    FOR EACH ROW EXECUTE FUNCTION {name}();",
+    ]
+
+
+def _resource_functions(state):
+    """リソース追加時の状態行の作成と、残高の元になる属性の変更への追従"""
+    remaining = [ev.remaining for ev in state.events if ev.remaining]
+    cols = [state.key] + [r[1] for r in remaining]
+    values = [f"NEW.{state.key}"] + [f"NEW.{r[0]}" for r in remaining]
+    prefix = state.table.lower()
+    lines = [
+        "",
+        f"-- {state.resource.japanese}の追加 → 状態行を作成（イベントのないリソースも一覧できるようにする）",
+        f"CREATE OR REPLACE FUNCTION {prefix}_init() RETURNS trigger LANGUAGE plpgsql AS $$",
+        "BEGIN",
+        f"    INSERT INTO {state.table} ({', '.join(cols)})",
+        f"    VALUES ({', '.join(values)})",
+        f"    ON CONFLICT ({state.key}) DO NOTHING;",
+        "    RETURN NULL;",
+        "END;",
+        "$$;",
+        "",
+        f"CREATE TRIGGER trg_{state.resource.table.lower()}_{prefix}_init AFTER INSERT ON {state.resource.table}",
+        f"    FOR EACH ROW EXECUTE FUNCTION {prefix}_init();",
+    ]
+    for resource_col, remaining_col, total in remaining:
+        lines += [
+            "",
+            f"-- {state.resource.japanese}の {resource_col} の訂正 → 残高を再計算",
+            f"CREATE OR REPLACE FUNCTION {prefix}_adjust_{resource_col}() RETURNS trigger LANGUAGE plpgsql AS $$",
+            "BEGIN",
+            f"    UPDATE {state.table}",
+            f"    SET {remaining_col} = NEW.{resource_col} - {total},",
+            "        updated_at = CURRENT_TIMESTAMP",
+            f"    WHERE {state.key} = NEW.{state.key};",
+            "    RETURN NULL;",
+            "END;",
+            "$$;",
+            "",
+            f"CREATE TRIGGER trg_{state.resource.table.lower()}_{prefix}_adjust_{resource_col}",
+            f"    AFTER UPDATE OF {resource_col} ON {state.resource.table}",
+            f"    FOR EACH ROW WHEN (NEW.{resource_col} IS DISTINCT FROM OLD.{resource_col})",
+            f"    EXECUTE FUNCTION {prefix}_adjust_{resource_col}();",
+        ]
+    return lines
+
+
+def _replaced_after(m, member_expr, dims_expr, since_expr, alias="r"):
+    """member がそれより後の交代イベントで旧側になっているか"""
+    if m.replace is None:
+        return None
+    conds = [f"{alias}.{m.replace_subject} = {dims_expr[0]}",
+             f"{alias}.{m.old_member} = {member_expr}"]
+    conds += [f"{alias}.{col} = {expr}" for (col, _, _), expr in zip(m.dims, dims_expr[1:])]
+    conds.append(f"{alias}.{m.replace.event_datetime.column} > {since_expr}")
+    return (f"EXISTS (SELECT 1 FROM {m.replace.table} {alias}\n"
+            f"                   WHERE " + "\n                     AND ".join(conds) + ")")
+
+
+def _membership_upsert(m, values, indent="    "):
+    keys = [m.subject_key, m.member_key] + [d[0] for d in m.dims]
+    cols = keys + ["since", "source_event", "source_event_id"]
+    return [
+        f"{indent}INSERT INTO {m.table} AS c ({', '.join(cols)})",
+        f"{indent}VALUES ({', '.join(values)})",
+        f"{indent}ON CONFLICT ({', '.join(keys)}) DO UPDATE SET",
+        f"{indent}    since = EXCLUDED.since,",
+        f"{indent}    source_event = EXCLUDED.source_event,",
+        f"{indent}    source_event_id = EXCLUDED.source_event_id",
+        f"{indent}WHERE (EXCLUDED.since, EXCLUDED.source_event_id) < (c.since, c.source_event_id);",
+    ]
+
+
+def _membership_candidates(m, params=None):
+    """組み合わせを開始するイベント（結合イベントと交代イベントの新側）の SELECT
+
+    params（主体・相手・次元の値）を渡すと、その組み合わせ 1 つ分に絞る。
+    """
+    dims = [col for col, _, _ in m.dims]
+    sources = [(m.link, m.link_subject, m.link_member)]
+    if m.replace is not None:
+        sources.append((m.replace, m.replace_subject, m.new_member))
+    candidates = []
+    for event, subject, member in sources:
+        cols = [subject, member] + dims
+        text = (f"        SELECT {', '.join(cols)}, {event.event_datetime.column}, "
+                f"'{event.table}', {event.pk.column} FROM {event.table}")
+        if params is not None:
+            text += "\n        WHERE " + " AND ".join(f"{c} = {v}" for c, v in zip(cols, params))
+        candidates.append(text)
+    return "\n        UNION ALL\n".join(candidates)
+
+
+def _refresh_membership(m, schema):
+    """交代イベントのある組み合わせ 1 つ分をイベントから作り直す関数
+
+    過去の日時の交代が後から届くと、どの開始イベントが生き残るかが変わる
+    （例: t1 アサイン・t3 アサインの後に t2 交代 → 開始は t3）。追記時に差分で
+    直さず、その組み合わせだけを rebuild と同じ条件で導き直す。
+    """
+    keys = [m.subject_key, m.member_key] + [d[0] for d in m.dims]
+    types = [_column_type(schema, m.link.table, c) for c in [m.link_subject, m.link_member] + [d[0] for d in m.dims]]
+    params = [f"p_{k}" for k in keys]
+    columns = ", ".join(keys + ["since", "source_event", "source_event_id"])
+    name = f"refresh_{m.table.lower()}"
+    replaced = _replaced_after(m, f"m.{m.member_key}", [f"m.{m.subject_key}"] + [f"m.{d[0]}" for d in m.dims], "m.since")
+    lines = ["", f"-- {m.subject.japanese}の現在の{m.member.japanese}の組み合わせ 1 つ分をイベントから作り直す",
+             f"CREATE OR REPLACE FUNCTION {name}({', '.join(f'{p} {t}' for p, t in zip(params, types))}) "
+             "RETURNS void LANGUAGE plpgsql AS $$",
+             "BEGIN",
+             "    -- 同じ主体への同時追記を直列化する（削除と導き直しの間に他の追記が割り込まないように）",
+             f"    PERFORM 1 FROM {m.subject.table} WHERE {m.subject_key} = {params[0]} FOR NO KEY UPDATE;",
+             f"    DELETE FROM {m.table}",
+             "    WHERE " + " AND ".join(f"{k} = {p}" for k, p in zip(keys, params)) + ";",
+             f"    INSERT INTO {m.table} ({columns})",
+             f"    SELECT {columns}",
+             "    FROM (",
+             _membership_candidates(m, params),
+             f"    ) AS m ({columns})",
+             f"    WHERE NOT {replaced}",
+             "    ORDER BY since, source_event, source_event_id",
+             "    LIMIT 1;",
+             "END;",
+             "$$;"]
+    return name, lines
+
+
+def _membership_functions(m, schema):
+    link_subject = m.link_subject
+    link_dt = m.link.event_datetime.column
+    dims = [f"NEW.{col}" for col, _, _ in m.dims]
+    prefix = m.table.lower()
+    lines = []
+    if m.replace is None:
+        values = [f"NEW.{link_subject}", f"NEW.{m.link_member}"] + dims + \
+            [f"NEW.{link_dt}", f"'{m.link.table}'", f"NEW.{m.link.pk.column}"]
+        body = _membership_upsert(m, values)
+    else:
+        refresh, lines = _refresh_membership(m, schema)
+        body = [f"    PERFORM {refresh}({', '.join([f'NEW.{link_subject}', f'NEW.{m.link_member}'] + dims)});"]
+    lines += ["", f"-- {m.link.japanese}の追記 → {m.subject.japanese}の現在の{m.member.japanese}に追加",
+              f"CREATE OR REPLACE FUNCTION {prefix}_apply_{m.link.table.lower()}() RETURNS trigger LANGUAGE plpgsql AS $$",
+              "BEGIN"]
+    lines += body
+    lines += ["    RETURN NULL;", "END;", "$$;", "",
+              f"CREATE TRIGGER trg_{m.link.table.lower()}_{prefix} AFTER INSERT ON {m.link.table}",
+              f"    FOR EACH ROW EXECUTE FUNCTION {prefix}_apply_{m.link.table.lower()}();"]
+    if m.replace is None:
+        return lines
+
+    rep = m.replace
+    rep_subject = m.replace_subject
+    lines += ["", f"-- {rep.japanese}の追記 → 旧側を外し、新側を{m.subject.japanese}の現在の{m.member.japanese}に追加",
+              f"CREATE OR REPLACE FUNCTION {prefix}_apply_{rep.table.lower()}() RETURNS trigger LANGUAGE plpgsql AS $$",
+              "BEGIN"]
+    for member in (m.old_member, m.new_member):
+        lines.append(f"    PERFORM {refresh}({', '.join([f'NEW.{rep_subject}', f'NEW.{member}'] + dims)});")
+    lines += ["    RETURN NULL;", "END;", "$$;", "",
+              f"CREATE TRIGGER trg_{rep.table.lower()}_{prefix} AFTER INSERT ON {rep.table}",
+              f"    FOR EACH ROW EXECUTE FUNCTION {prefix}_apply_{rep.table.lower()}();"]
+    return lines
+
+
+def _append_only(events):
+    lines = ["",
+             "-- イベントは追記のみ（更新・削除すると状態がイベントとずれるため拒否する）",
+             "CREATE OR REPLACE FUNCTION reject_event_modification() RETURNS trigger LANGUAGE plpgsql AS $$",
+             "BEGIN",
+             "    RAISE EXCEPTION 'イベントテーブル % は追記のみです（%）', TG_TABLE_NAME, TG_OP",
+             "        USING HINT = '訂正は新しいイベントとして追記してください';",
+             "END;",
+             "$$;"]
+    for event in events:
+        lines += ["", f"CREATE TRIGGER trg_{event.table.lower()}_append_only BEFORE UPDATE OR DELETE ON {event.table}",
+                  "    FOR EACH ROW EXECUTE FUNCTION reject_event_modification();"]
+    return lines
+
+
+def _rebuild_state(state):
+    name = f"rebuild_{state.table.lower()}"
+    remaining = [ev.remaining for ev in state.events if ev.remaining]
+    lines = ["", f"-- {state.resource.japanese}の現在状態をイベントから作り直す",
+             f"CREATE OR REPLACE FUNCTION {name}() RETURNS BIGINT LANGUAGE plpgsql AS $$",
+             "DECLARE",
+             "    n BIGINT;",
+             "BEGIN",
+             f"    LOCK TABLE {', '.join(ev.table for ev in state.events)} IN SHARE MODE;",
+             f"    TRUNCATE {state.table};",
+             f"    INSERT INTO {state.table} ({', '.join([state.key] + [r[1] for r in remaining])})",
+             f"    SELECT {', '.join([state.key] + [r[0] for r in remaining])} FROM {state.resource.table};"]
+    for ev in state.events:
+        p = ev.prefix
+        sets, selects = [f"{p}_count = e.n"], ["COUNT(*) AS n"]
+        if ev.datetime:
+            sets += [f"first_{p}_at = e.first_at", f"last_{p}_at = e.last_at"]
+            selects += [f"MIN({ev.datetime}) AS first_at", f"MAX({ev.datetime}) AS last_at"]
+        for event_col, state_col in ev.totals:
+            sets.append(f"{state_col} = e.{state_col}")
+            selects.append(f"COALESCE(SUM({event_col}), 0) AS {state_col}")
+        lines += ["", f"    -- {ev.entity.japanese}",
+                  f"    UPDATE {state.table} s SET {', '.join(sets)}",
+                  f"    FROM (SELECT {ev.subject_column}, {', '.join(selects)}",
+                  f"          FROM {ev.table} GROUP BY {ev.subject_column}) e",
+                  f"    WHERE s.{state.key} = e.{ev.subject_column};"]
+        if ev.datetime:
+            latest = [(ev.pk, f"last_{p}_id")] + ev.latest
+            lines += [f"    UPDATE {state.table} s SET {', '.join(f'{sc} = e.{ec}' for ec, sc in latest)}",
+                      f"    FROM (SELECT DISTINCT ON ({ev.subject_column}) {ev.subject_column}, "
+                      f"{', '.join(dict.fromkeys(ec for ec, _ in latest))}",
+                      f"          FROM {ev.table} ORDER BY {ev.subject_column}, {ev.datetime} DESC, {ev.pk} DESC) e",
+                      f"    WHERE s.{state.key} = e.{ev.subject_column};"]
+    for _resource_col, remaining_col, total in remaining:
+        lines += ["", f"    UPDATE {state.table} SET {remaining_col} = {remaining_col} - {total};"]
+    lines += ["", f"    SELECT COUNT(*) INTO n FROM {state.table};", "    RETURN n;", "END;", "$$;"]
+    return name, lines
+
+
+def _rebuild_membership(m):
+    name = f"rebuild_{m.table.lower()}"
+    keys = [m.subject_key, m.member_key] + [d[0] for d in m.dims]
+    tables = [m.link.table] + ([m.replace.table] if m.replace is not None else [])
+    columns = ", ".join(keys + ["since", "source_event", "source_event_id"])
+    lines = ["", f"-- {m.subject.japanese}の現在の{m.member.japanese}をイベントから作り直す",
+             f"CREATE OR REPLACE FUNCTION {name}() RETURNS BIGINT LANGUAGE plpgsql AS $$",
+             "DECLARE",
+             "    n BIGINT;",
+             "BEGIN",
+             f"    LOCK TABLE {', '.join(tables)} IN SHARE MODE;",
+             f"    TRUNCATE {m.table};",
+             f"    INSERT INTO {m.table} ({columns})",
+             f"    SELECT DISTINCT ON ({', '.join(keys)}) {columns}",
+             "    FROM (",
+             _membership_candidates(m),
+             f"    ) AS m ({columns})"]
+    replaced = _replaced_after(m, f"m.{m.member_key}", [f"m.{m.subject_key}"] + [f"m.{d[0]}" for d in m.dims], "m.since")
+    if replaced:
+        lines.append(f"    WHERE NOT {replaced}")
+    # 同じ開始日時はイベント ID の小さい方（先に追記された方）を採る。追記トリガーと揃える
+    lines += [f"    ORDER BY {', '.join(keys)}, since, source_event, source_event_id;",
+              "    GET DIAGNOSTICS n = ROW_COUNT;", "    RETURN n;", "END;", "$$;"]
+    return name, lines
+
+
+def projection_sql(model, schema):
+    memberships = find_memberships(model)
+    states = build_states(model, schema, memberships)
+    events = [e for e in model.events if model.subject(e.name) is not None]
+
+    example = states[0] if states else None
+    lines = [
+        _RULE,
+        "-- 現在状態プロジェクション（イベント追記時にトリガーで 1 行ずつ更新）",
+        f"-- {model.project}",
+        f"-- 生成: python -m tools.projection {model.project} --write",
+        "-- schema.sql の後、データ投入の前に実行する",
+        _RULE,
+        "--",
+        "-- 使い方:",
+    ]
+    if example is not None:
+        lines.append(f"--   SELECT * FROM {example.table} WHERE {example.key} = ?;  -- 主キー参照で現在状態を取得")
+    for m in memberships:
+        lines.append(f"--   SELECT * FROM {m.table} WHERE {m.subject_key} = ?;")
+    lines += ["--   CALL rebuild_projections();  -- イベントから全件を作り直す（復旧・トリガーを止めた一括投入の後）"]
+
+    lines += _section("プロジェクションテーブル")
+    for state in states:
+        lines += _create_state_table(state)
+    for m in memberships:
+        lines += _create_membership_table(m, schema)
+
+    lines += _section("追記トリガー")
+    for state in states:
+        lines += _resource_functions(state)
+        for ev in state.events:
+            lines += _apply_function(state, ev)
+    for m in memberships:
+        lines += _membership_functions(m, schema)
+    lines += _append_only(events)
+
+    lines += _section("イベントからの再構築")
+    names = []
+    for state in states:
+        name, body = _rebuild_state(state)
+        names.append(name)
+        lines += body
+    for m in memberships:
+        name, body = _rebuild_membership(m)
+        names.append(name)
+        lines += body
+    lines += ["", "CREATE OR REPLACE PROCEDURE rebuild_projections() LANGUAGE plpgsql AS $$", "BEGIN"]
+    lines += [f"    PERFORM {name}();" for name in names]
+    lines += ["END;", "$$;"]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="現在状態プロジェクションの DDL を生成する")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--write", action="store_true", help=f"artifacts/{{project}}/{OUTPUT_NAME} に書き出す")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.project)
+    schema = parse_schema(model.path / "schema.sql")
+    sql = projection_sql(model, schema)
+    if args.write:
+        out = model.path / OUTPUT_NAME
+        out.write_text(sql, encoding="utf-8")
+        print(f"{out}", file=sys.stderr)
+    else:
+        sys.stdout.write(sql)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""query_examples.sql の番号付きクエリブロックを解析する
+
+ファイルは次の見出しで区切られている:
+
+    -- ================================================
+    -- 【クエリ1】未入金請求書の一覧
+    -- イミュータブルモデルの特徴: 入金イベントの有無で判定
+    -- ================================================
+    SELECT ...;
+"""
+
+import re
+from dataclasses import dataclass
+
+_HEADER = re.compile(r"^--\s*【クエリ(\d+)】\s*(.*)$")
+_RULE = re.compile(r"^--\s*=+\s*$")
+
+
+@dataclass
+class QueryExample:
+    number: int
+    title: str
+    description: str
+    sql: str
+
+    @property
+    def key(self):
+        return str(self.number)
+
+
+def _strip_comments(lines):
+    body = [line for line in lines if not line.lstrip().startswith("--")]
+    return "\n".join(body).strip().rstrip(";").strip()
+
+
+def parse_query_examples(path):
+    """【クエリN】ごとの QueryExample を番号順に返す"""
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    queries, current, in_header = [], None, False
+    for line in lines:
+        header = _HEADER.match(line.strip())
+        if header:
+            if current:
+                queries.append(current)
+            current = {"number": int(header.group(1)), "title": header.group(2).strip(),
+                       "description": [], "body": []}
+            in_header = True
+            continue
+        if _RULE.match(line.strip()):
+            if current and in_header:
+                in_header = False
+            elif current and current["body"]:
+                # 次の見出し（【まとめ】など）の開始でブロックを閉じる
+                queries.append(current)
+                current = None
+            continue
+        if current is None:
+            continue
+        if in_header:
+            current["description"].append(line.lstrip("- ").strip())
+        else:
+            current["body"].append(line)
+    if current:
+        queries.append(current)
+
+    result = []
+    for q in queries:
+        sql = _strip_comments(q["body"])
+        if sql:
+            result.append(QueryExample(q["number"], q["title"],
+                                       " ".join(d for d in q["description"] if d), sql))
+    return sorted(result, key=lambda q: q.number)
@@ -0,0 +1,988 @@
+"""成果物のインクリメンタル再生成（state.yaml の build 節）
+
+エンティティを 1 つ変えるたびに schema.sql・sample_data.sql・er_diagram.mmd・openapi.yaml を
+全体から作り直す代わりに、変わったエンティティとその隣接エンティティ（関連でつながるもの）の
+断片だけを作り直し、既存の成果物に差し込む。
+
+- state.yaml の build 節に entities_raw.json / entities_classified.json / model.json の内容ハッシュと、
+  エンティティごとのハッシュ・隣接エンティティ（依存グラフ）を記録する
+- 入力 3 ファイルのハッシュが前回と同じなら何もしない
+- 断片は、テーブル定義（CREATE TABLE・コメント・外部キー制約）、ER 図のエンティティと関連線、
+  INSERT 文、openapi.yaml のスキーマ（と要求ボディのプロパティ）
+- 差し込みでは既存の行（NOT NULL・制約名・関連のラベル・説明文など model.json にない情報を
+  含む）を残し、モデルとの差分だけを書き換える。モデルと一致している断片は作り直しても
+  同じテキストになる
+
+使い方:
+    python -m tools.rebuild project-record-system              # 作り直す断片を表示
+    python -m tools.rebuild project-record-system --diff       # 差し込み結果の差分を表示
+    python -m tools.rebuild project-record-system --write      # 成果物と state.yaml を更新
+    python -m tools.rebuild project-record-system --all --diff # 全エンティティを作り直し、成果物とモデルのずれを確認
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import re
+import sys
+from dataclasses import dataclass
+
+from tools import openapi
+from tools.model import load_model, project_dir, to_camel, to_snake, to_table_name
+from tools.sample_data import insert_statements, scan_tuples
+from tools.schema import index_section_span, split_top_level
+
+INPUTS = ("entities_raw.json", "entities_classified.json", "model.json")
+STATE_NAME = "state.yaml"
+BUILD_KEY = "build"
+SAMPLE_DATA_FILES = ("sample_data.sql", "sample_data_relative.sql")
+FK_SECTION = "-- 外部キー制約（リソーステーブル）"
+SECTION_TITLES = {
+    "resource": "リソーステーブル",
+    "junction": "ジャンクションテーブル（多対多関係）",
+    "event": "イベントテーブル",
+}
+_RULE = "-- " + "=" * 48
+
+
+# ------------------------------------------------
+# 入力のハッシュと依存グラフ
+# ------------------------------------------------
+
+def _digest(value):
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def file_hash(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _words(name):
+    return re.findall(r"[A-Z][a-z0-9]*", name)
+
+
+def _raw_owners(group, candidate, entities):
+    """抽出候補から生まれたエンティティ（名詞は同名、動詞はその語を含むイベント）"""
+    name = "".join(w[:1].upper() + w[1:] for w in re.split(r"[\s_]+", candidate.get("english", "")) if w)
+    if "verb" in group:
+        return [e["name"] for e in entities if e.get("type") == "event" and name in _words(e["name"])]
+    return [e["name"] for e in entities if e["name"] == name]
+
+
+@dataclass
+class Fingerprint:
+    inputs: dict                  # ファイル名 → SHA-256
+    entities: dict                # エンティティ名 → 断片の元になる定義のハッシュ
+    neighbors: dict               # エンティティ名 → 関連でつながるエンティティ名
+    unmatched: str = ""           # どのエンティティにも対応しない抽出候補のハッシュ
+
+    def to_state(self):
+        return {
+            "inputs": dict(self.inputs),
+            "unmatched_candidates": self.unmatched,
+            "entities": {name: {"hash": digest, "neighbors": self.neighbors[name]}
+                         for name, digest in self.entities.items()},
+        }
+
+    @classmethod
+    def from_state(cls, data):
+        entities = data.get("entities") or {}
+        return cls(inputs=data.get("inputs") or {},
+                   entities={name: str(e["hash"]) for name, e in entities.items()},
+                   neighbors={name: list(e.get("neighbors") or []) for name, e in entities.items()},
+                   unmatched=str(data.get("unmatched_candidates") or ""))
+
+
+def fingerprint(base):
+    """成果物ディレクトリの入力からハッシュと依存グラフを求める
+
+    エンティティのハッシュは model.json の定義・entities_classified.json の分類・
+    元になった抽出候補・そのエンティティが端点になる関連から求める。
+    """
+    raw = _read_json(base / "entities_raw.json")
+    classified = _read_json(base / "entities_classified.json")
+    model = _read_json(base / "model.json")
+    entities = model.get("entities", [])
+    names = [e["name"] for e in entities]
+
+    items = {}
+    for group in classified.values():
+        if isinstance(group, list):
+            for item in group:
+                items[item.get("english")] = item
+
+    candidates = {name: [] for name in names}
+    unmatched = []
+    for group, values in raw.items():
+        if not isinstance(values, list):
+            continue
+        for candidate in values:
+            owners = _raw_owners(group, candidate, entities)
+            for owner in owners:
+                candidates[owner].append(candidate)
+            if not owners:
+                unmatched.append(candidate)
+
+    relationships = {name: [] for name in names}
+    neighbors = {name: set() for name in names}
+    for rel in model.get("relationships", []):
+        ends = [n for n in (rel.get("from"), rel.get("to"), rel.get("junction_table")) if n in relationships]
+        for name in ends:
+            relationships[name].append(rel)
+            neighbors[name].update(e for e in ends if e != name)
+
+    hashes = {
+        e["name"]: _digest({"model": e, "classified": items.get(e["name"]),
+                            "raw": candidates[e["name"]], "relationships": relationships[e["name"]]})
+        for e in entities
+    }
+    return Fingerprint(inputs={name: file_hash(base / name) for name in INPUTS},
+                       entities=hashes,
+                       neighbors={name: sorted(neighbors[name]) for name in names},
+                       unmatched=_digest(unmatched) if unmatched else "")
+
+
+def _build_span(text):
+    """state.yaml の build 節（行頭の "build:" から次のトップレベルのキーまで）の位置"""
+    offset, start = 0, None
+    for line in text.splitlines(keepends=True):
+        if start is None and line.rstrip() == f"{BUILD_KEY}:":
+            start = offset
+        elif start is not None and line.strip() and not line.startswith((" ", "#")):
+            return start, offset
+        offset += len(line)
+    return (start, len(text)) if start is not None else (len(text), len(text))
+
+
+def read_build(path):
+    """state.yaml の build 節を読む（なければ None）"""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    start, end = _build_span(text)
+    section = openapi.loads(text[start:end]).get(BUILD_KEY) if start < end else None
+    return Fingerprint.from_state(section) if section else None
+
+
+def write_build(path, fp):
+    """state.yaml の build 節だけを書き換える（他のキーはそのまま残す）"""
+    text = path.read_text(encoding="utf-8") if path.exists() else ""
+    start, end = _build_span(text)
+    head = text[:start]
+    if head and not head.endswith("\n"):
+        head += "\n"
+    path.write_text(head + openapi.dumps({BUILD_KEY: fp.to_state()}) + text[end:], encoding="utf-8")
+
+
+@dataclass
+class Plan:
+    changed: list                 # 追加・変更されたエンティティ
+    removed: list                 # 削除されたエンティティ
+    affected: list                # 作り直すエンティティ（変更 + 隣接、モデル定義順）
+
+
+def make_plan(previous, current, everything=False):
+    names = list(current.entities)
+    if everything or previous is None:
+        changed = names
+    else:
+        changed = [n for n in names if previous.entities.get(n) != current.entities[n]]
+    removed = sorted(set(previous.entities) - set(names)) if previous else []
+    affected = set(changed)
+    for graph in (previous.neighbors if previous else {}, current.neighbors):
+        for name in set(changed) | set(removed):
+            affected.update(graph.get(name, []))
+    return Plan(changed, removed, [n for n in names if n in affected])
+
+
+# ------------------------------------------------
+# モデルから断片を作る共通の規則
+# ------------------------------------------------
+
+_SQL_TYPES = {"INT": "INTEGER", "INT4": "INTEGER", "TIMESTAMP": "TIMESTAMP WITH TIME ZONE",
+              "DATETIME": "TIMESTAMP WITH TIME ZONE", "NUMERIC": "DECIMAL", "BOOL": "BOOLEAN"}
+_NUMERIC = ("INT", "INTEGER", "BIGINT", "SMALLINT", "DECIMAL", "NUMERIC")
+
+
+def sql_type(attr):
+    """model.json の型を schema.sql の型にする（例: TIMESTAMP → TIMESTAMP WITH TIME ZONE）"""
+    base = attr.base_type
+    return _SQL_TYPES.get(base, base) + attr.type.strip()[len(base):].strip()
+
+
+def _type_key(text):
+    """型の比較用の正規形（INT と INTEGER、タイムゾーンの有無を同一視する）"""
+    text = re.sub(r"\s+WITH(?:OUT)? TIME ZONE", "", text.upper()).replace(" ", "")
+    base, paren, rest = text.partition("(")
+    base = {"INT": "INTEGER", "INT4": "INTEGER", "NUMERIC": "DECIMAL",
+            "DATETIME": "TIMESTAMP", "BOOL": "BOOLEAN"}.get(base, base)
+    return base + paren + rest
+
+
+def _identity(entity, attr):
+    """GENERATED ALWAYS AS IDENTITY の主キー（INSERT の列には含めない）"""
+    return (not entity.is_junction and entity.pk is attr
+            and attr.base_type in ("INT", "INTEGER", "BIGINT"))
+
+
+def foreign_keys(model, entity):
+    """[(カラム, 参照先エンティティ名, 参照先カラム)]（モデル定義順）"""
+    if entity.is_junction:
+        return [(attr.column, ref, attr.column) for ref, attr in model.junction_refs(entity.name)]
+    return [(to_snake(rel.to_attribute), rel.from_entity, to_snake(rel.from_attribute))
+            for rel in model.parents(entity.name) if rel.from_entity in model.entities]
+
+
+def _not_null(entity, attr, fk_columns):
+    """新しく作る列の NOT NULL（主キー・作成日時・名称、イベントの外部キーと日時）"""
+    if attr.is_primary_key or attr.english == "CreatedAt" or attr.english.endswith("Name"):
+        return True
+    return entity.is_event and (attr.column in fk_columns or attr is entity.event_datetime)
+
+
+def _quote(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _apply(text, edits):
+    """(開始, 終了, 置き換え) の編集を後ろから適用する（同じ位置への挿入は記録順）"""
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1]), reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def _merge_inserts(inserts):
+    """同じ位置への挿入を 1 つの編集にまとめる"""
+    merged = {}
+    for pos, chunk in inserts:
+        merged[pos] = merged.get(pos, "") + chunk
+    return [(pos, pos, chunk) for pos, chunk in merged.items()]
+
+
+def _line_end(text, pos):
+    end = text.find("\n", pos)
+    return len(text) if end < 0 else end + 1
+
+
+# ------------------------------------------------
+# schema.sql
+# ------------------------------------------------
+
+_CREATE_TABLE = re.compile(r"^CREATE TABLE (\w+) \($", re.M)
+_FOREIGN_KEY = re.compile(r"FOREIGN KEY \((\w+)\)\s+REFERENCES (\w+)\s*\((\w+)\)", re.I)
+_ALTER_FOREIGN_KEY = re.compile(
+    r"^ALTER TABLE (\w+) ADD CONSTRAINT \w+\s+FOREIGN KEY \((\w+)\)\s+REFERENCES (\w+)\s*\((\w+)\)[^;]*;\n", re.M)
+_COLUMN_TYPE = re.compile(r"(\w+\s+)(\w+(?:\s*\([^)]*\))?(?: WITH(?:OUT)? TIME ZONE)?)", re.I)
+_COMMENT = re.compile(r"^COMMENT ON (?:TABLE \w+|COLUMN \w+\.(\w+)) IS '((?:[^']|'')*)';$")
+
+
+@dataclass
+class _TableBlock:
+    table: str
+    start: int
+    end: int
+    header: str                   # 直前の見出しコメント（"-- 顧客テーブル"）
+    items: list                   # CREATE TABLE 本体の要素（書かれたまま）
+    comments: list                # COMMENT ON の行
+
+
+def _table_blocks(text):
+    blocks = {}
+    for match in _CREATE_TABLE.finditer(text):
+        table, start, header = match.group(1), match.start(), ""
+        line_start = text.rfind("\n", 0, start - 1) + 1
+        line = text[line_start:start - 1]
+        if start and line.startswith("-- ") and not line.startswith(_RULE):
+            header, start = line, line_start
+        close = text.index("\n);", match.end())
+        end = scan = _line_end(text, close + 1)
+        while scan < len(text) and text[scan] == "\n":
+            scan += 1
+        comments = []
+        while scan < len(text):
+            line_end = _line_end(text, scan)
+            line = text[scan:line_end].rstrip("\n")
+            if not line.startswith((f"COMMENT ON TABLE {table} ", f"COMMENT ON COLUMN {table}.")):
+                break
+            comments.append(line)
+            end = scan = line_end
+        blocks[table.upper()] = _TableBlock(table, start, end, header,
+                                            split_top_level(text[match.end():close]), comments)
+    return blocks
+
+
+def _column_item(entity, attr, existing, fk_columns):
+    if existing:
+        match = _COLUMN_TYPE.match(existing)
+        if match and _type_key(match.group(2)) != _type_key(sql_type(attr)):
+            return match.group(1) + sql_type(attr) + existing[match.end():]
+        return existing
+    item = f"{attr.column} {sql_type(attr)}"
+    if _identity(entity, attr):
+        return item + " GENERATED ALWAYS AS IDENTITY PRIMARY KEY"
+    if entity.pk is attr:
+        return item + " PRIMARY KEY"
+    if attr.english == "CreatedAt":
+        return item + " NOT NULL DEFAULT CURRENT_TIMESTAMP"
+    return item + (" NOT NULL" if _not_null(entity, attr, fk_columns) else "")
+
+
+def fk_name(table, column, parent_table, fks):
+    """fk_{テーブル}_{参照先}（同じ参照先が複数あればカラム名から付ける）"""
+    if sum(1 for _, parent, _ in fks if parent == parent_table) > 1:
+        return f"fk_{table.lower()}_{column[:-3] if column.endswith('_id') else column}"
+    return f"fk_{table.lower()}_{parent_table.lower()}"
+
+
+def _table_text(model, entity, block, alter_style):
+    """テーブル定義の断片と、ALTER TABLE で張る外部キー [(テーブル, 制約名, カラム, 参照先, 参照先カラム)] を返す"""
+    table = block.table if block else entity.table
+    fks = foreign_keys(model, entity)
+    fk_columns = {column for column, _, _ in fks}
+    columns, primary, others, constraints = {}, [], [], []
+    for item in block.items if block else []:
+        head = item.split(None, 1)[0].upper()
+        fk = _FOREIGN_KEY.search(item)
+        if fk:
+            constraints.append(((fk.group(1).lower(), fk.group(2).upper()), item))
+        elif head == "PRIMARY" or (head == "CONSTRAINT" and "PRIMARY KEY" in item.upper()):
+            primary.append(item)
+        elif head in ("CONSTRAINT", "UNIQUE", "CHECK"):
+            others.append(item)
+        else:
+            columns[item.split(None, 1)[0].lower()] = item
+
+    items = [_column_item(entity, attr, columns.get(attr.column), fk_columns) for attr in entity.attributes]
+    pks = [attr.column for attr in entity.primary_keys]
+    if len(pks) > 1:
+        existing = [p for p in primary if re.sub(r"\s", "", p).lower().endswith(f"({','.join(pks)})")]
+        items.append(existing[0] if existing else f"PRIMARY KEY ({', '.join(pks)})")
+    items += others
+
+    fks = [(column, model.entities[parent].table, parent_column) for column, parent, parent_column in fks]
+    wanted = {(column, parent): (column, parent, parent_column) for column, parent, parent_column in fks}
+    kept = set()
+    for key, item in constraints:
+        if key in wanted and key not in kept:
+            items.append(item)
+            kept.add(key)
+    alter = []
+    for key, (column, parent, parent_column) in wanted.items():
+        if key in kept:
+            continue
+        name = fk_name(table, column, parent, fks)
+        if alter_style and parent != entity.table:
+            alter.append((table.upper(), name, column, parent, parent_column))
+        else:
+            items.append(f"CONSTRAINT {name} FOREIGN KEY ({column})\n"
+                         f"        REFERENCES {parent}({parent_column}) ON DELETE RESTRICT")
+
+    comments = {}
+    for line in block.comments if block else []:
+        match = _COMMENT.match(line)
+        if match:
+            comments[match.group(1) or ""] = (line, match.group(2).replace("''", "'"))
+    table_comment = entity.japanese + ("イベント" if entity.is_event else "")
+    existing = comments.get("")
+    lines = [existing[0] if existing and existing[1].startswith(entity.japanese)
+             else f"COMMENT ON TABLE {table} IS {_quote(table_comment)};"]
+    for attr in entity.attributes:
+        existing = comments.get(attr.column)
+        if existing and existing[1] == (attr.japanese or existing[1]):
+            lines.append(existing[0])
+        elif attr.japanese:
+            lines.append(f"COMMENT ON COLUMN {table}.{attr.column} IS {_quote(attr.japanese)};")
+
+    header = block.header if block and block.header else \
+        f"-- {entity.japanese}{'イベント' if entity.is_event else 'テーブル'}"
+    body = ",\n".join("    " + item for item in items)
+    text = f"{header}\nCREATE TABLE {table} (\n{body}\n);\n\n" + "\n".join(lines) + "\n"
+    return text, alter
+
+
+def _alter_statement(table, name, column, parent, parent_column):
+    return (f"ALTER TABLE {table} ADD CONSTRAINT {name}\n"
+            f"    FOREIGN KEY ({column}) REFERENCES {parent}({parent_column}) ON DELETE RESTRICT;\n")
+
+
+def _drop_index_groups(text, tables):
+    """インデックス節から削除したテーブルのインデックス（コメントを含む段落）を除く"""
+    start, end = index_section_span(text)
+    if start == end or not tables:
+        return text
+    groups = text[start:end].split("\n\n")
+    pattern = re.compile(r"^CREATE (?:UNIQUE )?INDEX .*? ON (\w+)", re.M)
+    kept = [g for g in groups if not any(m.group(1).upper() in tables for m in pattern.finditer(g))]
+    return text[:start] + "\n\n".join(kept) + text[end:]
+
+
+def splice_schema(text, model, plan):
+    blocks = _table_blocks(text)
+    removed = {to_table_name(name) for name in plan.removed}
+    affected = [model.entities[name] for name in plan.affected]
+    alter_section = FK_SECTION in text
+    alters = {(m.group(1).upper(), m.group(2).lower(), m.group(3).upper()): m
+              for m in _ALTER_FOREIGN_KEY.finditer(text)}
+    edits, inserts, wanted_alters, new_alters, notes = [], [], set(), [], []
+
+    for entity in model.topological_order():
+        if entity.name not in plan.affected:
+            continue
+        block = blocks.get(entity.table)
+        body, alter = _table_text(model, entity, block, alter_section and entity.is_resource)
+        for table, name, column, parent, parent_column in alter:
+            wanted_alters.add((table, column, parent))
+            if (table, column, parent) not in alters:
+                new_alters.append(_alter_statement(table, name, column, parent, parent_column))
+        if block:
+            if text[block.start:block.end] != body:
+                edits.append((block.start, block.end, body))
+                notes.append(f"schema.sql: {entity.table} を更新")
+            continue
+        same = [b.end for t, b in blocks.items() if t not in removed
+                and any(e.table == t and e.type == entity.type for e in model.entities.values())]
+        if same:
+            inserts.append((max(same), "\n" + body))
+        else:
+            pos = index_section_span(text)[0]
+            title = SECTION_TITLES.get(entity.type, entity.type)
+            inserts.append((pos, f"{_RULE}\n-- {title}\n{_RULE}\n\n{body}\n"))
+        notes.append(f"schema.sql: {entity.table} を追加")
+
+    for table in removed & set(blocks):
+        block = blocks[table]
+        end = block.end + (1 if text[block.end:block.end + 1] == "\n" else 0)
+        edits.append((block.start, end, ""))
+        notes.append(f"schema.sql: {table} を削除")
+
+    affected_tables = {e.table for e in affected}
+    dropped = set()
+    for key, match in alters.items():
+        table, _, parent = key
+        if table in removed or parent in removed or (table in affected_tables and key not in wanted_alters):
+            end = match.end() + (1 if text[match.end():match.end() + 1] == "\n" else 0)
+            edits.append((match.start(), end, ""))
+            dropped.add(key)
+    if new_alters:
+        remaining = [m.end() for k, m in alters.items() if k not in dropped]
+        if remaining:
+            inserts.append((max(remaining), "".join("\n" + s for s in new_alters)))
+        elif alter_section:
+            pos = _line_end(text, text.index(FK_SECTION))
+            inserts.append((pos, "\n".join(new_alters) + "\n"))
+
+    result = _apply(text, edits + _merge_inserts(inserts))
+    return _drop_index_groups(result, removed), notes
+
+
+# ------------------------------------------------
+# er_diagram.mmd
+# ------------------------------------------------
+
+_ER_BLOCK = re.compile(r"^(\s+)(\w+)\s*\{\s*$")
+_ER_RELATION = re.compile(r"^\s+(\w+)\s+(\S+)\s+(\w+)\s*:\s*(.*)$")
+_ER_CARDINALITY = {"1:N": "||--o{", "1:1": "||--||", "N:1": "}o--||", "M:N": "}o--o{"}
+
+
+def er_name(entity_name):
+    """ER 図の名前（予約語の置き換えをしないテーブル名、例: User → USER）"""
+    return to_snake(entity_name).upper()
+
+
+def _er_relationships(model):
+    """[(左, 記号, 右, ラベル)]。多対多はジャンクションへの 2 本の 1:N にする"""
+    relations = []
+    for rel in model.relationships:
+        if rel.from_entity not in model.entities or rel.to_entity not in model.entities:
+            continue
+        left, right = er_name(rel.from_entity), er_name(rel.to_entity)
+        if rel.junction_table in model.entities:
+            junction = er_name(rel.junction_table)
+            relations.append((left, "||--o{", junction, rel.relationship_type))
+            relations.append((right, "||--o{", junction, rel.relationship_type))
+        else:
+            relations.append((left, _ER_CARDINALITY.get(rel.cardinality, "||--o{"), right,
+                              rel.relationship_type))
+    return relations
+
+
+def _er_block(model, entity, existing, indent):
+    fk_columns = {column for column, _, _ in foreign_keys(model, entity)}
+    attributes = {}
+    for line in existing[1:-1]:
+        words = line.split()
+        if len(words) >= 2:
+            attributes[words[1]] = (line, words)
+    lines = [existing[0] if existing else f"{indent}{er_name(entity.name)} {{"]
+    for attr in entity.attributes:
+        kind = attr.base_type.lower()
+        marks = ",".join(m for m, on in (("PK", attr.is_primary_key), ("FK", attr.column in fk_columns)) if on)
+        old = attributes.get(attr.english)
+        if old and old[1][0] == kind and (old[1][2] if len(old[1]) > 2 and '"' not in old[1][2] else "") == marks:
+            lines.append(old[0])
+        else:
+            lines.append(f"{indent}    {kind} {attr.english}" + (f" {marks}" if marks else ""))
+    lines.append(existing[-1] if existing else f"{indent}}}")
+    return lines
+
+
+def splice_er(text, model, plan):
+    lines = text.split("\n")
+    entities = {er_name(name): e for name, e in model.entities.items()}
+    affected = {er_name(name) for name in plan.affected}
+    removed = {er_name(name) for name in plan.removed}
+    touched = affected | removed
+
+    blocks, relations, indent, i = {}, [], "    ", 0
+    while i < len(lines):
+        block = _ER_BLOCK.match(lines[i])
+        if block:
+            j = i
+            while j < len(lines) and lines[j].strip() != "}":
+                j += 1
+            blocks[block.group(2)] = (i, j)
+            indent = block.group(1)
+            i = j + 1
+            continue
+        relation = _ER_RELATION.match(lines[i])
+        if relation and not lines[i].strip().startswith("%%"):
+            relations.append((i, relation.group(1), relation.group(3)))
+        i += 1
+
+    wanted = {}
+    for relation in _er_relationships(model):
+        wanted.setdefault((relation[0], relation[2]), []).append(relation)
+    deleted, notes = set(), []
+    for i, left, right in relations:
+        if wanted.get((left, right)):
+            wanted[(left, right)].pop(0)
+        elif left in touched or right in touched:
+            deleted.add(i)
+    missing = [r for queue in wanted.values() for r in queue if r[0] in affected or r[2] in affected]
+    grouped = bool(relations and blocks) and max(i for i, _, _ in relations) < min(s for s, _ in blocks.values())
+
+    def relation_line(relation):
+        left, symbol, right, label = relation
+        return f'{indent}{left} {symbol} {right} : "{label}"'
+
+    before, after, replace = {}, {}, {}
+    new_blocks = {}
+    for name in plan.affected:
+        entity = model.entities[name]
+        er = er_name(name)
+        if er in blocks:
+            start, end = blocks[er]
+            block = _er_block(model, entity, lines[start:end + 1], indent)
+            if block != lines[start:end + 1]:
+                replace[start] = (end, block)
+                notes.append(f"er_diagram.mmd: {er} を更新")
+        else:
+            new_blocks[er] = _er_block(model, entity, [], indent)
+            notes.append(f"er_diagram.mmd: {er} を追加")
+    for er in removed & set(blocks):
+        start, end = blocks[er]
+        replace[start] = (end + (1 if end + 1 < len(lines) and not lines[end + 1].strip() else 0), [])
+        notes.append(f"er_diagram.mmd: {er} を削除")
+
+    owned = {}
+    for relation in missing:
+        owner = relation[2] if entities[relation[2]].is_event else relation[0]
+        if grouped:
+            alive = [i for i, _, _ in relations if i not in deleted]
+            anchor = max(alive) if alive else max(i for i, _, _ in relations)
+            after.setdefault(anchor, []).append(relation_line(relation))
+        elif owner in new_blocks:
+            owned.setdefault(owner, []).append(relation_line(relation))
+        elif owner in blocks:
+            before.setdefault(blocks[owner][0], []).append(relation_line(relation))
+        else:
+            after.setdefault(len(lines) - 1, []).append(relation_line(relation))
+    if missing:
+        notes.append(f"er_diagram.mmd: 関連線 {len(missing)} 本を追加")
+    if deleted:
+        notes.append(f"er_diagram.mmd: 関連線 {len(deleted)} 本を削除")
+
+    for er, block in new_blocks.items():
+        kind = entities[er].type
+        same = [end for name, (_, end) in blocks.items()
+                if name not in removed and name in entities and entities[name].type == kind]
+        anchor = max(same) if same else max(i for i, line in enumerate(lines) if line.strip())
+        after.setdefault(anchor, []).extend([""] + owned.get(er, []) + block)
+
+    out, i = [], 0
+    while i < len(lines):
+        out.extend(before.get(i, []))
+        if i in replace:
+            end, block = replace[i]
+            out.extend(block)
+            tail = after.get(end, []) if block else []
+            out.extend(tail)
+            i = end + 1
+            continue
+        if i not in deleted:
+            out.append(lines[i])
+        out.extend(after.get(i, []))
+        i += 1
+    result = "\n".join(out)
+    if "\n\n\n" not in text:
+        result = re.sub(r"\n{3,}", "\n\n", result)
+    return result, notes
+
+
+# ------------------------------------------------
+# sample_data*.sql
+# ------------------------------------------------
+
+def _sample_value(model, entity, attr, index, counts, relative, row=None):
+    """列の値（既存行に足す列は NULL を許すなら NULL、それ以外は型なりの値）"""
+    fks = {column: parent for column, parent, _ in foreign_keys(model, entity)}
+    if row is not None and not _not_null(entity, attr, set(fks)):
+        return "NULL"
+    if attr.column in fks:
+        return str(index % max(counts.get(model.entities[fks[attr.column]].table, 1), 1) + 1)
+    if attr.is_temporal:
+        if row:
+            for other in (entity.event_datetime, entity.attribute("CreatedAt")):
+                if other is not None and other.column in row:
+                    return row[other.column]
+        if attr.base_type == "DATE":
+            return f"CURRENT_DATE - INTERVAL '{index + 1} days'" if relative else f"'2024-04-{index + 1:02d}'"
+        if relative:
+            return f"CURRENT_TIMESTAMP - INTERVAL '{index + 1} days'"
+        return f"'2024-04-{index + 1:02d} 10:00:00+09'"
+    if attr.base_type in ("BOOLEAN", "BOOL"):
+        return "FALSE"
+    if attr.base_type in _NUMERIC:
+        return str(index + 1)
+    return _quote(f"{attr.japanese or attr.english}{index + 1}")
+
+
+def _statement_start(text, start):
+    """INSERT 文の直前の説明コメント（罫線を除く）を含めた開始位置"""
+    while start:
+        line_start = text.rfind("\n", 0, start - 1) + 1
+        line = text[line_start:start - 1]
+        if not line.startswith("-- ") or line.startswith(("-- ==", "-- --")):
+            break
+        start = line_start
+    return start
+
+
+def splice_sample_data(text, model, plan):
+    statements = insert_statements(text)
+    tables = {e.table: e for e in model.entities.values()}
+    affected = {model.entities[name].table for name in plan.affected}
+    removed = {to_table_name(name) for name in plan.removed}
+    relative = "CURRENT_TIMESTAMP" in text
+    counts = {}
+    for table, _, _, values, _ in statements:
+        counts[table] = counts.get(table, 0) + len(scan_tuples(text, values)[0])
+
+    edits, inserts, notes, updated = [], [], [], set()
+    for table, columns, start, values, end in statements:
+        if table in removed:
+            stop = _line_end(text, end)
+            stop += 1 if text[stop:stop + 1] == "\n" else 0
+            edits.append((_statement_start(text, start), stop, ""))
+            updated.add(("削除", table))
+            continue
+        if table not in affected:
+            continue
+        entity = tables[table]
+        wanted = [attr for attr in entity.attributes if not _identity(entity, attr)]
+        if [attr.column for attr in wanted] == columns:
+            continue
+        edits.append((start, values, f"INSERT INTO {table} ({', '.join(a.column for a in wanted)}) VALUES"))
+        for index, (tuple_start, tuple_end, tokens) in enumerate(scan_tuples(text, values)[0]):
+            row = dict(zip(columns, tokens))
+            values_text = [row[a.column] if a.column in row
+                           else _sample_value(model, entity, a, index, counts, relative, row)
+                           for a in wanted]
+            edits.append((tuple_start, tuple_end, "(" + ", ".join(values_text) + ")"))
+        updated.add(("更新", table))
+
+    present = {table for table, *_ in statements}
+    for entity in model.topological_order():
+        if entity.name not in plan.affected or entity.table in present:
+            continue
+        same = [end for table, _, _, _, end in statements
+                if table in tables and tables[table].is_event == entity.is_event]
+        rows = 3
+        wanted = [attr for attr in entity.attributes if not _identity(entity, attr)]
+        body = ",\n".join("(" + ", ".join(_sample_value(model, entity, a, i, counts, relative)
+                                          for a in wanted) + ")" for i in range(rows))
+        comment = entity.japanese if entity.is_event else f"{entity.japanese}データ"
+        statement = f"-- {comment}\nINSERT INTO {entity.table} ({', '.join(a.column for a in wanted)}) VALUES\n{body};\n"
+        counts[entity.table] = rows
+        inserts.append((_line_end(text, max(same)) if same else len(text), "\n" + statement))
+        updated.add(("追加", entity.table))
+
+    for action, table in sorted(updated, key=lambda u: u[1]):
+        notes.append(f"{table} の INSERT を{action}")
+    return _apply(text, edits + _merge_inserts(inserts)), notes
+
+
+# ------------------------------------------------
+# openapi.yaml
+# ------------------------------------------------
+
+def _openapi_type(attr):
+    """(type, format, 説明の型名)"""
+    base = attr.base_type
+    if base in ("INT", "INTEGER", "BIGINT", "SMALLINT"):
+        return "integer", None, "整数"
+    if base in ("DECIMAL", "NUMERIC"):
+        return "string", None, "数値（DECIMAL）"
+    if base == "DATE":
+        return "string", "date", "日付"
+    if base in ("TIMESTAMP", "DATETIME"):
+        return "string", "date-time", "日時"
+    if base in ("BOOLEAN", "BOOL"):
+        return "boolean", None, "ブール値"
+    return "string", None, "文字列"
+
+
+def _property(attr, required):
+    """components.schemas のプロパティ（/openapi-generator と同じ説明の書式）"""
+    kind, fmt, label = _openapi_type(attr)
+    camel = to_camel(attr.english)
+    lines = [f"項目名: {attr.japanese or attr.english}", f"ドメイン: {camel}", "制約:", f"  - 型: {label}"]
+    size = re.search(r"\((\d+)(?:\s*,\s*(\d+))?\)", attr.type)
+    if size and label == "文字列":
+        lines.append(f"  - 最大長: {size.group(1)}文字")
+    elif size and kind == "string" and fmt is None:
+        precision, scale = int(size.group(1)), int(size.group(2) or 0)
+        lines += [f"  - 整数部: 最大{precision - scale}桁", f"  - 小数部: {scale}桁"]
+    charset = ("ASCII文字（英数字、記号）" if attr.english.endswith("ID")
+               else "システム許容文字（全角・半角英数字、ひらがな、カタカナ、漢字、記号）")
+    lines += [f"  - 文字種: {charset}", f"  - 必須: {'はい' if required else 'いいえ'}"]
+    prop = {"type": kind, "description": "\n".join(lines)}
+    if fmt:
+        prop["format"] = fmt
+    prop["x-field-extra-annotation"] = f'@nablarch.core.validation.ee.Domain("{camel}")'
+    return prop
+
+
+def _request_property(attr):
+    kind, fmt, _ = _openapi_type(attr)
+    prop = {"type": kind, "description": attr.japanese or attr.english}
+    if fmt:
+        prop["format"] = fmt
+    return prop
+
+
+def _update_operations(doc, name, entity, added, dropped):
+    """スキーマを返す操作に列の追加・削除を反映する
+
+    POST / PUT / PATCH は要求ボディのプロパティ、GET は削除した列の絞り込み・ソート指定。
+    """
+    ref = f"#/components/schemas/{name}"
+    attributes = {to_camel(a.english): a for a in entity.attributes}
+    for item in doc.get("paths", {}).values():
+        for method, operation in item.items():
+            if not isinstance(operation, dict) or ref not in json.dumps(operation.get("responses", {})):
+                continue
+            if method == "get" and dropped:
+                parameters = operation.get("parameters", [])
+                parameters[:] = [p for p in parameters if p.get("name") not in dropped]
+                for parameter in parameters:
+                    enum = parameter.get("schema", {}).get("enum") if parameter.get("name") == "sort" else None
+                    if enum:
+                        enum[:] = [v for v in enum if v.lstrip("-") not in dropped]
+            if method not in ("post", "put", "patch"):
+                continue
+            schema = (operation.get("requestBody", {}).get("content", {})
+                      .get("application/json", {}).get("schema", {}))
+            body = schema.get("properties")
+            if not isinstance(body, dict):
+                continue
+            for key in dropped:
+                body.pop(key, None)
+                if key in schema.get("required", []):
+                    schema["required"].remove(key)
+            for key in added:
+                attr = attributes[key]
+                if not attr.is_primary_key and attr.english != "CreatedAt":
+                    body[key] = _request_property(attr)
+
+
+def splice_openapi(doc, model, plan):
+    schemas = doc.get("components", {}).get("schemas")
+    if schemas is None:
+        return []
+    notes = []
+    for name in plan.removed:
+        if name not in schemas:
+            continue
+        del schemas[name]
+        ref = f"#/components/schemas/{name}"
+        for path in [p for p, item in doc.get("paths", {}).items() if ref in json.dumps(item)]:
+            del doc["paths"][path]
+            notes.append(f"openapi.yaml: {path} を削除（{name} を参照）")
+        notes.append(f"openapi.yaml: スキーマ {name} を削除")
+
+    new_schemas = []
+    for name in plan.affected:
+        entity = model.entities[name]
+        if entity.is_junction:
+            continue  # ジャンクションは親リソースの操作で扱い、スキーマを持たない
+        fk_columns = {column for column, _, _ in foreign_keys(model, entity)}
+        old = schemas.get(name)
+        old_properties = (old or {}).get("properties") or {}
+        properties = {}
+        for attr in entity.attributes:
+            camel = to_camel(attr.english)
+            generated = _property(attr, _not_null(entity, attr, fk_columns))
+            existing = old_properties.get(camel)
+            same = existing and all(existing.get(k) == generated.get(k) for k in ("type", "format"))
+            properties[camel] = existing if same else generated
+        keys = [to_camel(a.english) for a in entity.attributes
+                if a.is_primary_key or a.column in fk_columns]
+        if old is None:
+            new_schemas.append((entity, {"type": "object", "required": keys, "properties": properties,
+                                         "description": entity.japanese}))
+            notes.append(f"openapi.yaml: スキーマ {name} を追加（エンドポイントは /openapi-generator で追加）")
+            continue
+        if list(properties.items()) == list(old_properties.items()):
+            continue
+        added = [k for k in properties if k not in old_properties]
+        dropped = [k for k in old_properties if k not in properties]
+        old["properties"] = properties
+        required = [k for k in old.get("required", []) if k in properties]
+        required += [k for k in keys if k in added and k not in required]
+        if required or "required" in old:
+            old["required"] = required
+        _update_operations(doc, name, entity, added, dropped)
+        notes.append(f"openapi.yaml: スキーマ {name} を更新")
+
+    if new_schemas:
+        order = list(schemas.items())
+        for entity, schema in new_schemas:
+            same = [i for i, (key, _) in enumerate(order)
+                    if key in model.entities and model.entities[key].type == entity.type]
+            entity_positions = [i for i, (key, _) in enumerate(order) if key in model.entities]
+            pos = (max(same) + 1 if same else max(entity_positions) + 1 if entity_positions else len(order))
+            order.insert(pos, (entity.name, schema))
+        schemas.clear()
+        schemas.update(order)
+    return notes
+
+
+# ------------------------------------------------
+# 実行
+# ------------------------------------------------
+
+def rebuild(model, plan):
+    """成果物ごとの (元のテキスト, 差し込み後のテキスト) と作業の記録を返す"""
+    base = model.path
+    results, notes = {}, []
+
+    def splice(name, splicer):
+        path = base / name
+        if path.exists():
+            text = path.read_text(encoding="utf-8")
+            new, log = splicer(text)
+            results[name] = (text, new)
+            notes.extend(log)
+
+    splice("schema.sql", lambda text: splice_schema(text, model, plan))
+    splice("er_diagram.mmd", lambda text: splice_er(text, model, plan))
+    for name in SAMPLE_DATA_FILES:
+        def sample_splicer(text, name=name):
+            new, log = splice_sample_data(text, model, plan)
+            return new, [f"{name}: {note}" for note in log]
+
+        splice(name, sample_splicer)
+
+    def openapi_splicer(text):
+        doc = openapi.loads(text)
+        log = splice_openapi(doc, model, plan)
+        return openapi.dumps(doc), log
+
+    splice("openapi.yaml", openapi_splicer)
+    return results, notes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="変更のあったエンティティの断片だけを作り直して成果物に差し込む")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--write", action="store_true", help="成果物と state.yaml を更新する")
+    parser.add_argument("--diff", action="store_true", help="差し込み結果を unified diff で表示する")
+    parser.add_argument("--all", action="store_true", help="前回の記録によらず全エンティティを作り直す")
+    args = parser.parse_args(argv)
+
+    base = project_dir(args.project)
+    state_path = base / STATE_NAME
+    previous = read_build(state_path)
+    current = fingerprint(base)
+
+    if previous is None and not args.all:
+        print("state.yaml に build 節がないため、現在の入力を基準として記録します"
+              + ("" if args.write else "（--write で記録）"), file=sys.stderr)
+        if args.write:
+            write_build(state_path, current)
+        return 0
+    if not args.all and previous.inputs == current.inputs:
+        print("入力に変更はありません", file=sys.stderr)
+        return 0
+
+    plan = make_plan(previous, current, everything=args.all)
+    neighbors = [n for n in plan.affected if n not in plan.changed]
+    print(f"変更: {', '.join(plan.changed) or 'なし'}")
+    if plan.removed:
+        print(f"削除: {', '.join(plan.removed)}")
+    print(f"隣接: {', '.join(neighbors) or 'なし'}")
+    if previous is not None and previous.unmatched != current.unmatched:
+        print("注意: entities_raw.json のうちエンティティに対応しない候補が変わりました"
+              "（分類・モデルに反映されるまで成果物は変わりません）", file=sys.stderr)
+
+    model = load_model(base)
+    results, notes = rebuild(model, plan)
+    for note in notes:
+        print(f"  {note}")
+    changed = [name for name, (old, new) in results.items() if old != new]
+    for name in changed:
+        old, new = results[name]
+        if args.diff:
+            sys.stdout.writelines(difflib.unified_diff(
+                old.splitlines(keepends=True), new.splitlines(keepends=True),
+                fromfile=f"a/{name}", tofile=f"b/{name}"))
+        if args.write:
+            (base / name).write_text(new, encoding="utf-8")
+    print(f"更新する成果物: {', '.join(changed) or 'なし'}")
+
+    if args.write:
+        write_build(state_path, current)
+        follow = []
+        if "openapi.yaml" in changed:
+            follow.append(f"python -m tools.api {args.project} --write")
+        if "schema.sql" in changed or "openapi.yaml" in changed:
+            follow.append(f"python -m tools.index_advisor {args.project} --write")
+        if "schema.sql" in changed:
+            follow += [f"python -m tools.projection {args.project} --write",
+                       f"python -m tools.temporal {args.project} --write",
+                       f"python -m tools.partition {args.project} --write"]
+        if follow:
+            print("成果物全体から導出するファイルも更新してください:", file=sys.stderr)
+            for command in follow:
+                print(f"  {command}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""sample_data*.sql の INSERT 文を解析する
+
+手書きのサンプルデータから「値の語彙」と「リソースあたりのイベント件数」を
+取り出し、大規模データ生成の分布として再利用する。
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+# 式（CURRENT_TIMESTAMP - INTERVAL '...' など）はリテラルではないため区別する
+EXPRESSION = object()
+
+_INSERT = re.compile(r"INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)\s*VALUES", re.I)
+_NUMBER = re.compile(r"^-?\d+(\.\d+)?$")
+
+
+@dataclass
+class SampleData:
+    """テーブルごとのカラム名と行（値のタプル）"""
+    rows: dict = field(default_factory=lambda: defaultdict(list))
+
+    def count(self, table):
+        return len(self.rows.get(table, []))
+
+    def column_values(self, table, column):
+        """指定カラムのリテラル値（式・NULLは除く）を出現順に返す"""
+        values = []
+        for row in self.rows.get(table, []):
+            value = row.get(column, EXPRESSION)
+            if value is not EXPRESSION and value is not None:
+                values.append(value)
+        return values
+
+    def vocabulary(self, table, column):
+        """指定カラムの文字列リテラルの語彙（重複除去・出現順）"""
+        seen = []
+        for value in self.column_values(table, column):
+            if isinstance(value, str) and value not in seen:
+                seen.append(value)
+        return seen
+
+    def counts_per_parent(self, table, column, parent_count):
+        """親ID（1..parent_count）ごとの子行数の分布を返す（0件の親を含む）"""
+        counts = [0] * parent_count
+        for value in self.column_values(table, column):
+            if isinstance(value, int) and 1 <= value <= parent_count:
+                counts[value - 1] += 1
+        return counts
+
+
+def _literal(token):
+    token = token.strip()
+    if not token:
+        return EXPRESSION
+    upper = token.upper()
+    if upper == "NULL":
+        return None
+    if upper in ("TRUE", "FALSE"):
+        return upper == "TRUE"
+    if _NUMBER.match(token):
+        return float(token) if "." in token else int(token)
+    if len(token) >= 2 and token[0] == token[-1] == "'" and "'" not in token[1:-1].replace("''", ""):
+        return token[1:-1].replace("''", "'")
+    return EXPRESSION
+
+
+def scan_tuples(text, pos):
+    """VALUES 以降のタプル列を走査し、(タプルのリスト, 終端位置) を返す
+
+    タプルは (開始位置, 終了位置, 値のトークン) で、トークンは書かれたままの文字列
+    （前後の空白を除く）。タプルの外のコメント・改行には触れない。
+    """
+    tuples, current, token, start = [], None, [], None
+    depth, i, n = 0, pos, len(text)
+    while i < n:
+        ch = text[i]
+        if ch == "'":
+            j = i + 1
+            while j < n:
+                if text[j] == "'" and j + 1 < n and text[j + 1] == "'":
+                    j += 2
+                    continue
+                if text[j] == "'":
+                    break
+                j += 1
+            token.append(text[i:j + 1])
+            i = j + 1
+            continue
+        if ch == "-" and text.startswith("--", i):
+            i = text.find("\n", i)
+            i = n if i < 0 else i
+            continue
+        if ch == "(":
+            depth += 1
+            if depth == 1:
+                current, token, start = [], [], i
+            else:
+                token.append(ch)
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                current.append("".join(token).strip())
+                tuples.append((start, i + 1, current))
+                current, token = None, []
+            else:
+                token.append(ch)
+        elif ch == "," and depth == 1:
+            current.append("".join(token).strip())
+            token = []
+        elif ch == ";" and depth == 0:
+            return tuples, i + 1
+        elif depth >= 1:
+            token.append(ch)
+        i += 1
+    return tuples, n
+
+
+def _scan_values(text, pos):
+    """VALUES 以降のタプル列を解析し、(行のリスト, 終端位置) を返す"""
+    tuples, end = scan_tuples(text, pos)
+    return [[_literal(token) for token in tokens] for _, _, tokens in tuples], end
+
+
+def insert_statements(text):
+    """INSERT INTO ... VALUES 文ごとに (テーブル名, カラム名, 文の開始位置, VALUES の直後, 文の終端) を返す"""
+    statements, pos = [], 0
+    while True:
+        match = _INSERT.search(text, pos)
+        if not match:
+            return statements
+        _, pos = scan_tuples(text, match.end())
+        columns = [c.strip().lower() for c in match.group(2).split(",")]
+        statements.append((match.group(1).upper(), columns, match.start(), match.end(), pos))
+
+
+def parse_sample_data(path):
+    """INSERT INTO ... VALUES 文を読み込み SampleData を返す"""
+    sample = SampleData()
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return sample
+    pos = 0
+    while True:
+        match = _INSERT.search(text, pos)
+        if not match:
+            break
+        table = match.group(1).upper()
+        columns = [c.strip().lower() for c in match.group(2).split(",")]
+        rows, pos = _scan_values(text, match.end())
+        for values in rows:
+            sample.rows[table].append(dict(zip(columns, values)))
+    return sample
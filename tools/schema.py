@@ -0,0 +1,194 @@
+"""schema.sql の読み込み
+
+/ddl-generator が出力した DDL から、テーブル定義（カラム・NOT NULL・コメント）と
+インデックス定義を取り出す。インデックス節の差し替えにも使う。
+"""
+
+import re
+from dataclasses import dataclass, field
+
+INDEX_SECTION_TITLE = "インデックス"
+
+_CREATE_TABLE = re.compile(r"^CREATE TABLE (\w+) \($", re.M)
+_CREATE_INDEX = re.compile(
+    r"^CREATE (UNIQUE )?INDEX (?:CONCURRENTLY )?(?:IF NOT EXISTS )?(\w+) ON (\w+)"
+    r"(?: USING (\w+))?\s*\((.*?)\)(?: INCLUDE \((.*?)\))?(?: WITH \((.*?)\))?(?: WHERE (.*?))?;$", re.M)
+_TABLE_COMMENT = re.compile(r"^COMMENT ON TABLE (\w+) IS '((?:[^']|'')*)';$", re.M)
+_RULE = "-- " + "=" * 48
+
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    not_null: bool = False
+    primary_key: bool = False
+
+
+@dataclass
+class Table:
+    name: str
+    columns: dict
+    comment: str = ""
+
+    @property
+    def primary_key(self):
+        return [c.name for c in self.columns.values() if c.primary_key]
+
+
+@dataclass
+class Index:
+    name: str
+    table: str
+    columns: list                      # [(カラム名, 降順か)]
+    include: list = field(default_factory=list)
+    where: str = None
+    unique: bool = False
+    method: str = "btree"
+    storage: str = None                # WITH (...) の格納パラメータ
+
+    @property
+    def key(self):
+        return tuple(c for c, _ in self.columns)
+
+    def ddl(self, concurrently=False):
+        keys = ", ".join(f"{c} DESC" if desc else c for c, desc in self.columns)
+        sql = "CREATE UNIQUE INDEX " if self.unique else "CREATE INDEX "
+        if concurrently:
+            sql += "CONCURRENTLY "
+        sql += f"{self.name} ON {self.table}"
+        if self.method != "btree":
+            sql += f" USING {self.method} "
+        sql += f"({keys})"
+        if self.include:
+            sql += f" INCLUDE ({', '.join(self.include)})"
+        if self.storage:
+            sql += f" WITH ({self.storage})"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql + ";"
+
+
+@dataclass
+class Schema:
+    tables: dict
+    indexes: list
+    text: str = ""
+
+    def table(self, name):
+        return self.tables.get(name.upper())
+
+
+def split_top_level(body):
+    """括弧の外側のカンマで分割する（CREATE TABLE の本体・インデックスの列リスト）"""
+    parts, depth, current = [], 0, []
+    for ch in body:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _table_body(text, start):
+    depth = 0
+    for pos in range(start, len(text)):
+        if text[pos] == "(":
+            depth += 1
+        elif text[pos] == ")":
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:pos]
+    raise ValueError("unterminated CREATE TABLE")
+
+
+def _columns(body):
+    columns, table_pk = {}, []
+    for part in split_top_level(body):
+        words = part.split()
+        head = words[0].upper()
+        if head == "CONSTRAINT" or head == "PRIMARY":
+            match = re.search(r"PRIMARY KEY \((.*?)\)", part, re.I)
+            if match:
+                table_pk = [c.strip().lower() for c in match.group(1).split(",")]
+            continue
+        if head in ("FOREIGN", "UNIQUE", "CHECK"):
+            continue
+        upper = part.upper()
+        type_match = re.match(r"\w+\s+(\w+(?:\s*\([^)]*\))?(?: WITH(?:OUT)? TIME ZONE)?)", part, re.I)
+        primary = "PRIMARY KEY" in upper
+        columns[words[0].lower()] = Column(
+            name=words[0].lower(),
+            type=type_match.group(1) if type_match else words[1],
+            not_null="NOT NULL" in upper or primary,
+            primary_key=primary,
+        )
+    for name in table_pk:
+        if name in columns:
+            columns[name].primary_key = True
+            columns[name].not_null = True
+    return columns
+
+
+def _index_columns(spec):
+    columns = []
+    for part in split_top_level(spec):
+        words = part.split()
+        columns.append((words[0].lower(), len(words) > 1 and words[1].upper() == "DESC"))
+    return columns
+
+
+def parse_schema(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    tables = {}
+    for match in _CREATE_TABLE.finditer(text):
+        name = match.group(1).upper()
+        body = _table_body(text, match.end() - 1)
+        tables[name] = Table(name, _columns(body))
+    for match in _TABLE_COMMENT.finditer(text):
+        if match.group(1).upper() in tables:
+            tables[match.group(1).upper()].comment = match.group(2).replace("''", "'")
+
+    return Schema(tables, parse_indexes(text), text)
+
+
+def parse_indexes(text):
+    """行頭の CREATE INDEX 文をすべて Index にする"""
+    return [
+        Index(name=m.group(2), table=m.group(3).upper(), columns=_index_columns(m.group(5)),
+              include=[c.strip().lower() for c in m.group(6).split(",")] if m.group(6) else [],
+              storage=m.group(7), where=m.group(8), unique=bool(m.group(1)),
+              method=(m.group(4) or "btree").lower())
+        for m in _CREATE_INDEX.finditer(text)
+    ]
+
+
+def index_section_span(text):
+    """インデックス節（見出しの罫線からファイル末尾まで）の開始・終了位置
+
+    見出しがなければ (len(text), len(text)) を返す。
+    """
+    lines = text.splitlines(keepends=True)
+    offset = 0
+    for i, line in enumerate(lines):
+        if (line.startswith(_RULE) and i + 1 < len(lines)
+                and lines[i + 1].startswith(f"-- {INDEX_SECTION_TITLE}")):
+            return offset, len(text)
+        offset += len(line)
+    return len(text), len(text)
+
+
+def replace_index_section(text, section):
+    """schema.sql のインデックス節を差し替えたテキストを返す"""
+    start, end = index_section_span(text)
+    head = text[:start].rstrip("\n") + "\n\n"
+    return head + section.rstrip("\n") + "\n" + text[end:]
@@ -0,0 +1,543 @@
+"""時点指定（as of）クエリの DDL 生成（/ddl-generator の追加出力）
+
+projections.sql の状態テーブルは「現在」しか持たない。過去のある時点の状態（その時点の
+担当者・その時点の最新リスク評価・その日の未入金残高）を履歴の走査なしで引けるように、
+連続するイベントから有効期間（そのイベントの日時 〜 次のイベントの日時）を導出して範囲型で
+持ち、GiST インデックスで「時点を含む行」を 1 回の索引探索で取り出す。
+
+- {イベント}_VALIDITY: 主体リソースごとに、各イベントが最新だった期間と、その時点までの
+  件数・数値属性の累計を持つ。追記トリガーで直前の行の期間を閉じる
+- {リソース}_{相手}_VALIDITY: イベント経由の多対多関連の組み合わせが有効だった期間
+  （例: 担当者アサインから、その人を旧側とする担当者交代まで）
+- 期間の重なりは EXCLUDE USING gist（btree_gist）で禁止し、同じ GiST インデックスで時点を引く
+- {リソース}_state_as_of(ID, 時点): {リソース}_STATE と同じ列を指定時点について返す
+  （残高はリソースの現在の値から時点までの累計を引く）
+- {リソース}_{相手}_as_of(ID, 時点): 指定時点の組み合わせを返す
+- rebuild_validity() でイベントから全件を作り直せる
+
+期間の型はイベント日時の型に合わせる（TIMESTAMP WITH TIME ZONE → tstzrange、
+TIMESTAMP → tsrange、DATE → daterange）。
+
+使い方:
+    python -m tools.temporal invoice-management             # DDL を表示
+    python -m tools.temporal project-record-system --write  # temporal.sql を出力
+"""
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass
+
+from tools.model import load_model
+from tools.projection import build_states, find_memberships
+from tools.schema import parse_schema
+
+OUTPUT_NAME = "temporal.sql"
+RANGE_TYPES = {"TIMESTAMP WITH TIME ZONE": "tstzrange", "TIMESTAMP": "tsrange", "DATE": "daterange"}
+_CASTS = {"TIMESTAMP WITH TIME ZONE": "timestamptz", "TIMESTAMP": "timestamp", "DATE": "date"}
+# 時点の引数の型は、主体のイベント日時のうち最も細かい型に合わせる
+_PRECISION = ("DATE", "TIMESTAMP", "TIMESTAMP WITH TIME ZONE")
+
+_RULE = "-- " + "=" * 48
+
+
+def datetime_type(type_):
+    """日時の型を RANGE_TYPES のキーにそろえる（精度指定・別名を除く）"""
+    text = re.sub(r"\s*\(\d+\)", "", " ".join(type_.upper().split()))
+    text = {"TIMESTAMPTZ": "TIMESTAMP WITH TIME ZONE",
+            "TIMESTAMP WITHOUT TIME ZONE": "TIMESTAMP", "DATETIME": "TIMESTAMP"}.get(text, text)
+    if text not in RANGE_TYPES:
+        raise ValueError(f"unsupported datetime type: {type_}")
+    return text
+
+
+@dataclass
+class EventValidity:
+    """主体リソースごとの 1 つのイベントの有効期間（次の同じイベントまで）"""
+    state: object               # StateProjection
+    event: object               # EventProjection
+    table: str
+    type: str                   # イベント日時の型
+
+    @property
+    def range(self):
+        return RANGE_TYPES[self.type]
+
+    @property
+    def key(self):
+        return self.state.key
+
+
+@dataclass
+class MembershipValidity:
+    """イベント経由の多対多関連の組み合わせが有効だった期間"""
+    membership: object          # Membership
+    table: str
+    type: str
+
+    @property
+    def range(self):
+        return RANGE_TYPES[self.type]
+
+    @property
+    def keys(self):
+        m = self.membership
+        return [m.subject_key, m.member_key] + [col for col, _, _ in m.dims]
+
+    @property
+    def function(self):
+        """指定時点の組み合わせを返す関数（{リソース}_{相手}_as_of）"""
+        return f"{self.table[:-len('_VALIDITY')].lower()}_as_of"
+
+
+def _column_type(schema, table, column):
+    return schema.tables[table].columns[column].type.replace(" GENERATED ALWAYS AS IDENTITY", "")
+
+
+def find_validities(model, schema):
+    """(状態, イベントの有効期間, 組み合わせの有効期間) を返す"""
+    memberships = find_memberships(model)
+    states = build_states(model, schema, memberships)
+    events = [
+        EventValidity(state, ev, f"{ev.table}_VALIDITY",
+                      datetime_type(_column_type(schema, ev.table, ev.datetime)))
+        for state in states for ev in state.events if ev.datetime is not None
+    ]
+    members = [
+        MembershipValidity(m, f"{m.subject.table}_{m.member.table}_VALIDITY",
+                           datetime_type(_column_type(schema, m.link.table, m.link.event_datetime.column)))
+        for m in memberships
+    ]
+    return states, events, members
+
+
+# ------------------------------------------------
+# SQL 出力
+# ------------------------------------------------
+
+def _section(title):
+    return ["", _RULE, f"-- {title}", _RULE]
+
+
+def _label(schema, event):
+    return schema.tables[event.table].comment or event.japanese
+
+
+def _state_types(state):
+    return {col.name: col.type for col in state.columns}
+
+
+def _create_event_validity(v, schema):
+    ev, key, name = v.event, v.key, v.table.lower()
+    label = _label(schema, ev.entity)
+    types = _state_types(v.state)
+    lines = ["", f"-- {label}の有効期間（次の{label}まで）", f"CREATE TABLE {v.table} ("]
+    defs = [f"    {key} {types[key]} NOT NULL",
+            f"    {ev.pk} {_column_type(schema, ev.table, ev.pk)} PRIMARY KEY",
+            f"    valid_from {_column_type(schema, ev.table, ev.datetime)} NOT NULL",
+            f"    valid_during {v.range} NOT NULL",
+            "    seq BIGINT NOT NULL"]
+    defs += [f"    {state_col} NUMERIC NOT NULL" for _, state_col in ev.totals]
+    defs += [f"    CONSTRAINT fk_{name}_{v.state.resource.table.lower()} FOREIGN KEY ({key})\n"
+             f"        REFERENCES {v.state.resource.table}({key}) ON DELETE RESTRICT",
+             f"    CONSTRAINT ex_{name}_overlap\n"
+             f"        EXCLUDE USING gist ({key} WITH =, valid_during WITH &&)"]
+    lines.append(",\n".join(defs))
+    lines += [");", "",
+              "-- 追記時の前後の行の探索・初回日時",
+              f"CREATE INDEX idx_{name}_from ON {v.table}({key}, valid_from, {ev.pk});", "",
+              f"COMMENT ON TABLE {v.table} IS '{label}の有効期間（イベントから導出）';",
+              f"COMMENT ON COLUMN {v.table}.valid_from IS '{ev.entity.event_datetime.japanese}';",
+              f"COMMENT ON COLUMN {v.table}.valid_during IS '最新の{label}だった期間（次の{label}の日時まで）';",
+              f"COMMENT ON COLUMN {v.table}.seq IS 'この時点までの{label}の件数';"]
+    comments = {col.name: col.comment for col in v.state.columns}
+    lines += [f"COMMENT ON COLUMN {v.table}.{state_col} IS '{comments[state_col]}（この時点まで）';"
+              for _, state_col in ev.totals]
+    return lines
+
+
+def _create_membership_validity(v, schema):
+    m, name = v.membership, v.table.lower()
+    lines = ["", f"-- {m.subject.japanese}の{m.member.japanese}の有効期間", f"CREATE TABLE {v.table} ("]
+    defs = [f"    {m.subject_key} {_column_type(schema, m.link.table, m.link_subject)} NOT NULL",
+            f"    {m.member_key} {_column_type(schema, m.link.table, m.link_member)} NOT NULL"]
+    defs += [f"    {col} {_column_type(schema, m.link.table, col)} NOT NULL" for col, _, _ in m.dims]
+    defs += [f"    valid_during {v.range} NOT NULL",
+             "    source_event VARCHAR(63) NOT NULL",
+             "    source_event_id INTEGER NOT NULL"]
+    if m.replace is not None:
+        defs.append("    ended_by_event_id INTEGER")
+    defs += [f"    CONSTRAINT fk_{name}_{m.subject.table.lower()} FOREIGN KEY ({m.subject_key})\n"
+             f"        REFERENCES {m.subject.table}({m.subject_key}) ON DELETE RESTRICT",
+             f"    CONSTRAINT fk_{name}_{m.member.table.lower()} FOREIGN KEY ({m.member_key})\n"
+             f"        REFERENCES {m.member.table}({m.member_key}) ON DELETE RESTRICT"]
+    defs += [f"    CONSTRAINT fk_{name}_{ref.lower()} FOREIGN KEY ({col})\n"
+             f"        REFERENCES {ref}({ref_col}) ON DELETE RESTRICT" for col, ref, ref_col in m.dims]
+    defs.append(f"    CONSTRAINT ex_{name}_overlap\n        EXCLUDE USING gist ("
+                + ", ".join(f"{k} WITH =" for k in v.keys) + ", valid_during WITH &&)")
+    lines.append(",\n".join(defs))
+    lines += [");", ""]
+    # 相手側からの逆引き（例: ある時点にある人が担当していたプロジェクト）
+    member = m.member_key[:-3] if m.member_key.endswith("_id") else m.member_key
+    lines.append(f"CREATE INDEX idx_{name}_{member} ON {v.table} USING gist ({m.member_key}, valid_during);")
+    ended = f"から{m.replace.japanese}で外れるまで" if m.replace else "以降"
+    lines += ["", f"COMMENT ON TABLE {v.table} IS '{m.subject.japanese}の{m.member.japanese}の有効期間"
+                  f"（{m.link.japanese}{ended}、イベントから導出）';",
+              f"COMMENT ON COLUMN {v.table}.valid_during IS '有効期間';",
+              f"COMMENT ON COLUMN {v.table}.source_event IS '開始したイベント';",
+              f"COMMENT ON COLUMN {v.table}.source_event_id IS '開始したイベントのID';"]
+    if m.replace is not None:
+        lines.append(f"COMMENT ON COLUMN {v.table}.ended_by_event_id IS '終了した{m.replace.japanese}のID';")
+    return lines
+
+
+def _lock_subject(resource, key, value):
+    """同じ主体への同時追記を直列化する（前後の行の探索と期間の更新がずれないように）"""
+    return f"    PERFORM 1 FROM {resource.table} WHERE {key} = {value} FOR NO KEY UPDATE;"
+
+
+def _event_validity_functions(v, schema):
+    ev, key, table = v.event, v.key, v.table
+    name = f"{table.lower()}_apply"
+    label = _label(schema, ev.entity)
+    dt, pk, subject = f"NEW.{ev.datetime}", f"NEW.{ev.pk}", f"NEW.{ev.subject_column}"
+    after = f"{key} = {subject} AND (valid_from, {ev.pk}) > ({dt}, {pk})"
+    cols = [key, ev.pk, "valid_from", "valid_during", "seq"] + [s for _, s in ev.totals]
+    values = [subject, pk, dt, f"{v.range}({dt}, next_from)", "COALESCE(prev.seq, 0) + 1"]
+    values += [f"COALESCE(prev.{s}, 0) + COALESCE(NEW.{e}, 0)" for e, s in ev.totals]
+    shifts = ["seq = seq + 1"] + [f"{s} = {s} + COALESCE(NEW.{e}, 0)" for e, s in ev.totals]
+    indent = "        "
+    return [
+        "",
+        f"-- {label}の追記 → 直前の行の期間を閉じ、有効期間を追加",
+        f"CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$",
+        "DECLARE",
+        f"    prev {table}%ROWTYPE;",
+        f"    next_from {_column_type(schema, ev.table, ev.datetime)};",
+        "BEGIN",
+        _lock_subject(v.state.resource, key, subject),
+        f"    SELECT * INTO prev FROM {table}",
+        f"    WHERE {key} = {subject} AND (valid_from, {ev.pk}) < ({dt}, {pk})",
+        f"    ORDER BY valid_from DESC, {ev.pk} DESC",
+        "    LIMIT 1;",
+        f"    SELECT valid_from INTO next_from FROM {table}",
+        f"    WHERE {after}",
+        f"    ORDER BY valid_from, {ev.pk}",
+        "    LIMIT 1;",
+        "",
+        f"    UPDATE {table} SET valid_during = {v.range}(valid_from, {dt})",
+        f"    WHERE {ev.pk} = prev.{ev.pk};",
+        "    -- 過去の日時で追記された場合は、後の行の件数・累計を繰り下げる",
+        "    IF next_from IS NOT NULL THEN",
+        f"        UPDATE {table} SET {', '.join(shifts)}",
+        f"        WHERE {after};",
+        "    END IF;",
+        f"    INSERT INTO {table} (",
+        indent + (",\n" + indent).join(cols),
+        "    ) VALUES (",
+        indent + (",\n" + indent).join(values),
+        "    );",
+        "    RETURN NULL;",
+        "END;",
+        "$$;",
+        "",
+        f"CREATE TRIGGER trg_{ev.prefix}_validity AFTER INSERT ON {ev.table}",
+        f"    FOR EACH ROW EXECUTE FUNCTION {name}();",
+    ]
+
+
+def _membership_ranges(v, params=None, indent="    "):
+    """組み合わせの有効期間を導出する SELECT（params を渡すと組み合わせ 1 つに絞る）
+
+    開始（アサイン・交代の新側）ごとに、その後で最初に旧側になった交代までを期間にする。
+    同じ交代で終わる開始は最も早いものにまとめる（現在の組み合わせの since と同じ規則）。
+    """
+    m = v.membership
+    dims = [col for col, _, _ in m.dims]
+
+    def source(event, subject, member):
+        dt = event.event_datetime.column
+        text = (f"{indent}    SELECT {', '.join([subject, member] + dims)}, {dt}, "
+                f"'{event.table}', {event.pk.column} FROM {event.table}")
+        if params is not None:
+            conds = [f"{c} = {p}" for c, p in zip([subject, member] + dims, params)]
+            text += f"\n{indent}    WHERE " + " AND ".join(conds)
+        return text
+
+    sources = [source(m.link, m.link_subject, m.link_member)]
+    if m.replace is not None:
+        sources.append(source(m.replace, m.replace_subject, m.new_member))
+    columns = v.keys + ["since", "source_event", "source_event_id"]
+    group = [f"s.{k}" for k in v.keys]
+    select = group + [f"{v.range}(s.since, {'e.ended_at' if m.replace else 'NULL'})",
+                      "s.source_event", "s.source_event_id"]
+    lines = []
+    if m.replace is not None:
+        group.append("e.ended_at")
+        select.append("e.ended_by")
+    lines += [f"{indent}SELECT DISTINCT ON ({', '.join(group)})",
+              f"{indent}    " + ", ".join(select),
+              f"{indent}FROM (",
+              f"\n{indent}    UNION ALL\n".join(sources),
+              f"{indent}) AS s ({', '.join(columns)})"]
+    if m.replace is not None:
+        rep_dt = m.replace.event_datetime.column
+        conds = [f"r.{m.replace_subject} = s.{m.subject_key}", f"r.{m.old_member} = s.{m.member_key}"]
+        conds += [f"r.{col} = s.{col}" for col in dims]
+        conds.append(f"r.{rep_dt} > s.since")
+        lines += [f"{indent}LEFT JOIN LATERAL (",
+                  f"{indent}    SELECT r.{rep_dt}, r.{m.replace.pk.column} FROM {m.replace.table} r",
+                  f"{indent}    WHERE " + f"\n{indent}      AND ".join(conds),
+                  f"{indent}    ORDER BY r.{rep_dt}, r.{m.replace.pk.column}",
+                  f"{indent}    LIMIT 1",
+                  f"{indent}) AS e (ended_at, ended_by) ON true"]
+    lines.append(f"{indent}ORDER BY {', '.join(group)}, s.since, s.source_event_id")
+    return lines
+
+
+def _membership_columns(v):
+    columns = v.keys + ["valid_during", "source_event", "source_event_id"]
+    if v.membership.replace is not None:
+        columns.append("ended_by_event_id")
+    return ", ".join(columns)
+
+
+def _membership_validity_functions(v, schema):
+    m = v.membership
+    prefix = v.table.lower()
+    refresh = f"refresh_{prefix}"
+    params = [f"p_{k}" for k in v.keys]
+    types = [_column_type(schema, m.link.table, c) for c in [m.link_subject, m.link_member]]
+    types += [_column_type(schema, m.link.table, col) for col, _, _ in m.dims]
+    lines = ["", f"-- {m.subject.japanese}の{m.member.japanese}の組み合わせ 1 つ分の有効期間をイベントから作り直す",
+             f"CREATE OR REPLACE FUNCTION {refresh}("
+             + ", ".join(f"{p} {t}" for p, t in zip(params, types)) + ") RETURNS void LANGUAGE plpgsql AS $$",
+             "BEGIN",
+             _lock_subject(m.subject, m.subject_key, params[0]),
+             f"    DELETE FROM {v.table}",
+             "    WHERE " + " AND ".join(f"{k} = {p}" for k, p in zip(v.keys, params)) + ";",
+             f"    INSERT INTO {v.table} ({_membership_columns(v)})"]
+    lines += _membership_ranges(v, params)
+    lines[-1] += ";"
+    lines += ["END;", "$$;"]
+
+    dims = [f"NEW.{col}" for col, _, _ in m.dims]
+    triggers = [(m.link, [[f"NEW.{m.link_subject}", f"NEW.{m.link_member}"] + dims], "に追加")]
+    if m.replace is not None:
+        subject = f"NEW.{m.replace_subject}"
+        triggers.append((m.replace, [[subject, f"NEW.{m.old_member}"] + dims,
+                                     [subject, f"NEW.{m.new_member}"] + dims], "の旧側を閉じ、新側を追加"))
+    for event, calls, action in triggers:
+        name = f"{prefix}_apply_{event.table.lower()}"
+        lines += ["", f"-- {event.japanese}の追記 → {m.subject.japanese}の{m.member.japanese}の有効期間{action}",
+                  f"CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$",
+                  "BEGIN"]
+        lines += [f"    PERFORM {refresh}({', '.join(args)});" for args in calls]
+        lines += ["    RETURN NULL;", "END;", "$$;", "",
+                  f"CREATE TRIGGER trg_{event.table.lower()}_{prefix} AFTER INSERT ON {event.table}",
+                  f"    FOR EACH ROW EXECUTE FUNCTION {name}();"]
+    return lines
+
+
+def _at(param_type, v_type):
+    """時点の引数を期間の要素の型に合わせる"""
+    return "p_at" if param_type == v_type else f"p_at::{v_type}"
+
+
+def _state_as_of(state, validities, schema):
+    """{リソース}_STATE と同じ列（日時のないイベントの列と updated_at を除く）を指定時点について返す"""
+    key = state.key
+    types = _state_types(state)
+    at_type = max((v.type for v in validities), key=_PRECISION.index)
+    exprs = {key: f"r.{key}"}
+    joins = []
+    for i, v in enumerate(validities, 1):
+        ev, p = v.event, v.event.prefix
+        va, ea = f"v{i}", f"e{i}"
+        exprs[f"{p}_count"] = f"COALESCE({va}.seq, 0)"
+        exprs[f"first_{p}_at"] = (f"CASE WHEN {va}.seq IS NOT NULL THEN "
+                                  f"(SELECT MIN(f.valid_from) FROM {v.table} f WHERE f.{key} = r.{key}) END")
+        exprs[f"last_{p}_at"] = f"{va}.valid_from"
+        exprs[f"last_{p}_id"] = f"{va}.{ev.pk}"
+        exprs.update((state_col, f"{ea}.{event_col}") for event_col, state_col in ev.latest)
+        exprs.update((state_col, f"COALESCE({va}.{state_col}, 0)") for _, state_col in ev.totals)
+        if ev.remaining:
+            resource_col, remaining, total = ev.remaining
+            exprs[remaining] = f"r.{resource_col} - COALESCE({va}.{total}, 0)"
+        joins.append(f"    LEFT JOIN {v.table} {va}\n"
+                     f"        ON {va}.{key} = r.{key} AND {va}.valid_during @> {_at(at_type, v.type)}")
+        if ev.latest:
+            joins.append(f"    LEFT JOIN {ev.table} {ea} ON {ea}.{ev.pk} = {va}.{ev.pk}")
+    columns = [col.name for col in state.columns if col.name in exprs]
+    name = f"{state.table.lower()}_as_of"
+    return name, [
+        "",
+        f"-- 指定時点の{state.resource.japanese}の状態（{state.table} の時点指定版）",
+        f"CREATE OR REPLACE FUNCTION {name}(p_{key} {types[key]}, p_at {at_type})",
+        "RETURNS TABLE (",
+        "    " + ",\n    ".join(f"{c} {types[c]}" for c in columns),
+        ") LANGUAGE sql STABLE AS $$",
+        "    SELECT",
+        "        " + ",\n        ".join(exprs[c] for c in columns),
+        f"    FROM {state.resource.table} r",
+        *joins,
+        f"    WHERE r.{key} = p_{key}",
+        "$$;",
+    ]
+
+
+def _membership_as_of(v, schema):
+    m = v.membership
+    link_types = [_column_type(schema, m.link.table, c) for c in [m.link_member] + [d for d, _, _ in m.dims]]
+    outputs = list(zip(v.keys[1:], link_types))
+    outputs += [("since", _column_type(schema, m.link.table, m.link.event_datetime.column)),
+                ("source_event", "VARCHAR(63)"), ("source_event_id", "INTEGER")]
+    name = v.function
+    return name, [
+        "",
+        f"-- 指定時点の{m.subject.japanese}の{m.member.japanese}",
+        f"CREATE OR REPLACE FUNCTION {name}(p_{m.subject_key} "
+        f"{_column_type(schema, m.link.table, m.link_subject)}, p_at {v.type})",
+        "RETURNS TABLE (",
+        "    " + ",\n    ".join(f"{c} {t}" for c, t in outputs),
+        ") LANGUAGE sql STABLE AS $$",
+        "    SELECT " + ", ".join(f"v.{k}" for k in v.keys[1:])
+        + ", lower(v.valid_during), v.source_event, v.source_event_id",
+        f"    FROM {v.table} v",
+        f"    WHERE v.{m.subject_key} = p_{m.subject_key} AND v.valid_during @> p_at",
+        f"    ORDER BY {', '.join(f'v.{k}' for k in reversed(v.keys[1:]))}",
+        "$$;",
+    ]
+
+
+def _rebuild_event_validity(v):
+    ev, key = v.event, v.key
+    name = f"rebuild_{v.table.lower()}"
+    cols = [key, ev.pk, "valid_from", "valid_during", "seq"] + [s for _, s in ev.totals]
+    selects = [ev.subject_column, ev.pk, ev.datetime,
+               f"{v.range}({ev.datetime}, LEAD({ev.datetime}) OVER w)", "ROW_NUMBER() OVER w"]
+    selects += [f"SUM(COALESCE({e}, 0)) OVER w" for e, _ in ev.totals]
+    return name, [
+        "",
+        f"-- {ev.entity.japanese}の有効期間をイベントから作り直す",
+        f"CREATE OR REPLACE FUNCTION {name}() RETURNS BIGINT LANGUAGE plpgsql AS $$",
+        "DECLARE",
+        "    n BIGINT;",
+        "BEGIN",
+        f"    LOCK TABLE {ev.table} IN SHARE MODE;",
+        f"    TRUNCATE {v.table};",
+        f"    INSERT INTO {v.table} ({', '.join(cols)})",
+        f"    SELECT {', '.join(selects)}",
+        f"    FROM {ev.table}",
+        f"    WINDOW w AS (PARTITION BY {ev.subject_column} ORDER BY {ev.datetime}, {ev.pk});",
+        "    GET DIAGNOSTICS n = ROW_COUNT;",
+        "    RETURN n;",
+        "END;",
+        "$$;",
+    ]
+
+
+def _rebuild_membership_validity(v):
+    m = v.membership
+    name = f"rebuild_{v.table.lower()}"
+    tables = [m.link.table] + ([m.replace.table] if m.replace is not None else [])
+    lines = ["", f"-- {m.subject.japanese}の{m.member.japanese}の有効期間をイベントから作り直す",
+             f"CREATE OR REPLACE FUNCTION {name}() RETURNS BIGINT LANGUAGE plpgsql AS $$",
+             "DECLARE",
+             "    n BIGINT;",
+             "BEGIN",
+             f"    LOCK TABLE {', '.join(tables)} IN SHARE MODE;",
+             f"    TRUNCATE {v.table};",
+             f"    INSERT INTO {v.table} ({_membership_columns(v)})"]
+    lines += _membership_ranges(v)
+    lines[-1] += ";"
+    lines += ["    GET DIAGNOSTICS n = ROW_COUNT;", "    RETURN n;", "END;", "$$;"]
+    return name, lines
+
+
+def temporal_sql(model, schema):
+    states, events, members = find_validities(model, schema)
+
+    as_of = []
+    for state in states:
+        validities = [v for v in events if v.state is state]
+        if validities:
+            as_of.append((state, validities))
+    lines = [
+        _RULE,
+        "-- 時点指定（as of）クエリ（イベントの有効期間を範囲型で持ち、GiST インデックスで時点を引く）",
+        f"-- {model.project}",
+        f"-- 生成: python -m tools.temporal {model.project} --write",
+        "-- projections.sql の後、データ投入の前に実行する（イベントの追記のみトリガーを前提にする）",
+        _RULE,
+        "--",
+        "-- 使い方:",
+    ]
+    for state, validities in as_of[:1]:
+        lines.append(f"--   SELECT * FROM {state.table.lower()}_as_of(?, ?);  -- 指定時点の状態（{state.table} と同じ列）")
+        lines.append(f"--   SELECT r.{state.key}, s.* FROM {state.resource.table} r")
+        lines.append(f"--   CROSS JOIN LATERAL {state.table.lower()}_as_of(r.{state.key}, ?) s;  -- 全件の指定時点の状態")
+        v = max(validities, key=lambda v: len(v.event.latest))
+        lines.append(f"--   SELECT e.* FROM {v.table} v JOIN {v.event.table} e USING ({v.event.pk})")
+        lines.append(f"--   WHERE v.{v.key} = ? AND v.valid_during @> ?::{_CASTS[v.type]};  -- 指定時点で最新の{v.event.entity.japanese}")
+    for v in members:
+        lines.append(f"--   SELECT * FROM {v.function}(?, ?);"
+                     f"  -- 指定時点の{v.membership.subject.japanese}の{v.membership.member.japanese}")
+    lines += ["--   CALL rebuild_validity();  -- イベントから全件を作り直す（復旧・トリガーを止めた一括投入の後）"]
+
+    lines += _section("有効期間テーブル")
+    lines += ["", "-- 整数列の = と範囲の && を 1 つの GiST インデックス・排他制約にまとめる",
+              "CREATE EXTENSION IF NOT EXISTS btree_gist;"]
+    for v in events:
+        lines += _create_event_validity(v, schema)
+    for v in members:
+        lines += _create_membership_validity(v, schema)
+
+    lines += _section("追記トリガー")
+    for v in events:
+        lines += _event_validity_functions(v, schema)
+    for v in members:
+        lines += _membership_validity_functions(v, schema)
+
+    lines += _section("時点指定の関数")
+    for state, validities in as_of:
+        lines += _state_as_of(state, validities, schema)[1]
+    for v in members:
+        lines += _membership_as_of(v, schema)[1]
+
+    lines += _section("イベントからの再構築")
+    names = []
+    for v in events:
+        name, body = _rebuild_event_validity(v)
+        names.append(name)
+        lines += body
+    for v in members:
+        name, body = _rebuild_membership_validity(v)
+        names.append(name)
+        lines += body
+    lines += ["", "CREATE OR REPLACE PROCEDURE rebuild_validity() LANGUAGE plpgsql AS $$", "BEGIN"]
+    lines += [f"    PERFORM {name}();" for name in names]
+    lines += ["END;", "$$;"]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="時点指定クエリ用の有効期間テーブルと関数の DDL を生成する")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--write", action="store_true", help=f"artifacts/{{project}}/{OUTPUT_NAME} に書き出す")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.project)
+    schema = parse_schema(model.path / "schema.sql")
+    sql = temporal_sql(model, schema)
+    if args.write:
+        out = model.path / OUTPUT_NAME
+        out.write_text(sql, encoding="utf-8")
+        print(f"{out}", file=sys.stderr)
+    else:
+        sys.stdout.write(sql)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,567 @@
+"""データモデルの検証（/data-modeler の検証フェーズ、validation_result.json）
+
+model.json を索引付きのグラフ（エンティティ・属性の辞書と外部キーの隣接リスト）に読み込み、
+validation_result.json の 4 つの検査を規則として 1 回の走査で行う。
+
+- event_datetime_check: イベントは日時属性を 1 つだけ持つ
+- resource_check: リソースは主キー 1 つ、更新日時を持たない（変更はイベントとして記録する）
+- relationship_check: 多対多は交差テーブルで解消、外部キーは参照先の主キーと名前・型が一致、
+  外部キーの循環がない（自己参照は階層として許し、主キー自身を指すものはエラー）
+- naming_check: エンティティ名・属性名は PascalCase、主キーは {エンティティ名}ID
+
+規則はエンティティ単位で評価するので、--watch では model.json / entities_classified.json が
+変わるたびに tools.rebuild と同じ内容ハッシュで変わったエンティティとその隣接エンティティを求め、
+その分だけ検査し直す。
+
+使い方:
+    python -m tools.validate project-record-system            # 結果を表示（エラーがあれば終了コード 1）
+    python -m tools.validate project-record-system --write    # validation_result.json を更新
+    python -m tools.validate project-record-system --watch    # 変更を監視して検査し直す
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date
+
+from tools.model import load_model
+from tools.rebuild import fingerprint, make_plan
+
+RESULT_NAME = "validation_result.json"
+WATCHED = ("model.json", "entities_classified.json")
+CHECKS = ("event_datetime_check", "resource_check", "relationship_check", "naming_check")
+CARDINALITIES = ("1:1", "1:N", "M:N")
+
+_PASCAL = re.compile(r"^[A-Z][A-Za-z0-9]*$")
+_UPDATE_TIMESTAMP = re.compile(r"^(Updated|Modified|Deleted)(At|Date|DateTime|On)$")
+_ROLE_SUFFIX = ("By",)                          # RegisteredBy など、役割名だけの外部キー
+_PLURAL_EXCEPTIONS = ("ss", "us", "is", "ys")
+
+
+@dataclass
+class Issue:
+    check: str
+    level: str                    # "error" / "warning"
+    entity: str
+    message: str
+    attribute: str = None
+
+    def to_json(self):
+        item = {"category": self.check.removesuffix("_check"), "entity": self.entity}
+        if self.attribute:
+            item["attribute"] = self.attribute
+        item["message"] = self.message
+        return item
+
+
+@dataclass
+class EntityResult:
+    """エンティティ 1 つ分の検査結果（--watch ではエンティティ単位で差し替える）"""
+    issues: list = field(default_factory=list)
+    details: dict = field(default_factory=dict)   # 検査名 → 合格した項目の説明
+    foreign_keys: int = 0
+    self_references: int = 0
+
+    def error(self, check, entity, message, attribute=None):
+        self.issues.append(Issue(check, "error", entity, message, attribute))
+
+    def warning(self, check, entity, message, attribute=None):
+        self.issues.append(Issue(check, "warning", entity, message, attribute))
+
+    def ok(self, check, text):
+        self.details.setdefault(check, []).append(f"{text} ✓")
+
+
+# ------------------------------------------------
+# 索引付きグラフ
+# ------------------------------------------------
+
+class Graph:
+    """Model の索引（属性の辞書、外部キーの隣接リスト、主キー名 → リソース）"""
+
+    def __init__(self, model):
+        self.model = model
+        self.entities = model.entities
+        self.attributes = {name: {a.english: a for a in e.attributes} for name, e in self.entities.items()}
+        self.incoming = {name: [] for name in self.entities}      # 子 → 外部キーの関連
+        self.junctions = {}                                        # 交差テーブル → M:N の関連
+        self.owned = {name: [] for name in self.entities}         # 関連そのものを検査するエンティティ → 関連
+        self.unknown = []                                          # 端点が存在しない関連
+        for rel in model.relationships:
+            if rel.from_entity not in self.entities or rel.to_entity not in self.entities:
+                self.unknown.append(rel)
+            elif rel.is_foreign_key:
+                self.incoming[rel.to_entity].append(rel)
+            if rel.junction_table:
+                self.junctions.setdefault(rel.junction_table, []).append(rel)
+            # 関連そのものの検査は交差テーブル側（なければ from 側、それもなければ to 側）で 1 回だけ行う
+            owner = next((n for n in (rel.junction_table, rel.from_entity, rel.to_entity) if n in self.entities), None)
+            if owner:
+                self.owned[owner].append(rel)
+        self.pk_owners = {}
+        for name, entity in self.entities.items():
+            if entity.is_resource and entity.pk is not None:
+                self.pk_owners.setdefault(entity.pk.english, name)
+
+    def dependencies(self, name):
+        """外部キーで参照する（先に存在しなければならない）エンティティ（自己参照を除く）"""
+        deps = [r.from_entity for r in self.incoming[name] if not r.is_self_reference]
+        entity = self.entities[name]
+        if entity.is_junction:
+            deps += [self.pk_owners[a.english] for a in entity.primary_keys
+                     if a.english in self.pk_owners and self.pk_owners[a.english] != name]
+        return deps
+
+
+# ------------------------------------------------
+# 規則
+# ------------------------------------------------
+
+def _pk_names(entity):
+    """イベント・リソースの主キーとして認める名前（EventID、{名前}ID、名前の先頭語 + ID）"""
+    words = re.findall(r"[A-Z][a-z0-9]*", entity.name)
+    names = {f"{entity.name}ID"}
+    if entity.is_event:
+        names.add("EventID")
+        names.update("".join(words[:i]) + "ID" for i in range(1, len(words)))
+    return names
+
+
+def _check_event(graph, entity, result):
+    check = "event_datetime_check"
+    temporal = [a for a in entity.attributes if a.is_temporal]
+    declared = entity.datetime_attribute
+    if declared and graph.attributes[entity.name].get(declared) is None:
+        result.error(check, entity.name, f"datetime_attribute の {declared} が属性にありません", declared)
+    elif not temporal:
+        result.error(check, entity.name, "イベントに日時属性がありません（発生日時を 1 つ持たせてください）")
+    elif len(temporal) > 1:
+        names = ", ".join(a.english for a in temporal)
+        result.error(check, entity.name,
+                     f"日時属性が複数あります（{names}）。1つのイベントは1つの日時のみ持ちます")
+    elif declared and temporal[0].english != declared:
+        result.error(check, entity.name, f"datetime_attribute の {declared} が日時型ではありません", declared)
+    else:
+        attr = temporal[0]
+        if attr.base_type == "DATE":
+            result.warning(check, entity.name, "日時属性が DATE 型です。発生時刻を持つ TIMESTAMP を推奨します",
+                           attr.english)
+        result.ok(check, f"{entity.name}: {attr.english}（1つの日時属性のみ）")
+
+
+def _check_resource(graph, entity, result):
+    check = "resource_check"
+    if len(entity.primary_keys) != 1:
+        result.error(check, entity.name, "リソースの主キーは1つにしてください")
+    updates = [a for a in entity.attributes if _UPDATE_TIMESTAMP.match(a.english)]
+    for attr in updates:
+        result.error(check, entity.name,
+                     f"{attr.english}：リソースは更新日時を持ちません（変更はイベントとして記録します）",
+                     attr.english)
+    for attr in entity.attributes:
+        if attr.base_type in ("TIMESTAMP", "DATETIME") and attr.english.endswith("DateTime"):
+            result.warning(check, entity.name,
+                           f"{attr.english}：発生日時を持つ属性はイベントとして分離できる可能性があります",
+                           attr.english)
+    if not updates:
+        temporal = [a.english for a in entity.attributes if a.is_temporal]
+        result.ok(check, f"{entity.name}: 更新日時なし（日時属性: {', '.join(temporal) or 'なし'}）")
+
+
+def _check_junction(graph, entity, result):
+    check = "relationship_check"
+    keys = entity.primary_keys
+    refs = [a for a in keys if a.english in graph.pk_owners]
+    if len(keys) < 2:
+        result.error(check, entity.name, "交差テーブルは参照する両側の主キーからなる複合主キーを持ちます")
+    for attr in keys:
+        if attr not in refs:
+            result.error(check, entity.name, f"{attr.english} に対応するリソースの主キーがありません", attr.english)
+    if not graph.junctions.get(entity.name):
+        result.warning(check, entity.name, "この交差テーブルを使う M:N の関連が model.json にありません")
+
+
+def _check_foreign_key(graph, rel, result):
+    """外部キーの関連（子エンティティ側で評価する）"""
+    check = "relationship_check"
+    parent, child = graph.entities[rel.from_entity], graph.entities[rel.to_entity]
+    pk = parent.pk
+    attr = graph.attributes[child.name].get(rel.to_attribute)
+    result.foreign_keys += 1
+    if pk is None or rel.from_attribute != pk.english:
+        expected = pk.english if pk else "（単一主キーなし）"
+        result.error(check, child.name,
+                     f"{rel.from_entity}.{rel.from_attribute} は参照先の主キーではありません（主キー: {expected}）",
+                     rel.to_attribute)
+        return
+    if attr is None:
+        result.error(check, child.name, f"外部キー {rel.to_attribute} が属性にありません", rel.to_attribute)
+        return
+    if attr.base_type != pk.base_type and {attr.base_type, pk.base_type} != {"INT", "INTEGER"}:
+        result.error(check, child.name,
+                     f"{attr.english} の型 {attr.type} が参照先の主キー {pk.english} の型 {pk.type} と異なります",
+                     attr.english)
+    if rel.is_self_reference:
+        result.self_references += 1
+        if attr is pk:
+            result.error(check, child.name, f"{attr.english} が自分自身の主キーを参照しています", attr.english)
+        else:
+            result.ok(check, f"{child.name}.{attr.english}: 自己参照（階層）")
+    elif not (attr.english == pk.english or attr.english.endswith(pk.english)
+              or attr.english.endswith(_ROLE_SUFFIX)):
+        result.warning(check, child.name,
+                       f"外部キー {attr.english} が参照先の主キー名 {pk.english} と一致しません"
+                       f"（役割名を付ける場合も {pk.english} で終わる名前を推奨します）",
+                       attr.english)
+
+
+def _check_relationships(graph, entity, result):
+    check = "relationship_check"
+    for rel in graph.incoming[entity.name]:
+        _check_foreign_key(graph, rel, result)
+    linked = {rel.to_attribute for rel in graph.incoming[entity.name]}
+    for attr in entity.attributes:
+        owner = graph.pk_owners.get(attr.english)
+        if owner and owner != entity.name and attr.english not in linked and not entity.is_junction:
+            result.warning(check, entity.name, f"{attr.english} は {owner} の主キーと同名ですが関連が定義されていません",
+                           attr.english)
+    for rel in graph.owned[entity.name]:
+        label = f"{rel.from_entity} → {rel.to_entity}"
+        if rel in graph.unknown:
+            missing = [n for n in (rel.from_entity, rel.to_entity) if n not in graph.entities]
+            result.error(check, entity.name, f"関連 {label} の {', '.join(missing)} がエンティティにありません")
+        elif rel.cardinality not in CARDINALITIES:
+            result.error(check, entity.name, f"関連 {label} の多重度 {rel.cardinality!r} が不明です")
+        if rel.cardinality == "M:N" and not rel.junction_table:
+            result.error(check, entity.name, f"多対多の関連 {label} は交差テーブルまたはイベントで解消してください")
+        elif rel.junction_table:
+            junction = graph.entities.get(rel.junction_table)
+            if junction is None or not junction.is_junction:
+                result.error(check, entity.name, f"関連 {label} の交差テーブル {rel.junction_table} がありません")
+            else:
+                keys = {a.english for a in junction.primary_keys}
+                for end in (rel.from_entity, rel.to_entity):
+                    pk = graph.entities[end].pk if end in graph.entities else None
+                    if pk is not None and pk.english not in keys:
+                        result.error(check, entity.name,
+                                     f"交差テーブル {junction.name} に {end} の主キー {pk.english} がありません")
+        elif not rel.is_foreign_key and rel not in graph.unknown:
+            result.error(check, entity.name, f"関連 {label} に from_attribute / to_attribute がありません")
+    if entity.is_junction:
+        _check_junction(graph, entity, result)
+
+
+def _check_naming(graph, entity, result):
+    check = "naming_check"
+    if not _PASCAL.match(entity.name):
+        result.error(check, entity.name, "エンティティ名は PascalCase にしてください")
+    elif entity.name.endswith("s") and not entity.name.endswith(_PLURAL_EXCEPTIONS):
+        result.warning(check, entity.name, "エンティティ名が複数形の可能性があります（単数形を推奨します）")
+    seen = set()
+    for attr in entity.attributes:
+        if not _PASCAL.match(attr.english):
+            result.error(check, entity.name, f"属性名 {attr.english} は PascalCase にしてください", attr.english)
+        if attr.english in seen:
+            result.error(check, entity.name, f"属性名 {attr.english} が重複しています", attr.english)
+        seen.add(attr.english)
+    if not entity.is_junction and entity.pk is not None and entity.pk.english not in _pk_names(entity):
+        expected = f"{entity.name}ID" + (" または EventID" if entity.is_event else "")
+        result.error(check, entity.name, f"主キー {entity.pk.english} は {expected} としてください", entity.pk.english)
+
+
+def check_entity(graph, name):
+    """エンティティ 1 つ分の規則を評価する（関連は子側・交差テーブル側で評価する）"""
+    entity = graph.entities[name]
+    result = EntityResult()
+    if entity.is_event:
+        _check_event(graph, entity, result)
+    elif entity.is_resource:
+        _check_resource(graph, entity, result)
+    _check_relationships(graph, entity, result)
+    _check_naming(graph, entity, result)
+    return result
+
+
+def find_cycles(graph, roots=None):
+    """外部キーの循環（自己参照を除く強連結成分）を求める
+
+    roots を渡すと、そこから辿れる範囲だけを調べ、roots を含む循環だけを返す。
+    再帰を使わない Tarjan 法なので数千エンティティでも深さの制限を受けない。
+    """
+    names = list(graph.entities) if roots is None else [r for r in roots if r in graph.entities]
+    index, low, on_stack, stack, cycles, counter = {}, {}, set(), [], [], [0]
+    for root in names:
+        if root in index:
+            continue
+        work = [(root, iter(graph.dependencies(root)))]
+        index[root] = low[root] = counter[0]
+        counter[0] += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, edges = work[-1]
+            advanced = False
+            for dep in edges:
+                if dep not in index:
+                    index[dep] = low[dep] = counter[0]
+                    counter[0] += 1
+                    stack.append(dep)
+                    on_stack.add(dep)
+                    work.append((dep, iter(graph.dependencies(dep))))
+                    advanced = True
+                    break
+                if dep in on_stack:
+                    low[node] = min(low[node], index[dep])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                low[work[-1][0]] = min(low[work[-1][0]], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    order = {n: i for i, n in enumerate(graph.entities)}
+                    cycles.append(sorted(component, key=order.get))
+    if roots is not None:
+        wanted = set(roots)
+        cycles = [c for c in cycles if wanted.intersection(c)]
+    return cycles
+
+
+# ------------------------------------------------
+# 結果のまとめ
+# ------------------------------------------------
+
+class Validator:
+    """エンティティごとの結果を保持し、変わったエンティティだけ検査し直す"""
+
+    def __init__(self):
+        self.graph = None
+        self.results = {}
+        self.cycles = []
+
+    def run(self, model, names=None):
+        """names（None なら全エンティティ）を検査し直す
+
+        主キー名の持ち主（pk_owners）が変わったときは、その名前の属性を持つエンティティも検査し直す
+        （関連がなくても、属性名だけで参照先を決める規則があるため）。
+        """
+        before = self.graph.pk_owners if self.graph is not None else {}
+        self.graph = Graph(model)
+        targets = list(model.entities) if names is None else [n for n in names if n in model.entities]
+        if names is not None:
+            after = self.graph.pk_owners
+            moved = {k for k in before.keys() | after.keys() if before.get(k) != after.get(k)}
+            targets += [n for n, e in model.entities.items()
+                        if n not in targets and moved.intersection(a.english for a in e.attributes)]
+        self.results = {n: r for n, r in self.results.items() if n in model.entities}
+        for name in targets:
+            self.results[name] = check_entity(self.graph, name)
+        if names is None:
+            self.cycles = find_cycles(self.graph)
+        else:
+            touched = set(targets)
+            self.cycles = [c for c in self.cycles if not touched.intersection(c)
+                           and all(n in model.entities for n in c)]
+            self.cycles += find_cycles(self.graph, targets)
+        return targets
+
+    def issues(self):
+        ordered = [i for name in self.graph.entities for i in self.results[name].issues]
+        for cycle in self.cycles:
+            path = " → ".join(cycle + cycle[:1])
+            ordered.append(Issue("relationship_check", "error", cycle[0],
+                                 f"外部キーが循環しています（{path}）。作成順を決められません"))
+        return ordered
+
+    def to_json(self, previous=None):
+        """validation_result.json の内容（previous の suggestions / strengths は引き継ぐ）"""
+        graph = self.graph
+        issues = self.issues()
+        errors = [i for i in issues if i.level == "error"]
+        warnings = [i for i in issues if i.level == "warning"]
+        failed = {i.check for i in errors}
+        results = [self.results[name] for name in graph.entities]
+        foreign_keys = sum(r.foreign_keys for r in results)
+        self_references = sum(r.self_references for r in results)
+        junctions = len(graph.junctions)
+        counts = {kind: sum(1 for e in graph.entities.values() if e.type == kind)
+                  for kind in ("resource", "event", "junction")}
+
+        summary_lines = {
+            "event_datetime_check": [],
+            "resource_check": [],
+            "relationship_check": [
+                f"多対多の関係は交差テーブル {junctions} 件で解消",
+                f"外部キー {foreign_keys} 件が参照先の主キーと一致",
+                f"外部キーの循環なし（自己参照 {self_references} 件）",
+            ],
+            "naming_check": [
+                "エンティティ名: PascalCase、単数形",
+                "主キー: {エンティティ名}ID形式",
+                "属性名: PascalCase",
+            ],
+        }
+        details = {}
+        for check in CHECKS:
+            lines = [line for r in results for line in r.details.get(check, [])]
+            if check not in failed:
+                lines = [f"{line} ✓" for line in summary_lines[check]] + lines
+            lines += [f"{i.entity}: {i.message} {'✗' if i.level == 'error' else '△'}"
+                      for i in issues if i.check == check]
+            details[check] = {"passed": check not in failed, "details": lines}
+
+        result = {
+            "is_valid": not errors,
+            "validation_date": date.today().isoformat(),
+            "total_entities": len(graph.entities),
+            "total_relationships": len(graph.model.relationships),
+            "errors": [i.to_json() for i in errors],
+            "warnings": [i.to_json() for i in warnings],
+            "suggestions": (previous or {}).get("suggestions", []),
+            "validation_details": details,
+        }
+        if (previous or {}).get("strengths"):
+            result["strengths"] = previous["strengths"]
+        result["summary"] = (f"リソース{counts['resource']}個、イベント{counts['event']}個、"
+                             f"交差テーブル{counts['junction']}個、関連{len(graph.model.relationships)}個。"
+                             f"エラー{len(errors)}件、警告{len(warnings)}件。")
+        return result
+
+
+def _read_result(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_result(path, result):
+    """validation_result.json を書く（日付以外が同じなら書き換えない）。書いたら True"""
+    previous = _read_result(path)
+    strip = lambda data: {k: v for k, v in data.items() if k != "validation_date"}
+    if previous and strip(previous) == strip(result):
+        return False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
+    return True
+
+
+def report_lines(result):
+    lines = []
+    for check, detail in result["validation_details"].items():
+        lines.append(f"{'OK ' if detail['passed'] else 'NG '} {check}")
+    for level, items in (("エラー", result["errors"]), ("警告", result["warnings"])):
+        for item in items:
+            target = item["entity"] + (f".{item['attribute']}" if item.get("attribute") else "")
+            lines.append(f"{level}: {target}: {item['message']}")
+    lines.append(result["summary"])
+    return lines
+
+
+def _mtimes(base):
+    stamps = {}
+    for name in WATCHED:
+        path = base / name
+        stamps[name] = path.stat().st_mtime_ns if path.exists() else None
+    return stamps
+
+
+def watch(project, interval, write):
+    """入力の更新を監視し、変わったエンティティと隣接エンティティだけを検査し直す"""
+    started = time.perf_counter()
+    model = load_model(project)
+    base = model.path
+    stamps = _mtimes(base)
+    previous_fp = fingerprint(base)
+    loaded = (time.perf_counter() - started) * 1000
+    validator = Validator()
+    started = time.perf_counter()
+    validator.run(model)
+    checked = (time.perf_counter() - started) * 1000
+
+    def publish(label, count, loaded, checked):
+        result = validator.to_json(_read_result(base / RESULT_NAME))
+        if write:
+            write_result(base / RESULT_NAME, result)
+        state = "OK" if result["is_valid"] else f"エラー {len(result['errors'])} 件"
+        print(f"[{time.strftime('%H:%M:%S')}] {label} {count} エンティティを検査"
+              f"（読み込み {loaded:.1f} ms / 検査 {checked:.1f} ms）: {state}、警告 {len(result['warnings'])} 件",
+              file=sys.stderr)
+        for item in result["errors"]:
+            target = item["entity"] + (f".{item['attribute']}" if item.get("attribute") else "")
+            print(f"  エラー: {target}: {item['message']}", file=sys.stderr)
+
+    publish("全体", len(model.entities), loaded, checked)
+    failed = None
+    try:
+        while True:
+            time.sleep(interval)
+            current = _mtimes(base)
+            if current == stamps:
+                continue
+            started = time.perf_counter()
+            try:
+                model = load_model(base)
+                fp = fingerprint(base)
+            except (json.JSONDecodeError, KeyError) as e:
+                # 保存途中の可能性があるので stamps は進めず、次の確認で読み直す
+                if current != failed:
+                    print(f"[{time.strftime('%H:%M:%S')}] 読み込みに失敗しました: {e}", file=sys.stderr)
+                failed = current
+                continue
+            stamps = current
+            loaded = (time.perf_counter() - started) * 1000
+            plan = make_plan(previous_fp, fp)
+            previous_fp = fp
+            if not plan.affected and not plan.removed:
+                continue
+            started = time.perf_counter()
+            targets = validator.run(model, plan.affected)
+            publish("変更", len(targets), loaded, (time.perf_counter() - started) * 1000)
+    except KeyboardInterrupt:
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="データモデルを規則で検証し validation_result.json を作る")
+    parser.add_argument("project", help="artifacts 配下のプロジェクト名またはディレクトリ")
+    parser.add_argument("--write", action="store_true", help=f"{RESULT_NAME} を更新する")
+    parser.add_argument("--json", action="store_true", help=f"{RESULT_NAME} の内容を標準出力に書く")
+    parser.add_argument("--watch", action="store_true", help="入力の変更を監視し、変わったエンティティだけ検査し直す")
+    parser.add_argument("--interval", type=float, default=1.0, help="--watch の確認間隔（秒）")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        return watch(args.project, args.interval, args.write)
+
+    started = time.perf_counter()
+    model = load_model(args.project)
+    validator = Validator()
+    validator.run(model)
+    path = model.path / RESULT_NAME
+    result = validator.to_json(_read_result(path))
+    elapsed = (time.perf_counter() - started) * 1000
+    if args.json:
+        sys.stdout.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
+    else:
+        print("\n".join(report_lines(result)))
+    if args.write:
+        changed = write_result(path, result)
+        print(f"{path}: {'更新しました' if changed else '変更なし'}", file=sys.stderr)
+    print(f"{len(model.entities)} エンティティを {elapsed:.1f} ms で検査", file=sys.stderr)
+    return 0 if result["is_valid"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())